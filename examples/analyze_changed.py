@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Example script that analyzes only the listings that changed since the last run.
+After a brokerage export refresh, listings whose rows are unchanged keep their
+existing reports and research; added and changed listings are re-analyzed.
+"""
+
+import sys
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+import traceback
+from contextlib import nullcontext
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import project modules
+from src.data.loader import PropertyDataLoader
+from src.data.changes import ChangeTracker
+from src.reports.index import ReportIndex
+from src.models.crew import PropertyAnalysisCrew, analyze_properties
+from src.visualization.pipeline import ChartRenderer, render_property_charts
+from src.utils.formatting import print_header, print_error, print_info
+from src.utils.llm import setup_llm as setup_llm_util, setup_router as setup_router_util
+
+# Load environment variables
+load_dotenv()
+
+def setup_llm():
+    """Set up the language model based on environment variables."""
+    use_mock = os.getenv("USE_MOCK_LLM", "false").lower() == "true" or "--use-mock" in sys.argv
+    
+    return setup_llm_util(
+        use_mock=use_mock,
+        for_crewai=True,
+        model_name=os.getenv("OLLAMA_MODEL", "llama3"),
+        base_url=os.getenv("OLLAMA_API_BASE", "http://localhost:11434"),
+        temperature=float(os.getenv("CREW_TEMPERATURE", "0.7")),
+        verbose=True
+    )
+
+def setup_router(llm):
+    """Set up per-stage model routing (OLLAMA_MODEL_ROUTES) around the default LLM."""
+    use_mock = os.getenv("USE_MOCK_LLM", "false").lower() == "true" or "--use-mock" in sys.argv
+    
+    return setup_router_util(
+        llm,
+        use_mock=use_mock,
+        for_crewai=True,
+        base_url=os.getenv("OLLAMA_API_BASE", "http://localhost:11434"),
+        temperature=float(os.getenv("CREW_TEMPERATURE", "0.7")),
+        verbose=True
+    )
+
+def main():
+    """Detect changed listings and analyze only those."""
+    try:
+        dry_run = "--dry-run" in sys.argv
+        # Print-quality (SVG) charts are only rendered when asked for
+        tiers = ["screen", "thumbnail", "print"] if "--print-charts" in sys.argv else None
+        
+        loader = PropertyDataLoader()
+        tracker = ChangeTracker()
+        changes = loader.detect_changes(tracker)
+        
+        print_header("DATA REFRESH")
+        for key in ["added", "removed", "changed", "unchanged"]:
+            print(f"{key.capitalize()}: {len(changes[key])}")
+        print(f"Invalidated cached outputs: {len(changes['invalidated'])}")
+        print(f"Stale reports: {len(changes['stale_reports'])}")
+        
+        # Listings without a current report: added, changed, or never successfully analyzed
+        pending = tracker.pending()
+        print_info(f"{len(pending)} properties need analysis")
+        
+        if dry_run or not pending:
+            for stock_number in pending:
+                print(f"  {stock_number}")
+            return 0
+            
+        # Chart sets for every pending listing render together in one process pool
+        renderer = ChartRenderer(tiers=tiers, optimize="--optimize-charts" in sys.argv)
+        render_property_charts(loader, pending, renderer=renderer, change_tracker=tracker)
+        
+        llm = setup_llm()
+        router = setup_router(llm)
+        report_index = ReportIndex()
+        
+        # Summaries of one listing run on the small model while the next listing is
+        # researched on the large one, when both fit in memory
+        overlap = router.can_overlap()
+        if overlap:
+            print_info("Summary stages overlap the next listing's research")
+        
+        def crews():
+            for index, stock_number in enumerate(pending, 1):
+                print_header(f"ANALYZING {stock_number} ({index}/{len(pending)})")
+                yield PropertyAnalysisCrew(
+                    loader.get_property_data(stock_number),
+                    llm,
+                    market_area=loader.get_market_area(stock_number),
+                    financial_projection=loader.get_financial_projection(stock_number),
+                    property_trends=loader.get_property_trends(stock_number),
+                    change_tracker=tracker,
+                    report_index=report_index,
+                    router=router
+                )
+        
+        # Keep the model loaded for the whole batch (the mock LLM has no residency)
+        residency = getattr(llm, "residency", None)
+        with residency.pinned() if residency is not None else nullcontext():
+            analyze_properties(crews(), overlap=overlap)
+        
+        # Failed analyses are not registered and are retried on the next run
+        failures = tracker.pending(pending)
+        
+        if residency is not None and residency.cold_starts():
+            cold = residency.cold_starts()
+            print_info(f"Model cold starts: {len(cold)} ({sum(t['load_seconds'] for t in cold):.1f}s loading)")
+        
+        if failures:
+            print_error(f"Analysis failed for: {', '.join(failures)}")
+            return 1
+        return 0
+    except Exception as e:
+        print_error(f"Error: {str(e)}")
+        print_error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
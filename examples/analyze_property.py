@@ -20,6 +20,8 @@ sys.path.append(str(project_root))
 
 # Import project modules
 from src.data.loader import PropertyDataLoader
+from src.data.changes import ChangeTracker
+from src.reports.index import ReportIndex
 from src.models.crew import PropertyAnalysisCrew
 from src.utils.system import check_ollama_installed, check_ollama_running, setup_ollama_model
 from src.utils.formatting import print_header, print_error, print_info, print_warning
@@ -345,7 +347,15 @@ def main():
         llm = setup_llm()
         
         # Create the crew for property analysis
-        crew = PropertyAnalysisCrew(property_data, llm)
+        crew = PropertyAnalysisCrew(
+            property_data,
+            llm,
+            market_area=loader.get_market_area(stock_number),
+            financial_projection=loader.get_financial_projection(stock_number),
+            property_trends=loader.get_property_trends(stock_number),
+            change_tracker=ChangeTracker(),
+            report_index=ReportIndex()
+        )
         
         try:
             # Run the analysis
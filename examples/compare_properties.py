@@ -50,6 +50,7 @@ def main():
     try:
         loader = PropertyDataLoader()
         properties_data = []
+        market_areas = {}
         
         for stock_number in stock_numbers:
             property_data = loader.get_property_data(stock_number)
@@ -59,6 +60,7 @@ def main():
                 return 1
                 
             properties_data.append(property_data)
+            market_areas[property_data['StockNumber']] = loader.get_market_area(stock_number)
             
     except Exception as e:
         print_error(f"Error loading property data: {e}")
@@ -68,11 +70,11 @@ def main():
     llm = setup_llm()
     
     # Create the property analysis crew with the first property (needed for initialization)
-    crew = PropertyAnalysisCrew(properties_data[0], llm=llm)
+    crew = PropertyAnalysisCrew(properties_data[0], llm=llm, market_area=market_areas[properties_data[0]['StockNumber']])
     
     try:
         # Run the comparison analysis
-        comparison_report = crew.compare_properties(properties_data)
+        comparison_report = crew.compare_properties(properties_data, market_areas=market_areas)
         
         # Print the comparison report
         print_header("PROPERTY COMPARISON REPORT")
@@ -21,6 +21,7 @@ import plotly.graph_objects as go
 
 # Import enhanced web research tool
 from enhanced_web_research import WebResearchTool, EnhancedWebResearchTool
+from src.utils.residency import ModelResidency
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +30,7 @@ load_dotenv()
 OLLAMA_BASE_URL = "http://localhost:11434"
 OLLAMA_MODEL = "llama3:70b"  # Using Llama 3.3 70B model
 CREW_TEMPERATURE = 0.1  # Lower temperature for more focused, deterministic responses
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # How long the model stays loaded after a request
 
 # This is the key issue - litellm needs the provider prefix
 # Using two separate constants: one for CrewAI (prefixed) and one for Ollama API (just model name)
@@ -172,9 +174,14 @@ def setup_ollama_model():
         print("Continuing with Ollama anyway, but you may need to pull the model manually.")
 
 class PropertyAnalyzer:
-    def __init__(self, csv_path="DATA/master.csv"):
-        """Initialize the property analyzer with CSV data"""
+    def __init__(self, csv_path="DATA/master.csv", residency=None):
+        """Initialize the property analyzer with CSV data
+        
+        residency: Optional ModelResidency; while it pins the model, every request
+                   keeps the model loaded instead of resetting its expiry
+        """
         self.csv_path = csv_path
+        self.residency = residency
         
         # Check if CSV file exists
         if not os.path.exists(csv_path):
@@ -201,7 +208,7 @@ class PropertyAnalyzer:
         # Set up Ollama directly
         try:
             from langchain.llms import Ollama
-            self.ollama_llm = Ollama(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL)
+            self.ollama_llm = Ollama(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL, keep_alive=self.keep_alive())
             print(f"\nInitialized Ollama with model {OLLAMA_MODEL}")
         except Exception as e:
             print(f"Error initializing Ollama: {e}")
@@ -214,6 +221,12 @@ class PropertyAnalyzer:
             print("Then start it with 'ollama serve' command in a separate terminal.")
             sys.exit(1)
             
+    def keep_alive(self):
+        """keep_alive for requests made now: no expiry while the residency pins the model"""
+        if self.residency is None:
+            return OLLAMA_KEEP_ALIVE
+        return self.residency.request_keep_alive()
+    
     def get_property_data(self, stock_number):
         """Get all data for a specific property by stock number"""
         property_data = self.data[self.data['StockNumber'] == stock_number]
@@ -267,10 +280,12 @@ class PropertyAnalyzer:
         from langchain.llms import Ollama
         
         # Create Ollama LLM instances directly for each agent - with full config
+        # keep_alive is sent with every request, so a pinned model stays loaded
         llm = Ollama(
             model=OLLAMA_MODEL,
             base_url=OLLAMA_BASE_URL,
-            temperature=CREW_TEMPERATURE
+            temperature=CREW_TEMPERATURE,
+            keep_alive=self.keep_alive()
         )
         
         try:
@@ -644,24 +659,13 @@ def main():
         sys.exit(1)
     else:
         print("\nUsing Llama 3 model via Ollama")
-        try:
-            # Make a direct request to Ollama API as a test
-            response = requests.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json={"model": OLLAMA_MODEL, "prompt": "Hello, are you working?", "stream": False}
-            )
-            if response.status_code == 200:
-                print("Successfully connected to Ollama API")
-            else:
-                print(f"Warning: Ollama API responded with status code {response.status_code}")
-        except Exception as e:
-            print(f"Warning: Error testing Ollama API: {e}")
+        residency = ModelResidency(OLLAMA_MODEL, OLLAMA_BASE_URL, keep_alive=OLLAMA_KEEP_ALIVE)
     
     try:
         # Initialize analyzer
         print("\nInitializing property analyzer...")
         try:
-            analyzer = PropertyAnalyzer()
+            analyzer = PropertyAnalyzer(residency=residency)
             print("Property data loaded successfully.")
         except FileNotFoundError as e:
             print(f"\nError: {e}")
@@ -678,6 +682,13 @@ def main():
         # Setup Ollama model
         setup_ollama_model()
         
+        # Load the model now that it is pulled, so the first analysis stage does not pay the cold start
+        timing = residency.preload()
+        if timing is not None:
+            print(f"Successfully connected to Ollama API (model ready in {timing['seconds']:.1f}s)")
+        else:
+            print("Warning: Could not preload the model; the first request will load it")
+        
         # Test web search functionality
         print("\nVerifying web search capability...")
         search_available = test_web_search()
@@ -749,7 +760,9 @@ def main():
         print("The system is working even if it appears to be inactive.")
         
         try:
-            analyzer.analyze_property(stock_number)
+            # Keep the model loaded through the gaps between analysis stages
+            with residency.pinned():
+                analyzer.analyze_property(stock_number)
         except Exception as e:
             print(f"\nError during analysis: {e}")
             print("Please try again with a different property.")
@@ -7,4 +7,4 @@ for high-density residential development using a multi-agent AI system.
 
 __version__ = "1.0.0"
 __author__ = "ADLA Team"
-__all__ = ["agents", "data", "models", "tools", "utils", "visualization"] 
\ No newline at end of file
+__all__ = ["agents", "analysis", "data", "models", "tools", "utils", "visualization"] 
\ No newline at end of file
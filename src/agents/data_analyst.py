@@ -7,6 +7,10 @@ Analyzes property data, demographics, and market metrics to identify development
 from crewai import Agent, Task
 from textwrap import dedent
 
+from ..analysis.clustering import format_market_area
+from ..analysis.trends import format_trend_summary
+from ..analysis.financials import format_financial_summary
+
 class DataAnalyst:
     """Agent for analyzing property financial data and development potential."""
 
@@ -36,7 +40,8 @@ class DataAnalyst:
             llm=llm
         )
         
-    def create_property_potential_task(self, property_data, demographic_data, market_data):
+    def create_property_potential_task(self, property_data, demographic_data, market_data, financial_projection=None,
+                                       property_trends=None):
         """
         Create a task to analyze a property's development potential.
         
@@ -44,10 +49,24 @@ class DataAnalyst:
             property_data: Basic property information
             demographic_data: Demographic analysis for the area
             market_data: Market analysis for the area
+            financial_projection: Optional precomputed projection row from simulate_financials
+            property_trends: Optional precomputed trend row from PropertyDataLoader.get_property_trends
             
         Returns:
             Task: Task to execute in a crew
         """
+        demographic_data = self._with_trends(demographic_data, property_trends)
+        
+        if financial_projection is None:
+            financial_feasibility = """- Calculate land cost per potential unit
+                   - Estimate development costs based on local market
+                   - Project potential revenue based on local rental/sales rates
+                   - Calculate rough ROI and compare to industry standards"""
+        else:
+            # The model's numbers are given verbatim so the agent narrates rather than calculates
+            financial_feasibility = "- Quote and interpret this precomputed projection exactly; do not recalculate it:\n" + \
+                "\n".join(f"                     {line}" for line in format_financial_summary(financial_projection).splitlines())
+        
         return Task(
             description=dedent(f"""
                 Analyze the development potential of the property located at 
@@ -75,10 +94,7 @@ class DataAnalyst:
                    - Consider mixed-use potential if appropriate
                 
                 2. Financial Feasibility
-                   - Calculate land cost per potential unit
-                   - Estimate development costs based on local market
-                   - Project potential revenue based on local rental/sales rates
-                   - Calculate rough ROI and compare to industry standards
+                   {financial_feasibility}
                 
                 3. Demographic Alignment
                    - Analyze how well the site matches demographic trends
@@ -113,13 +129,14 @@ class DataAnalyst:
             agent=self.agent
         )
         
-    def create_property_comparison_task(self, properties_data, criteria=None):
+    def create_property_comparison_task(self, properties_data, criteria=None, market_areas=None):
         """
         Create a task to compare multiple properties based on development potential.
         
         Args:
             properties_data: List of property data dictionaries
             criteria: Optional dictionary of weighting criteria
+            market_areas: Optional dictionary mapping stock numbers to market area dictionaries
             
         Returns:
             Task: Task to execute in a crew
@@ -134,17 +151,28 @@ class DataAnalyst:
                 "market_strength": 0.20
             }
         
+        market_areas = market_areas or {}
+        
         # Extract properties for display in the task description
         properties_summary = "\n\n".join([
             f"Property {i+1}: {prop.get('Property Address', 'N/A')}, {prop.get('City', 'N/A')}, {prop.get('State', 'N/A')}"
             f"\n- Size: {prop.get('Land Area (AC)', 'N/A')} acres"
             f"\n- Price: ${prop.get('For Sale Price', 'N/A')}"
+            f"\n- Market Area: {market_areas.get(str(prop.get('StockNumber', '')).strip(), {}).get('id', 'N/A')}"
             for i, prop in enumerate(properties_data)
         ])
         
         # Create criteria description
         criteria_desc = "\n".join([f"- {key} ({value * 100}%)" for key, value in criteria.items()])
         
+        # Describe each market area once, however many of the properties share it
+        areas = {}
+        for prop in properties_data:
+            area = market_areas.get(str(prop.get('StockNumber', '')).strip())
+            if area:
+                areas.setdefault(area['id'], area)
+        market_area_desc = "\n\n".join(format_market_area(area) for area in areas.values()) or "No market area grouping provided."
+        
         return Task(
             description=dedent(f"""
                 Compare the following properties for their potential for high-density 
@@ -152,6 +180,12 @@ class DataAnalyst:
                 
                 {properties_summary}
                 
+                Market areas (shared statistics for properties in the same area):
+                {market_area_desc}
+                
+                Properties in the same market area share these area-level conditions, so
+                focus on site-level differences when comparing them with each other.
+                
                 Create a structured comparison using the following criteria and weights:
                 {criteria_desc}
                 
@@ -182,17 +216,20 @@ class DataAnalyst:
             agent=self.agent
         )
         
-    def create_demographic_trends_task(self, demographic_data, property_location):
+    def create_demographic_trends_task(self, demographic_data, property_location, property_trends=None):
         """
         Create a task to analyze demographic trends for a specific location.
         
         Args:
             demographic_data: Demographic data for analysis
             property_location: City, state or specific location
+            property_trends: Optional precomputed trend row from PropertyDataLoader.get_property_trends
             
         Returns:
             Task: Task to execute in a crew
         """
+        demographic_data = self._with_trends(demographic_data, property_trends)
+        
         return Task(
             description=dedent(f"""
                 Analyze the demographic trends for {property_location} and their implications
@@ -252,6 +289,24 @@ class DataAnalyst:
             agent=self.agent
         )
 
+    def _with_trends(self, demographic_data, property_trends):
+        """
+        Append precomputed trend analytics to demographic data for a prompt.
+        
+        Args:
+            demographic_data: Demographic data for analysis
+            property_trends: Precomputed trend row, or None
+            
+        Returns:
+            str: Demographic data followed by the precomputed trends, if any
+        """
+        if property_trends is None:
+            return demographic_data
+            
+        return (f"{demographic_data}\n\n"
+                "Precomputed growth rates by radius (quote these exactly; do not recalculate):\n"
+                f"{format_trend_summary(property_trends)}")
+        
     def analyze_property_potential(self, property_data, demographic_data, market_data):
         """
         Analyze a property's development potential based on various data points.
@@ -295,7 +350,7 @@ class DataAnalyst:
         # For backward compatibility - create a task but note it needs a crew to execute
         return "To execute this task, please use the create_demographic_trends_task method with a crew."
 
-    def analyze_property_valuation(self, address, city, state, current_valuation, development_potential, investment_analysis, market_position):
+    def analyze_property_valuation(self, address, city, state, current_valuation, development_potential, investment_analysis, market_position, financial_projection=None):
         """
         Analyze a property's valuation based on various data points.
         
@@ -307,40 +362,14 @@ class DataAnalyst:
             development_potential: Potential for different development types
             investment_analysis: Investment analysis for different scenarios
             market_position: Property's competitive position in the local real estate market
+            financial_projection: Optional precomputed projection row from simulate_financials
             
         Returns:
             str: Property valuation analysis
         """
         # Create a task for the data analyst
         task = Task(
-            description=f"""
-            Analyze the provided property data for {address}, {city}, {state}.
-            
-            Your analysis should include:
-            
-            1. **Current Valuation**:
-               - Analyze current market value based on comparable sales
-               - Calculate price per square foot/acre compared to local market
-               - Identify key factors affecting current value
-            
-            2. **Development Potential**:
-               - Evaluate potential for different development types (residential, commercial, mixed-use)
-               - Estimate development costs including land prep, utilities, construction
-               - Calculate potential ROI for different development scenarios
-            
-            3. **Investment Analysis**:
-               - Conduct 5-year and 10-year ROI projections for different scenarios
-               - Compare investment potential to other opportunities in the region
-               - Identify key risk factors and mitigations
-               - Calculate potential cash flow for income-producing developments
-            
-            4. **Market Position**:
-               - Analyze property's competitive position in the local real estate market
-               - Identify target demographic and demand assessment
-               - Evaluate market absorption rate for developed units
-            
-            Document all assumptions made in your calculations and cite market data sources.
-            """,
+            description=self._financial_analysis_description(address, city, state, financial_projection),
             expected_output="A comprehensive financial analysis including current valuation, development potential, ROI projections, and market position assessment.",
             agent=self
         )
@@ -348,12 +377,15 @@ class DataAnalyst:
         # For backward compatibility - create a task but note it needs a crew to execute
         return "To execute this task, please use the analyze_property_valuation method with a crew."
 
-    def create_financial_analysis_task(self, property_data):
+    def create_financial_analysis_task(self, property_data, financial_projection=None):
         """
         Create a task for financial analysis of a property.
         
         Args:
             property_data: Dictionary of property data
+            financial_projection: Optional precomputed projection row from simulate_financials.
+                                  When given, the agent narrates these numbers instead of
+                                  calculating its own.
             
         Returns:
             Task: Task to execute in a crew
@@ -364,7 +396,34 @@ class DataAnalyst:
         state = property_data.get('State', 'Unknown')
         
         # Create task description
-        task_description = f"""
+        task_description = self._financial_analysis_description(address, city, state, financial_projection)
+        
+        task_expected_output = "A comprehensive financial analysis including current valuation, development potential, ROI projections, and market position assessment."
+        
+        from crewai import Task
+        
+        # Create and return the task with the new configuration
+        return Task(
+            description=task_description,
+            expected_output=task_expected_output,
+            agent=self
+        )
+
+    def _financial_analysis_description(self, address, city, state, financial_projection=None):
+        """
+        Build the financial analysis task description.
+        
+        Args:
+            address: Property address
+            city: City of the property
+            state: State of the property
+            financial_projection: Optional precomputed projection row from simulate_financials
+            
+        Returns:
+            str: Task description
+        """
+        if financial_projection is None:
+            return f"""
         Analyze the provided property data for {address}, {city}, {state}.
         
         Your analysis should include:
@@ -393,16 +452,38 @@ class DataAnalyst:
         Document all assumptions made in your calculations and cite market data sources.
         """
         
-        task_expected_output = "A comprehensive financial analysis including current valuation, development potential, ROI projections, and market position assessment."
+        return f"""
+        Analyze the provided property data for {address}, {city}, {state}.
         
-        from crewai import Task
+        The financial model below has already been computed for the company's housing mix.
+        Do NOT recalculate or change any of these figures; quote them exactly and explain
+        what they mean for the investment decision.
         
-        # Create and return the task with the new configuration
-        return Task(
-            description=task_description,
-            expected_output=task_expected_output,
-            agent=self
-        )
+        Precomputed Financial Projection:
+        {format_financial_summary(financial_projection)}
+        
+        Your analysis should include:
+        
+        1. **Current Valuation**:
+           - Interpret the land cost relative to acreage and the local market
+           - Identify key factors affecting current value
+        
+        2. **Development Potential**:
+           - Explain the unit count, development cost and revenue figures above
+           - Identify which inputs (costs, prices, rents) drive the result
+        
+        3. **Investment Analysis**:
+           - Present the conservative, moderate and optimistic ROI scenarios above
+           - Interpret the probability of loss and breakeven figures
+           - Identify key risk factors and mitigations
+        
+        4. **Market Position**:
+           - Analyze property's competitive position in the local real estate market
+           - Identify target demographic and demand assessment
+           - Evaluate market absorption rate for developed units
+        
+        Clearly distinguish the precomputed figures from your qualitative judgments.
+        """
 
     def get(self, key, default=None):
         """
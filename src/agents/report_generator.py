@@ -36,7 +36,8 @@ class ReportGenerator:
             llm=llm
         )
         
-    def create_report_task(self, property_data, research_data, market_analysis, data_analysis):
+    def create_report_task(self, property_data, research_data, market_analysis, data_analysis, financial_summary=None,
+                           demographic_trends=None):
         """
         Create a task for generating a comprehensive report.
         
@@ -45,6 +46,8 @@ class ReportGenerator:
             research_data: Property research data
             market_analysis: Market analysis data
             data_analysis: Financial analysis data
+            financial_summary: Optional precomputed financial projection text
+            demographic_trends: Optional precomputed demographic trend text
             
         Returns:
             Task: Task to execute in a crew
@@ -69,6 +72,12 @@ class ReportGenerator:
         3. Data Analysis:
         {data_analysis}
         
+        4. Precomputed Financial Projection (use these figures exactly; do not recalculate):
+        {financial_summary or "Not available - base financial estimates on the data above."}
+        
+        5. Precomputed Demographic Trends (use these growth rates exactly; do not recalculate):
+        {demographic_trends or "Not available - base demographic trends on the data above."}
+        
         Your report should include:
         
         1. Executive Summary: A concise overview of key findings and recommendations.
@@ -92,7 +101,7 @@ class ReportGenerator:
            - Current valuation assessment
            - Development cost projections
            - Revenue potential analysis
-           - ROI calculations for various scenarios
+           - ROI scenarios (conservative, moderate, optimistic) from the precomputed projection
            - Risk assessment and sensitivity analysis
         
         6. Investment Recommendations:
@@ -164,7 +173,7 @@ class ReportGenerator:
             agent=self.agent
         )
     
-    def create_investment_summary_task(self, property_data, property_potential, executive_summary):
+    def create_investment_summary_task(self, property_data, property_potential, executive_summary, financial_summary=None):
         """
         Create a task for the report generator agent to produce an investment summary for the property.
         
@@ -172,6 +181,7 @@ class ReportGenerator:
             property_data (dict): The property data
             property_potential (str): The property potential analysis
             executive_summary (str): The executive summary
+            financial_summary (str, optional): Precomputed financial projection text
             
         Returns:
             Task: The task for creating an investment summary
@@ -192,9 +202,12 @@ class ReportGenerator:
             Executive Summary:
             {executive_summary}
             
+            Precomputed Financial Projection (quote these figures exactly; do not recalculate):
+            {financial_summary or "Not available."}
+            
             The investment summary should include:
             1. Key Financial Metrics - ROI, IRR, NPV, Payback Period
-            2. Investment Scenario Analysis - Best/Likely/Worst cases
+            2. Investment Scenario Analysis - Best/Likely/Worst cases (use the P90/P50/P10 ROI scenarios when available)
             3. Comparative Market Analysis - How this property compares to similar properties
             4. Investment Strategy Recommendations - Development type, phasing, timelines
             5. Risk Factors and Mitigation Strategies
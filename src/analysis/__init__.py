@@ -0,0 +1,26 @@
+"""
+Numerical analysis modules for property portfolios.
+"""
+
+from src.analysis.clustering import MarketClusterer, format_market_area
+from src.analysis.financials import (
+    evaluate_development,
+    simulate_financials,
+    format_financial_summary,
+)
+from src.analysis.trends import build_trend_table, trend_series, format_trend_summary
+from src.analysis.scenarios import sweep_scenarios, scenario_table, tornado_sensitivities
+
+__all__ = [
+    "MarketClusterer",
+    "format_market_area",
+    "evaluate_development",
+    "simulate_financials",
+    "format_financial_summary",
+    "build_trend_table",
+    "trend_series",
+    "format_trend_summary",
+    "sweep_scenarios",
+    "scenario_table",
+    "tornado_sensitivities",
+]
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Market area clustering for the Land Analysis Crew.
+Groups listings into market areas using density-based clustering on location
+and demographic similarity, so area-level work can be shared across listings.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+
+# Earth radius used for great-circle distances
+EARTH_RADIUS_MILES = 3958.8
+
+# Demographic columns used to measure similarity between listings
+DEFAULT_CLUSTER_FEATURES = [
+    'MedianHHInc_5',
+    'MedianHValue_5',
+    'MedianGrossRent_5',
+    'TotPop_5',
+    '% Pop Grwth 2024-2029(5m)',
+]
+
+# Radius columns summarized once per market area
+MARKET_STAT_COLUMNS = [
+    'TotPop_5',
+    'TotPop_10',
+    '% Pop Grwth 2020-2024(5m)',
+    '% Pop Grwth 2024-2029(5m)',
+    '% Pop Grwth 2024-2029(10m)',
+    'MedianHHInc_5',
+    'MedianHHInc_10',
+    'MedianHValue_5',
+    'MedianHValue_10',
+    'MedianGrossRent_5',
+    'MedianGrossRent_10',
+    'OwnerVacRate_5',
+    'RenterVacRate_5',
+    'MobileHomesPerK_5',
+    'Composite_Score',
+]
+
+
+def _numeric_column(properties, column):
+    """Return a column as a float array, or all-NaN if the column is missing."""
+    if column not in properties.columns:
+        return np.full(len(properties), np.nan)
+    return pd.to_numeric(properties[column], errors='coerce').to_numpy(dtype=float)
+
+
+def haversine_matrix(latitudes, longitudes):
+    """
+    Compute pairwise great-circle distances between points.
+
+    Args:
+        latitudes: Array of latitudes in degrees
+        longitudes: Array of longitudes in degrees
+
+    Returns:
+        numpy.ndarray: Square matrix of distances in miles (NaN where a coordinate is missing)
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2) ** 2
+
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def dbscan(neighbors, min_samples):
+    """
+    Run DBSCAN on a precomputed neighbourhood matrix.
+
+    Args:
+        neighbors: Boolean square matrix, True where two points are within eps
+        min_samples: Minimum neighbourhood size (including the point) for a core point
+
+    Returns:
+        numpy.ndarray: Cluster label per point, -1 for noise
+    """
+    n = neighbors.shape[0]
+    labels = np.full(n, -1, dtype=int)
+    core = neighbors.sum(axis=1) >= min_samples
+
+    cluster_id = 0
+    for start in np.flatnonzero(core):
+        if labels[start] != -1:
+            continue
+
+        # Expand the cluster breadth-first from this core point
+        labels[start] = cluster_id
+        frontier = [start]
+        while frontier:
+            point = frontier.pop()
+            if not core[point]:
+                continue
+            for neighbor in np.flatnonzero(neighbors[point] & (labels == -1)):
+                labels[neighbor] = cluster_id
+                frontier.append(neighbor)
+
+        cluster_id += 1
+
+    return labels
+
+
+class MarketClusterer:
+    """
+    Clusters property listings into market areas.
+
+    Two listings are neighbours when their combined distance is within one unit,
+    where the geographic part is scaled by ``eps_miles`` and the demographic part
+    is the standardized feature distance weighted by ``demographic_weight``.
+    Listings that do not fall into any cluster become single-listing market areas,
+    so every listing always has a market area.
+    """
+
+    def __init__(self, eps_miles=15.0, min_samples=2, demographic_weight=1.0, features=None):
+        """
+        Initialize the market clusterer.
+
+        Args:
+            eps_miles: Neighbourhood radius in miles for listings with identical demographics
+            min_samples: Minimum listings in a neighbourhood to seed a market area
+            demographic_weight: Weight of demographic dissimilarity relative to distance (0 disables it)
+            features: Demographic columns to compare (default: DEFAULT_CLUSTER_FEATURES)
+        """
+        self.eps_miles = eps_miles
+        self.min_samples = min_samples
+        self.demographic_weight = demographic_weight
+        self.features = features or DEFAULT_CLUSTER_FEATURES
+
+        self.labels = None
+        self.market_areas = {}
+        self.membership = {}
+
+    def _demographic_distance(self, properties):
+        """Compute pairwise standardized demographic distances."""
+        columns = [col for col in self.features if col in properties.columns]
+        if not columns or self.demographic_weight <= 0:
+            return np.zeros((len(properties), len(properties)))
+
+        values = properties[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        # Standardize each feature; missing values sit at the feature mean
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[~np.isfinite(std) | (std == 0)] = 1.0
+        z = np.nan_to_num((values - mean) / std)
+
+        diff = z[:, None, :] - z[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=2) / len(columns))
+
+    def fit(self, properties):
+        """
+        Cluster the given listings into market areas.
+
+        Args:
+            properties: DataFrame of listings with StockNumber, Latitude and Longitude columns
+
+        Returns:
+            dict: Mapping of market area id to market area dictionaries
+        """
+        n = len(properties)
+        if n == 0:
+            self.labels = np.array([], dtype=int)
+            self.market_areas = {}
+            self.membership = {}
+            return self.market_areas
+
+        latitudes = _numeric_column(properties, 'Latitude')
+        longitudes = _numeric_column(properties, 'Longitude')
+
+        geo = haversine_matrix(latitudes, longitudes) / self.eps_miles
+        demo = self._demographic_distance(properties) * self.demographic_weight
+
+        # Listings without coordinates never neighbour anything but themselves
+        combined = np.sqrt(geo ** 2 + demo ** 2)
+        neighbors = np.nan_to_num(combined, nan=np.inf) <= 1.0
+        np.fill_diagonal(neighbors, True)
+
+        labels = dbscan(neighbors, self.min_samples)
+
+        # Promote noise points to their own single-listing market areas
+        next_label = labels.max() + 1
+        for index in np.flatnonzero(labels == -1):
+            labels[index] = next_label
+            next_label += 1
+
+        self.labels = labels
+        self._build_market_areas(properties, labels, latitudes, longitudes)
+
+        return self.market_areas
+
+    def _build_market_areas(self, properties, labels, latitudes, longitudes):
+        """Compute the shared statistics for each market area once."""
+        stock_numbers = properties['StockNumber'].astype(str).to_numpy() if 'StockNumber' in properties else np.arange(len(properties)).astype(str)
+        stat_columns = [col for col in MARKET_STAT_COLUMNS if col in properties.columns]
+        stats_values = properties[stat_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        # Order market areas by size so the largest areas get the lowest ids
+        unique_labels, counts = np.unique(labels, return_counts=True)
+        ordered = unique_labels[np.argsort(-counts, kind='stable')]
+
+        self.market_areas = {}
+        self.membership = {}
+        for position, label in enumerate(ordered, 1):
+            mask = labels == label
+            area_id = f"MA-{position:03d}"
+            members = stock_numbers[mask].tolist()
+
+            # Area medians are computed once here and shared by every member
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                medians = np.nanmedian(stats_values[mask], axis=0)
+                centroid = (float(np.nanmean(latitudes[mask])), float(np.nanmean(longitudes[mask])))
+
+            stats = {col: float(value) for col, value in zip(stat_columns, medians) if np.isfinite(value)}
+
+            self.market_areas[area_id] = {
+                "id": area_id,
+                "name": self._area_name(properties[mask]),
+                "members": members,
+                "size": len(members),
+                "centroid": centroid,
+                "counties": sorted(properties.loc[mask, 'County Name'].dropna().astype(str).unique().tolist()) if 'County Name' in properties else [],
+                "statistics": stats,
+            }
+            for stock_number in members:
+                self.membership[stock_number] = area_id
+
+    def _area_name(self, members):
+        """Build a readable name from the members' market and counties."""
+        market = ''
+        if 'Market' in members and members['Market'].notna().any():
+            market = members['Market'].dropna().astype(str).mode().iloc[0]
+
+        counties = []
+        if 'County Name' in members:
+            counties = members['County Name'].dropna().astype(str).value_counts().index.tolist()[:3]
+
+        county_text = "/".join(counties)
+        if market and county_text:
+            return f"{market}: {county_text}"
+        return market or county_text or "Unassigned"
+
+    def get_market_area(self, stock_number):
+        """
+        Get the market area for a listing.
+
+        Args:
+            stock_number: The stock number of the listing
+
+        Returns:
+            dict: The market area, or None if the listing was not clustered
+        """
+        area_id = self.membership.get(str(stock_number).strip())
+        return self.market_areas.get(area_id) if area_id else None
+
+
+def format_market_area(market_area):
+    """
+    Format a market area as plain text for agent prompts.
+
+    Args:
+        market_area: Market area dictionary from MarketClusterer
+
+    Returns:
+        str: Human-readable summary of the market area
+    """
+    if not market_area:
+        return "No market area information available."
+
+    lines = [
+        f"Market Area {market_area['id']}: {market_area['name']}",
+        f"- Listings in area: {market_area['size']} ({', '.join(market_area['members'])})",
+    ]
+    if market_area.get('counties'):
+        lines.append(f"- Counties: {', '.join(market_area['counties'])}")
+    for col, value in market_area.get('statistics', {}).items():
+        lines.append(f"- {col} (area median): {value:,.2f}")
+
+    return "\n".join(lines)
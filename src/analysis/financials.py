@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Financial projection engine for the Land Analysis Crew.
+Models the company's 80/15/5 manufactured/apartment/stick-built housing mix and
+runs vectorized Monte Carlo ROI simulations over whole portfolios at once, so
+agents narrate precomputed numbers instead of doing arithmetic in prose.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ..utils.columns import to_numeric_array
+
+# Housing types in the company's development model
+HOUSING_TYPES = ["manufactured", "apartment", "stick_built"]
+
+# Base-case development assumptions; any key can be overridden per call
+DEFAULT_ASSUMPTIONS = {
+    # Share of units by housing type (80/15/5 model from the project plan)
+    "housing_mix": {"manufactured": 0.80, "apartment": 0.15, "stick_built": 0.05},
+    # Gross buildable density across the site
+    "units_per_acre": 6.0,
+    # Hard construction cost per unit by housing type
+    "unit_costs": {"manufactured": 110000, "apartment": 185000, "stick_built": 300000},
+    # Site work, utilities and amenities per unit
+    "site_cost_per_unit": 35000,
+    # Land cost per acre used when a listing has no asking price
+    "default_land_cost_per_acre": 25000,
+    # Sale price of for-sale homes relative to the local median home value
+    "sale_price_ratio": {"manufactured": 0.75, "stick_built": 1.10},
+    # Apartment rent relative to the local median gross rent
+    "rent_ratio": 1.0,
+    # Apartment operating expenses as a share of effective rent
+    "operating_expense_ratio": 0.40,
+    # Stabilized apartment vacancy
+    "vacancy_rate": 0.06,
+    # Capitalization rate used to value the apartment component
+    "cap_rate": 0.065,
+    # Years from acquisition to sell-out and stabilization
+    "development_years": 4.0,
+}
+
+# Standard deviations (or ranges) of the Monte Carlo draws around the base case
+DEFAULT_UNCERTAINTY = {
+    "cost_factor": 0.10,
+    "price_factor": 0.10,
+    "rent_factor": 0.08,
+    "density_factor": 0.10,
+    "cap_rate": 0.0075,
+    "development_years": (3.0, 4.0, 6.0),
+}
+
+# Local market columns in order of preference
+RENT_COLUMNS = ['MedianGrossRent_5', 'MedianGrossRent_10', 'MedianGrossRent_15']
+HOME_VALUE_COLUMNS = ['MedianHValue_5', 'MedianHValue_10', 'MedianHValue_15']
+
+
+def _merge_assumptions(assumptions):
+    """Combine caller assumptions with the defaults, merging nested dictionaries."""
+    merged = {key: (dict(value) if isinstance(value, dict) else value)
+              for key, value in DEFAULT_ASSUMPTIONS.items()}
+    for key, value in (assumptions or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key].update(value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _first_available(properties, columns):
+    """Return the first non-missing value across columns for every row."""
+    values = np.full(len(properties), np.nan)
+    for col in columns:
+        if col in properties.columns:
+            candidate = to_numeric_array(properties[col])
+            values = np.where(np.isnan(values), candidate, values)
+    return values
+
+
+def extract_financial_inputs(properties, assumptions=None):
+    """
+    Extract the per-property model inputs as typed NumPy arrays.
+
+    Args:
+        properties: DataFrame of listings
+        assumptions: Optional assumption overrides
+
+    Returns:
+        dict: StockNumber array plus float arrays for acres, land_cost, rent and home_value
+    """
+    assumptions = _merge_assumptions(assumptions)
+    n = len(properties)
+
+    acres = to_numeric_array(properties['Land Area (AC)']) if 'Land Area (AC)' in properties.columns else np.full(n, np.nan)
+    asking = to_numeric_array(properties['For Sale Price']) if 'For Sale Price' in properties.columns else np.full(n, np.nan)
+
+    # Listings without an asking price fall back to a per-acre land cost
+    estimated = acres * assumptions["default_land_cost_per_acre"]
+    land_cost = np.where(np.isfinite(asking) & (asking > 0), asking, estimated)
+
+    stock_numbers = (properties['StockNumber'].astype(str).to_numpy()
+                     if 'StockNumber' in properties.columns else np.arange(n).astype(str))
+
+    return {
+        "stock_numbers": stock_numbers,
+        "acres": acres,
+        "land_cost": land_cost,
+        "land_cost_estimated": ~(np.isfinite(asking) & (asking > 0)),
+        "rent": _first_available(properties, RENT_COLUMNS),
+        "home_value": _first_available(properties, HOME_VALUE_COLUMNS),
+    }
+
+
+def evaluate_development(inputs, assumptions=None, cost_factor=1.0, price_factor=1.0,
+                         rent_factor=1.0, density_factor=1.0, land_factor=1.0,
+                         cap_rate=None, development_years=None):
+    """
+    Evaluate the development model for every property.
+
+    All factors broadcast against the per-property input arrays, so passing
+    arrays shaped (draws, 1) or (scenarios, 1) evaluates every draw or scenario
+    for every property in one array computation.
+
+    Args:
+        inputs: Dictionary from extract_financial_inputs
+        assumptions: Optional assumption overrides
+        cost_factor: Multiplier on construction and site costs
+        price_factor: Multiplier on for-sale home prices
+        rent_factor: Multiplier on apartment rents
+        density_factor: Multiplier on buildable units per acre
+        land_factor: Multiplier on land cost
+        cap_rate: Apartment cap rate (default: assumption value)
+        development_years: Years to sell-out (default: assumption value)
+
+    Returns:
+        dict: Arrays for units, total_cost, revenue, profit, roi, annualized_roi and breakeven_ratio
+    """
+    assumptions = _merge_assumptions(assumptions)
+    mix = assumptions["housing_mix"]
+    unit_costs = assumptions["unit_costs"]
+    sale_ratio = assumptions["sale_price_ratio"]
+
+    if cap_rate is None:
+        cap_rate = assumptions["cap_rate"]
+    if development_years is None:
+        development_years = assumptions["development_years"]
+
+    units = np.floor(inputs["acres"] * assumptions["units_per_acre"] * density_factor)
+    units_by_type = {housing_type: units * mix.get(housing_type, 0.0) for housing_type in HOUSING_TYPES}
+
+    # Development cost: land plus site work plus hard costs for the housing mix
+    hard_cost = sum(units_by_type[t] * unit_costs[t] for t in HOUSING_TYPES)
+    total_cost = (inputs["land_cost"] * land_factor
+                  + (units * assumptions["site_cost_per_unit"] + hard_cost) * cost_factor)
+
+    # For-sale revenue from manufactured and stick-built homes
+    home_value = inputs["home_value"] * price_factor
+    sales_revenue = (units_by_type["manufactured"] * home_value * sale_ratio["manufactured"]
+                     + units_by_type["stick_built"] * home_value * sale_ratio["stick_built"])
+
+    # Apartments are held and valued on stabilized net operating income
+    monthly_rent = inputs["rent"] * assumptions["rent_ratio"] * rent_factor
+    noi = (units_by_type["apartment"] * monthly_rent * 12
+           * (1 - assumptions["vacancy_rate"]) * (1 - assumptions["operating_expense_ratio"]))
+    apartment_value = noi / cap_rate
+
+    revenue = sales_revenue + apartment_value
+    profit = revenue - total_cost
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = profit / total_cost
+        annualized_roi = np.clip(1 + roi, 0, None) ** (1 / development_years) - 1
+        breakeven_ratio = total_cost / revenue
+
+    return {
+        "units": units,
+        "total_cost": total_cost,
+        "revenue": revenue,
+        "profit": profit,
+        "roi": roi,
+        "annualized_roi": annualized_roi,
+        "breakeven_ratio": breakeven_ratio,
+    }
+
+
+def _draw_factors(rng, draws, assumptions, uncertainty):
+    """Draw the Monte Carlo factors as (draws, 1) columns that broadcast over properties."""
+    low, mode, high = uncertainty["development_years"]
+    factors = {
+        "cost_factor": rng.normal(1.0, uncertainty["cost_factor"], draws),
+        "price_factor": rng.normal(1.0, uncertainty["price_factor"], draws),
+        "rent_factor": rng.normal(1.0, uncertainty["rent_factor"], draws),
+        "density_factor": rng.normal(1.0, uncertainty["density_factor"], draws),
+        "cap_rate": rng.normal(assumptions["cap_rate"], uncertainty["cap_rate"], draws),
+        "development_years": rng.triangular(low, mode, high, draws),
+    }
+
+    # Keep draws physically meaningful
+    for key in ("cost_factor", "price_factor", "rent_factor", "density_factor"):
+        factors[key] = np.clip(factors[key], 0.05, None)
+    factors["cap_rate"] = np.clip(factors["cap_rate"], 0.02, None)
+
+    return {key: value[:, None] for key, value in factors.items()}
+
+
+def simulate_financials(properties, assumptions=None, uncertainty=None, draws=10000,
+                        seed=42, chunk_size=500):
+    """
+    Run a Monte Carlo ROI simulation for every property.
+
+    The same random draws are applied to every property, so results are
+    reproducible for a given seed and directly comparable across properties.
+
+    Args:
+        properties: DataFrame of listings
+        assumptions: Optional assumption overrides
+        uncertainty: Optional overrides for DEFAULT_UNCERTAINTY
+        draws: Number of Monte Carlo draws
+        seed: Random seed for reproducible results
+        chunk_size: Properties evaluated per array block, to bound memory use
+
+    Returns:
+        DataFrame: One row per StockNumber with base-case and percentile results
+    """
+    assumptions = _merge_assumptions(assumptions)
+    uncertainty = {**DEFAULT_UNCERTAINTY, **(uncertainty or {})}
+    inputs = extract_financial_inputs(properties, assumptions)
+
+    rng = np.random.default_rng(seed)
+    factors = _draw_factors(rng, draws, assumptions, uncertainty)
+    base = evaluate_development(inputs, assumptions)
+
+    n = len(inputs["stock_numbers"])
+    percentiles = {name: np.full((3, n), np.nan) for name in ("roi", "profit", "annualized_roi")}
+    probability_of_loss = np.full(n, np.nan)
+    expected_roi = np.full(n, np.nan)
+
+    for start in range(0, n, chunk_size):
+        block = slice(start, start + chunk_size)
+        block_inputs = {key: value[block] for key, value in inputs.items()}
+        results = evaluate_development(block_inputs, assumptions, **factors)
+
+        for name in percentiles:
+            percentiles[name][:, block] = np.percentile(results[name], [10, 50, 90], axis=0)
+
+        valid = np.isfinite(results["roi"]).all(axis=0)
+        probability_of_loss[block] = np.where(valid, (results["profit"] < 0).mean(axis=0), np.nan)
+        expected_roi[block] = np.where(valid, results["roi"].mean(axis=0), np.nan)
+
+    return pd.DataFrame({
+        "StockNumber": inputs["stock_numbers"],
+        "units": base["units"],
+        "land_cost": inputs["land_cost"],
+        "land_cost_estimated": inputs["land_cost_estimated"],
+        "total_cost": base["total_cost"],
+        "revenue": base["revenue"],
+        "profit": base["profit"],
+        "roi": base["roi"],
+        "annualized_roi": base["annualized_roi"],
+        "breakeven_ratio": base["breakeven_ratio"],
+        "roi_conservative": percentiles["roi"][0],
+        "roi_moderate": percentiles["roi"][1],
+        "roi_optimistic": percentiles["roi"][2],
+        "profit_conservative": percentiles["profit"][0],
+        "profit_moderate": percentiles["profit"][1],
+        "profit_optimistic": percentiles["profit"][2],
+        "annualized_roi_moderate": percentiles["annualized_roi"][1],
+        "expected_roi": expected_roi,
+        "probability_of_loss": probability_of_loss,
+        "draws": draws,
+        "seed": seed,
+    }).set_index("StockNumber")
+
+
+def _money(value):
+    """Format a dollar amount with the sign ahead of the currency symbol."""
+    return f"-${abs(value):,.0f}" if value < 0 else f"${value:,.0f}"
+
+
+def format_financial_summary(projection, assumptions=None):
+    """
+    Format one property's projection as plain text for agent prompts.
+
+    Args:
+        projection: Row (Series or dict) from simulate_financials
+        assumptions: Optional assumption overrides used for the projection
+
+    Returns:
+        str: Human-readable financial summary
+    """
+    if projection is None:
+        return "No financial projection available."
+
+    assumptions = _merge_assumptions(assumptions)
+    projection = dict(projection)
+
+    if not np.isfinite(projection.get("roi", np.nan)):
+        return "Financial projection unavailable: the listing is missing land area, rent or home value data."
+
+    mix = assumptions["housing_mix"]
+    mix_text = "/".join(f"{mix[t] * 100:.0f}" for t in HOUSING_TYPES)
+    land_note = " (estimated from acreage; no asking price)" if projection.get("land_cost_estimated") else ""
+
+    return "\n".join([
+        f"Housing mix (manufactured/apartment/stick-built): {mix_text}",
+        f"- Potential units: {projection['units']:,.0f}",
+        f"- Land cost: {_money(projection['land_cost'])}{land_note}",
+        f"- Total development cost: {_money(projection['total_cost'])}",
+        f"- Projected revenue: {_money(projection['revenue'])}",
+        f"- Base-case profit: {_money(projection['profit'])}",
+        f"- Base-case ROI: {projection['roi'] * 100:.1f}% "
+        f"({projection['annualized_roi'] * 100:.1f}% annualized over {assumptions['development_years']:g} years)",
+        f"- Breakeven: {projection['breakeven_ratio'] * 100:.1f}% of projected revenue",
+        f"- ROI scenarios from {int(projection['draws']):,} Monte Carlo draws (seed {int(projection['seed'])}):",
+        f"  - Conservative (P10): {projection['roi_conservative'] * 100:.1f}%",
+        f"  - Moderate (P50): {projection['roi_moderate'] * 100:.1f}%",
+        f"  - Optimistic (P90): {projection['roi_optimistic'] * 100:.1f}%",
+        f"- Probability of loss: {projection['probability_of_loss'] * 100:.1f}%",
+    ])
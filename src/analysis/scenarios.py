@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Scenario sweep engine for the Land Analysis Crew.
+Evaluates grids of parameter perturbations across every property as a single
+broadcast array computation, and produces tornado-chart sensitivities.
+"""
+
+import itertools
+import numpy as np
+import pandas as pd
+
+from .financials import DEFAULT_ASSUMPTIONS, extract_financial_inputs, evaluate_development
+
+# Parameters accepted by evaluate_development that a scenario can perturb
+SCENARIO_PARAMETERS = [
+    "cost_factor",
+    "price_factor",
+    "rent_factor",
+    "density_factor",
+    "land_factor",
+    "cap_rate",
+    "development_years",
+]
+
+# Low/high values used for tornado sensitivities. The timeline only affects
+# annualized ROI, so it is left out of the default ranges.
+DEFAULT_SENSITIVITY_RANGES = {
+    "cost_factor": (0.85, 1.15),
+    "price_factor": (0.90, 1.10),
+    "rent_factor": (0.90, 1.10),
+    "density_factor": (0.85, 1.10),
+    "land_factor": (0.80, 1.20),
+    "cap_rate": (0.055, 0.075),
+}
+
+# Readable names for charts and prompts
+PARAMETER_LABELS = {
+    "cost_factor": "Construction costs",
+    "price_factor": "Home sale prices",
+    "rent_factor": "Apartment rents",
+    "density_factor": "Buildable density",
+    "land_factor": "Land cost",
+    "cap_rate": "Cap rate",
+    "development_years": "Development timeline (years)",
+}
+
+
+def _base_values(assumptions):
+    """Return the base-case value of every scenario parameter."""
+    merged = {**DEFAULT_ASSUMPTIONS, **(assumptions or {})}
+    base = {name: 1.0 for name in SCENARIO_PARAMETERS}
+    base["cap_rate"] = merged["cap_rate"]
+    base["development_years"] = merged["development_years"]
+    return base
+
+
+def _validate_parameters(names):
+    """Reject parameters the financial model does not understand."""
+    unknown = [name for name in names if name not in SCENARIO_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown scenario parameters: {', '.join(unknown)}. "
+                         f"Expected any of: {', '.join(SCENARIO_PARAMETERS)}")
+
+
+def _evaluate_scenarios(inputs, scenarios, assumptions):
+    """Evaluate a DataFrame of scenarios against all properties in one broadcast call."""
+    factors = {name: scenarios[name].to_numpy(dtype=float)[:, None] for name in SCENARIO_PARAMETERS}
+    return evaluate_development(inputs, assumptions, **factors)
+
+
+def sweep_scenarios(properties, grid, assumptions=None, metrics=("roi", "profit")):
+    """
+    Evaluate every combination of parameter values for every property.
+
+    Example:
+        sweep_scenarios(properties, {"cost_factor": [1.0, 1.15], "rent_factor": [0.95, 1.0]})
+        evaluates four scenarios, including "costs +15% and rents -5%".
+
+    Args:
+        properties: DataFrame of listings
+        grid: Dictionary mapping scenario parameters to lists of values.
+              Parameters not in the grid stay at their base-case value.
+        assumptions: Optional assumption overrides for the financial model
+        metrics: Result arrays to return from the financial model
+
+    Returns:
+        dict: "scenarios" (DataFrame of parameter values, one row per scenario),
+              "parameters" (the swept parameter names), "stock_numbers" (array) and one (scenarios x properties) array per metric
+    """
+    _validate_parameters(grid.keys())
+
+    names = list(grid.keys())
+    combinations = list(itertools.product(*(np.atleast_1d(grid[name]) for name in names)))
+
+    scenarios = pd.DataFrame([_base_values(assumptions)] * len(combinations))
+    for position, name in enumerate(names):
+        scenarios[name] = [combination[position] for combination in combinations]
+    scenarios.index.name = "scenario"
+
+    inputs = extract_financial_inputs(properties, assumptions)
+    results = _evaluate_scenarios(inputs, scenarios, assumptions)
+
+    sweep = {"scenarios": scenarios, "parameters": names, "stock_numbers": inputs["stock_numbers"]}
+    for metric in metrics:
+        sweep[metric] = results[metric]
+    return sweep
+
+
+def scenario_table(sweep, metric="roi"):
+    """
+    Pivot a sweep result into a table of properties by scenario.
+
+    Args:
+        sweep: Result of sweep_scenarios
+        metric: Metric to tabulate
+
+    Returns:
+        DataFrame: Rows are stock numbers, columns are scenario labels
+    """
+    scenarios = sweep["scenarios"]
+    labels = [", ".join(f"{name}={row[name]:g}" for name in sweep["parameters"])
+              for _, row in scenarios.iterrows()]
+
+    return pd.DataFrame(sweep[metric].T, index=pd.Index(sweep["stock_numbers"], name="StockNumber"),
+                        columns=labels)
+
+
+def tornado_sensitivities(properties, ranges=None, assumptions=None, metric="roi"):
+    """
+    Compute one-at-a-time sensitivities for every property.
+
+    Each parameter is moved to its low and high value while the others stay at
+    the base case. All 2 x parameters scenarios are evaluated in one broadcast call.
+
+    Args:
+        properties: DataFrame of listings
+        ranges: Dictionary mapping parameters to (low, high) values
+                (default: DEFAULT_SENSITIVITY_RANGES)
+        assumptions: Optional assumption overrides for the financial model
+        metric: Metric to measure (e.g. "roi" or "profit")
+
+    Returns:
+        DataFrame: One row per property and parameter with low/high values, the
+                   metric at each, and the swing, sorted by swing within each property
+    """
+    ranges = ranges or DEFAULT_SENSITIVITY_RANGES
+    _validate_parameters(ranges.keys())
+
+    base = _base_values(assumptions)
+    names = list(ranges.keys())
+
+    # Row 0 is the base case, then a low and a high row per parameter
+    rows = [dict(base)]
+    for name in names:
+        low, high = ranges[name]
+        rows.append({**base, name: low})
+        rows.append({**base, name: high})
+    scenarios = pd.DataFrame(rows)
+
+    inputs = extract_financial_inputs(properties, assumptions)
+    values = _evaluate_scenarios(inputs, scenarios, assumptions)[metric]
+
+    base_metric = values[0]
+    low_metric = values[1::2]
+    high_metric = values[2::2]
+
+    n_properties = len(inputs["stock_numbers"])
+    table = pd.DataFrame({
+        "StockNumber": np.tile(inputs["stock_numbers"], len(names)),
+        "parameter": np.repeat(names, n_properties),
+        "label": np.repeat([PARAMETER_LABELS.get(name, name) for name in names], n_properties),
+        "low_value": np.repeat([ranges[name][0] for name in names], n_properties),
+        "high_value": np.repeat([ranges[name][1] for name in names], n_properties),
+        "base": np.tile(base_metric, len(names)),
+        "low": low_metric.ravel(),
+        "high": high_metric.ravel(),
+    })
+    table["swing"] = (table["high"] - table["low"]).abs()
+
+    return (table.sort_values(["StockNumber", "swing"], ascending=[True, False], kind="stable")
+                 .reset_index(drop=True))
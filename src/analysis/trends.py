@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Demographic trend analytics for the Land Analysis Crew.
+Turns the 2000/2020/2024/2029 population, income and home value columns at the
+3, 5 and 10-mile radii into one precomputed table of CAGRs, growth deltas,
+radius gradients and interpolated yearly series for every property.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ..utils.columns import to_numeric_array
+
+# Radii (in miles) with year-stamped demographic columns
+TREND_RADII = [3, 5, 10]
+
+# Year the data vendor treats as "current"; earlier years are history, later are projections
+BASE_YEAR = 2024
+
+# Column templates by metric and year; {radius} is the radius in miles
+TREND_METRICS = {
+    "population": {
+        2000: "2000 Population({radius}m)",
+        2020: "2020 Population({radius}m)",
+        2024: "2024 Population({radius}m)",
+        2029: "2029 Population({radius}m)",
+    },
+    "median_income": {
+        2020: "2020 Med HH Inc({radius}m)",
+        2024: "2024 Med HH Inc({radius}m)",
+        2029: "2029 Med HH Inc({radius}m)",
+    },
+    "home_value": {
+        2024: "2024 Median Home Value({radius}m)",
+        2029: "2029 Median HH Value({radius}m)",
+    },
+}
+
+# Readable names for charts and prompts
+METRIC_LABELS = {
+    "population": "Population",
+    "median_income": "Median Household Income",
+    "home_value": "Median Home Value",
+}
+
+
+def _known_values(properties, metric, radius):
+    """Return the known years and an (N, years) array of values for one metric and radius."""
+    years = sorted(TREND_METRICS[metric])
+    values = np.full((len(properties), len(years)), np.nan)
+    for position, year in enumerate(years):
+        column = TREND_METRICS[metric][year].format(radius=radius)
+        if column in properties.columns:
+            values[:, position] = to_numeric_array(properties[column])
+    return np.array(years), values
+
+
+def _cagr(start, end, years):
+    """Compound annual growth rate between two arrays of values."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = (end / start) ** (1.0 / years) - 1
+    return np.where((start > 0) & (end > 0), rate, np.nan)
+
+
+def interpolate_series(known_years, values, years):
+    """
+    Interpolate yearly values between known census and projection years.
+
+    Interpolation is geometric (constant growth rate within each segment), which
+    matches how CAGRs are quoted, and falls back to linear where a value is not positive.
+
+    Args:
+        known_years: Sorted array of years with data
+        values: (N, len(known_years)) array of values
+        years: Years to interpolate, all within the known range
+
+    Returns:
+        numpy.ndarray: (N, len(years)) array of interpolated values
+    """
+    years = np.asarray(years, dtype=float)
+    upper = np.clip(np.searchsorted(known_years, years, side='left'), 1, len(known_years) - 1)
+    lower = upper - 1
+
+    y0 = known_years[lower]
+    y1 = known_years[upper]
+    weight = (years - y0) / (y1 - y0)
+
+    v0 = values[:, lower]
+    v1 = values[:, upper]
+    linear = v0 + weight * (v1 - v0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        geometric = v0 * (v1 / v0) ** weight
+
+    return np.where((v0 > 0) & (v1 > 0), geometric, linear)
+
+
+def build_trend_table(properties):
+    """
+    Precompute trend analytics for every property, metric and radius.
+
+    Columns are named "{metric}_{radius}m_{statistic}", for example
+    "population_5m_projected_cagr", with yearly series in "{metric}_{radius}m_{year}".
+    Radius gradients compare the innermost and outermost radius as
+    "{metric}_cagr_gradient" and "{metric}_radius_ratio".
+
+    Args:
+        properties: DataFrame of listings
+
+    Returns:
+        DataFrame: One row per property indexed by StockNumber
+    """
+    if 'StockNumber' in properties.columns:
+        index = pd.Index(properties['StockNumber'].astype(str).str.strip(), name="StockNumber")
+    else:
+        index = pd.RangeIndex(len(properties), name="StockNumber")
+
+    columns = {}
+    inner, outer = TREND_RADII[0], TREND_RADII[-1]
+
+    for metric in TREND_METRICS:
+        for radius in TREND_RADII:
+            known_years, values = _known_values(properties, metric, radius)
+            prefix = f"{metric}_{radius}m"
+
+            # Yearly series across the full known span
+            years = np.arange(known_years[0], known_years[-1] + 1)
+            series = interpolate_series(known_years, values, years)
+            for position, year in enumerate(years):
+                columns[f"{prefix}_{year}"] = series[:, position]
+
+            first, last = values[:, 0], values[:, -1]
+            base = values[:, list(known_years).index(BASE_YEAR)]
+
+            columns[f"{prefix}_cagr"] = _cagr(first, last, known_years[-1] - known_years[0])
+            columns[f"{prefix}_historical_cagr"] = (
+                _cagr(first, base, BASE_YEAR - known_years[0]) if known_years[0] < BASE_YEAR
+                else np.full(len(properties), np.nan))
+            columns[f"{prefix}_projected_cagr"] = _cagr(base, last, known_years[-1] - BASE_YEAR)
+            columns[f"{prefix}_change"] = last - first
+            columns[f"{prefix}_projected_change"] = last - base
+
+        # Positive gradients mean growth is concentrated close to the site
+        columns[f"{metric}_cagr_gradient"] = (columns[f"{metric}_{inner}m_projected_cagr"] -
+                                              columns[f"{metric}_{outer}m_projected_cagr"])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns[f"{metric}_radius_ratio"] = (columns[f"{metric}_{inner}m_{BASE_YEAR}"] /
+                                                 columns[f"{metric}_{outer}m_{BASE_YEAR}"])
+
+    return pd.DataFrame(columns, index=index)
+
+
+def trend_series(trends, metric, radius):
+    """
+    Get the interpolated yearly series for one property.
+
+    Args:
+        trends: Row of the trend table (pandas Series)
+        metric: Metric name from TREND_METRICS
+        radius: Radius in miles from TREND_RADII
+
+    Returns:
+        dict: Year to value, omitting missing years
+    """
+    prefix = f"{metric}_{radius}m_"
+    series = {}
+    for column, value in trends.items():
+        if column.startswith(prefix) and column[len(prefix):].isdigit() and pd.notna(value):
+            series[int(column[len(prefix):])] = float(value)
+    return series
+
+
+def _percent(value):
+    """Format a growth rate for prompts."""
+    return "N/A" if pd.isna(value) else f"{value * 100:+.2f}%"
+
+
+def _amount(metric, value):
+    """Format a metric value for prompts."""
+    if pd.isna(value):
+        return "N/A"
+    return f"${value:,.0f}" if metric != "population" else f"{value:,.0f}"
+
+
+def format_trend_summary(trends):
+    """
+    Format a property's trend analytics as text for agent prompts.
+
+    Args:
+        trends: Row of the trend table (pandas Series), or None
+
+    Returns:
+        str: Multi-line summary of values, growth rates and radius gradients
+    """
+    if trends is None:
+        return "Precomputed demographic trends are unavailable for this property."
+
+    lines = []
+    for metric, year_columns in TREND_METRICS.items():
+        first_year, last_year = min(year_columns), max(year_columns)
+        lines.append(f"{METRIC_LABELS[metric]}:")
+        for radius in TREND_RADII:
+            prefix = f"{metric}_{radius}m"
+            line = (f"- {radius}-mile: {_amount(metric, trends.get(f'{prefix}_{BASE_YEAR}'))} ({BASE_YEAR}) -> "
+                    f"{_amount(metric, trends.get(f'{prefix}_{last_year}'))} ({last_year}), "
+                    f"projected CAGR {_percent(trends.get(f'{prefix}_projected_cagr'))}")
+            if first_year < BASE_YEAR:
+                line += f", {first_year}-{BASE_YEAR} CAGR {_percent(trends.get(f'{prefix}_historical_cagr'))}"
+            lines.append(line)
+
+        gradient = trends.get(f"{metric}_cagr_gradient")
+        if pd.notna(gradient):
+            where = "closer to the site" if gradient > 0 else "farther from the site"
+            lines.append(f"- Radius gradient: projected growth is {abs(gradient) * 100:.2f} percentage points/yr "
+                         f"higher {where} ({TREND_RADII[0]}-mile vs {TREND_RADII[-1]}-mile)")
+
+    return "\n".join(lines)
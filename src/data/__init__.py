@@ -3,5 +3,6 @@ Data processing modules for property analysis.
 """
 
 from src.data.loader import PropertyDataLoader
+from src.data.changes import ChangeTracker, row_hashes, diff_snapshots
 
-__all__ = ["PropertyDataLoader"] 
\ No newline at end of file
+__all__ = ["PropertyDataLoader", "ChangeTracker", "row_hashes", "diff_snapshots"] 
\ No newline at end of file
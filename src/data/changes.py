@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Change detection for refreshed property exports.
+Diffs a freshly loaded master.csv against the previously loaded snapshot by
+StockNumber and per-row content hash, and invalidates only the cached outputs
+(reports, charts, research) that depend on listings that actually changed.
+"""
+
+import os
+import json
+import threading
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from ..utils.files import atomic_write
+from ..utils.formatting import print_error, print_info
+
+# Artifact kinds that are pure caches and are deleted when their listing changes.
+# Other kinds (e.g. timestamped reports) are kept on disk and only marked stale.
+CACHE_ARTIFACT_KINDS = {"chart", "research"}
+
+# Artifact kind that marks a listing as analyzed
+REPORT_ARTIFACT_KIND = "report"
+
+
+def row_hashes(properties):
+    """
+    Hash the content of every listing.
+
+    Columns are hashed in sorted order so a reordered export does not look like
+    a change; adding or removing a column changes every hash.
+
+    Args:
+        properties: DataFrame of listings with a StockNumber column
+
+    Returns:
+        dict: Stock number to a 16-character hex content hash
+    """
+    if properties is None or 'StockNumber' not in properties.columns:
+        return {}
+
+    content = properties[sorted(properties.columns)]
+    hashes = pd.util.hash_pandas_object(content, index=False)
+    stock_numbers = properties['StockNumber'].astype(str).str.strip()
+
+    return {stock: f"{value:016x}" for stock, value in zip(stock_numbers, hashes.to_numpy())}
+
+
+def diff_snapshots(previous, current):
+    """
+    Compare two row-hash snapshots.
+
+    Args:
+        previous: Stock number to hash from the earlier load
+        current: Stock number to hash from the new load
+
+    Returns:
+        dict: "added", "removed", "changed" and "unchanged" sets of stock numbers
+    """
+    previous = previous or {}
+    current = current or {}
+    shared = previous.keys() & current.keys()
+
+    return {
+        "added": set(current.keys() - previous.keys()),
+        "removed": set(previous.keys() - current.keys()),
+        "changed": {stock for stock in shared if previous[stock] != current[stock]},
+        "unchanged": {stock for stock in shared if previous[stock] == current[stock]},
+    }
+
+
+class ChangeTracker:
+    """
+    Persists the last seen snapshot and the outputs derived from each listing.
+    """
+
+    def __init__(self, snapshot_path=None):
+        """
+        Initialize the change tracker.
+
+        Args:
+            snapshot_path: JSON file holding the snapshot and artifact registry
+                           (default: outputs/snapshots/master_snapshot.json)
+        """
+        if snapshot_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            snapshot_path = project_root / "outputs" / "snapshots" / "master_snapshot.json"
+
+        self.snapshot_path = Path(snapshot_path)
+        self.state = self._read_state()
+
+        # Artifacts may be registered from several threads of a batch
+        self._lock = threading.RLock()
+
+    def _read_state(self):
+        """Read the persisted snapshot, starting empty if there is none."""
+        empty = {"rows": {}, "artifacts": {}, "updated_at": None}
+        if not self.snapshot_path.exists():
+            return empty
+
+        try:
+            with open(self.snapshot_path) as f:
+                return {**empty, **json.load(f)}
+        except (OSError, json.JSONDecodeError) as e:
+            print_error(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return empty
+
+    def _write_state(self):
+        """Write the snapshot atomically so an interrupted run cannot corrupt it."""
+        with atomic_write(self.snapshot_path) as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+
+    def update(self, hashes):
+        """
+        Record a new snapshot and invalidate outputs of added, removed and changed listings.
+
+        Args:
+            hashes: Stock number to hash for the freshly loaded data (see row_hashes)
+
+        Returns:
+            dict: The diff from diff_snapshots plus "invalidated" (deleted cache files)
+                  and "stale_reports" (report files no longer matching their listing)
+        """
+        changes = diff_snapshots(self.state["rows"], hashes)
+        invalidated, stale_reports = self.invalidate(changes["changed"] | changes["removed"], save=False)
+
+        self.state["rows"] = dict(hashes)
+        self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        self._write_state()
+
+        changes["invalidated"] = invalidated
+        changes["stale_reports"] = stale_reports
+        return changes
+
+    def register_artifact(self, stock_number, path, kind=REPORT_ARTIFACT_KIND):
+        """
+        Record an output that was derived from a listing.
+
+        Args:
+            stock_number: Stock number of the listing the output depends on
+            path: Path of the output file
+            kind: Artifact kind, e.g. "report", "chart" or "research"
+        """
+        stock_number = str(stock_number).strip()
+        entry = {"path": str(path), "kind": kind}
+        with self._lock:
+            artifacts = self.state["artifacts"].setdefault(stock_number, [])
+            if entry not in artifacts:
+                artifacts.append(entry)
+                self._write_state()
+
+    def invalidate(self, stock_numbers, save=True):
+        """
+        Drop the outputs derived from the given listings.
+
+        Cached outputs are deleted from disk; reports are left in place but no
+        longer count as a current analysis.
+
+        Args:
+            stock_numbers: Stock numbers whose outputs are stale
+            save: Persist the registry afterwards
+
+        Returns:
+            tuple: (deleted cache file paths, stale report paths)
+        """
+        invalidated = []
+        stale_reports = []
+
+        for stock_number in sorted(stock_numbers):
+            for artifact in self.state["artifacts"].pop(stock_number, []):
+                if artifact["kind"] not in CACHE_ARTIFACT_KINDS:
+                    stale_reports.append(artifact["path"])
+                    continue
+                if artifact["path"] in invalidated:
+                    continue
+                try:
+                    os.remove(artifact["path"])
+                except FileNotFoundError:
+                    pass
+                invalidated.append(artifact["path"])
+
+        # Shared caches (e.g. market-area research) are gone for every listing that used them
+        if invalidated:
+            for stock_number, artifacts in self.state["artifacts"].items():
+                self.state["artifacts"][stock_number] = [a for a in artifacts if a["path"] not in invalidated]
+
+        if save:
+            self._write_state()
+        if invalidated or stale_reports:
+            print_info(f"Invalidated {len(invalidated)} cached outputs and {len(stale_reports)} reports")
+
+        return invalidated, stale_reports
+
+    def pending(self, stock_numbers=None):
+        """
+        Get the listings that have no current analysis report.
+
+        Args:
+            stock_numbers: Listings to check (default: every listing in the snapshot)
+
+        Returns:
+            list: Sorted stock numbers that need to be analyzed
+        """
+        if stock_numbers is None:
+            stock_numbers = self.state["rows"].keys()
+
+        return sorted(
+            stock for stock in stock_numbers
+            if not any(a["kind"] == REPORT_ARTIFACT_KIND for a in self.state["artifacts"].get(stock, []))
+        )
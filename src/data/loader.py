@@ -8,6 +8,10 @@ import os
 import pandas as pd
 from pathlib import Path
 from ..utils.formatting import print_error, print_info
+from ..analysis.clustering import MarketClusterer
+from ..analysis.financials import simulate_financials
+from ..analysis.trends import build_trend_table
+from .changes import ChangeTracker, row_hashes, diff_snapshots
 
 class PropertyDataLoader:
     """
@@ -30,6 +34,10 @@ class PropertyDataLoader:
             
         self.data_file = data_file
         self.properties = None
+        self.market_clusterer = None
+        self.financial_projections = None
+        self.trend_table = None
+        self.row_hashes = {}
         self._load_data()
         
     def _load_data(self):
@@ -45,6 +53,16 @@ class PropertyDataLoader:
             # Basic cleaning and normalization
             self._clean_data()
             
+            # Per-listing content hashes for change detection
+            self.row_hashes = row_hashes(self.properties)
+            
+            # Trend analytics are read by charts, prompts and ranking, so build them once per load
+            self.trend_table = build_trend_table(self.properties)
+            
+            # Other derived data is rebuilt lazily from the freshly loaded properties
+            self.market_clusterer = None
+            self.financial_projections = None
+            
             print_info(f"Loaded {len(self.properties)} properties from {self.data_file}")
         except Exception as e:
             print_error(f"Error loading property data: {e}")
@@ -68,6 +86,37 @@ class PropertyDataLoader:
             if col in self.properties.columns:
                 self.properties[col] = self.properties[col].fillna('Unknown')
     
+    def reload(self):
+        """
+        Re-read the data file and report which listings changed since the last load.
+        
+        Returns:
+            A dictionary of "added", "removed", "changed" and "unchanged" stock number sets.
+        """
+        previous = self.row_hashes
+        self._load_data()
+        changes = diff_snapshots(previous, self.row_hashes)
+        
+        print_info(f"Reloaded {self.data_file}: {len(changes['added'])} added, "
+                   f"{len(changes['removed'])} removed, {len(changes['changed'])} changed")
+        return changes
+    
+    def detect_changes(self, change_tracker=None):
+        """
+        Compare the loaded data with the snapshot persisted by the previous run.
+        
+        Outputs derived from added, removed or changed listings are invalidated
+        and the current data becomes the new snapshot.
+        
+        Args:
+            change_tracker: ChangeTracker to use (default: the project snapshot under outputs/)
+            
+        Returns:
+            A dictionary of changed stock number sets and invalidated outputs (see ChangeTracker.update).
+        """
+        change_tracker = change_tracker or ChangeTracker()
+        return change_tracker.update(self.row_hashes)
+    
     def get_property_list(self):
         """
         Get a list of all properties.
@@ -189,6 +238,150 @@ class PropertyDataLoader:
                     filtered = filtered[filtered['County'] == value]
         
         return filtered.to_dict('records')
+    
+    def get_market_areas(self, **cluster_options):
+        """
+        Group all properties into market areas.
+        
+        The clustering runs once per data load and is reused by later calls
+        unless different clustering options are given.
+        
+        Args:
+            **cluster_options: Keyword arguments for MarketClusterer
+                               Example: eps_miles=25, min_samples=2
+                               
+        Returns:
+            A dictionary mapping market area ids to market area dictionaries.
+        """
+        if self.properties is None:
+            return {}
+            
+        if self.market_clusterer is None or cluster_options:
+            self.market_clusterer = MarketClusterer(**cluster_options)
+            self.market_clusterer.fit(self.properties)
+            
+        return self.market_clusterer.market_areas
+    
+    def get_financial_projections(self, **simulation_options):
+        """
+        Run the Monte Carlo financial projection for all properties.
+        
+        The simulation runs once per data load for the default options.
+        
+        Args:
+            **simulation_options: Keyword arguments for simulate_financials
+                                  Example: draws=10000, seed=42, assumptions={...}
+                                  
+        Returns:
+            A DataFrame of projections indexed by stock number.
+        """
+        if self.properties is None:
+            return None
+            
+        if simulation_options:
+            return simulate_financials(self.properties, **simulation_options)
+            
+        if self.financial_projections is None:
+            self.financial_projections = simulate_financials(self.properties)
+            
+        return self.financial_projections
+    
+    def get_financial_projection(self, stock_number):
+        """
+        Get the financial projection for a specific property.
+        
+        Args:
+            stock_number: The stock number of the property.
+            
+        Returns:
+            A pandas Series with the projection, or None if the property is not found.
+        """
+        projections = self.get_financial_projections()
+        stock_number = str(stock_number).strip()
+        
+        if projections is None or stock_number not in projections.index:
+            return None
+            
+        return projections.loc[stock_number]
+    
+    def get_trend_table(self):
+        """
+        Get the precomputed demographic trend analytics for all properties.
+        
+        Returns:
+            A DataFrame indexed by stock number (see build_trend_table), or None if no data is loaded.
+        """
+        return self.trend_table
+    
+    def get_property_trends(self, stock_number):
+        """
+        Get the precomputed demographic trend analytics for a specific property.
+        
+        Args:
+            stock_number: The stock number of the property.
+            
+        Returns:
+            A pandas Series with the property's trends, or None if the property is not found.
+        """
+        stock_number = str(stock_number).strip()
+        
+        if self.trend_table is None or stock_number not in self.trend_table.index:
+            return None
+            
+        return self.trend_table.loc[stock_number]
+    
+    def rank_properties(self, by="population_5m_projected_cagr", ascending=False, limit=None):
+        """
+        Rank properties by a precomputed trend statistic.
+        
+        Args:
+            by: Column of the trend table to rank by
+                Example: "median_income_5m_projected_cagr" or "population_cagr_gradient"
+            ascending: Rank the lowest values first
+            limit: Maximum number of properties to return (default: all)
+            
+        Returns:
+            A list of dictionaries with rank, stock number, address and value.
+        """
+        if self.trend_table is None:
+            return []
+            
+        if by not in self.trend_table.columns:
+            print_error(f"Unknown trend column: {by}")
+            return []
+            
+        values = self.trend_table[by].dropna().sort_values(ascending=ascending, kind="stable")
+        if limit is not None:
+            values = values.head(limit)
+            
+        addresses = self.properties.set_index('StockNumber')
+        ranking = []
+        for rank, (stock_number, value) in enumerate(values.items(), 1):
+            ranking.append({
+                'Rank': rank,
+                'StockNumber': stock_number,
+                'Property Address': addresses['Property Address'].get(stock_number, 'N/A') if 'Property Address' in addresses else 'N/A',
+                'City': addresses['City'].get(stock_number, 'N/A') if 'City' in addresses else 'N/A',
+                'State': addresses['State'].get(stock_number, 'N/A') if 'State' in addresses else 'N/A',
+                by: value,
+            })
+        return ranking
+    
+    def get_market_area(self, stock_number):
+        """
+        Get the market area containing a specific property.
+        
+        Args:
+            stock_number: The stock number of the property.
+            
+        Returns:
+            A market area dictionary, or None if the property is not found.
+        """
+        self.get_market_areas()
+        if self.market_clusterer is None:
+            return None
+            
+        return self.market_clusterer.get_market_area(stock_number)
 
 
 if __name__ == "__main__":
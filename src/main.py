@@ -11,6 +11,7 @@ from dotenv import load_dotenv
 
 # Import components from the project
 from src.data.loader import PropertyDataLoader
+from src.reports.index import ReportIndex
 from src.utils.system import check_ollama_installed, check_ollama_running, setup_ollama_model
 from src.utils.formatting import print_header, print_subheader, print_agent
 
@@ -24,14 +25,19 @@ def show_help():
     print("\nUSAGE:")
     print("  python -m src.main [options]")
     print("\nOPTIONS:")
-    print("  --help, -h     Show this help message")
-    print("  --list         List available properties")
-    print("  --search TEXT  Search for properties by address or city")
-    print("  --stock NUM    Analyze the property with the given stock number")
+    print("  --help, -h          Show this help message")
+    print("  --list              List available properties")
+    print("  --search TEXT       Search for properties by address or city")
+    print("  --stock NUM         Analyze the property with the given stock number")
+    print("  --rank [COL]        Rank properties by a trend statistic (default: 5-mile projected population CAGR)")
+    print("  --reports [NUM]     List generated reports, optionally for one stock number")
+    print("  --find-report TEXT  Full-text search across generated reports")
     print("\nEXAMPLES:")
     print("  python -m src.main --list")
     print("  python -m src.main --search \"Austin\"")
     print("  python -m src.main --stock 12345")
+    print("  python -m src.main --rank median_income_5m_projected_cagr")
+    print("  python -m src.main --find-report \"zoning AND wetlands\"")
     print("\nFor more information, see the documentation.")
     
 def list_properties(loader):
@@ -72,6 +78,66 @@ def search_properties(loader, query):
     for i, prop in enumerate(results, 1):
         print(f"{i}. Stock# {prop['StockNumber']} - {prop.get('Property Address', 'N/A')}, {prop.get('City', 'N/A')}, {prop.get('State', 'N/A')}")
 
+def rank_properties(loader, column=None):
+    """Rank properties by a precomputed trend statistic."""
+    column = column or "population_5m_projected_cagr"
+    print_header(f"PROPERTY RANKING: {column}")
+    
+    ranking = loader.rank_properties(by=column, limit=20)
+    if not ranking:
+        print("No properties could be ranked by this column.")
+        return
+    
+    for prop in ranking:
+        value = prop[column]
+        value = f"{value * 100:+.2f}%" if column.endswith("cagr") or column.endswith("gradient") else f"{value:,.2f}"
+        print(f"{prop['Rank']}. Stock# {prop['StockNumber']} - {prop['Property Address']}, {prop['City']}, {prop['State']}: {value}")
+
+def _print_report(i, report):
+    """Print one report index entry."""
+    score = report.get('composite_score')
+    score = f", score {score:.3f}" if score is not None else ""
+    if report.get('opportunity_score') is not None:
+        score += f", opportunity {report['opportunity_score']:.0f}/10 ({report.get('risk_level') or 'unknown'} risk)"
+    duration = report.get('total_seconds')
+    duration = f", {duration:.0f}s" if duration is not None else ""
+    print(f"{i}. Stock# {report.get('stock_number') or 'N/A'} - {report.get('address') or 'N/A'} "
+          f"[{report.get('model') or 'unknown model'}, updated {report['updated_at']}{score}{duration}]")
+    print(f"   {report['path']}")
+
+def list_reports(stock_number=None):
+    """List generated reports from the report index."""
+    print_header(f"REPORTS: Stock# {stock_number}" if stock_number else "REPORTS")
+    
+    index = ReportIndex()
+    index.sync()
+    reports = index.reports(stock_number, limit=20)
+    if not reports:
+        print("No reports found.")
+        return
+    
+    for i, report in enumerate(reports, 1):
+        _print_report(i, report)
+
+def find_reports(query):
+    """Search the full text of generated reports."""
+    print_header(f"REPORT SEARCH: {query}")
+    
+    index = ReportIndex()
+    index.sync()
+    try:
+        results = index.search(query)
+    except Exception as e:
+        print(f"Invalid search query: {e}")
+        return
+    if not results:
+        print(f"No reports found matching '{query}'.")
+        return
+    
+    for i, report in enumerate(results, 1):
+        _print_report(i, report)
+        print(f"   ...{report['snippet']}...")
+
 def analyze_property(loader, stock_number):
     """Analyze a property by stock number."""
     print_header(f"ANALYZING PROPERTY: Stock# {stock_number}")
@@ -107,6 +173,15 @@ def main():
             show_help()
             return 0
             
+        # Report index commands do not need the property data
+        if arg == '--reports':
+            list_reports(sys.argv[2] if len(sys.argv) > 2 else None)
+            return 0
+            
+        if arg == '--find-report' and len(sys.argv) > 2:
+            find_reports(sys.argv[2])
+            return 0
+            
         # Initialize the data loader
         try:
             loader = PropertyDataLoader()
@@ -134,6 +209,11 @@ def main():
             analyze_property(loader, stock_number)
             return 0
             
+        # Handle ranking command
+        if arg == '--rank':
+            rank_properties(loader, sys.argv[2] if len(sys.argv) > 2 else None)
+            return 0
+            
         # Unknown command
         print(f"Unknown command: {arg}")
         print("Use --help to see available commands.")
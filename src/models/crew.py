@@ -9,14 +9,102 @@ import inspect
 from crewai import Crew, Process
 from pathlib import Path
 import time
+import hashlib
+import pandas as pd
 from datetime import datetime
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from ..agents.web_researcher import WebResearchAgent
 from ..agents.data_analyst import DataAnalyst
 from ..agents.market_analyst import MarketAnalyst
 from ..agents.report_generator import ReportGenerator
+from ..analysis.clustering import format_market_area
+from ..analysis.financials import simulate_financials, format_financial_summary
+from ..analysis.trends import build_trend_table, format_trend_summary
+from ..reports.assembly import ReportAssembler, write_text_atomic
+from ..reports.records import (
+    ASSESSMENT_SCHEMA,
+    ASSESSMENT_SYSTEM_PROMPT,
+    PropertyAssessment,
+    assessment_prompt,
+    save_assessment,
+)
+from ..tools.web_research import create_page_archive
+from ..utils.context import ContextStore, find_urls
 from ..utils.formatting import print_header, print_subheader, print_agent, print_info, print_error
+from ..utils.relevance import RelevanceEngine
+from ..utils.routing import ModelRouter, model_name_of, parse_mapping
+
+
+# Placeholder texts returned when a generation step fails
+REPORT_FAILED = "Error generating property report."
+EXECUTIVE_SUMMARY_FAILED = "Error generating executive summary."
+INVESTMENT_SUMMARY_FAILED = "Error generating investment summary."
+RESEARCH_FAILED = "Error analyzing property potential."
+COMPARISON_FAILED = "Error generating property comparison."
+FAILED_OUTPUTS = {REPORT_FAILED, EXECUTIVE_SUMMARY_FAILED, INVESTMENT_SUMMARY_FAILED, RESEARCH_FAILED,
+                  COMPARISON_FAILED}
+
+# Questions the research context of each prompt section is selected for
+CONTEXT_QUESTIONS = {
+    "research_data": [
+        "What is the property's zoning, lot size, land use and permitted development?",
+        "What site conditions, utilities, access, environmental or flood issues affect the property?",
+        "What permits, approvals or regulations apply to developing the property?",
+    ],
+    "market_analysis": [
+        "What are home prices, rents, vacancy and comparable land sales in the area?",
+        "What is the housing demand, supply and shortage in the market?",
+        "What new housing, commercial or infrastructure development projects are planned nearby?",
+    ],
+    "data_analysis": [
+        "How are population, households and incomes changing in the area?",
+        "What are the employment, major employers and economic growth trends?",
+    ],
+    "executive_summary": [
+        "What are the most important findings about the property and its market?",
+        "What development strategies and uses are recommended for the property?",
+        "What are the major risks, challenges and special opportunities?",
+    ],
+    "investment_summary": [
+        "What are land prices, home values, rents and comparable sales in the area?",
+        "How strong is demand and how is the market trending?",
+        "What development costs, incentives, timelines and phasing apply?",
+        "What investment risks exist and how can they be mitigated?",
+    ],
+}
+
+# Research tokens packed into each stage's prompt; the report budget is shared by its three sections
+DEFAULT_CONTEXT_BUDGETS = {"report": 3000, "executive_summary": 1200, "investment_summary": 1200}
+
+
+def _failed(text):
+    """Check whether a generation step produced nothing usable."""
+    return not text or str(text).strip() in FAILED_OUTPUTS
+
+
+def _output_text(results):
+    """
+    Get the text of a Crew.kickoff() result across CrewAI versions.
+    
+    Args:
+        results: CrewOutput, legacy raw_output/results object, list or string
+        
+    Returns:
+        str: The result text, or None if there is none
+    """
+    if results is None:
+        return None
+    if isinstance(results, str):
+        return results
+    for attribute in ("raw", "raw_output", "results"):
+        value = getattr(results, attribute, None)
+        if value:
+            return _output_text(value)
+    if isinstance(results, (list, tuple)):
+        return _output_text(results[0]) if results else None
+    return str(results)
 
 
 class PropertyAnalysisCrew:
@@ -25,7 +113,16 @@ class PropertyAnalysisCrew:
     Coordinates the workflow between research, analysis, and reporting agents.
     """
     
-    def __init__(self, property_data, llm=None, process=Process.sequential):
+    # Market-area research shared by every crew in this process, keyed by market area
+    _market_research_cache = {}
+    
+    # Embedding relevance engine shared by every crew in this process, created on first use
+    _relevance_engine = None
+    _relevance_loaded = False
+    
+    def __init__(self, property_data, llm=None, process=Process.sequential, market_area=None,
+                 financial_projection=None, property_trends=None, change_tracker=None, report_index=None,
+                 router=None):
         """
         Initialize the property analysis crew.
         
@@ -33,19 +130,54 @@ class PropertyAnalysisCrew:
             property_data: Dictionary containing property information
             llm: Language model to use for agents (if None, uses default)
             process: CrewAI process type (sequential or hierarchical)
+            market_area: Optional market area dictionary from PropertyDataLoader.get_market_area.
+                         When given, area-level research runs once per market area and is
+                         reused by every property in it.
+            financial_projection: Optional row from simulate_financials for this property.
+                                  If None, it is simulated when first needed.
+            property_trends: Optional row from PropertyDataLoader.get_property_trends.
+                             If None, it is computed when first needed.
+            change_tracker: Optional ChangeTracker. Reports and research are registered
+                            with it so they are invalidated when the listing changes.
+            report_index: Optional ReportIndex. Saved reports are cataloged in it with
+                          the model, scores and stage durations.
+            router: Optional ModelRouter choosing the model of each stage and limiting
+                    how many stages use a model at once (default: llm for every stage)
         """
         self.property_data = property_data
         self.llm = llm
+        self.router = router or ModelRouter(llm)
         self.process = process
+        self.market_area = market_area
+        self.financial_projection = financial_projection
+        self.property_trends = property_trends
+        self.change_tracker = change_tracker
+        self.report_index = report_index
+        
+        # Seconds spent in each analysis stage of the latest run
+        self.stage_durations = {}
+        
+        # Structured assessment of the latest run (PropertyAssessment)
+        self.assessment = None
+        
+        # Research tokens packed into each stage's prompt (CONTEXT_BUDGETS, 0 passes all research)
+        self.context_budgets = {**DEFAULT_CONTEXT_BUDGETS, **parse_mapping(os.getenv("CONTEXT_BUDGETS"), int)}
+        
+        # Packed and available research tokens of each stage of the latest run
+        self.context_usage = {}
+        self._context_store = None
         
         # Create the output directories if they don't exist
         self._setup_output_dirs()
         
-        # Initialize the agents
-        self.web_researcher = WebResearchAgent(llm=self.llm)
-        self.data_analyst = DataAnalyst(llm=self.llm)
-        self.market_analyst = MarketAnalyst(llm=self.llm)
-        self.report_generator = ReportGenerator(llm=self.llm)
+        # Initialize the agents with the models routed to their stages
+        self.web_researcher = WebResearchAgent(llm=self.router.llm_for("research"))
+        self.data_analyst = DataAnalyst(llm=self.router.llm_for("comparison"))
+        self.market_analyst = MarketAnalyst(llm=self.router.llm_for("research"))
+        self.report_generator = ReportGenerator(llm=self.router.llm_for("report"))
+        
+        # Report generators for summary stages routed to other models, by model name
+        self._report_generators = {self.router.model_for("report"): self.report_generator}
         
         # Tasks will be added dynamically during analysis
     
@@ -58,6 +190,7 @@ class PropertyAnalysisCrew:
         os.makedirs(project_root / "outputs", exist_ok=True)
         os.makedirs(project_root / "outputs" / "reports", exist_ok=True)
         os.makedirs(project_root / "outputs" / "charts", exist_ok=True)
+        os.makedirs(project_root / "outputs" / "market_areas", exist_ok=True)
     
     def analyze_property(self):
         """Complete analysis method that performs all analysis steps on a property.
@@ -66,117 +199,248 @@ class PropertyAnalysisCrew:
             tuple: (full_report, executive_summary, investment_summary, report_path)
         """
         try:
-            # Step 1: Research property potential
-            print_header("PROPERTY POTENTIAL ANALYSIS")
-            property_potential = self.research_property_potential()
-            print_info("Retrieved property potential successfully")
-            
-            # Step 2: Generate the complete report
-            print_header("GENERATING FULL PROPERTY REPORT")
-            full_report = self.generate_report(property_potential)
-            
-            # Step 3: Generate the executive summary
-            print_header("GENERATING EXECUTIVE SUMMARY")
-            executive_summary = self.generate_executive_summary(property_potential, full_report)
-            
-            # Step 4: Generate investment summary
-            print_header("GENERATING INVESTMENT SUMMARY") 
-            investment_summary = self.generate_investment_summary(property_potential, executive_summary)
-            
-            # Step 5: Save the report to a file
-            report_path = self.save_report_to_file(full_report, executive_summary, investment_summary)
-            
-            print_info(f"Return values from analyze_property: {len([full_report, executive_summary, investment_summary, report_path])} items")
-            
-            return full_report, executive_summary, investment_summary, report_path
-            
+            property_potential, full_report = self.analyze_site()
+            return self.summarize_analysis(property_potential, full_report)
         except Exception as e:
-            print_error(f"Error in property analysis: {str(e)}")
-            
-            # Create mock reports in case of failure
-            mock_report = self.get_mock_report()
-            mock_exec_summary = "Executive summary not available due to an error."
-            mock_invest_summary = "Investment summary not available due to an error."
+            return self.fail_analysis(e)
+    
+    def analyze_site(self):
+        """Run the deep analysis stages: research and the full report.
+        
+        Returns:
+            tuple: (property_potential, full_report)
+        """
+        self.stage_durations = {}
+        
+        # Step 1: Research property potential
+        print_header("PROPERTY POTENTIAL ANALYSIS")
+        started = time.perf_counter()
+        property_potential = self.research_property_potential()
+        self.stage_durations["research"] = time.perf_counter() - started
+        print_info("Retrieved property potential successfully")
+        
+        # Step 2: Generate the complete report
+        print_header("GENERATING FULL PROPERTY REPORT")
+        started = time.perf_counter()
+        full_report = self.generate_report(property_potential)
+        self.stage_durations["report"] = time.perf_counter() - started
+        
+        return property_potential, full_report
+    
+    def summarize_analysis(self, property_potential, full_report):
+        """Run the summary stages on the deep analysis and save the reports.
+        
+        Args:
+            property_potential (str): Output of the research stage
+            full_report (str): The full property report
             
-            # Save what we have to a file
-            report_path = self.save_report_to_file(
-                mock_report, 
-                mock_exec_summary,
-                mock_invest_summary,
-                custom_filename=f"error_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            )
+        Returns:
+            tuple: (full_report, executive_summary, investment_summary, report_path)
+        """
+        # Step 3: Generate the executive summary
+        print_header("GENERATING EXECUTIVE SUMMARY")
+        started = time.perf_counter()
+        executive_summary = self.generate_executive_summary(property_potential, full_report)
+        self.stage_durations["executive_summary"] = time.perf_counter() - started
+        
+        # Step 4: Generate investment summary
+        print_header("GENERATING INVESTMENT SUMMARY") 
+        started = time.perf_counter()
+        investment_summary = self.generate_investment_summary(property_potential, executive_summary)
+        self.stage_durations["investment_summary"] = time.perf_counter() - started
+        
+        # Step 5: Extract a structured assessment for ranking and comparison
+        print_header("EXTRACTING STRUCTURED ASSESSMENT")
+        started = time.perf_counter()
+        self.assessment = self.extract_assessment(full_report, executive_summary)
+        self.stage_durations["assessment"] = time.perf_counter() - started
+        
+        # Step 6: Save the report to a file
+        report_path = self.save_report_to_file(full_report, executive_summary, investment_summary,
+                                               assessment=self.assessment)
+        
+        # Only successful analyses count as current for change detection
+        if self.change_tracker is not None:
+            self.change_tracker.register_artifact(self.property_data.get('StockNumber'), report_path)
+        
+        print_info(f"Return values from analyze_property: {len([full_report, executive_summary, investment_summary, report_path])} items")
+        
+        return full_report, executive_summary, investment_summary, report_path
+    
+    def fail_analysis(self, error):
+        """Save placeholder reports after an analysis error.
+        
+        Args:
+            error (Exception): The error that stopped the analysis
             
-            return mock_report, mock_exec_summary, mock_invest_summary, report_path
+        Returns:
+            tuple: (full_report, executive_summary, investment_summary, report_path)
+        """
+        print_error(f"Error in property analysis: {str(error)}")
+        
+        # Create mock reports in case of failure
+        mock_report = self.get_mock_report()
+        mock_exec_summary = "Executive summary not available due to an error."
+        mock_invest_summary = "Investment summary not available due to an error."
+        
+        # Save what we have to a file
+        report_path = self.save_report_to_file(
+            mock_report, 
+            mock_exec_summary,
+            mock_invest_summary,
+            custom_filename=f"error_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        )
+        
+        return mock_report, mock_exec_summary, mock_invest_summary, report_path
         
     def save_report_to_file(self, 
                        full_report, 
                        executive_summary, 
                        investment_summary,
                        timestamp=None,
-                       custom_filename=None):
+                       custom_filename=None,
+                       assessment=None):
         """Save the generated report to a file.
         
+        By default the report is kept at outputs/reports/property_<StockNumber>/analysis.md
+        and re-assembled incrementally: sections whose text is unchanged are carried
+        over, and an unchanged report is not rewritten. Passing a timestamp or a
+        custom filename writes a separate file in outputs/reports instead.
+        
         Args:
             full_report (str): The complete property analysis report
             executive_summary (str): Executive summary of the analysis
             investment_summary (str): Investment summary 
-            timestamp (str, optional): Timestamp for the filename. If None, current time is used.
+            timestamp (str, optional): Timestamp for a separate, timestamped report file.
             custom_filename (str, optional): Custom filename to use instead of the generated one.
+            assessment (PropertyAssessment, optional): Structured assessment, stored beside
+                the report as "<report name>.assessment.json".
             
         Returns:
-            str: Path to the created report file
+            str: Path to the report file
         """
         # Get the project root directory
         project_root = Path(__file__).resolve().parent.parent.parent
-        
-        # Create the output directory if it doesn't exist
         output_dir = os.path.join(project_root, "outputs", "reports")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate the filename
-        if not timestamp:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-        address = self.property_data.get('Property Address', 'unknown').lower().replace(' ', '_')
         
         if custom_filename:
-            filename = custom_filename
+            report_path = os.path.join(output_dir, custom_filename)
+        elif timestamp:
+            address = self.property_data.get('Property Address', 'unknown').lower().replace(' ', '_')
+            report_path = os.path.join(output_dir, f"{timestamp}_{address}_analysis.md")
         else:
-            filename = f"{timestamp}_{address}_analysis.md"
-            
-        report_path = os.path.join(output_dir, filename)
+            report_path = os.path.join(self._property_report_dir(), "analysis.md")
         
-        # Format the report
-        # Check if any of the report sections exist or provide defaults
-        if not full_report or "Error" in full_report:
+        # Fall back to placeholders only for steps that actually failed
+        if _failed(full_report):
             full_report = self.get_mock_report()
             
-        if not executive_summary or "Error" in executive_summary:
+        if _failed(executive_summary):
             executive_summary = "Executive summary not available."
             
-        if not investment_summary or "Error" in investment_summary:
+        if _failed(investment_summary):
             investment_summary = "Investment summary not available."
-            
-        report_content = f"""# PROPERTY ANALYSIS REPORT
-
-## EXECUTIVE SUMMARY
-
-{executive_summary}
-
-## INVESTMENT SUMMARY
-
-{investment_summary}
-
-## FULL ANALYSIS REPORT
-
-{full_report}
-"""
         
-        # Write to file
-        with open(report_path, 'w') as f:
-            f.write(report_content)
+        assembler = ReportAssembler(report_path)
+        assembler.add_section("executive_summary", "EXECUTIVE SUMMARY", str(executive_summary))
+        assembler.add_section("investment_summary", "INVESTMENT SUMMARY", str(investment_summary))
+        assembler.add_section("full_report", "FULL ANALYSIS REPORT", str(full_report))
+        result = assembler.assemble()
+        
+        if result["written"]:
+            print_info(f"Report saved to {report_path} (updated: {', '.join(result['rendered']) or 'layout'})")
+        else:
+            print_info(f"Report at {report_path} is already current")
+        
+        if assessment is not None:
+            save_assessment(report_path, assessment)
+        
+        if self.report_index is not None:
+            try:
+                self.report_index.record(report_path, self.property_data, model=self.router.llm_for("report"),
+                                         durations=self.stage_durations or None, assessment=assessment)
+            except Exception as e:
+                # The report itself is saved; a catalog failure should not lose it
+                print_error(f"Error indexing report {report_path}: {str(e)}")
             
         return report_path
+    
+    def extract_assessment(self, full_report, executive_summary=None):
+        """Extract a structured assessment from the generated reports.
+        
+        Sends a schema-constrained request (Ollama structured outputs) and validates
+        the response into a PropertyAssessment.
+        
+        Args:
+            full_report (str): The full property report
+            executive_summary (str, optional): The executive summary
+            
+        Returns:
+            PropertyAssessment: The assessment, or None if it could not be extracted
+        """
+        llm = self.router.llm_for("assessment")
+        structured = getattr(llm, "structured", None)
+        if structured is None:
+            print_info("The language model does not support structured output; skipping assessment")
+            return None
+            
+        if _failed(full_report):
+            return None
+        
+        print_agent("Report Generator", "Extracting structured assessment...")
+        with self.router.slot("assessment"):
+            response = structured(
+                assessment_prompt(self.property_data, full_report,
+                                  None if _failed(executive_summary) else executive_summary),
+                ASSESSMENT_SCHEMA,
+                system_prompt=ASSESSMENT_SYSTEM_PROMPT
+            )
+        if response is None:
+            print_error("No structured assessment was returned")
+            return None
+        
+        try:
+            return PropertyAssessment.from_response(
+                response,
+                stock_number=str(self.property_data.get('StockNumber', '')).strip() or None,
+                model=model_name_of(llm)
+            )
+        except (TypeError, ValueError) as e:
+            print_error(f"Error validating structured assessment: {str(e)}")
+            return None
+    
+    def _report_generator_for(self, stage):
+        """Get a report generator agent running on the model routed to a stage."""
+        model = self.router.model_for(stage)
+        if model not in self._report_generators:
+            self._report_generators[model] = ReportGenerator(llm=self.router.llm_for(stage))
+        return self._report_generators[model]
+    
+    def _kickoff(self, stage, agent, task):
+        """Run a single-task crew within the concurrency limit of the stage's model.
+        
+        Args:
+            stage (str): Analysis stage name (see routing.STAGES)
+            agent: The CrewAI agent
+            task: The CrewAI task
+            
+        Returns:
+            str: The task output, or None if there was none
+        """
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            verbose=True,
+            process=self.process
+        )
+        with self.router.slot(stage):
+            return _output_text(crew.kickoff())
+    
+    def _property_report_dir(self):
+        """Get the report directory of this property."""
+        project_root = Path(__file__).resolve().parent.parent.parent
+        property_id = str(self.property_data.get('StockNumber', 'unknown')).strip()
+        return project_root / "outputs" / "reports" / f"property_{property_id}"
         
     def get_mock_report(self):
         """Return a mock report for testing.
@@ -227,33 +491,22 @@ The primary risks include market fluctuations, construction costs, and regulator
         Returns:
             str: Path to the reports directory
         """
-        # Get the project root directory
-        project_root = Path(__file__).parent.parent.parent
-        reports_dir = project_root / "outputs" / "reports"
-        
-        # Create a property-specific directory
-        property_id = self.property_data.get('StockNumber', 'unknown')
-        property_dir = reports_dir / f"property_{property_id}"
-        os.makedirs(property_dir, exist_ok=True)
+        property_dir = self._property_report_dir()
         
-        # Save the reports
-        with open(property_dir / "full_report.md", "w") as f:
-            f.write(full_report)
-            
-        with open(property_dir / "executive_summary.md", "w") as f:
-            f.write(executive_summary)
-            
-        with open(property_dir / "investment_summary.md", "w") as f:
-            f.write(investment_summary)
+        # Save the reports, leaving files with unchanged content untouched
+        write_text_atomic(property_dir / "full_report.md", str(full_report))
+        write_text_atomic(property_dir / "executive_summary.md", str(executive_summary))
+        write_text_atomic(property_dir / "investment_summary.md", str(investment_summary))
             
         return str(property_dir)
         
-    def compare_properties(self, properties_data_list):
+    def compare_properties(self, properties_data_list, market_areas=None):
         """
         Compare multiple properties for development potential.
         
         Args:
             properties_data_list: List of property data dictionaries
+            market_areas: Optional dictionary mapping stock numbers to market area dictionaries
             
         Returns:
             str: Comparison report
@@ -271,34 +524,49 @@ The primary risks include market fluctuations, construction costs, and regulator
         print_agent("Data Analyst", "Comparing properties for development potential...")
         
         # Create task for property comparison
-        comparison_task = self.data_analyst.create_property_comparison_task(properties_data_list)
-        
-        # Create a crew for property comparison
-        comparison_crew = Crew(
-            agents=[self.data_analyst.agent],
-            tasks=[comparison_task],
-            verbose=True,
-            process=self.process
+        comparison_task = self.data_analyst.create_property_comparison_task(
+            properties_data_list,
+            market_areas=market_areas
         )
         
-        # Execute property comparison crew
-        comparison_results = comparison_crew.kickoff()
-        
-        # Extract comparison report
-        comparison_report = comparison_results[0]
+        # Execute property comparison
+        comparison_report = (self._kickoff("comparison", self.data_analyst.agent, comparison_task)
+                             or COMPARISON_FAILED)
         
         # Save report to file
         project_root = Path(__file__).parent.parent.parent
         reports_dir = project_root / "outputs" / "reports"
         
-        with open(reports_dir / "property_comparison.md", "w") as f:
-            f.write(comparison_report)
+        write_text_atomic(reports_dir / "property_comparison.md", comparison_report)
             
         print_subheader("Comparison Complete")
         print(f"Comparison report saved to: {reports_dir / 'property_comparison.md'}")
         
         return comparison_report
 
+    def get_financial_projection(self):
+        """Get the precomputed financial projection for the property.
+        
+        Returns:
+            pandas.Series: Projection row from simulate_financials
+        """
+        if self.financial_projection is None:
+            projections = simulate_financials(pd.DataFrame([self.property_data]))
+            self.financial_projection = projections.iloc[0]
+            
+        return self.financial_projection
+
+    def get_property_trends(self):
+        """Get the precomputed demographic trend analytics for the property.
+        
+        Returns:
+            pandas.Series: Row from build_trend_table
+        """
+        if self.property_trends is None:
+            self.property_trends = build_trend_table(pd.DataFrame([self.property_data])).iloc[0]
+            
+        return self.property_trends
+
     def generate_investment_summary(self, property_potential, executive_summary):
         """Generate investment summary for the property.
         
@@ -310,29 +578,19 @@ The primary risks include market fluctuations, construction costs, and regulator
             str: Investment summary
         """
         # Create the investment summary task
-        invest_summary_task = self.report_generator.create_investment_summary_task(
+        generator = self._report_generator_for("investment_summary")
+        research, = self._pack_research("investment_summary", property_potential, ["investment_summary"])
+        invest_summary_task = generator.create_investment_summary_task(
             self.property_data,
-            property_potential,
-            executive_summary
-        )
-        
-        # Create a crew for investment summary generation
-        invest_summary_crew = Crew(
-            agents=[self.report_generator.agent],
-            tasks=[invest_summary_task],
-            verbose=True,
-            process=self.process
+            research,
+            executive_summary,
+            financial_summary=format_financial_summary(self.get_financial_projection())
         )
         
         # Execute the task
         print_agent("Report Generator", "Creating investment summary...")
-        invest_results = invest_summary_crew.kickoff()
-        
-        # Extract investment summary content
-        if isinstance(invest_results, list) and len(invest_results) > 0:
-            investment_summary = invest_results[0]
-        else:
-            investment_summary = "Error generating investment summary."
+        investment_summary = (self._kickoff("investment_summary", generator.agent, invest_summary_task)
+                              or INVESTMENT_SUMMARY_FAILED)
         
         return investment_summary
 
@@ -347,91 +605,121 @@ The primary risks include market fluctuations, construction costs, and regulator
             str: Executive summary
         """
         # Create the executive summary task
-        exec_summary_task = self.report_generator.create_executive_summary_task(
+        generator = self._report_generator_for("executive_summary")
+        research, = self._pack_research("executive_summary", property_potential, ["executive_summary"])
+        exec_summary_task = generator.create_executive_summary_task(
             self.property_data,
-            property_potential,
+            research,
             full_report
         )
         
-        # Create a crew for executive summary generation
-        exec_summary_crew = Crew(
-            agents=[self.report_generator.agent],
-            tasks=[exec_summary_task],
-            verbose=True,
-            process=self.process
-        )
-        
         # Execute the task
         print_agent("Report Generator", "Creating executive summary...")
-        exec_results = exec_summary_crew.kickoff()
-        
-        # Extract executive summary content
-        if isinstance(exec_results, list) and len(exec_results) > 0:
-            executive_summary = exec_results[0]
-        else:
-            executive_summary = "Error generating executive summary."
+        executive_summary = (self._kickoff("executive_summary", generator.agent, exec_summary_task)
+                             or EXECUTIVE_SUMMARY_FAILED)
         
         return executive_summary
 
     def research_property_potential(self):
         """Research property development potential.
         
+        When the crew has a market area, the area-level research is taken from
+        research_market_area and only site-specific research is run here.
+        
         Returns:
             str: Property potential analysis
         """
-        # Import here to avoid circular imports
-        from crewai import Crew
-        
         # Set up the crew for web research
         print_agent("Web Researcher", "Researching property details and economic\npotential...")
         
-        # Create a web research task
-        query = self._generate_research_query()
+        if self.market_area:
+            market_research = self.research_market_area()
+            query = self._generate_site_research_query()
+        else:
+            market_research = None
+            query = self._generate_research_query()
         
+        property_research = self._run_research_task(query)
+        
+        if market_research is None:
+            return property_research
+            
+        return f"""## Market Area Research: {self.market_area['name']}
+
+{market_research}
+
+## Site Research: {self.property_data.get('Property Address', 'Unknown')}
+
+{property_research}
+"""
+
+    def research_market_area(self):
+        """Research the crew's market area, reusing earlier research for the same area.
+        
+        Area research is cached in memory and under outputs/market_areas, so it is run
+        once per market area rather than once per property.
+        
+        Returns:
+            str: Market area research, or None if the crew has no market area
+        """
+        if not self.market_area:
+            return None
+            
+        cache_key = self._market_area_key()
+        project_root = Path(__file__).resolve().parent.parent.parent
+        cache_path = project_root / "outputs" / "market_areas" / f"{cache_key}.md"
+        
+        # A deleted cache file means a member listing changed and the research is stale
+        if cache_key in self._market_research_cache and cache_path.exists():
+            print_info(f"Reusing research for market area {self.market_area['id']}")
+            return self._market_research_cache[cache_key]
+            
+        if cache_path.exists():
+            print_info(f"Loaded research for market area {self.market_area['id']} from {cache_path}")
+            market_research = cache_path.read_text()
+        else:
+            print_agent("Web Researcher", f"Researching market area {self.market_area['name']}...")
+            market_research = str(self._run_research_task(self._generate_market_area_query()))
+            
+            # Failed research is not cached so the next property retries it
+            if _failed(market_research):
+                return market_research
+                
+            os.makedirs(cache_path.parent, exist_ok=True)
+            cache_path.write_text(market_research)
+            
+            # The research depends on every listing in the area
+            if self.change_tracker is not None:
+                for stock_number in self.market_area.get('members', []):
+                    self.change_tracker.register_artifact(stock_number, cache_path, kind="research")
+            
+        self._market_research_cache[cache_key] = market_research
+        return market_research
+        
+    def _market_area_key(self):
+        """Build a cache key that changes whenever the market area's membership changes."""
+        members = ",".join(sorted(self.market_area.get('members', [])))
+        digest = hashlib.sha1(members.encode("utf-8")).hexdigest()[:10]
+        return f"{self.market_area['id']}_{digest}"
+
+    def _run_research_task(self, query):
+        """Run a single web research task and return its output as text.
+        
+        Args:
+            query (str): The research query for the web researcher
+            
+        Returns:
+            str: Research output
+        """
         # Create the web research task
         web_research_task = self.web_researcher.create_research_task(query)
         
-        # Create a crew for web research
-        research_crew = Crew(
-            agents=[self.web_researcher.agent],
-            tasks=[web_research_task],
-            verbose=True,
-            process=self.process
-        )
-        
         # Execute web research task and get results
         try:
-            web_research_results = research_crew.kickoff()
-            
-            # Check the result type and handle accordingly
-            result_type = type(web_research_results)
-            print_info(f"Web research result object type: {result_type}")
-            
-            if hasattr(web_research_results, 'raw_output'):
-                # New CrewAI version format
-                return web_research_results.raw_output
-            elif hasattr(web_research_results, 'results'):
-                # Alternative format
-                return web_research_results.results
-            elif isinstance(web_research_results, list) and len(web_research_results) > 0:
-                # Older list format
-                try:
-                    return web_research_results[0]
-                except (IndexError, KeyError) as e:
-                    print_error(f"Error indexing results: {str(e)}")
-                    return "Error analyzing property potential."
-            elif isinstance(web_research_results, str):
-                # Direct string result
-                return web_research_results
-            else:
-                # Fallback - try to convert to string
-                try:
-                    return str(web_research_results)
-                except:
-                    return "Error analyzing property potential."
+            return self._kickoff("research", self.web_researcher.agent, web_research_task) or RESEARCH_FAILED
         except Exception as e:
             print_error(f"Error during web research: {str(e)}")
-            return "Error analyzing property potential."
+            return RESEARCH_FAILED
 
     def generate_report(self, property_potential):
         """Generate a comprehensive property report.
@@ -444,34 +732,99 @@ The primary risks include market fluctuations, construction costs, and regulator
         """
         print_agent("Report Generator", "Creating comprehensive property report...")
         
-        # For compatibility with the actual report_task API, we use property_potential data
-        # for all analysis fields since it contains all the necessary information
+        # The research covers all three analysis fields; each gets the part relevant to it
+        research_data, market_analysis, data_analysis = self._pack_research(
+            "report", property_potential, ["research_data", "market_analysis", "data_analysis"]
+        )
         report_task = self.report_generator.create_report_task(
             self.property_data,
-            property_potential,  # Use as research_data
-            property_potential,  # Use as market_analysis 
-            property_potential   # Use as data_analysis
-        )
-        
-        # Create a crew for report generation
-        report_crew = Crew(
-            agents=[self.report_generator.agent],
-            tasks=[report_task],
-            verbose=True,
-            process=self.process
+            research_data,
+            market_analysis,
+            data_analysis,
+            financial_summary=format_financial_summary(self.get_financial_projection()),
+            demographic_trends=format_trend_summary(self.get_property_trends())
         )
         
         # Execute report generation and get results
-        report_results = report_crew.kickoff()
-        
-        # Extract report content
-        if isinstance(report_results, list) and len(report_results) > 0:
-            report = report_results[0]
-        else:
-            report = "Error generating property report."
+        report = self._kickoff("report", self.report_generator.agent, report_task) or REPORT_FAILED
             
         return report
 
+    def _pack_research(self, stage, property_potential, sections):
+        """Select the research relevant to each section of a stage's prompt.
+        
+        Research that fits the stage's budget is passed whole in the first section.
+        Longer research is chunked and each section gets the chunks that best
+        answer its CONTEXT_QUESTIONS, within an equal share of the budget and
+        without repeating chunks given to an earlier section.
+        
+        Args:
+            stage (str): "report", "executive_summary" or "investment_summary"
+            property_potential (str): Output of the research stage
+            sections (list): Keys of CONTEXT_QUESTIONS, one per prompt section
+            
+        Returns:
+            list: Research text for each section
+        """
+        research = str(property_potential)
+        budget = self.context_budgets.get(stage, 0)
+        
+        # Packing turned off, or nothing worth selecting from
+        if budget <= 0 or _failed(research):
+            return [research] * len(sections)
+            
+        store = self._context_store_for(research)
+        if store.total_tokens <= budget and store.sources == {"research"}:
+            self.context_usage[stage] = {"tokens": store.total_tokens, "total_tokens": store.total_tokens}
+            return [research] + ["Included in the research above."] * (len(sections) - 1)
+        
+        packed = []
+        used = set()
+        tokens = 0
+        for section in sections:
+            selection = store.pack(CONTEXT_QUESTIONS[section], budget // len(sections), exclude=used)
+            used |= selection["chunks"]
+            tokens += selection["tokens"]
+            packed.append(selection["text"] or "No research relevant to this section was found.")
+            
+        self.context_usage[stage] = {"tokens": tokens, "total_tokens": store.total_tokens}
+        print_info(f"Packed {tokens} of {store.total_tokens} research tokens into the {stage} prompt")
+        return packed
+    
+    def _context_store_for(self, research):
+        """Get the retrieval store over a research output, building it on first use.
+        
+        The store holds the research and the archived text of the pages it cites.
+        
+        Args:
+            research (str): Output of the research stage
+            
+        Returns:
+            ContextStore: The store
+        """
+        if self._context_store is not None and self._context_store[0] == research:
+            return self._context_store[1]
+            
+        store = ContextStore(relevance=self._relevance())
+        store.add(research, source="research")
+        archive = create_page_archive()
+        if archive is not None:
+            try:
+                store.add_pages(archive, find_urls(research))
+            finally:
+                archive.close()
+                
+        self._context_store = (research, store)
+        return store
+    
+    @classmethod
+    def _relevance(cls):
+        """Get the shared embedding relevance engine, or None if embeddings are turned off."""
+        if not cls._relevance_loaded:
+            cls._relevance_engine = RelevanceEngine.from_env()
+            cls._relevance_loaded = True
+        return cls._relevance_engine
+
     def _generate_research_query(self):
         """Generate a research query for the property.
         
@@ -525,3 +878,118 @@ The primary risks include market fluctuations, construction costs, and regulator
         
         return query
 
+    def _generate_market_area_query(self):
+        """Generate a research query covering a whole market area.
+        
+        Returns:
+            str: Research query for the web researcher
+        """
+        counties = ", ".join(self.market_area.get('counties', [])) or "the surrounding counties"
+        state = self.property_data.get('State', 'Unknown')
+        
+        query = f"""
+        Conduct market-area research for {self.market_area['name']} ({counties}, {state}).
+        This research will be shared by every candidate property in the area, so focus on
+        area-wide conditions rather than any single site.
+        
+        Known market statistics (area medians across candidate properties):
+        {format_market_area(self.market_area)}
+        
+        Your research should include:
+        
+        1. **Local Demographics & Economics**
+           - Population trends and projections
+           - Economic indicators (income levels, employment rates)
+           - Major employers and economic development news
+           - Local amenities and services
+        
+        2. **Housing Market**
+           - Housing demand, pricing and rental trends
+           - Affordable and manufactured housing acceptance
+           - Existing and planned competing developments
+        
+        3. **Regulatory Environment**
+           - Local government attitude toward development
+           - Recent similar projects and their reception
+           - Incentives or restrictions for development
+           - Timeline for typical approval processes
+        
+        4. **Future Outlook**
+           - Planned infrastructure improvements
+           - Long-term development plans for the area
+           - Anticipated regulatory changes
+        """
+        
+        return query
+
+    def _generate_site_research_query(self):
+        """Generate a site-specific research query for a property in a researched market area.
+        
+        Returns:
+            str: Research query for the web researcher
+        """
+        address = self.property_data.get('Property Address', 'Unknown')
+        city = self.property_data.get('City', 'Unknown')
+        state = self.property_data.get('State', 'Unknown')
+        
+        query = f"""
+        Conduct site-specific research on the property located at {address}, {city}, {state}.
+        Area-wide demographics, economics and regulation for market area
+        {self.market_area['name']} have already been researched, so do not repeat them.
+        
+        Your research should include:
+        
+        1. **Property Details & Zoning**
+           - Current zoning and applicable regulations
+           - Historical information and prior use
+           - Environmental considerations (flood zones, soil conditions, etc.)
+           - Utilities availability (water, sewer, electricity, internet)
+           - Access and transportation infrastructure
+        
+        2. **Immediate Surroundings**
+           - Similar properties and recent land sales nearby
+           - Adjacent land uses and planned projects near the site
+           - Factors that could affect this property's value over time
+        """
+        
+        return query
+
+
+def analyze_properties(crews, overlap=False):
+    """
+    Analyze a batch of properties.
+    
+    With overlap, each property's summary stages run on a background thread
+    while the next property's research and report run, so a small summary model
+    works alongside the large model instead of waiting for it. Use it when the
+    router sends the two stage groups to different models that fit in memory
+    together (see ModelRouter.can_overlap); per-model concurrency limits still
+    apply to every stage.
+    
+    Args:
+        crews: Iterable of PropertyAnalysisCrew objects (may be a generator)
+        overlap: Whether summary stages overlap the next property's deep stages
+        
+    Returns:
+        list: analyze_property results, in the order of the crews
+    """
+    if not overlap:
+        return [crew.analyze_property() for crew in crews]
+    
+    def summarize(crew, property_potential, full_report):
+        try:
+            return crew.summarize_analysis(property_potential, full_report)
+        except Exception as e:
+            return crew.fail_analysis(e)
+    
+    futures = []
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="summaries") as summaries:
+        for crew in crews:
+            try:
+                property_potential, full_report = crew.analyze_site()
+            except Exception as e:
+                futures.append(summaries.submit(crew.fail_analysis, e))
+                continue
+            futures.append(summaries.submit(summarize, crew, property_potential, full_report))
+    
+    return [future.result() for future in futures]
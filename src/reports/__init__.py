@@ -0,0 +1,26 @@
+"""
+Report assembly and storage for property analysis reports.
+"""
+
+from src.reports.assembly import ReportAssembler, read_sections, section_hash, write_text_atomic
+from src.reports.index import ReportIndex
+from src.reports.records import (
+    PropertyAssessment,
+    ASSESSMENT_SCHEMA,
+    validate,
+    save_assessment,
+    load_assessment,
+)
+
+__all__ = [
+    "ReportAssembler",
+    "read_sections",
+    "section_hash",
+    "write_text_atomic",
+    "ReportIndex",
+    "PropertyAssessment",
+    "ASSESSMENT_SCHEMA",
+    "validate",
+    "save_assessment",
+    "load_assessment",
+]
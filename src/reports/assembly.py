@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Report assembly engine for property analysis reports.
+Builds markdown reports from named sections, each stored between marker
+comments with a hash of the inputs it was rendered from. Re-assembling a
+report re-renders only sections whose inputs changed, copies the others
+byte-for-byte from the existing file, streams section bodies to a temporary
+file and atomically replaces the report. Unchanged reports are not rewritten.
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+
+from ..utils.files import atomic_write, write_bytes_atomic
+
+# Bump to re-render every section after a template change
+TEMPLATE_VERSION = 1
+
+# Default report title
+REPORT_TITLE = "PROPERTY ANALYSIS REPORT"
+
+SECTION_START = re.compile(rb"^<!-- section:(\S+) sha256:([0-9a-f]{64}) -->\r?\n?$")
+SECTION_END = "<!-- /section:{name} -->"
+
+# Bytes copied per read when carrying unchanged sections over
+COPY_CHUNK_SIZE = 1 << 16
+
+
+def section_hash(name, heading, inputs):
+    """
+    Hash a section's name, heading and inputs.
+
+    Args:
+        name: Section name
+        heading: Section heading
+        inputs: JSON-serializable inputs the section is rendered from
+
+    Returns:
+        str: Hex digest
+    """
+    payload = {"name": name, "heading": heading, "inputs": inputs, "version": TEMPLATE_VERSION}
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def read_sections(path):
+    """
+    Locate the sections of an assembled report without loading their bodies.
+
+    Args:
+        path: Report file path
+
+    Returns:
+        dict: Section name to {"hash", "start", "end"} byte offsets (including
+              the marker lines), in file order; empty if the file does not exist
+    """
+    sections = {}
+    if not os.path.exists(path):
+        return sections
+
+    offset = 0
+    current = None
+    with open(path, "rb") as f:
+        for line in f:
+            if current is None:
+                match = SECTION_START.match(line)
+                if match:
+                    current = {"name": match.group(1).decode("utf-8"), "hash": match.group(2).decode("ascii"),
+                               "start": offset}
+            elif line.rstrip(b"\r\n") == SECTION_END.format(name=current["name"]).encode("utf-8"):
+                sections[current["name"]] = {"hash": current["hash"], "start": current["start"],
+                                             "end": offset + len(line)}
+                current = None
+            offset += len(line)
+
+    return sections
+
+
+def _chunks(content):
+    """Yield the text of a rendered section, whether a string or an iterable of strings."""
+    if content is None:
+        return
+    if isinstance(content, str):
+        yield content
+    else:
+        for chunk in content:
+            yield str(chunk)
+
+
+class ReportAssembler:
+    """
+    Assembles a markdown report from named sections with incremental regeneration.
+    """
+
+    def __init__(self, path, title=REPORT_TITLE, keep_existing=False):
+        """
+        Initialize the report assembler.
+
+        Args:
+            path: Report file path
+            title: Top-level report heading
+            keep_existing: Carry over sections of the existing report that are not
+                           added, so a single section can be refreshed on its own
+        """
+        self.path = Path(path)
+        self.title = title
+        self.keep_existing = keep_existing
+        self.sections = []
+
+    def add_section(self, name, heading, render, inputs=None):
+        """
+        Add a section to the report.
+
+        Args:
+            name: Unique section name (used in the marker comments)
+            heading: Section heading, written as a level-two heading
+            render: Section text, or a callable returning the text or an iterable
+                    of text chunks (written as they are produced)
+            inputs: JSON-serializable inputs that determine the section's content
+                    (default: the text itself, when render is a string)
+
+        Returns:
+            ReportAssembler: self, for chaining
+        """
+        if any(section["name"] == name for section in self.sections):
+            raise ValueError(f"Duplicate report section: {name}")
+        if inputs is None and callable(render):
+            raise ValueError(f"Section {name} renders lazily and needs inputs to hash")
+
+        self.sections.append({
+            "name": name,
+            "heading": heading,
+            "render": render,
+            "hash": section_hash(name, heading, render if inputs is None else inputs),
+        })
+        return self
+
+    def assemble(self, force=False):
+        """
+        Write the report, re-rendering only the sections whose inputs changed.
+
+        Args:
+            force: Re-render every section
+
+        Returns:
+            dict: "path", "rendered" and "reused" section names, and "written"
+                  (False when the existing report was already current)
+        """
+        existing = read_sections(self.path)
+        added = {section["name"]: section for section in self.sections}
+
+        order = [section["name"] for section in self.sections]
+        if self.keep_existing:
+            order = [name for name in existing] + [name for name in order if name not in existing]
+
+        plan = []
+        for name in order:
+            section = added.get(name)
+            if section is None:
+                plan.append(("copy", name))
+            elif not force and name in existing and existing[name]["hash"] == section["hash"]:
+                plan.append(("copy", name))
+            else:
+                plan.append(("render", name))
+
+        rendered = [name for action, name in plan if action == "render"]
+        reused = [name for action, name in plan if action == "copy"]
+        result = {"path": str(self.path), "rendered": rendered, "reused": reused, "written": False}
+
+        if not rendered and order == list(existing) and self._header_matches():
+            return result
+
+        self._write(plan, existing, added)
+        result["written"] = True
+        return result
+
+    def _header(self):
+        """Text written before the first section."""
+        return f"# {self.title}\n\n"
+
+    def _header_matches(self):
+        """Check whether the existing report starts with the current header."""
+        header = self._header().encode("utf-8")
+        with open(self.path, "rb") as f:
+            return f.read(len(header)) == header
+
+    def _write(self, plan, existing, added):
+        """Stream the planned sections to a temporary file and replace the report."""
+        source = open(self.path, "rb") if any(action == "copy" for action, _ in plan) else None
+
+        try:
+            with atomic_write(self.path, "wb", fsync=True) as out:
+                out.write(self._header().encode("utf-8"))
+                for action, name in plan:
+                    if action == "copy":
+                        self._copy_section(source, existing[name], out)
+                    else:
+                        self._render_section(added[name], out)
+        finally:
+            if source is not None:
+                source.close()
+
+    def _copy_section(self, source, span, out):
+        """Copy an unchanged section from the existing report."""
+        source.seek(span["start"])
+        remaining = span["end"] - span["start"]
+        while remaining > 0:
+            chunk = source.read(min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            out.write(chunk)
+            remaining -= len(chunk)
+        out.write(b"\n")
+
+    def _render_section(self, section, out):
+        """Render a section and write it chunk by chunk."""
+        out.write(f"<!-- section:{section['name']} sha256:{section['hash']} -->\n"
+                  f"## {section['heading']}\n\n".encode("utf-8"))
+
+        render = section["render"]
+        last = "\n"
+        for chunk in _chunks(render() if callable(render) else render):
+            if chunk:
+                out.write(chunk.encode("utf-8"))
+                last = chunk
+        if not last.endswith("\n"):
+            out.write(b"\n")
+
+        out.write(f"{SECTION_END.format(name=section['name'])}\n\n".encode("utf-8"))
+
+
+def write_text_atomic(path, content):
+    """
+    Write a text file through a temporary file and atomic replace, skipping
+    the write when the file already holds the same content.
+
+    Args:
+        path: File path
+        content: Text to write
+
+    Returns:
+        bool: True if the file was written
+    """
+    path = Path(path)
+    data = content.encode("utf-8")
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+
+    write_bytes_atomic(path, data, fsync=True)
+    return True
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Local report index for the Land Analysis Crew.
+Catalogs every generated report in an embedded SQLite database with its
+metadata (stock number, model, timestamps, scores and stage durations) and its
+full text in an FTS5 table, so the latest report for a listing or every report
+mentioning a topic can be found without listing and parsing report files.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+
+from ..utils.formatting import print_info
+from ..utils.routing import model_name_of
+from .records import load_assessment
+
+# Listing scores stored with each report
+SCORE_COLUMNS = [
+    'Composite_Score',
+    'Home_Affordability',
+    'Rent_Affordability',
+    'Convenience_Index',
+    'Population_Access',
+    'Market_Saturation',
+]
+
+# Report file names written by PropertyAnalysisCrew.save_report_to_file
+TIMESTAMPED_REPORT = re.compile(r"^(\d{8}_\d{6})_(.+)_analysis\.md$")
+ERROR_REPORT = re.compile(r"^error_report_\d{8}_\d{6}\.md$")
+PROPERTY_DIRECTORY = re.compile(r"^property_(.+)$")
+PROPERTY_REPORT = "analysis.md"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    stock_number TEXT,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    model TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    composite_score REAL,
+    scores TEXT,
+    durations TEXT,
+    total_seconds REAL,
+    opportunity_score REAL,
+    risk_level TEXT,
+    assessment TEXT
+);
+CREATE INDEX IF NOT EXISTS reports_stock ON reports (stock_number, updated_at);
+"""
+
+# Columns added after the first schema, created on older databases when opened
+ADDED_COLUMNS = {
+    "opportunity_score": "REAL",
+    "risk_level": "TEXT",
+    "assessment": "TEXT",
+}
+
+# Columns reports can be ranked by
+RANK_COLUMNS = ["opportunity_score", "composite_score", "total_seconds"]
+
+
+def _score(value):
+    """Convert a listing score to a float, or None if it is not numeric."""
+    try:
+        value = float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+
+def is_report_file(path, directory):
+    """
+    Check whether a file is a report written by save_report_to_file.
+
+    Args:
+        path: File path
+        directory: Reports directory the file was found in
+
+    Returns:
+        bool: True for property_<StockNumber>/analysis.md and for timestamped
+              and error reports directly in the directory; False for the
+              summaries, comparisons and other Markdown files beside them
+    """
+    path = Path(path)
+    if path.name == PROPERTY_REPORT:
+        return bool(PROPERTY_DIRECTORY.match(path.parent.name))
+    return path.parent == Path(directory) and bool(TIMESTAMPED_REPORT.match(path.name)
+                                                   or ERROR_REPORT.match(path.name))
+
+
+class ReportIndex:
+    """
+    SQLite catalog and full-text search store for generated reports.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the report index.
+
+        Args:
+            db_path: SQLite database file (default: outputs/reports/report_index.sqlite)
+        """
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            db_path = project_root / "outputs" / "reports" / "report_index.sqlite"
+
+        self.db_path = Path(db_path)
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        # One connection shared by the threads of a batch, serialized by a lock
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._add_missing_columns()
+        self.full_text = self._create_text_table()
+
+    def _add_missing_columns(self):
+        """Add columns introduced after a database was created."""
+        existing = {row["name"] for row in self.connection.execute("PRAGMA table_info(reports)")}
+        with self.connection:
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    self.connection.execute(f"ALTER TABLE reports ADD COLUMN {column} {column_type}")
+
+    def _create_text_table(self):
+        """Create the full-text table, falling back to a plain table without FTS5."""
+        try:
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS report_text USING fts5(address, body, tokenize='porter')")
+            return True
+        except sqlite3.OperationalError:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS report_text (rowid INTEGER PRIMARY KEY, address TEXT, body TEXT)")
+            return False
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def record(self, path, property_data=None, model=None, durations=None, assessment=None):
+        """
+        Add or update the index entry of a report file.
+
+        The full text is re-indexed only when the file content changed; metadata
+        such as the model and stage durations is updated on every call.
+
+        Args:
+            path: Report file path
+            property_data: Optional dictionary of the listing's data
+            model: Model name or LLM object that generated the report
+            durations: Optional dictionary of stage name to seconds
+            assessment: Optional PropertyAssessment extracted from the report
+
+        Returns:
+            int: Row id of the report
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        content = path.read_text(encoding="utf-8", errors="replace")
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        now = datetime.now().isoformat(timespec="seconds")
+
+        metadata = self._file_metadata(path)
+        if property_data:
+            scores = {column: _score(property_data.get(column)) for column in SCORE_COLUMNS
+                      if column in property_data}
+            metadata.update({
+                "stock_number": str(property_data.get('StockNumber', metadata["stock_number"]) or '').strip() or None,
+                "address": property_data.get('Property Address', metadata["address"]),
+                "city": property_data.get('City'),
+                "state": property_data.get('State'),
+                "composite_score": scores.get('Composite_Score'),
+                "scores": json.dumps(scores, sort_keys=True),
+            })
+        if model is not None:
+            metadata["model"] = model if isinstance(model, str) else model_name_of(model)
+        if durations is not None:
+            metadata["durations"] = json.dumps({stage: round(seconds, 3) for stage, seconds in durations.items()},
+                                               sort_keys=True)
+            metadata["total_seconds"] = round(sum(durations.values()), 3)
+        if assessment is not None:
+            metadata.update({
+                "opportunity_score": assessment.opportunity_score,
+                "risk_level": assessment.risk_level,
+                "assessment": json.dumps(assessment.to_dict(), sort_keys=True),
+            })
+
+        with self._lock, self.connection:
+            existing = self.connection.execute(
+                "SELECT id, content_hash FROM reports WHERE path = ?", (str(path),)).fetchone()
+            values = {**{k: v for k, v in metadata.items() if v is not None},
+                      "content_hash": content_hash, "size": stat.st_size,
+                      "mtime_ns": stat.st_mtime_ns, "updated_at": now}
+
+            if existing is None:
+                values.update({"path": str(path), "created_at": now})
+                columns = ", ".join(values)
+                placeholders = ", ".join("?" for _ in values)
+                report_id = self.connection.execute(
+                    f"INSERT INTO reports ({columns}) VALUES ({placeholders})", list(values.values())).lastrowid
+            else:
+                report_id = existing["id"]
+                assignments = ", ".join(f"{column} = ?" for column in values)
+                self.connection.execute(f"UPDATE reports SET {assignments} WHERE id = ?",
+                                        list(values.values()) + [report_id])
+                if existing["content_hash"] == content_hash:
+                    return report_id
+                self.connection.execute("DELETE FROM report_text WHERE rowid = ?", (report_id,))
+
+            address = values.get("address") or self.connection.execute(
+                "SELECT address FROM reports WHERE id = ?", (report_id,)).fetchone()["address"]
+            self.connection.execute("INSERT INTO report_text (rowid, address, body) VALUES (?, ?, ?)",
+                                    (report_id, address or "", content))
+
+        return report_id
+
+    def _file_metadata(self, path):
+        """Infer a stock number, address and timestamp from a report's location."""
+        metadata = {"stock_number": None, "address": None}
+        match = TIMESTAMPED_REPORT.match(path.name)
+        if match:
+            metadata["address"] = match.group(2).replace('_', ' ')
+        directory = PROPERTY_DIRECTORY.match(path.parent.name)
+        if directory:
+            metadata["stock_number"] = directory.group(1)
+        return metadata
+
+    def sync(self, directory=None):
+        """
+        Index report files on disk that are new or changed since they were indexed,
+        and drop entries whose files are gone or are not reports.
+
+        Args:
+            directory: Directory searched for reports (see is_report_file)
+                       (default: the directory of the database)
+
+        Returns:
+            dict: Counts of "indexed", "unchanged" and "removed" reports
+        """
+        directory = Path(directory or self.db_path.parent).resolve()
+        known = {row["path"]: (row["size"], row["mtime_ns"]) for row in
+                 self._query("SELECT path, size, mtime_ns FROM reports")}
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+
+        for path in sorted(directory.rglob("*.md")):
+            if not is_report_file(path, directory):
+                continue
+            stat = path.stat()
+            if known.get(str(path)) == (stat.st_size, stat.st_mtime_ns):
+                counts["unchanged"] += 1
+                continue
+            self.record(path, assessment=load_assessment(path))
+            counts["indexed"] += 1
+
+        with self._lock, self.connection:
+            for path in known:
+                if Path(path).is_relative_to(directory) and (not os.path.exists(path)
+                                                             or not is_report_file(path, directory)):
+                    self._delete(path)
+                    counts["removed"] += 1
+
+        if counts["indexed"] or counts["removed"]:
+            print_info(f"Report index: {counts['indexed']} indexed, {counts['removed']} removed")
+        return counts
+
+    def _delete(self, path):
+        """Remove one report from the index."""
+        row = self.connection.execute("SELECT id FROM reports WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            self.connection.execute("DELETE FROM report_text WHERE rowid = ?", (row["id"],))
+            self.connection.execute("DELETE FROM reports WHERE id = ?", (row["id"],))
+
+    def _query(self, sql, parameters=()):
+        """Run a query and convert its rows (see _rows)."""
+        with self._lock:
+            return self._rows(self.connection.execute(sql, parameters))
+
+    def _rows(self, rows):
+        """Convert database rows to dictionaries with decoded JSON fields."""
+        results = []
+        for row in rows:
+            entry = dict(row)
+            for field in ("scores", "durations", "assessment"):
+                if field in entry:
+                    entry[field] = json.loads(entry[field]) if entry[field] else {}
+            results.append(entry)
+        return results
+
+    def reports(self, stock_number=None, limit=50):
+        """
+        List indexed reports, most recently updated first.
+
+        Args:
+            stock_number: Only reports for this listing
+            limit: Maximum number of reports
+
+        Returns:
+            list: Report metadata dictionaries
+        """
+        query = "SELECT * FROM reports"
+        parameters = []
+        if stock_number is not None:
+            query += " WHERE stock_number = ?"
+            parameters.append(str(stock_number).strip())
+        query += " ORDER BY updated_at DESC, id DESC LIMIT ?"
+        parameters.append(limit)
+        return self._query(query, parameters)
+
+    def latest(self, stock_number):
+        """
+        Get the most recently updated report for a listing.
+
+        Args:
+            stock_number: Stock number of the listing
+
+        Returns:
+            dict: Report metadata, or None if the listing has no indexed report
+        """
+        reports = self.reports(stock_number, limit=1)
+        return reports[0] if reports else None
+
+    def rank(self, by="opportunity_score", limit=20):
+        """
+        Rank listings by a numeric column of their latest report.
+
+        Args:
+            by: Column to rank by, one of RANK_COLUMNS (highest first)
+            limit: Maximum number of listings
+
+        Returns:
+            list: Report metadata dictionaries, one per listing with a value
+        """
+        if by not in RANK_COLUMNS:
+            raise ValueError(f"Cannot rank reports by {by}; choose one of {', '.join(RANK_COLUMNS)}")
+
+        sql = (f"SELECT * FROM reports AS r WHERE {by} IS NOT NULL AND r.id = ("
+               "SELECT latest.id FROM reports AS latest WHERE latest.stock_number IS r.stock_number "
+               f"AND latest.{by} IS NOT NULL ORDER BY latest.updated_at DESC, latest.id DESC LIMIT 1) "
+               f"ORDER BY {by} DESC, updated_at DESC LIMIT ?")
+        return self._query(sql, (limit,))
+
+    def search(self, query, stock_number=None, limit=20):
+        """
+        Full-text search across indexed reports.
+
+        Args:
+            query: Search terms (FTS5 query syntax when FTS5 is available)
+            stock_number: Only reports for this listing
+            limit: Maximum number of results
+
+        Returns:
+            list: Report metadata dictionaries with a "snippet", best matches first
+        """
+        if self.full_text:
+            sql = ("SELECT reports.*, snippet(report_text, 1, '[', ']', ' ... ', 12) AS snippet "
+                   "FROM report_text JOIN reports ON reports.id = report_text.rowid "
+                   "WHERE report_text MATCH ?")
+            parameters = [query]
+        else:
+            sql = ("SELECT reports.*, substr(report_text.body, 1, 160) AS snippet "
+                   "FROM report_text JOIN reports ON reports.id = report_text.rowid "
+                   "WHERE report_text.body LIKE ?")
+            parameters = [f"%{query}%"]
+
+        if stock_number is not None:
+            sql += " AND reports.stock_number = ?"
+            parameters.append(str(stock_number).strip())
+        sql += " ORDER BY bm25(report_text) LIMIT ?" if self.full_text else " ORDER BY reports.updated_at DESC LIMIT ?"
+        parameters.append(limit)
+
+        return self._query(sql, parameters)
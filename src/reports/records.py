@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Structured assessment records for property analysis reports.
+Defines the JSON schema sent to Ollama as the `format` of a constrained
+request, validates the response against it, and stores the result as a
+compact typed record beside the report, so reports can be ranked and compared
+without re-parsing prose or re-prompting the model.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict, fields
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .assembly import write_text_atomic
+
+RISK_LEVELS = ["low", "medium", "high"]
+
+# Schema of the model's response (Ollama structured outputs)
+ASSESSMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "opportunity_score": {"type": "integer", "minimum": 1, "maximum": 10},
+        "risk_level": {"type": "string", "enum": RISK_LEVELS},
+        "recommended_use": {"type": "string", "maxLength": 120},
+        "estimated_units": {"type": ["integer", "null"], "minimum": 0},
+        "roi_low_pct": {"type": ["number", "null"]},
+        "roi_high_pct": {"type": ["number", "null"]},
+        "rezoning_required": {"type": ["boolean", "null"]},
+        "key_strengths": {"type": "array", "items": {"type": "string", "maxLength": 160}, "maxItems": 5},
+        "key_risks": {"type": "array", "items": {"type": "string", "maxLength": 160}, "maxItems": 5},
+        "summary": {"type": "string", "maxLength": 400},
+    },
+    "required": ["opportunity_score", "risk_level", "recommended_use", "key_strengths", "key_risks", "summary"],
+}
+
+ASSESSMENT_SYSTEM_PROMPT = (
+    "You extract structured facts from property development reports. "
+    "Answer only with JSON matching the requested schema. Use null for values the report does not state."
+)
+
+# Characters of report text included in the extraction prompt
+MAX_REPORT_CHARS = 12000
+
+JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+
+@dataclass
+class PropertyAssessment:
+    """Typed summary of one property analysis."""
+    opportunity_score: int
+    risk_level: str
+    recommended_use: str
+    estimated_units: Optional[int] = None
+    roi_low_pct: Optional[float] = None
+    roi_high_pct: Optional[float] = None
+    rezoning_required: Optional[bool] = None
+    key_strengths: List[str] = field(default_factory=list)
+    key_risks: List[str] = field(default_factory=list)
+    summary: str = ""
+    stock_number: Optional[str] = None
+    model: Optional[str] = None
+    extracted_at: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, data, stock_number=None, model=None):
+        """
+        Validate a structured model response into a record.
+
+        Args:
+            data: Parsed JSON response
+            stock_number: Stock number of the listing
+            model: Name of the model that produced the response
+
+        Returns:
+            PropertyAssessment: The validated record
+
+        Raises:
+            ValueError: If the response does not match ASSESSMENT_SCHEMA
+        """
+        values = validate(data, ASSESSMENT_SCHEMA)
+        return cls(**values, stock_number=stock_number, model=model,
+                   extracted_at=datetime.now().isoformat(timespec="seconds"))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record saved with to_dict."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def to_dict(self):
+        """Convert the record to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def _check(value, schema, path, errors):
+    """Validate one value against a schema fragment, collecting errors."""
+    types = schema.get("type")
+    if types is not None:
+        types = types if isinstance(types, list) else [types]
+        # JSON has one number type; accept whole floats for integers but never booleans
+        if "integer" in types and isinstance(value, float) and value.is_integer():
+            value = int(value)
+        matches = [t for t in types if isinstance(value, JSON_TYPES[t])
+                   and not (t in ("integer", "number") and isinstance(value, bool))]
+        if not matches:
+            errors.append(f"{path}: expected {' or '.join(types)}, got {type(value).__name__}")
+            return value
+
+    if value is None:
+        return value
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if "minimum" in schema and value < schema["minimum"]:
+        errors.append(f"{path}: {value} is below {schema['minimum']}")
+    if "maximum" in schema and value > schema["maximum"]:
+        errors.append(f"{path}: {value} is above {schema['maximum']}")
+    if isinstance(value, str) and "maxLength" in schema:
+        value = value[:schema["maxLength"]].strip()
+    if isinstance(value, list):
+        value = [_check(item, schema.get("items", {}), f"{path}[{i}]", errors)
+                 for i, item in enumerate(value[:schema.get("maxItems", len(value))])]
+    if isinstance(value, dict):
+        value = _check_object(value, schema, path, errors)
+    return value
+
+
+def _check_object(data, schema, path, errors):
+    """Validate an object's properties, dropping keys the schema does not define."""
+    properties = schema.get("properties", {})
+    for key in schema.get("required", []):
+        if key not in data:
+            errors.append(f"{path}.{key}: missing")
+    return {key: _check(value, properties[key], f"{path}.{key}", errors)
+            for key, value in data.items() if key in properties}
+
+
+def validate(data, schema):
+    """
+    Validate a parsed JSON value against a JSON schema subset.
+
+    Supports type (including type lists), enum, minimum, maximum, required,
+    properties, items and maxItems. Over-long strings and arrays are truncated
+    and unknown object keys are dropped, so records stay compact.
+
+    Args:
+        data: Parsed JSON value
+        schema: JSON schema
+
+    Returns:
+        The cleaned value
+
+    Raises:
+        ValueError: Listing every mismatch
+    """
+    errors = []
+    cleaned = _check(data, schema, "$", errors)
+    if errors:
+        raise ValueError("Structured response does not match schema: " + "; ".join(errors))
+    return cleaned
+
+
+def assessment_prompt(property_data, full_report, executive_summary=None):
+    """
+    Build the extraction prompt for a property's reports.
+
+    Args:
+        property_data: Dictionary of property data
+        full_report: Full analysis report text
+        executive_summary: Optional executive summary text
+
+    Returns:
+        str: Prompt asking for an ASSESSMENT_SCHEMA response
+    """
+    parts = [
+        f"Property: {property_data.get('Property Address', 'N/A')}, "
+        f"{property_data.get('City', 'N/A')}, {property_data.get('State', 'N/A')} "
+        f"(Stock# {property_data.get('StockNumber', 'N/A')})",
+    ]
+    if executive_summary:
+        parts.append(f"EXECUTIVE SUMMARY:\n{str(executive_summary)[:MAX_REPORT_CHARS // 4]}")
+    parts.append(f"FULL REPORT:\n{str(full_report)[:MAX_REPORT_CHARS]}")
+    parts.append(
+        "Extract: the 1-10 opportunity score the report gives (or the one it supports), the overall "
+        "risk level, the recommended development use, the estimated number of units, the ROI range in "
+        "percent, whether rezoning is required, up to five key strengths and risks, and a two-sentence summary."
+    )
+    return "\n\n".join(parts)
+
+
+def assessment_path(report_path):
+    """
+    Get the path of the assessment record stored beside a report.
+
+    Args:
+        report_path: Report file path
+
+    Returns:
+        Path: "<report stem>.assessment.json" in the report's directory
+    """
+    report_path = Path(report_path)
+    return report_path.with_name(f"{report_path.stem}.assessment.json")
+
+
+def save_assessment(report_path, assessment):
+    """
+    Store an assessment record beside its report.
+
+    Args:
+        report_path: Report file path
+        assessment: PropertyAssessment
+
+    Returns:
+        str: Path of the record file
+    """
+    path = assessment_path(report_path)
+    write_text_atomic(path, json.dumps(assessment.to_dict(), indent=2, sort_keys=True) + "\n")
+    return str(path)
+
+
+def load_assessment(report_path):
+    """
+    Load the assessment record stored beside a report.
+
+    Args:
+        report_path: Report file path
+
+    Returns:
+        PropertyAssessment: The record, or None if the report has none
+    """
+    path = assessment_path(report_path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return PropertyAssessment.from_dict(json.load(f))
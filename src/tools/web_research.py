@@ -12,9 +12,51 @@ import requests
 import json
 import os
 import time
+import sqlite3
 from bs4 import BeautifulSoup
+from pathlib import Path
 from urllib.parse import quote_plus
 
+from ..utils.archive import PageArchive
+from ..utils.dedup import DuplicateIndex
+from ..utils.fixtures import RECORD, REPLAY, fixture_mode_from_env, http_client_for, search_engine_for
+from ..utils.matching import TermMatcher
+from ..utils.ratelimit import RateLimitExceeded, domain_key, shared_limiter
+from ..utils.relevance import RelevanceEngine
+from ..utils.research_budget import ResearchBudget
+from ..utils.search_providers import create_search_engine, create_search_providers
+
+# Project root, which relative research paths are resolved against
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Where URL aliases and text fingerprints are kept between runs
+FINGERPRINT_FILE = PROJECT_ROOT / "outputs" / "cache" / "research_fingerprints.json"
+
+
+def create_duplicate_index():
+    """
+    Create the duplicate index named by RESEARCH_FINGERPRINTS ("none" keeps it in memory).
+    
+    Relative paths are resolved against the project root, not the working directory.
+    """
+    path = os.getenv("RESEARCH_FINGERPRINTS", str(FINGERPRINT_FILE))
+    if not path or path.lower() == "none":
+        return DuplicateIndex(None)
+    return DuplicateIndex(PROJECT_ROOT / path)
+
+
+def hedging_enabled():
+    """Whether slow searches are also sent to the next provider (SEARCH_HEDGE, default true)."""
+    return os.getenv("SEARCH_HEDGE", "true").lower() == "true"
+
+
+def create_page_archive():
+    """Create the page archive at PAGE_ARCHIVE, or None if it is set to "none"."""
+    path = os.getenv("PAGE_ARCHIVE", "")
+    if path.lower() == "none":
+        return None
+    return PageArchive(path or None)
+
 class EnhancedWebResearchTool:
     """Tool for conducting web research with enhanced search strategies."""
     
@@ -62,15 +104,63 @@ class EnhancedWebResearchTool:
         ]
     }
     
-    def __init__(self):
-        # Try to import the DuckDuckGo search library
-        try:
-            from duckduckgo_search import DDGS
-            self.search_engine = DDGS()
-            self.search_available = True
-        except ImportError:
-            print("DuckDuckGo search library not available. Web research will be limited.")
-            self.search_available = False
+    # Category keywords and recency indicators used for keyword relevance
+    RELEVANCE_TERMS = TermMatcher({
+        "economic_development": ["business", "economy", "job", "employment", "growth", "industry"],
+        "housing_market": ["housing", "home", "apartment", "rent", "mortgage", "residential"],
+        "infrastructure": ["road", "transit", "utility", "infrastructure", "transportation", "development"],
+        "government_policy": ["zoning", "regulation", "permit", "tax", "incentive", "government"],
+        "community_factors": ["school", "education", "crime", "recreation", "healthcare", "park"],
+        "recency": ["2024", "2023", "recent", "new", "latest", "update", "month", "week"]
+    })
+    
+    # Signals looked for in result summaries by the insights and meta-analysis
+    SIGNAL_TERMS = TermMatcher({
+        "growth": ["expansion", "growth", "new jobs", "hiring", "investment"],
+        "decline": ["layoff", "closing", "downturn", "recession", "struggling"],
+        "shortage": ["shortage", "crisis", "lack of housing", "insufficient", "limited supply"],
+        "housing_development": ["development", "construction", "new homes", "building", "project"],
+        "projects": ["project", "development", "investment"],
+        "affordable_trend": ["affordable"],
+        "shortage_trend": ["shortage"],
+        "growth_trend": ["growth"]
+    })
+    
+    def __init__(self, relevance=None, duplicates=None, search_engine=None, limiter=None):
+        """
+        Initialize the research tool.
+        
+        Args:
+            relevance: Optional RelevanceEngine that filters results by embedding
+                       similarity (default: built from the environment)
+            duplicates: Optional DuplicateIndex recognizing articles seen under
+                        other URLs (default: persisted to RESEARCH_FINGERPRINTS)
+            search_engine: Optional engine with a text(query, max_results) method
+                           (default: DuckDuckGo, or fixtures per RESEARCH_FIXTURES)
+            limiter: Optional RateLimiter pacing searches (default: the shared
+                     limiter; none when replaying fixtures)
+        """
+        self.fixture_mode, fixture_store, fixture_latency = fixture_mode_from_env()
+        
+        # Search providers per SEARCH_PROVIDERS, replaced by fixtures when replaying
+        if search_engine is not None:
+            providers = [search_engine_for(self.fixture_mode, fixture_store, fixture_latency)
+                         if self.fixture_mode == REPLAY else search_engine]
+        else:
+            providers = create_search_providers(fixture_mode=self.fixture_mode, fixture_store=fixture_store,
+                                                fixture_latency=fixture_latency)
+        
+        # Pace live searches; throttled queries wait in the retry queue
+        if limiter is None and self.fixture_mode != REPLAY:
+            limiter = shared_limiter()
+        self.limiter = limiter
+        
+        # Providers are tried in order, hedging calls slower than their p90 latency;
+        # recordings store what the hedged search returned
+        self.search_engine = create_search_engine(providers, limiter, hedge=hedging_enabled(),
+                                                  fixture_mode=self.fixture_mode, fixture_store=fixture_store)
+        self.search_available = self.search_engine is not None
+        self.retry_queue = []
         
         # Initialize storage for search results
         self.search_results = {
@@ -87,6 +177,16 @@ class EnhancedWebResearchTool:
         
         # Track searches to avoid duplicates
         self.executed_searches = set()
+        
+        # Embedding relevance filter; None falls back to keyword scoring
+        self.relevance = relevance if relevance is not None else RelevanceEngine.from_env()
+        
+        # Duplicate detection, and the documents already returned by this tool;
+        # recordings and replays start from an empty index so every run sees the same results
+        if duplicates is None:
+            duplicates = DuplicateIndex() if self.fixture_mode in (RECORD, REPLAY) else create_duplicate_index()
+        self.duplicates = duplicates
+        self.seen_documents = set()
     
     def create_location_context(self, property_data):
         """Create a hierarchical location context from property data."""
@@ -130,6 +230,13 @@ class EnhancedWebResearchTool:
         """
         Execute a comprehensive search strategy using templated queries.
         
+        Queries are budgeted adaptively: every category gets one query, a
+        category with results closes as soon as a query brings no new facts,
+        and each first query that finds nothing frees a follow-up for the
+        categories with the thinnest coverage (those still without results
+        first), so no more queries run than stopping each category at its
+        first results would take.
+        
         Args:
             property_data: Dictionary containing property information
             category: Optional category to focus search on (or None for all categories)
@@ -142,7 +249,7 @@ class EnhancedWebResearchTool:
         if not self.search_available:
             return {
                 "error": "Search unavailable",
-                "message": "DuckDuckGo search library not installed."
+                "message": "No search provider is available."
             }
         
         # Create location context if not already done
@@ -152,88 +259,190 @@ class EnhancedWebResearchTool:
         location_context = self.search_results["location_context"]
         
         # Determine which categories to search
-        categories = [category] if category else self.SEARCH_TEMPLATES.keys()
+        categories = [category] if category else list(self.SEARCH_TEMPLATES.keys())
         
-        for search_category in categories:
-            # Get templates for this category
-            templates = self.SEARCH_TEMPLATES.get(search_category, [])
+        # Candidate queries per category: every template at each specificity level
+        queues = {
+            search_category: self._candidate_queries(search_category, location_context)[:max_queries]
+            for search_category in categories
+        }
+        budget = ResearchBudget(categories)
+        
+        while True:
+            search_category = budget.next_category([c for c in categories if queues[c]])
+            if search_category is None:
+                break
+            query = queues[search_category].pop(0)
             
-            # Limit the number of templates we'll use
-            templates = templates[:max_queries]
+            # Execute the search
+            try:
+                structured_results = self._run_query(search_category, query, max_results_per_query)
+            except RateLimitExceeded as e:
+                # Keep the query for another attempt once the limiter has slowed down
+                print(f"Deferring {search_category} search: {e}")
+                self.retry_queue.append((search_category, query, max_results_per_query))
+                continue
+            except Exception as e:
+                print(f"Error during {search_category} search: {e}")
+                structured_results = None
             
-            # Try different specificity levels if needed
-            for specificity_level in ['medium', 'high', 'low']:
-                location_query = self.build_location_query(location_context, specificity_level)
-                
-                # Skip empty location queries
-                if not location_query:
-                    continue
-                
-                for template in templates:
-                    # Format the template with the location
-                    query = template.format(location=location_query)
-                    
-                    # Skip if we've already run this query
-                    if query in self.executed_searches:
-                        continue
-                    
-                    # Execute the search
-                    try:
-                        results = self.search_engine.text(query, max_results=max_results_per_query)
-                        self.executed_searches.add(query)
-                        
-                        # If we got results, store them and go to next template
-                        if results and len(results) > 0:
-                            timestamp = datetime.now().isoformat()
-                            
-                            # Process and store the results
-                            structured_results = {
-                                "category": search_category,
-                                "query": query,
-                                "timestamp": timestamp,
-                                "results": []
-                            }
-                            
-                            # Add each result with metadata
-                            for result in results:
-                                structured_result = {
-                                    "title": result.get("title", ""),
-                                    "url": result.get("href", ""),
-                                    "source": self._extract_source_from_url(result.get("href", "")),
-                                    "summary": result.get("body", "")[:500],  # First 500 chars
-                                    "key_points": self._extract_key_points(result.get("body", "")),
-                                    "entities": self._extract_entities(result.get("body", "")),
-                                    "relevance_score": self._calculate_relevance(result, search_category),
-                                    "confidence_rating": "medium"  # Default
-                                }
-                                
-                                structured_results["results"].append(structured_result)
-                            
-                            # Add aggregate insights
-                            structured_results["aggregate_insights"] = self._generate_insights(
-                                structured_results["results"], 
-                                search_category
-                            )
-                            
-                            # Add to overall results
-                            self.search_results["search_results"].append(structured_results)
-                            
-                            # Add to meta-analysis
-                            self._update_meta_analysis(structured_results)
-                            
-                            # If we got reasonable results, no need to try other specificity levels
-                            break
-                            
-                    except Exception as e:
-                        print(f"Error during {search_category} search: {e}")
-                        continue
-                
-                # If we got results for this category, don't try other specificity levels
-                if any(r["category"] == search_category for r in self.search_results["search_results"]):
-                    break
+            budget.observe(search_category, self._novelty_items(structured_results))
         
+        self.search_results["research_budget"] = budget.summary()
+        self._drain_retry_queue()
+        self.duplicates.save()
         return self.search_results
     
+    def _candidate_queries(self, search_category, location_context):
+        """
+        List the queries of a category, least specific location last.
+        
+        Args:
+            search_category: Search category
+            location_context: Location context from create_location_context
+            
+        Returns:
+            List of queries not yet executed, in order of preference
+        """
+        queries = []
+        
+        # Try different specificity levels if needed
+        for specificity_level in ['medium', 'high', 'low']:
+            location_query = self.build_location_query(location_context, specificity_level)
+            
+            # Skip empty location queries
+            if not location_query:
+                continue
+            
+            for template in self.SEARCH_TEMPLATES.get(search_category, []):
+                query = template.format(location=location_query)
+                
+                # Skip if we've already run this query
+                if query not in self.executed_searches and query not in queries:
+                    queries.append(query)
+        
+        return queries
+    
+    def _novelty_items(self, structured_results):
+        """
+        Get the facts a search contributed, for measuring its novelty.
+        
+        Facts are the sources, dollar amounts and market signals of the
+        stored results; a search that stored nothing contributes none.
+        
+        Args:
+            structured_results: Stored results of one query, or None
+            
+        Returns:
+            Set of (kind, value) tuples
+        """
+        items = set()
+        for result in (structured_results or {}).get("results", []):
+            items.add(("source", self._extract_source_from_url(result.get("canonical_url") or result.get("url"))))
+            items.update(("amount", amount.replace(" ", "").lower())
+                         for amount in result.get("entities", {}).get("amounts", []))
+            items.update(("signal", label) for label in self.SIGNAL_TERMS.labels(result.get("summary", "")))
+        return items
+    
+    def _run_query(self, search_category, query, max_results):
+        """
+        Run one search and store its useful results.
+        
+        Args:
+            search_category: Category the query belongs to
+            query: The search query
+            max_results: Maximum results to request
+            
+        Returns:
+            The stored results dictionary, or None if nothing was stored
+            
+        Raises:
+            RateLimitExceeded: If the search provider kept throttling the query
+        """
+        results = self._search(query, max_results)
+        self.executed_searches.add(query)
+        
+        if not results:
+            return None
+        
+        timestamp = datetime.now().isoformat()
+        
+        # Process and store the results
+        structured_results = {
+            "category": search_category,
+            "query": query,
+            "timestamp": timestamp,
+            "results": []
+        }
+        
+        # Drop copies of articles already found under another URL
+        unique = self._drop_duplicates(results)
+        structured_results["duplicate_results"] = len(results) - len(unique)
+        results = unique
+        
+        # Drop off-topic results before they are processed or prompted
+        relevant, scores = self._filter_relevant(query, results, search_category)
+        structured_results["dropped_results"] = len(results) - len(relevant)
+        if not relevant:
+            return None
+        
+        # Add each result with metadata
+        for result, score in zip(relevant, scores):
+            structured_result = {
+                "title": result.get("title", ""),
+                "url": result.get("href", ""),
+                "canonical_url": result.get("canonical_url", ""),
+                "source": self._extract_source_from_url(result.get("href", "")),
+                "summary": result.get("body", "")[:500],  # First 500 chars
+                "key_points": self._extract_key_points(result.get("body", "")),
+                "entities": self._extract_entities(result.get("body", "")),
+                "relevance_score": score,
+                "confidence_rating": "medium"  # Default
+            }
+        
+            structured_results["results"].append(structured_result)
+        
+        # Add aggregate insights
+        structured_results["aggregate_insights"] = self._generate_insights(
+            structured_results["results"], 
+            search_category
+        )
+        
+        # Add to overall results
+        self.search_results["search_results"].append(structured_results)
+        
+        # Add to meta-analysis
+        self._update_meta_analysis(structured_results)
+        
+        return structured_results
+    
+    def _drain_retry_queue(self):
+        """Retry deferred searches of categories that are still without results."""
+        pending, self.retry_queue = self.retry_queue, []
+        for search_category, query, max_results in pending:
+            if self.get_results_by_category(search_category) or query in self.executed_searches:
+                continue
+            try:
+                self._run_query(search_category, query, max_results)
+            except RateLimitExceeded as e:
+                print(f"Giving up on {search_category} search for now: {e}")
+                self.retry_queue.append((search_category, query, max_results))
+            except Exception as e:
+                print(f"Error during {search_category} search: {e}")
+    
+    def _search(self, query, max_results):
+        """
+        Send a query to the search providers, paced by the rate limiter.
+        
+        Args:
+            query: The search query
+            max_results: Maximum results to request
+            
+        Returns:
+            List of raw results
+        """
+        return self.search_engine.text(query, max_results=max_results)
+    
     def search(self, query, max_results=5, category=None):
         """
         Legacy search method for compatibility.
@@ -259,7 +468,9 @@ class EnhancedWebResearchTool:
                             for r in cat.get("results", [])]
             
             # Default behavior: direct search
-            results = self.search_engine.text(query, max_results=max_results)
+            results = self._search(query, max_results)
+            if results:
+                results, _ = self._filter_relevant(query, results, category)
             return results
         except Exception as e:
             print(f"Error during web search: {e}")
@@ -317,6 +528,55 @@ class EnhancedWebResearchTool:
             
         return entities
     
+    def _drop_duplicates(self, results):
+        """
+        Remove results that repeat a document this tool already returned.
+        
+        A result is a repeat when its canonical URL or snippet matches an
+        earlier result, including mobile, AMP and syndicated copies.
+        
+        Args:
+            results: List of raw results with "title", "body" and "href"
+            
+        Returns:
+            List of the new results, each with a "canonical_url" added
+        """
+        unique = []
+        for result in results:
+            text = f"{result.get('title', '')} {result.get('body', '')}"
+            representative = self.duplicates.representative(result.get("href", ""), text)
+            if representative in self.seen_documents:
+                continue
+            self.seen_documents.add(representative)
+            unique.append(dict(result, canonical_url=representative))
+        return unique
+    
+    def _filter_relevant(self, query, results, category=None):
+        """
+        Score raw search results and drop those unrelated to the query.
+        
+        All snippets of a query are embedded and scored in one batch. Without
+        embeddings every result is kept and scored by keywords instead.
+        
+        Args:
+            query: The search query
+            results: List of raw results with "title" and "body"
+            category: Optional search category, used for keyword scoring
+            
+        Returns:
+            Tuple of the kept results and their relevance scores
+        """
+        scores = None
+        if self.relevance is not None:
+            texts = [f"{r.get('title', '')}. {r.get('body', '')}" for r in results]
+            scores = self.relevance.score(query, texts)
+        
+        if scores is None:
+            return list(results), [self._calculate_relevance(r, category) for r in results]
+        
+        kept = self.relevance.keep(scores)
+        return [results[i] for i in kept], [round(float(scores[i]), 3) for i in kept]
+    
     def _calculate_relevance(self, result, category):
         """Calculate relevance score based on category and content."""
         # Simple implementation - a more robust system would use NLP
@@ -325,28 +585,17 @@ class EnhancedWebResearchTool:
             
         score = 0.5  # Start with neutral score
         
-        # Check if category keywords appear in the content
-        category_keywords = {
-            "economic_development": ["business", "economy", "job", "employment", "growth", "industry"],
-            "housing_market": ["housing", "home", "apartment", "rent", "mortgage", "residential"],
-            "infrastructure": ["road", "transit", "utility", "infrastructure", "transportation", "development"],
-            "government_policy": ["zoning", "regulation", "permit", "tax", "incentive", "government"],
-            "community_factors": ["school", "education", "crime", "recreation", "healthcare", "park"]
-        }
-        
-        # Check title and content for keywords
-        keywords = category_keywords.get(category, [])
-        content = (result.get("title", "") + " " + result.get("body", "")).lower()
+        # Find category keywords and recency indicators in the title and content
+        hits = self.RELEVANCE_TERMS.hits(result.get("title", "") + " " + result.get("body", ""))
         
         # Count matching keywords
-        matches = sum(1 for keyword in keywords if keyword in content)
+        matches = len(hits.get(category, ()))
         
         # Adjust score based on matches (0.1 per match, max +0.4)
         score += min(0.4, matches * 0.1)
         
         # Check recency indicators
-        recency_indicators = ["2024", "2023", "recent", "new", "latest", "update", "month", "week"]
-        recency_matches = sum(1 for indicator in recency_indicators if indicator in content)
+        recency_matches = len(hits.get("recency", ()))
         
         # Adjust score for recency (0.05 per match, max +0.2)
         score += min(0.2, recency_matches * 0.05)
@@ -362,27 +611,26 @@ class EnhancedWebResearchTool:
         # Count common themes and keywords
         insights = []
         
+        # Scan each summary once for every signal
+        signals = set().union(*(self.SIGNAL_TERMS.labels(r.get("summary", "")) for r in results))
+        
         # Simple insight generation - in production, this would use more advanced NLP
         if category == "economic_development":
             # Check for growth indicators
-            growth_terms = ["expansion", "growth", "new jobs", "hiring", "investment"]
-            if any(any(term in r.get("summary", "").lower() for term in growth_terms) for r in results):
+            if "growth" in signals:
                 insights.append("Evidence of economic growth in the area")
                 
             # Check for decline indicators
-            decline_terms = ["layoff", "closing", "downturn", "recession", "struggling"]
-            if any(any(term in r.get("summary", "").lower() for term in decline_terms) for r in results):
+            if "decline" in signals:
                 insights.append("Potential economic challenges in the area")
                 
         elif category == "housing_market":
             # Check for housing shortage
-            shortage_terms = ["shortage", "crisis", "lack of housing", "insufficient", "limited supply"]
-            if any(any(term in r.get("summary", "").lower() for term in shortage_terms) for r in results):
+            if "shortage" in signals:
                 insights.append("Indicators of housing shortage in the market")
                 
             # Check for development activity
-            development_terms = ["development", "construction", "new homes", "building", "project"]
-            if any(any(term in r.get("summary", "").lower() for term in development_terms) for r in results):
+            if "housing_development" in signals:
                 insights.append("Active housing development in the area")
                 
         # Add at least one generic insight if none found
@@ -402,8 +650,7 @@ class EnhancedWebResearchTool:
         # Update the meta-analysis based on category
         if category == "economic_development":
             # Count potential projects mentioned
-            project_count = sum(1 for r in results if any(term in r.get("summary", "").lower() 
-                                                       for term in ["project", "development", "investment"]))
+            project_count = sum(1 for r in results if "projects" in self.SIGNAL_TERMS.labels(r.get("summary", "")))
             
             # Extract any dollar amounts
             all_amounts = []
@@ -420,11 +667,12 @@ class EnhancedWebResearchTool:
             # Extract housing market trends
             trends = []
             for r in results:
-                if "affordable" in r.get("summary", "").lower():
+                signals = self.SIGNAL_TERMS.labels(r.get("summary", ""))
+                if "affordable_trend" in signals:
                     trends.append("Focus on affordable housing solutions")
-                if "shortage" in r.get("summary", "").lower():
+                if "shortage_trend" in signals:
                     trends.append("Housing shortage indicated")
-                if "growth" in r.get("summary", "").lower():
+                if "growth_trend" in signals:
                     trends.append("Housing market growth mentioned")
                     
             # Add unique trends to the meta analysis
@@ -500,12 +748,30 @@ class WebResearchTool:
     Tool for gathering property information from web sources.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Terms looked for in page text by extract_key_information
+    PAGE_TERMS = TermMatcher({
+        "residential": ["residential"],
+        "commercial": ["commercial"],
+        "population": ["population"],
+        "median_income": ["median income"]
+    })
+    
+    # Zoning codes are matched case-sensitively
+    ZONING_CODES = TermMatcher({"residential": ["R-1"], "commercial": ["C-"]}, ignore_case=False)
+    
+    def __init__(self, api_key: Optional[str] = None, archive: Optional[PageArchive] = None,
+                 max_page_age: Optional[float] = None, offline: Optional[bool] = None):
         """
         Initialize the web research tool.
         
         Args:
             api_key: Optional API key for premium search services
+            archive: Optional PageArchive for fetched pages (default: PAGE_ARCHIVE;
+                     none when replaying fixtures)
+            max_page_age: Seconds an archived page is reused before it is fetched
+                          again (default: PAGE_MAX_AGE_HOURS, one week)
+            offline: Serve pages from the archive only, whatever their age
+                     (default: RESEARCH_OFFLINE)
         """
         self.api_key = api_key or os.getenv("SEARCH_API_KEY")
         
@@ -518,6 +784,38 @@ class WebResearchTool:
             "Upgrade-Insecure-Requests": "1",
             "Cache-Control": "max-age=0"
         }
+        
+        # HTTP client: live, or recording and replaying fixtures per RESEARCH_FIXTURES
+        self.fixture_mode, fixture_store, fixture_latency = fixture_mode_from_env()
+        self.http = http_client_for(self.fixture_mode, fixture_store, fixture_latency)
+        replaying = self.fixture_mode == REPLAY
+        # Recordings fetch every page, so that replays find each one among the fixtures
+        self.recording = self.fixture_mode == RECORD
+        
+        # Requests to each domain are paced, except when replaying fixtures
+        self.limiter = None if replaying else shared_limiter()
+        
+        # Search providers, used before falling back to scraping search result pages
+        providers = create_search_providers(fixture_mode=self.fixture_mode, fixture_store=fixture_store,
+                                            fixture_latency=fixture_latency)
+        self.search_engine = create_search_engine(providers, self.limiter, hedge=hedging_enabled(),
+                                                  fixture_mode=self.fixture_mode, fixture_store=fixture_store)
+        
+        # Duplicate detection, and the text of pages fetched by this tool
+        self.duplicates = DuplicateIndex() if replaying or self.recording else create_duplicate_index()
+        self.pages = {}
+        
+        # Archive of fetched pages, reused while fresh; pages are archived in every mode
+        # except replay, but recordings fetch live rather than read from the archive
+        if archive is None and not replaying:
+            archive = create_page_archive()
+        self.archive = archive
+        if max_page_age is None:
+            max_page_age = float(os.getenv("PAGE_MAX_AGE_HOURS", "168")) * 3600
+        self.max_page_age = max_page_age
+        if offline is None:
+            offline = os.getenv("RESEARCH_OFFLINE", "false").lower() == "true"
+        self.offline = offline
     
     def search_property_info(self, 
                             address: str, 
@@ -551,15 +849,30 @@ class WebResearchTool:
         else:
             query = f"{address} {city} {state} {search_type}"
             
-        # Use free search API or fallback to scraping
-        if self.api_key:
+        # Use the search providers or fallback to scraping
+        if self.search_engine is not None:
             return self._search_with_api(query)
         else:
             return self._search_with_scraping(query)
     
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request, paced per domain and retried while throttled.
+        
+        Args:
+            url: URL to request
+            **kwargs: Arguments for the HTTP client's get method
+            
+        Returns:
+            The HTTP response
+        """
+        if self.limiter is None:
+            return self.http.get(url, **kwargs)
+        return self.limiter.call(domain_key(url), self.http.get, url, **kwargs)
+    
     def _search_with_api(self, query: str) -> List[Dict[str, Any]]:
         """
-        Search using a search API service.
+        Search using the configured search providers.
         
         Args:
             query: Search query
@@ -568,27 +881,17 @@ class WebResearchTool:
             List of search results
         """
         try:
-            # This is a placeholder for a real search API service
-            # Replace with your preferred search API (Google SerpAPI, Bing API, etc.)
-            url = f"https://api.searchservice.com/search?q={quote_plus(query)}&api_key={self.api_key}"
-            response = requests.get(url)
+            results = []
             
-            if response.status_code == 200:
-                data = response.json()
-                results = []
+            for item in self.search_engine.text(query, max_results=10):  # Limit to top 10 results
+                results.append({
+                    'title': item.get('title', ''),
+                    'url': item.get('href', ''),
+                    'snippet': item.get('body', ''),
+                    'source': 'API'
+                })
                 
-                for item in data.get('results', [])[:10]:  # Limit to top 10 results
-                    results.append({
-                        'title': item.get('title', ''),
-                        'url': item.get('link', ''),
-                        'snippet': item.get('snippet', ''),
-                        'source': 'API'
-                    })
-                    
-                return results
-            else:
-                print(f"API search failed with status code: {response.status_code}")
-                return []
+            return results
                 
         except Exception as e:
             print(f"Error using search API: {e}")
@@ -610,7 +913,7 @@ class WebResearchTool:
             # Using DuckDuckGo HTML for demonstration
             # Replace with preferred search engine (with appropriate handling)
             search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
-            response = requests.get(search_url, headers=self.headers)
+            response = self._get(search_url, headers=self.headers)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -649,8 +952,23 @@ class WebResearchTool:
         Returns:
             String containing the page text content
         """
+        # A page already fetched under this or an equivalent URL is not downloaded again
+        known = self.duplicates.lookup(url)
+        if known in self.pages:
+            return self.pages[known]
+        
+        # Reuse an archived copy while it is fresh; offline runs accept any age
+        if self.archive is not None and not self.recording:
+            text = self.archive.get_text(url, max_age=None if self.offline else self.max_page_age)
+            if text is not None:
+                self.pages.setdefault(self.duplicates.representative(url, text, by_text=True), text)
+                return text
+        if self.offline:
+            print(f"Page not archived, skipped in offline mode: {url}")
+            return ""
+        
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get(url, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -666,6 +984,10 @@ class WebResearchTool:
                 chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
                 text = '\n'.join(chunk for chunk in chunks if chunk)
                 
+                representative = self.duplicates.representative(url, text, by_text=True)
+                self.pages.setdefault(representative, text)
+                self.duplicates.save()
+                self._archive_page(url, response, text)
                 return text
             else:
                 print(f"Failed to fetch page, status code: {response.status_code}")
@@ -675,6 +997,23 @@ class WebResearchTool:
             print(f"Error fetching page content: {e}")
             return ""
     
+    def _archive_page(self, url: str, response: requests.Response, text: str) -> None:
+        """
+        Store a fetched page in the archive, if there is one.
+        
+        Args:
+            url: URL of the page
+            response: HTTP response the page was read from
+            text: Text extracted from the page
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.store(url, response.content, text, status=response.status_code,
+                               content_type=response.headers.get("Content-Type"))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not archive page {url}: {e}")
+    
     def extract_key_information(self, content: str, info_type: str) -> Dict[str, Any]:
         """
         Extract structured information from text based on the type of information needed.
@@ -700,19 +1039,21 @@ class WebResearchTool:
         # Add some basic extracted fields based on info_type
         if info_type == "zoning":
             # Look for zoning codes, density info, etc.
-            if "R-1" in content or "residential" in content.lower():
+            found = self.ZONING_CODES.labels(content) | self.PAGE_TERMS.labels(content)
+            if "residential" in found:
                 result["extracted_data"]["zoning_type"] = "Residential"
-            elif "C-" in content or "commercial" in content.lower():
+            elif "commercial" in found:
                 result["extracted_data"]["zoning_type"] = "Commercial"
             # More sophisticated extraction would go here
             
         elif info_type == "demographics":
             # Extract population, income, etc.
             # This is simplified - real implementation would use regex or NLP
-            if "population" in content.lower():
+            found = self.PAGE_TERMS.labels(content)
+            if "population" in found:
                 # Find population figures
                 result["extracted_data"]["population_mentioned"] = True
-            if "median income" in content.lower():
+            if "median_income" in found:
                 # Extract income data
                 result["extracted_data"]["income_mentioned"] = True
             
@@ -745,12 +1086,21 @@ class WebResearchTool:
             "categories": {}
         }
         
+        # Documents already reported under an earlier category
+        seen = set()
+        
         # Research each category
         for category in categories:
             print(f"Researching {category} information...")
             
-            # Search for information in this category
-            search_results = self.search_property_info(address, city, state, category)
+            # Search for information in this category, skipping repeated articles
+            search_results = []
+            for result in self.search_property_info(address, city, state, category):
+                representative = self.duplicates.representative(result.get('url', ''),
+                                                                f"{result.get('title', '')} {result.get('snippet', '')}")
+                if representative not in seen:
+                    seen.add(representative)
+                    search_results.append(result)
             
             # If we have search results, get the content from the top result
             if search_results:
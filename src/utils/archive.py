@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Local archive of fetched web pages.
+Stores the raw HTML and extracted text of each page by content hash,
+compressed with zstd when the zstandard package is installed and zlib
+otherwise, and keeps a SQLite index from URL to content hashes with the fetch
+time, so pages can be reused while fresh and research runs replayed offline.
+"""
+
+import os
+import zlib
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+
+from .dedup import canonicalize_url
+from .files import write_bytes_atomic
+from .formatting import print_warning
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    raw_hash TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    status INTEGER,
+    content_type TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_canonical ON pages (canonical_url, fetched_at);
+"""
+
+# File suffix of each compression format
+ZSTD_SUFFIX = ".zst"
+ZLIB_SUFFIX = ".zz"
+
+
+def content_hash(data):
+    """Get the SHA-256 hex digest of bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class PageArchive:
+    """
+    Content-addressed store of fetched pages with a URL index.
+    """
+
+    def __init__(self, root=None, compression_level=10):
+        """
+        Initialize the page archive.
+
+        Args:
+            root: Archive directory (default: outputs/cache/pages)
+            compression_level: zstd level, or zlib level capped at 9
+        """
+        if root is None:
+            project_root = Path(__file__).parent.parent.parent
+            root = project_root / "outputs" / "cache" / "pages"
+
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        os.makedirs(self.objects, exist_ok=True)
+
+        if zstandard is not None:
+            self.suffix = ZSTD_SUFFIX
+            self._compress = zstandard.ZstdCompressor(level=compression_level).compress
+        else:
+            self.suffix = ZLIB_SUFFIX
+            self._compress = lambda data: zlib.compress(data, min(compression_level, 9))
+
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def _object_path(self, digest, suffix):
+        """Get the file of a stored object."""
+        return self.objects / digest[:2] / f"{digest}{suffix}"
+
+    def put_blob(self, data):
+        """
+        Store bytes under their content hash; identical content is stored once.
+
+        Args:
+            data: Bytes to store
+
+        Returns:
+            str: Content hash
+        """
+        digest = content_hash(data)
+        if any(self._object_path(digest, suffix).exists() for suffix in (ZSTD_SUFFIX, ZLIB_SUFFIX)):
+            return digest
+
+        path = self._object_path(digest, self.suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written atomically so a crash never leaves a truncated object
+        write_bytes_atomic(path, self._compress(data))
+        return digest
+
+    def get_blob(self, digest):
+        """
+        Read stored bytes.
+
+        Args:
+            digest: Content hash
+
+        Returns:
+            bytes: The content, or None if it is missing or cannot be decompressed
+        """
+        path = self._object_path(digest, ZSTD_SUFFIX)
+        if path.exists():
+            if zstandard is None:
+                print_warning(f"Archived page {digest[:12]} is zstd-compressed; install zstandard to read it")
+                return None
+            with open(path, "rb") as f:
+                return zstandard.ZstdDecompressor().decompress(f.read())
+
+        path = self._object_path(digest, ZLIB_SUFFIX)
+        if path.exists():
+            with open(path, "rb") as f:
+                return zlib.decompress(f.read())
+        return None
+
+    def store(self, url, raw, text, status=200, content_type=None, fetched_at=None):
+        """
+        Archive a fetched page.
+
+        Args:
+            url: Page URL
+            raw: Raw response body (str or bytes)
+            text: Extracted text
+            status: HTTP status code
+            content_type: Optional Content-Type header
+            fetched_at: Fetch time (default: now)
+
+        Returns:
+            dict: The index record of the page
+        """
+        raw = raw.encode("utf-8") if isinstance(raw, str) else raw
+        record = {
+            "url": url,
+            "canonical_url": canonicalize_url(url),
+            "raw_hash": self.put_blob(raw),
+            "text_hash": self.put_blob(text.encode("utf-8")),
+            "status": status,
+            "content_type": content_type,
+            "fetched_at": (fetched_at or datetime.now()).isoformat(timespec="seconds"),
+        }
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages (url, canonical_url, raw_hash, text_hash, status, content_type, "
+                "fetched_at) VALUES (:url, :canonical_url, :raw_hash, :text_hash, :status, :content_type, "
+                ":fetched_at)",
+                record
+            )
+        return record
+
+    def lookup(self, url):
+        """
+        Find the latest archived fetch of a URL or one of its variants.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            dict: Index record with an added "age_seconds", or None if never fetched
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT * FROM pages WHERE url = ? OR canonical_url = ? "
+                "ORDER BY url = ? DESC, fetched_at DESC LIMIT 1",
+                (url, canonicalize_url(url), url)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["age_seconds"] = (datetime.now() - datetime.fromisoformat(record["fetched_at"])).total_seconds()
+        return record
+
+    def get_text(self, url, max_age=None):
+        """
+        Get the archived text of a page.
+
+        Args:
+            url: Page URL
+            max_age: Maximum age in seconds (None accepts any age)
+
+        Returns:
+            str: Extracted text, or None if the page is missing or stale
+        """
+        record = self.lookup(url)
+        if record is None or (max_age is not None and record["age_seconds"] > max_age):
+            return None
+        data = self.get_blob(record["text_hash"])
+        return data.decode("utf-8") if data is not None else None
+
+    def get_raw(self, url):
+        """
+        Get the archived raw body of a page, regardless of age.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            str: Raw body, or None if the page was never archived
+        """
+        record = self.lookup(url)
+        data = self.get_blob(record["raw_hash"]) if record else None
+        return data.decode("utf-8", errors="replace") if data is not None else None
+
+    def count(self):
+        """Get the number of archived URLs."""
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Backend selection for LLM requests.
+Tracks the health of each way of reaching the model (direct Ollama API,
+LangChain, LiteLLM) with a circuit breaker, so a failing backend is skipped
+without waiting on it again until its backoff expires, and the first healthy
+backend answers every request instead of each request walking the whole
+fallback chain. Only signs that a backend itself is down (it cannot be reached,
+fails its health check or keeps answering with server errors) count against
+its breaker; a request the backend rejects or that times out does not.
+"""
+
+import time
+import random
+import threading
+
+from .formatting import print_info, print_warning
+
+# Seconds a health check result is trusted
+HEALTH_TTL = 30.0
+
+# Consecutive unavailable replies that open a breaker
+DEFAULT_FAILURE_THRESHOLD = 3
+
+
+class BackendUnavailable(Exception):
+    """Raised by a backend call when the backend cannot be reached or keeps failing on its side."""
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=60.0, jitter=0.5, rng=random.random):
+    """
+    Exponential backoff with jitter.
+
+    Args:
+        attempt: Number of consecutive failures so far (0 for the first retry)
+        base_delay: Delay after the first failure, in seconds
+        max_delay: Upper bound of the delay before jitter
+        jitter: Fraction of the delay that is randomized (0 to 1)
+        rng: Random number source returning floats in [0, 1)
+
+    Returns:
+        float: Seconds to wait
+    """
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    return delay * (1 - jitter * rng())
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one backend.
+
+    Closed: requests pass. After failure_threshold consecutive failures (or
+    one failure recorded as a trip) the breaker opens and rejects requests for a backoff delay that doubles each
+    time it re-opens. Once the delay has passed it lets a single trial request
+    through (half-open); success closes it, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, base_delay=1.0, max_delay=60.0, jitter=0.5,
+                 clock=time.monotonic, rng=random.random):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            base_delay: Open time after the first opening, in seconds
+            max_delay: Maximum open time before jitter, in seconds
+            jitter: Fraction of the open time that is randomized
+            clock: Monotonic time source
+            rng: Random number source for jitter
+        """
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng
+
+        self.state = "closed"
+        self.failures = 0
+        self.openings = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            bool: True if the breaker is closed, or if it is open, its delay has
+                  passed and this is the single half-open trial request
+        """
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self.clock() >= self.open_until:
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self):
+        """Close the breaker after a successful request."""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.openings = 0
+
+    def record_failure(self, trip=False):
+        """
+        Count a failure, opening the breaker at the threshold.
+
+        Args:
+            trip: Open the breaker whatever the count, e.g. after a failed health check
+        """
+        with self._lock:
+            self.failures += 1
+            if trip or self.state == "half_open" or self.failures >= self.failure_threshold:
+                delay = backoff_delay(self.openings, self.base_delay, self.max_delay, self.jitter, self.rng)
+                self.state = "open"
+                self.open_until = self.clock() + delay
+                self.openings += 1
+
+    def retry_in(self):
+        """Seconds until an open breaker allows a trial request (0 if not open)."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.open_until - self.clock())
+
+
+class Backend:
+    """
+    One way of sending a request to the model.
+    """
+
+    def __init__(self, name, call, check=None, breaker=None):
+        """
+        Initialize a backend.
+
+        Args:
+            name: Backend name
+            call: Callable sending a request; returns the response text, returns
+                  None (or raises) if the request failed, and raises
+                  BackendUnavailable if the backend could not serve it
+            check: Optional callable returning True if the backend is usable
+            breaker: CircuitBreaker (default: a new breaker)
+        """
+        self.name = name
+        self.call = call
+        self.check = check
+        self.breaker = breaker or CircuitBreaker()
+        self.checked_at = None
+        self.healthy = None
+
+
+class BackendManager:
+    """
+    Routes requests to the first healthy backend, in order of preference.
+    """
+
+    def __init__(self, backends, health_ttl=HEALTH_TTL, clock=time.monotonic):
+        """
+        Initialize the backend manager.
+
+        Args:
+            backends: Backends in order of preference
+            health_ttl: Seconds a health check result is trusted
+            clock: Monotonic time source
+        """
+        self.backends = list(backends)
+        self.health_ttl = health_ttl
+        self.clock = clock
+        self.active = None
+        self._lock = threading.Lock()
+
+    def backend(self, name):
+        """Get a backend by name."""
+        for backend in self.backends:
+            if backend.name == name:
+                return backend
+        raise KeyError(f"Unknown LLM backend: {name}")
+
+    def _is_healthy(self, backend):
+        """Run a backend's health check, reusing a recent result."""
+        if backend.check is None:
+            return True
+        with self._lock:
+            now = self.clock()
+            if backend.checked_at is None or now - backend.checked_at >= self.health_ttl:
+                try:
+                    backend.healthy = bool(backend.check())
+                except Exception:
+                    backend.healthy = False
+                backend.checked_at = now
+            return backend.healthy
+
+    def available(self, names=None):
+        """
+        Yield the backends a request may be sent to now.
+
+        A backend is skipped while its breaker is open; a failed health check
+        opens the breaker, so an unhealthy backend is not checked again until
+        its backoff expires. Backends are checked lazily, so fallbacks are not
+        touched while a preferred backend answers.
+
+        Args:
+            names: Only consider these backends
+
+        Yields:
+            Backend: Usable backends in order of preference
+        """
+        for backend in self.backends:
+            if names is not None and backend.name not in names:
+                continue
+            if not backend.breaker.allow():
+                continue
+            if backend.breaker.state == "half_open":
+                # Trial request after a backoff: check health again first
+                backend.checked_at = None
+            if self._is_healthy(backend):
+                yield backend
+            else:
+                backend.breaker.record_failure(trip=True)
+
+    def run(self, *args, names=None, **kwargs):
+        """
+        Send a request to the first backend that answers it.
+
+        Args:
+            *args: Arguments passed to the backend call
+            names: Only use these backends
+            **kwargs: Keyword arguments passed to the backend call
+
+        Returns:
+            The backend's response, or None if no backend could answer
+        """
+        for backend in self.available(names):
+            response = self._send(backend, backend.call, *args, **kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def run_on(self, name, request, *args, **kwargs):
+        """
+        Send a request that only one backend supports, through its breaker.
+
+        Args:
+            name: Backend name
+            request: Callable sending the request; returns None (or raises) on
+                     failure, and raises BackendUnavailable if the backend is down
+            *args: Arguments passed to the request
+            **kwargs: Keyword arguments passed to the request
+
+        Returns:
+            The response, or None if the backend is unavailable or failed
+        """
+        backend = next(self.available([name]), None)
+        if backend is None:
+            return None
+        return self._send(backend, request, *args, **kwargs)
+
+    def _send(self, backend, request, *args, **kwargs):
+        """
+        Send one request and record its outcome on the backend's breaker.
+
+        BackendUnavailable counts against the breaker and has the backend's
+        health checked again before its next request. Other errors and None
+        responses fail only this request: a rejected request or a timeout says
+        nothing about whether the backend can serve the next one.
+        """
+        try:
+            response = request(*args, **kwargs)
+        except BackendUnavailable as e:
+            print_warning(f"LLM backend '{backend.name}' unavailable: {str(e)}")
+            backend.breaker.record_failure()
+            backend.checked_at = None
+            return None
+        except Exception as e:
+            print_warning(f"LLM backend '{backend.name}' failed: {str(e)}")
+            return None
+
+        if response is None:
+            return None
+
+        backend.breaker.record_success()
+        if self.active != backend.name:
+            print_info(f"Using LLM backend '{backend.name}'")
+            self.active = backend.name
+        return response
+
+    def status(self):
+        """
+        Describe the state of every backend.
+
+        Returns:
+            dict: Backend name to {"state", "healthy", "retry_in"}
+        """
+        return {backend.name: {"state": backend.breaker.state, "healthy": backend.healthy,
+                               "retry_in": round(backend.breaker.retry_in(), 1)}
+                for backend in self.backends}
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Column conversions shared by the analysis and visualization modules.
+"""
+
+import pandas as pd
+
+
+def to_numeric_array(series):
+    """
+    Convert a column that may hold currency strings to floats.
+
+    Args:
+        series: pandas Series, e.g. "$1,250,000" or "3,400" strings or numbers
+
+    Returns:
+        numpy.ndarray: Float values, NaN where a value is not numeric
+    """
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        series = series.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Retrieval of research context for report prompts.
+Splits research output and archived pages into chunks of a few hundred
+tokens, scores them against the questions of a report task (by embedding
+similarity when an embedding model is available, BM25 keyword scoring
+otherwise), and packs the best chunks into a token budget, so each task
+prompt carries only the research it needs instead of all of it.
+"""
+
+import re
+import math
+from collections import Counter
+
+import numpy as np
+
+# Approximate characters per token of English text
+CHARS_PER_TOKEN = 4
+
+# Target size of a chunk, in tokens
+DEFAULT_CHUNK_TOKENS = 200
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+HEADING_PATTERN = re.compile(r"^\s{0,3}(#{1,6})\s+(.+?)\s*#*\s*$")
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'()\[\]]+")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(*-])")
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'-]*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were what which
+will with how does do any their there these those than into about over under per not can should would
+""".split())
+
+
+def estimate_tokens(text):
+    """Estimate the number of tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def tokenize(text):
+    """Split text into lowercase keyword terms, leaving out stopwords."""
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+
+
+def find_urls(text):
+    """
+    Find the URLs cited in a text.
+
+    Args:
+        text: Research text
+
+    Returns:
+        list: Distinct URLs in order of first appearance, without trailing punctuation
+    """
+    urls = [url.rstrip(".,;:!?*") for url in URL_PATTERN.findall(text or "")]
+    return list(dict.fromkeys(urls))
+
+
+def _split_long(paragraph, max_chars):
+    """Split a paragraph longer than max_chars at sentence ends, or hard if it has none."""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_PATTERN.split(paragraph):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text, max_tokens=DEFAULT_CHUNK_TOKENS):
+    """
+    Split Markdown text into chunks under their headings.
+
+    Consecutive paragraphs under the same heading are merged up to max_tokens;
+    longer paragraphs are split at sentence ends. A chunk never spans headings.
+
+    Args:
+        text: Markdown or plain text
+        max_tokens: Target chunk size in tokens
+
+    Returns:
+        list: Dictionaries with "heading" (the nearest heading line, or "") and "text"
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    heading = ""
+    current = []
+
+    def flush():
+        if current:
+            chunks.append({"heading": heading, "text": "\n\n".join(current)})
+            current.clear()
+
+    for block in re.split(r"\n\s*\n", text or ""):
+        lines = block.strip("\n").splitlines()
+        body = []
+        for line in lines:
+            if HEADING_PATTERN.match(line):
+                # A heading closes the chunk before it, even mid-block
+                if body:
+                    current.append("\n".join(body).strip())
+                    body = []
+                flush()
+                heading = line.strip()
+            else:
+                body.append(line)
+        paragraph = "\n".join(body).strip()
+        if not paragraph:
+            continue
+
+        for piece in (_split_long(paragraph, max_chars) if len(paragraph) > max_chars else [paragraph]):
+            if current and sum(len(part) + 2 for part in current) + len(piece) > max_chars:
+                flush()
+            current.append(piece)
+    flush()
+    return chunks
+
+
+def bm25_scores(queries, documents, k1=BM25_K1, b=BM25_B):
+    """
+    Score documents against queries with BM25.
+
+    Args:
+        queries: List of query texts
+        documents: List of document texts
+
+    Returns:
+        numpy.ndarray: Array of shape (len(queries), len(documents))
+    """
+    terms = [tokenize(document) for document in documents]
+    scores = np.zeros((len(queries), len(documents)))
+    if not documents:
+        return scores
+
+    lengths = np.array([len(document_terms) for document_terms in terms], dtype=float)
+    average_length = lengths.mean() or 1.0
+    counts = [Counter(document_terms) for document_terms in terms]
+    frequencies = Counter(term for document_counts in counts for term in document_counts)
+    normalizer = k1 * (1 - b + b * lengths / average_length)
+
+    for row, query in enumerate(queries):
+        for term in set(tokenize(query)):
+            if term not in frequencies:
+                continue
+            idf = math.log(1 + (len(documents) - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+            tf = np.array([document_counts.get(term, 0) for document_counts in counts], dtype=float)
+            scores[row] += idf * tf * (k1 + 1) / (tf + normalizer)
+    return scores
+
+
+class ContextStore:
+    """
+    Chunked research text and pages, packed into per-task prompt context.
+    """
+
+    def __init__(self, relevance=None, chunk_tokens=DEFAULT_CHUNK_TOKENS):
+        """
+        Initialize the context store.
+
+        Args:
+            relevance: Optional RelevanceEngine; without one, or when its embedding
+                       model is unavailable, chunks are scored by BM25
+            chunk_tokens: Target chunk size in tokens
+        """
+        self.relevance = relevance
+        self.chunk_tokens = chunk_tokens
+        self.chunks = []
+        self.sources = set()
+
+    @property
+    def total_tokens(self):
+        """Estimated tokens of everything in the store."""
+        return sum(chunk["tokens"] for chunk in self.chunks)
+
+    def add(self, text, source="research"):
+        """
+        Chunk a text into the store.
+
+        Args:
+            text: Markdown or plain text
+            source: Name of the text, such as "research" or a page URL
+
+        Returns:
+            int: Number of chunks added
+        """
+        if source in self.sources:
+            return 0
+        self.sources.add(source)
+        chunks = chunk_text(text, self.chunk_tokens)
+        for chunk in chunks:
+            chunk["id"] = len(self.chunks)
+            chunk["source"] = source
+            chunk["tokens"] = estimate_tokens(chunk["heading"]) + estimate_tokens(chunk["text"])
+            self.chunks.append(chunk)
+        return len(chunks)
+
+    def add_pages(self, archive, urls, max_age=None):
+        """
+        Add the archived text of fetched pages.
+
+        Args:
+            archive: PageArchive the pages were stored in
+            urls: Page URLs, such as those cited by the research
+            max_age: Maximum page age in seconds (None accepts any age)
+
+        Returns:
+            int: Number of pages found in the archive
+        """
+        added = 0
+        for url in urls:
+            text = archive.get_text(url, max_age=max_age)
+            if text:
+                self.add(text, source=url)
+                added += 1
+        return added
+
+    def score(self, questions, chunks=None):
+        """
+        Score chunks by their best match to any of the questions.
+
+        Args:
+            questions: List of question texts
+            chunks: Chunks to score (default: all)
+
+        Returns:
+            numpy.ndarray: One score per chunk; embedding scores are cosine
+                           similarities, BM25 scores are scaled to [0, 1] per question
+        """
+        chunks = self.chunks if chunks is None else chunks
+        if not chunks or not questions:
+            return np.zeros(len(chunks))
+        texts = [f"{chunk['heading']}\n{chunk['text']}".strip() for chunk in chunks]
+
+        if self.relevance is not None:
+            rows = [self.relevance.score(question, texts) for question in questions]
+            if all(row is not None for row in rows):
+                return np.max(np.vstack(rows), axis=0)
+
+        scores = bm25_scores(questions, texts)
+        peaks = scores.max(axis=1, keepdims=True)
+        scaled = np.divide(scores, peaks, out=np.zeros_like(scores), where=peaks > 0)
+        return scaled.max(axis=0)
+
+    def pack(self, questions, token_budget, exclude=None):
+        """
+        Select the chunks most relevant to a task within a token budget.
+
+        Chunks are taken best first while they fit; chunks that match no
+        question are never taken. The selection is rendered in its original
+        order, under its headings and page sources.
+
+        Args:
+            questions: Questions the task has to answer
+            token_budget: Maximum estimated tokens of the packed text
+            exclude: Optional set of chunk ids not to select, such as chunks
+                     already packed for another section of the same prompt
+
+        Returns:
+            dict: {"text", "chunks" (selected ids), "tokens", "total_tokens"}
+        """
+        exclude = exclude or set()
+        candidates = [chunk for chunk in self.chunks if chunk["id"] not in exclude]
+        scores = self.score(questions, candidates)
+
+        selected = []
+        used = 0
+        for position in np.argsort(-scores, kind="stable"):
+            chunk = candidates[position]
+            if scores[position] <= 0:
+                break
+            if used + chunk["tokens"] <= token_budget:
+                selected.append(chunk)
+                used += chunk["tokens"]
+
+        selected.sort(key=lambda chunk: chunk["id"])
+        return {
+            "text": self._render(selected),
+            "chunks": {chunk["id"] for chunk in selected},
+            "tokens": used,
+            "total_tokens": self.total_tokens,
+        }
+
+    @staticmethod
+    def _render(chunks):
+        """Join chunks, repeating a source or heading only where it changes."""
+        parts = []
+        source = heading = None
+        for chunk in chunks:
+            if chunk["source"] != source:
+                source, heading = chunk["source"], None
+                if source.startswith("http"):
+                    parts.append(f"Source: {source}")
+            if chunk["heading"] and chunk["heading"] != heading:
+                parts.append(chunk["heading"])
+            heading = chunk["heading"]
+            parts.append(chunk["text"])
+        return "\n\n".join(parts)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Duplicate detection for web research.
+Canonicalizes URLs (tracking parameters, mobile and AMP variants) and
+fingerprints snippet and page text with SimHash, so the same article found
+under different URLs or syndicated by another site is fetched and prompted
+once. Fingerprints can be saved to disk and reused across runs.
+"""
+
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import numpy as np
+
+from .formatting import print_warning
+
+# Query parameters that only track the visitor and never change the content
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref", "ref_src",
+                   "cmpid", "ncid", "ocid", "amp"}
+TRACKING_PREFIXES = ("utm_", "_hs", "pk_", "mtm_")
+
+# Query parameters that select an AMP rendering when set to "amp"
+AMP_PARAMS = {"output", "outputtype", "format"}
+
+# Host prefixes of mobile and AMP editions of a site
+MOBILE_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+# Bits in a SimHash fingerprint
+FINGERPRINT_BITS = 64
+
+# Fingerprints differing in at most this many bits are near-duplicates;
+# unrelated texts differ in about half of the bits
+DEFAULT_MAX_DISTANCE = 8
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def canonicalize_url(url):
+    """
+    Reduce a URL to a canonical form shared by its variants.
+
+    Lowercases the scheme and host, drops "www.", mobile and AMP host
+    prefixes, AMP path segments, default ports, fragments, tracking
+    parameters and trailing slashes, and sorts the remaining parameters.
+
+    Args:
+        url: URL string
+
+    Returns:
+        str: Canonical URL ("" for an empty URL)
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    for prefix in MOBILE_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    segments = [segment for segment in parts.path.split("/") if segment and segment.lower() != "amp"]
+    path = "/" + "/".join(segments)
+    if path.endswith((".amp", ".amp.html")):
+        path = path[:path.rindex(".amp")] + (".html" if path.endswith(".html") else "")
+
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+                   and not (key.lower() in AMP_PARAMS and value.lower() == "amp"))
+
+    # http and https editions of a page are the same document
+    return urlunsplit(("https", host, path.rstrip("/") or "/", urlencode(query), ""))
+
+
+def shingles(text, size=3):
+    """
+    Split text into overlapping word sequences.
+
+    Args:
+        text: Text to split
+        size: Words per shingle
+
+    Returns:
+        list: Shingle strings (the whole text if it has fewer words than size)
+    """
+    words = WORD_PATTERN.findall((text or "").lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text, bits=FINGERPRINT_BITS):
+    """
+    Compute the SimHash fingerprint of a text.
+
+    Similar texts get fingerprints that differ in few bits.
+
+    Args:
+        text: Text to fingerprint
+        bits: Fingerprint length (at most 64)
+
+    Returns:
+        int: Fingerprint, or None for text without words
+    """
+    features = shingles(text)
+    if not features:
+        return None
+
+    hashes = np.array([int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+                       for feature in features], dtype=np.uint64)
+    # Each feature votes +1 for its set bits and -1 for the others
+    set_bits = (hashes[:, None] >> np.arange(bits, dtype=np.uint64)) & np.uint64(1)
+    weights = 2 * set_bits.sum(axis=0, dtype=np.int64) - len(features)
+    return sum(1 << int(bit) for bit in np.flatnonzero(weights > 0))
+
+
+def hamming_distance(a, b):
+    """Count the bits in which two fingerprints differ."""
+    return bin(a ^ b).count("1")
+
+
+class DuplicateIndex:
+    """
+    Remembers documents by canonical URL and text fingerprint.
+
+    Each document resolves to a representative URL: its own canonical URL
+    when it is new, or that of the first document it duplicates.
+    """
+
+    def __init__(self, path=None, max_distance=DEFAULT_MAX_DISTANCE, bits=FINGERPRINT_BITS):
+        """
+        Initialize the index.
+
+        Args:
+            path: Optional JSON file the index is loaded from and saved to
+            max_distance: Largest fingerprint distance counted as a duplicate
+            bits: Fingerprint length
+        """
+        self.path = Path(path) if path else None
+        self.max_distance = max_distance
+        self.bits = bits
+
+        # Fingerprints are split into max_distance + 1 bands; near-duplicates
+        # agree on at least one band, so only those buckets are compared
+        self.band_count = max_distance + 1
+        self.band_width = bits // self.band_count
+
+        self.urls = {}
+        self.fingerprints = []
+        self._bands = {}
+        self._lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def _band_keys(self, fingerprint):
+        """Get the band bucket keys of a fingerprint."""
+        mask = (1 << self.band_width) - 1
+        return [(band, fingerprint >> (band * self.band_width) & mask) for band in range(self.band_count)]
+
+    def _add_fingerprint(self, fingerprint, representative):
+        """Store a fingerprint and index its bands."""
+        position = len(self.fingerprints)
+        self.fingerprints.append((fingerprint, representative))
+        for key in self._band_keys(fingerprint):
+            self._bands.setdefault(key, []).append(position)
+
+    def _near(self, fingerprint):
+        """Find the representative of a stored fingerprint near the given one."""
+        candidates = set()
+        for key in self._band_keys(fingerprint):
+            candidates.update(self._bands.get(key, ()))
+        for position in sorted(candidates):
+            stored, representative = self.fingerprints[position]
+            if hamming_distance(stored, fingerprint) <= self.max_distance:
+                return representative
+        return None
+
+    def lookup(self, url):
+        """
+        Get the representative of a URL without recording it.
+
+        Args:
+            url: Document URL
+
+        Returns:
+            str: Canonical URL of the representative, or None if the URL is unknown
+        """
+        with self._lock:
+            return self.urls.get(canonicalize_url(url))
+
+    def representative(self, url, text=None, by_text=False):
+        """
+        Resolve a document to the first equivalent document seen, recording it.
+
+        Args:
+            url: Document URL
+            text: Optional snippet or page text to fingerprint
+            by_text: Whether a text match overrides what the URL is already
+                     known as; used for full page text, which is more reliable
+                     than the snippet the URL was first recorded with
+
+        Returns:
+            str: Canonical URL of the representative document
+        """
+        canonical = canonicalize_url(url)
+        fingerprint = simhash(text) if text else None
+
+        with self._lock:
+            representative = self.urls.get(canonical) if canonical else None
+            near = self._near(fingerprint) if fingerprint is not None else None
+            if near is not None and (representative is None or by_text):
+                representative = near
+            if representative is None:
+                representative = canonical or (f"text:{fingerprint:x}" if fingerprint is not None else "")
+
+            if canonical and (by_text or canonical not in self.urls):
+                self.urls[canonical] = representative
+            if fingerprint is not None and near is None:
+                self._add_fingerprint(fingerprint, representative)
+        return representative
+
+    def load(self):
+        """Load the index from path."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print_warning(f"Ignoring unreadable fingerprint file {self.path}: {str(e)}")
+            return
+        with self._lock:
+            self.urls.update(data.get("urls", {}))
+            for fingerprint, representative in data.get("fingerprints", []):
+                self._add_fingerprint(int(fingerprint, 16), representative)
+
+    def save(self):
+        """Write the index to path, if one was given."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "urls": dict(self.urls),
+                "fingerprints": [[f"{fingerprint:x}", representative]
+                                 for fingerprint, representative in self.fingerprints],
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print_warning(f"Could not save fingerprint file {self.path}: {str(e)}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Atomic file writes.
+Writes go to a temporary file in the target's directory that replaces the
+target only once it is complete, so readers and interrupted runs never see a
+truncated file. The replacement keeps the permissions of the file it replaces,
+or gets the usual permissions of a newly created file.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+
+# Process umask, read once at import since reading it means briefly changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _target_mode(path):
+    """Permissions for a file written to path: those of the existing file, or 0666 minus the umask."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_write(path, mode="w", fsync=False, encoding=None):
+    """
+    Open a temporary file that atomically replaces path when the block completes.
+
+    If the block raises, the temporary file is removed and path is left untouched.
+
+    Args:
+        path: File path
+        mode: "w" for text or "wb" for bytes
+        fsync: Flush the data to disk before replacing the file
+        encoding: Text encoding (default: the platform default, like open)
+
+    Yields:
+        The open temporary file
+    """
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.chmod(temp_path, _target_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_bytes_atomic(path, data, fsync=False):
+    """
+    Write bytes to a file through a temporary file and atomic replace.
+
+    Args:
+        path: File path
+        data: Bytes to write
+        fsync: Flush the data to disk before replacing the file
+    """
+    with atomic_write(path, "wb", fsync=fsync) as f:
+        f.write(data)
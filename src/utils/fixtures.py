@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Record and replay of web research traffic.
+In record mode, search engine calls and HTTP page fetches pass through to
+the live services and their responses are saved to a fixture store. In replay
+mode the same calls are answered from the store with a configurable latency,
+so research runs are deterministic and can be benchmarked without network
+access.
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .files import atomic_write
+
+# Values of RESEARCH_FIXTURES
+RECORD = "record"
+REPLAY = "replay"
+
+# Query parameters never written to fixtures
+SECRET_PARAMS = {"api_key", "apikey", "key", "token", "access_token"}
+
+# Replay latency that reproduces the time each call took when recorded
+RECORDED_LATENCY = "recorded"
+
+
+class FixtureMissingError(LookupError):
+    """Raised when a replayed call was never recorded."""
+
+
+def fixture_key(kind, request):
+    """Get the store key of a request."""
+    payload = json.dumps({"kind": kind, "request": request}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """
+    Directory of recorded responses, one JSON file per request.
+    """
+
+    def __init__(self, root=None):
+        """
+        Initialize the fixture store.
+
+        Args:
+            root: Fixture directory (default: outputs/fixtures)
+        """
+        if root is None:
+            project_root = Path(__file__).parent.parent.parent
+            root = project_root / "outputs" / "fixtures"
+        self.root = Path(root)
+
+    def _path(self, kind, request):
+        """Get the file of a fixture."""
+        return self.root / kind / f"{fixture_key(kind, request)}.json"
+
+    def save(self, kind, request, response, elapsed):
+        """
+        Record a response.
+
+        Args:
+            kind: Call type, such as "search" or "http"
+            request: JSON-serializable description of the call
+            response: JSON-serializable response
+            elapsed: Seconds the live call took
+        """
+        path = self._path(kind, request)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fixture = {
+            "kind": kind,
+            "request": request,
+            "response": response,
+            "elapsed": round(elapsed, 4),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with atomic_write(path) as f:
+            json.dump(fixture, f, indent=2)
+
+    def load(self, kind, request):
+        """
+        Read a recorded response.
+
+        Args:
+            kind: Call type
+            request: Description of the call, as recorded
+
+        Returns:
+            dict: Fixture with "response" and "elapsed"
+
+        Raises:
+            FixtureMissingError: If the call was never recorded
+        """
+        path = self._path(kind, request)
+        if not path.exists():
+            raise FixtureMissingError(f"No recorded {kind} response for {json.dumps(request, sort_keys=True)}")
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def count(self, kind=None):
+        """Get the number of recorded fixtures, optionally of one kind."""
+        pattern = f"{kind}/*.json" if kind else "*/*.json"
+        return len(list(self.root.glob(pattern)))
+
+
+class _Replayer:
+    """Shared latency handling of replay backends."""
+
+    def __init__(self, store, latency=0.0):
+        """
+        Args:
+            store: FixtureStore to answer from
+            latency: Seconds to wait per call, or RECORDED_LATENCY to wait as
+                     long as the recorded call took
+        """
+        self.store = store
+        self.latency = latency
+
+    def _replay(self, kind, request):
+        """Load a fixture and wait out its latency."""
+        fixture = self.store.load(kind, request)
+        delay = fixture.get("elapsed", 0.0) if self.latency == RECORDED_LATENCY else float(self.latency or 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        return fixture["response"]
+
+
+def _search_request(query, max_results):
+    """Describe a search call."""
+    return {"query": query, "max_results": max_results}
+
+
+class RecordingSearchEngine:
+    """
+    Search engine wrapper that records every text search.
+    """
+
+    def __init__(self, engine, store):
+        """
+        Args:
+            engine: Live engine with a text(query, max_results) method, such as DDGS
+            store: FixtureStore to record into
+        """
+        self.engine = engine
+        self.store = store
+        name = getattr(engine, "name", None)
+        self.name = name if isinstance(name, str) and name else "search"
+
+    def text(self, query, max_results=None, **kwargs):
+        """Run a live search and record its results."""
+        started = time.perf_counter()
+        results = self.engine.text(query, max_results=max_results, **kwargs)
+        results = list(results or [])
+        self.store.save("search", _search_request(query, max_results), results, time.perf_counter() - started)
+        return results
+
+
+class ReplaySearchEngine(_Replayer):
+    """
+    Search engine answering text searches from recorded fixtures.
+    """
+
+    def text(self, query, max_results=None, **kwargs):
+        """Return the recorded results of a search."""
+        return self._replay("search", _search_request(query, max_results))
+
+
+class FixtureResponse:
+    """
+    Recorded HTTP response with the attributes the research tools read.
+    """
+
+    def __init__(self, url, status_code, text, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    def json(self):
+        """Parse the body as JSON."""
+        return json.loads(self.text)
+
+
+def _http_request(url):
+    """Describe a GET request, leaving out credentials in the query string."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key.lower() not in SECRET_PARAMS]
+    return {"url": urlunsplit(parts._replace(query=urlencode(query)))}
+
+
+class RecordingHttp:
+    """
+    HTTP client that records every GET response.
+    """
+
+    def __init__(self, store, session=None):
+        """
+        Args:
+            store: FixtureStore to record into
+            session: Object with a requests-style get method (default: requests)
+        """
+        self.store = store
+        self.session = session or requests
+
+    def get(self, url, **kwargs):
+        """Send a live GET request and record the response."""
+        started = time.perf_counter()
+        response = self.session.get(url, **kwargs)
+        self.store.save("http", _http_request(url), {
+            "status_code": response.status_code,
+            "text": response.text,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+        }, time.perf_counter() - started)
+        return response
+
+
+class ReplayHttp(_Replayer):
+    """
+    HTTP client answering GET requests from recorded fixtures.
+    """
+
+    def get(self, url, **kwargs):
+        """Return the recorded response for a URL."""
+        response = self._replay("http", _http_request(url))
+        return FixtureResponse(url, response["status_code"], response["text"], response.get("headers"))
+
+
+def fixture_mode_from_env():
+    """
+    Read the fixture settings from the environment.
+
+    RESEARCH_FIXTURES selects "record" or "replay" (anything else is live),
+    FIXTURE_DIR the store location and FIXTURE_LATENCY the replay latency in
+    seconds or "recorded".
+
+    Returns:
+        tuple: (mode or None, FixtureStore or None, latency)
+    """
+    mode = os.getenv("RESEARCH_FIXTURES", "").lower()
+    if mode not in (RECORD, REPLAY):
+        return None, None, 0.0
+    latency = os.getenv("FIXTURE_LATENCY", "0")
+    if latency != RECORDED_LATENCY:
+        latency = float(latency)
+    return mode, FixtureStore(os.getenv("FIXTURE_DIR") or None), latency
+
+
+def search_engine_for(mode, store, latency, engine=None):
+    """
+    Wrap or replace a search engine according to the fixture mode.
+
+    Args:
+        mode: RECORD, REPLAY or None
+        store: FixtureStore
+        latency: Replay latency
+        engine: Live search engine, if one is available
+
+    Returns:
+        The engine to use, or None if none is available
+    """
+    if mode == REPLAY:
+        return ReplaySearchEngine(store, latency)
+    if mode == RECORD and engine is not None:
+        return RecordingSearchEngine(engine, store)
+    return engine
+
+
+def http_client_for(mode, store, latency):
+    """
+    Get the HTTP client for a fixture mode.
+
+    Args:
+        mode: RECORD, REPLAY or None
+        store: FixtureStore
+        latency: Replay latency
+
+    Returns:
+        An object with a requests-style get method
+    """
+    if mode == REPLAY:
+        return ReplayHttp(store, latency)
+    if mode == RECORD:
+        return RecordingHttp(store)
+    return requests
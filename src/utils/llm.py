@@ -19,11 +19,25 @@ if str(project_root) not in sys.path:
 
 from src.utils.formatting import print_header, print_info, print_warning, print_error, print_success
 from src.utils.system import check_ollama_installed, check_ollama_running, setup_ollama_model
+from src.utils.backends import Backend, BackendManager, BackendUnavailable, CircuitBreaker, backoff_delay
+from src.utils.residency import ModelResidency
+from src.utils.routing import ModelRouter, parse_mapping
+
+# Timeout of backend health checks, in seconds
+HEALTH_CHECK_TIMEOUT = 3
+
+# Roles accepted by Ollama's chat endpoint; others are sent as user messages
+CHAT_ROLES = {"system", "user", "assistant", "tool"}
+
+# Response returned when no backend can answer
+NO_BACKEND_RESPONSE = "Error: Unable to generate a response using any available method."
 
 class LlamaLLM:
     """
     A unified interface for interacting with Llama models via Ollama.
-    This class ensures compatibility with CrewAI and provides multiple fallback mechanisms.
+    This class ensures compatibility with CrewAI and routes requests through a
+    backend manager: the direct Ollama API first, then LangChain and LiteLLM,
+    each behind a circuit breaker so a failing backend is skipped quickly.
     """
     
     def __init__(
@@ -34,7 +48,10 @@ class LlamaLLM:
         timeout: int = 120,
         retry_count: int = 3,
         retry_delay: int = 2,
-        verbose: bool = True
+        verbose: bool = True,
+        use_chat: bool = True,
+        keep_alive: Optional[str] = "30m",
+        num_ctx: Optional[int] = None
     ):
         """
         Initialize the LlamaLLM interface.
@@ -44,9 +61,16 @@ class LlamaLLM:
             base_url: Base URL for the Ollama API
             temperature: Sampling temperature (0.0 to 1.0)
             timeout: Request timeout in seconds
-            retry_count: Number of retries for failed requests
-            retry_delay: Delay between retries in seconds
+            retry_count: Attempts per request when Ollama returns an error status
+            retry_delay: Base delay of the exponential backoff between attempts, in seconds
             verbose: Whether to print detailed information
+            use_chat: Send chat messages to /api/chat with their roles, so Ollama
+                      applies the model's chat template and can reuse the cached
+                      prompt prefix across turns (False: flatten into /api/generate)
+            keep_alive: How long Ollama keeps the model loaded after a request
+                        (e.g. "30m"; None for the server default)
+            num_ctx: Context window in tokens; fixed per instance because changing it
+                     reloads the model and drops the prompt cache (None: model default)
         """
         self.model_name = model_name
         self.base_url = base_url.rstrip('/')
@@ -55,15 +79,84 @@ class LlamaLLM:
         self.retry_count = retry_count
         self.retry_delay = retry_delay
         self.verbose = verbose
+        self.use_chat = use_chat
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
+        
+        # Token counts and timings of the latest Ollama response
+        self.last_usage = {}
+        
+        # Load state, cold-start timings and batch pinning of the model
+        self.residency = ModelResidency(model_name, self.base_url, keep_alive=keep_alive,
+                                        options={"num_ctx": num_ctx} if num_ctx else None)
         
         # For langchain/crewai compatibility
         self.model = model_name
         
+        # Clients built once and reused across requests
+        self._clients = {}
+        self.backends = self._create_backends()
+        
         if verbose:
             print_info(f"Initializing LlamaLLM with model={model_name}, temperature={temperature}")
         
-        # Check if model is available
-        self._verify_model_availability()
+        # Check if model is available, then load it so the first request is warm
+        if self._verify_model_availability():
+            self.residency.preload()
+    
+    def _create_backends(self) -> BackendManager:
+        """Create the backend manager, in order of preference."""
+        def breaker():
+            return CircuitBreaker(base_delay=max(self.retry_delay, 1), max_delay=120)
+        
+        return BackendManager([
+            Backend("ollama", self._ollama_backend, check=self._server_available, breaker=breaker()),
+            Backend("langchain", self._langchain_backend,
+                    check=lambda: self._client("langchain") is not None and self._server_available(),
+                    breaker=breaker()),
+            Backend("litellm", self._litellm_ollama_completion,
+                    check=lambda: self._client("litellm") is not None and self._server_available(),
+                    breaker=breaker()),
+        ])
+    
+    def _server_available(self) -> bool:
+        """Quick check that the Ollama server answers."""
+        try:
+            response = requests.get(f"{self.base_url}/api/tags", timeout=min(self.timeout, HEALTH_CHECK_TIMEOUT))
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+    
+    def _client(self, name):
+        """
+        Get a cached client for a fallback backend, building it on first use.
+        
+        Args:
+            name: "langchain" (an OllamaLLM instance) or "litellm" (the module)
+            
+        Returns:
+            The client, or None if its package is not installed
+        """
+        if name in self._clients:
+            return self._clients[name]
+            
+        client = None
+        try:
+            if name == "langchain":
+                from langchain_ollama import OllamaLLM
+                client = OllamaLLM(model=self.model_name, base_url=self.base_url, temperature=self.temperature)
+            elif name == "litellm":
+                import litellm
+                # Set a dummy API key to satisfy LiteLLM's validation
+                os.environ.setdefault("OPENAI_API_KEY", "ollama-dummy-key")
+                litellm.set_verbose = False
+                client = litellm
+        except ImportError:
+            package = "langchain-ollama" if name == "langchain" else name
+            print_info(f"{package} is not installed; the {name} backend is unavailable")
+            
+        self._clients[name] = client
+        return client
     
     def _verify_model_availability(self) -> bool:
         """Check if the model is available in Ollama and try to load it if not."""
@@ -123,7 +216,9 @@ class LlamaLLM:
     def _direct_ollama_completion(
         self, 
         prompt: str,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Union[str, Dict[str, Any]]] = None,
+        temperature: Optional[float] = None
     ) -> Optional[str]:
         """
         Send a completion request directly to the Ollama API.
@@ -132,56 +227,145 @@ class LlamaLLM:
         Args:
             prompt: The user prompt to send to the model
             system_prompt: Optional system prompt to set context
+            response_format: Optional Ollama `format`: "json" or a JSON schema
+            temperature: Sampling temperature for this request (default: self.temperature)
+            
+        Returns:
+            The model's response text or None if request failed
+        """
+        request_body = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "temperature": self.temperature if temperature is None else temperature,
+            "stream": False
+        }
+        
+        if system_prompt:
+            request_body["system"] = system_prompt
+            
+        if response_format is not None:
+            request_body["format"] = response_format
+        
+        result = self._post_ollama("generate", request_body)
+        return None if result is None else result.get("response", "")
+    
+    def _chat_ollama_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Optional[Union[str, Dict[str, Any]]] = None,
+        temperature: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Send chat messages to Ollama's chat endpoint with their roles.
+        
+        The request is built only from the messages and settings fixed for this
+        instance, so an agent loop that resends a growing conversation produces
+        requests whose beginning is byte-identical from turn to turn, and Ollama
+        only evaluates the new messages.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            response_format: Optional Ollama `format`: "json" or a JSON schema
+            temperature: Sampling temperature for this request (default: self.temperature)
             
         Returns:
             The model's response text or None if request failed
         """
-        for attempt in range(self.retry_count):
+        request_body = {
+            "model": self.model_name,
+            "messages": self._chat_messages(messages),
+            "stream": False
+        }
+        
+        if response_format is not None:
+            request_body["format"] = response_format
+            
+        if temperature is not None:
+            request_body["temperature"] = temperature
+        
+        result = self._post_ollama("chat", request_body)
+        return None if result is None else result.get("message", {}).get("content", "")
+    
+    def _chat_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Normalize messages for the chat endpoint.
+        
+        Args:
+            messages: List of message dictionaries
+            
+        Returns:
+            List of {"role", "content"} dictionaries with roles Ollama accepts
+        """
+        normalized = []
+        for message in messages:
+            role = message.get("role", "user")
+            content = message.get("content")
+            normalized.append({
+                "role": role if role in CHAT_ROLES else "user",
+                "content": "" if content is None else str(content)
+            })
+        return normalized
+    
+    def _post_ollama(self, endpoint: str, request_body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Post a request to an Ollama API endpoint.
+        
+        Adds the instance's sampling options and keep_alive, retries error
+        statuses with backoff, and records token counts in last_usage.
+        
+        Args:
+            endpoint: API endpoint name ("generate" or "chat")
+            request_body: Request body
+            
+        Returns:
+            The response JSON, or None if the request timed out or was rejected
+            
+        Raises:
+            BackendUnavailable: If the server could not be reached, or kept
+                                answering with server errors or 429
+        """
+        # Ollama reads sampling settings from options
+        options = {"temperature": request_body.pop("temperature", self.temperature)}
+        if self.num_ctx:
+            options["num_ctx"] = self.num_ctx
+        request_body["options"] = options
+        keep_alive = self.residency.request_keep_alive()
+        if keep_alive is not None:
+            request_body["keep_alive"] = keep_alive
+        
+        # Only server errors are retried: a refused connection fails at once and
+        # the backend manager's circuit breaker takes over, while a timeout or a
+        # rejected request (4xx) fails only this request
+        for attempt in range(max(1, self.retry_count)):
             try:
-                request_body = {
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "temperature": self.temperature,
-                    "stream": False
-                }
-                
-                if system_prompt:
-                    request_body["system"] = system_prompt
-                
                 response = requests.post(
-                    f"{self.base_url}/api/generate",
+                    f"{self.base_url}/api/{endpoint}",
                     json=request_body,
                     timeout=self.timeout
                 )
-                
-                if response.status_code != 200:
-                    print_error(f"Ollama API error. Status: {response.status_code}")
-                    if attempt < self.retry_count - 1:
-                        print_info(f"Retrying ({attempt+2}/{self.retry_count})...")
-                        time.sleep(self.retry_delay)
-                        continue
-                    return None
-                
-                result = response.json()
-                return result.get("response", "")
-                
             except requests.exceptions.Timeout:
                 print_error(f"Request timed out after {self.timeout} seconds")
-                if attempt < self.retry_count - 1:
-                    print_info(f"Retrying ({attempt+2}/{self.retry_count})...")
-                    time.sleep(self.retry_delay)
-                    continue
                 return None
-                
-            except Exception as e:
+            except requests.exceptions.RequestException as e:
                 print_error(f"Error during completion request: {str(e)}")
-                if attempt < self.retry_count - 1:
-                    print_info(f"Retrying ({attempt+2}/{self.retry_count})...")
-                    time.sleep(self.retry_delay)
-                    continue
+                raise BackendUnavailable(str(e)) from e
+                
+            if response.status_code == 200:
+                result = response.json()
+                self.last_usage = {key: result[key] for key in
+                                   ("prompt_eval_count", "eval_count", "prompt_eval_duration",
+                                    "eval_duration", "load_duration", "total_duration") if key in result}
+                self.residency.observe(result, event=endpoint)
+                return result
+                
+            print_error(f"Ollama API error. Status: {response.status_code}")
+            if response.status_code < 500 and response.status_code != 429:
                 return None
+            if attempt < self.retry_count - 1:
+                print_info(f"Retrying ({attempt+2}/{self.retry_count})...")
+                time.sleep(backoff_delay(attempt, self.retry_delay, max_delay=30))
                 
-        return None
+        raise BackendUnavailable(f"Ollama API kept failing with status {response.status_code}")
     
     def _format_messages(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -217,6 +401,18 @@ class LlamaLLM:
         
         return formatted_prompt, system_prompt
 
+    def _ollama_backend(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """Backend call for the direct Ollama API."""
+        if self.use_chat:
+            return self._chat_ollama_completion(messages)
+        formatted_prompt, system_prompt = self._format_messages(messages)
+        return self._direct_ollama_completion(formatted_prompt, system_prompt)
+    
+    def _langchain_backend(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """Backend call for LangChain's OllamaLLM integration."""
+        formatted_prompt, _ = self._format_messages(messages)
+        return self._langchain_ollama_completion(formatted_prompt)
+    
     def _langchain_ollama_completion(self, prompt: str) -> Optional[str]:
         """
         Send a completion request using LangChain's OllamaLLM integration.
@@ -228,22 +424,13 @@ class LlamaLLM:
         Returns:
             The model's response text or None if request failed
         """
-        try:
-            from langchain_ollama import OllamaLLM
-            
-            llm = OllamaLLM(
-                model=self.model_name,
-                base_url=self.base_url,
-                temperature=self.temperature
-            )
+        llm = self._client("langchain")
+        if llm is None:
+            return None
             
+        try:
             return llm.invoke(prompt)
             
-        except ImportError:
-            print_error("langchain_ollama package not installed")
-            print_info("Try installing with: pip install langchain-ollama")
-            return None
-            
         except Exception as e:
             print_error(f"Error using LangChain OllamaLLM: {str(e)}")
             return None
@@ -259,15 +446,11 @@ class LlamaLLM:
         Returns:
             The model's response text or None if request failed
         """
-        try:
-            import litellm
-            
-            # Set a dummy API key to satisfy LiteLLM's validation
-            os.environ["OPENAI_API_KEY"] = "ollama-dummy-key"
-            
-            # Configure LiteLLM
-            litellm.set_verbose = False
+        litellm = self._client("litellm")
+        if litellm is None:
+            return None
             
+        try:
             # Use the ollama/ prefix required by LiteLLM
             response = litellm.completion(
                 model=f"ollama/{self.model_name}",
@@ -278,78 +461,43 @@ class LlamaLLM:
             
             return response.choices[0].message.content
             
-        except ImportError:
-            print_error("litellm package not installed")
-            print_info("Try installing with: pip install litellm")
-            return None
-            
         except Exception as e:
             print_error(f"Error using LiteLLM for Ollama: {str(e)}")
             return None
     
     # Interface methods for different libraries
     
+    def _generate(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Send messages to the first healthy backend.
+        
+        Args:
+            messages: List of message dictionaries
+            
+        Returns:
+            The response text, or an error message if no backend could answer
+        """
+        response = self.backends.run(messages)
+        if response is not None:
+            return response
+            
+        waits = [f"{name} in {state['retry_in']:.0f}s" for name, state in self.backends.status().items()
+                 if state["state"] == "open"]
+        print_error("No LLM backend could answer" + (f" (next retry: {', '.join(waits)})" if waits else ""))
+        return NO_BACKEND_RESPONSE
+    
     def completion(self, **kwargs):
         """LiteLLM-compatible completion method."""
         messages = kwargs.get("messages", [])
         if not messages:
             return {"choices": [{"message": {"content": "No input provided"}}]}
         
-        # Format messages for direct Ollama call
-        formatted_prompt, system_prompt = self._format_messages(messages)
-        
-        # Try direct Ollama API first (most reliable)
-        response = self._direct_ollama_completion(formatted_prompt, system_prompt)
-        
-        if response is not None:
-            return {
-                "choices": [
-                    {
-                        "message": {
-                            "role": "assistant",
-                            "content": response
-                        }
-                    }
-                ]
-            }
-        
-        # If direct call fails, try LangChain
-        response = self._langchain_ollama_completion(formatted_prompt)
-        
-        if response is not None:
-            return {
-                "choices": [
-                    {
-                        "message": {
-                            "role": "assistant",
-                            "content": response
-                        }
-                    }
-                ]
-            }
-            
-        # If LangChain also fails, try LiteLLM
-        response = self._litellm_ollama_completion(messages)
-        
-        if response is not None:
-            return {
-                "choices": [
-                    {
-                        "message": {
-                            "role": "assistant",
-                            "content": response
-                        }
-                    }
-                ]
-            }
-            
-        # If all methods fail, return an error message
         return {
             "choices": [
                 {
                     "message": {
                         "role": "assistant",
-                        "content": "Error: Unable to generate a response using any available method."
+                        "content": self._generate(messages)
                     }
                 }
             ]
@@ -367,29 +515,40 @@ class LlamaLLM:
             else:
                 return "Error: No input provided"
         
-        # Format messages for direct Ollama call
-        formatted_prompt, system_prompt = self._format_messages(messages)
-        
-        # Try direct Ollama API first
-        response = self._direct_ollama_completion(formatted_prompt, system_prompt)
+        return self._generate(messages)
+    
+    def structured(self, prompt: str, schema: Dict[str, Any], system_prompt: Optional[str] = None):
+        """
+        Request a JSON response constrained to a JSON schema.
         
-        if response is not None:
-            return response
-            
-        # Try LangChain next
-        response = self._langchain_ollama_completion(formatted_prompt)
+        Uses Ollama structured outputs (the `format` parameter) at temperature 0,
+        so the response is parseable without scraping it out of prose.
         
-        if response is not None:
-            return response
+        Args:
+            prompt: The user prompt
+            schema: JSON schema the response must follow
+            system_prompt: Optional system prompt
             
-        # Try LiteLLM last
-        response = self._litellm_ollama_completion(messages)
-        
-        if response is not None:
-            return response
+        Returns:
+            The parsed JSON response, or None if the request failed
+        """
+        # Only the direct API supports constrained output. It is called outside the
+        # backend manager: a rejected schema must not count against the ollama
+        # breaker that plain calls depend on.
+        try:
+            response = self._direct_ollama_completion(prompt, system_prompt, response_format=schema,
+                                                      temperature=0)
+        except BackendUnavailable as e:
+            print_error(f"Structured request failed: {str(e)}")
+            return None
+        if response is None:
+            return None
             
-        # If all methods fail, return error message
-        return "Error: Unable to generate a response using any available method."
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError as e:
+            print_error(f"Structured response was not valid JSON: {str(e)}")
+            return None
     
     def invoke(self, prompt, **kwargs):
         """LangChain-compatible invoke method."""
@@ -408,6 +567,26 @@ class LlamaLLM:
         return self.call(prompt=prompt, **kwargs)
 
 
+def _mock_value(schema):
+    """Build the simplest value that satisfies a JSON schema fragment."""
+    if "enum" in schema:
+        return schema["enum"][len(schema["enum"]) // 2]
+    types = schema.get("type", "null")
+    kind = types[0] if isinstance(types, list) else types
+    if kind == "object":
+        return {key: _mock_value(value) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_mock_value(schema.get("items", {}))]
+    if kind in ("integer", "number"):
+        low, high = schema.get("minimum", 0), schema.get("maximum", schema.get("minimum", 0) + 10)
+        return (low + high) // 2 if kind == "integer" else (low + high) / 2
+    if kind == "boolean":
+        return False
+    if kind == "string":
+        return "Mock value"
+    return None
+
+
 class MockLLM:
     """
     Mock implementation of an LLM for testing without actual API calls.
@@ -480,6 +659,11 @@ class MockLLM:
         """Make the class callable for compatibility with some frameworks."""
         return self.call(prompt=prompt, **kwargs)
     
+    def structured(self, prompt, schema, system_prompt=None):
+        """Mock structured output that satisfies the requested schema."""
+        print_info("[MockLLM] Returning structured response")
+        return _mock_value(schema)
+    
     def _get_mock_response(self, topic):
         """Get a mock response based on the topic."""
         responses = {
@@ -570,19 +754,26 @@ class CrewAILlamaAdapter:
     This addresses the specific requirements CrewAI has for LLM integration.
     """
     
-    def __init__(self, model_name="llama3", base_url="http://localhost:11434", temperature=0.7, verbose=True):
+    def __init__(self, model_name="llama3", base_url="http://localhost:11434", temperature=0.7, verbose=True,
+                 use_chat=True, keep_alive="30m", num_ctx=None):
         # Initialize our real LLM implementation
         self.llm = LlamaLLM(
             model_name=model_name,
             base_url=base_url,
             temperature=temperature,
-            verbose=verbose
+            verbose=verbose,
+            use_chat=use_chat,
+            keep_alive=keep_alive,
+            num_ctx=num_ctx
         )
         
         # Properties required by CrewAI
         self.model = f"ollama/{model_name}"  # Use the prefixed model name for LiteLLM compatibility
         self.temperature = temperature
         
+        # Model residency manager (see LlamaLLM)
+        self.residency = self.llm.residency
+        
     def chat(self, messages):
         """LangChain/LiteLLM-compatible chat method."""
         try:
@@ -620,6 +811,10 @@ class CrewAILlamaAdapter:
         """LangChain-compatible invoke method."""
         return self.complete(prompt)
     
+    def structured(self, prompt, schema, system_prompt=None):
+        """Schema-constrained JSON response (see LlamaLLM.structured)."""
+        return self.llm.structured(prompt, schema, system_prompt=system_prompt)
+    
     def completion(self, **kwargs):
         """LiteLLM-compatible completion method required by CrewAI."""
         messages = kwargs.get("messages", [])
@@ -695,6 +890,10 @@ class CrewAIMockAdapter:
         """LangChain-compatible invoke method."""
         return self.complete(prompt)
     
+    def structured(self, prompt, schema, system_prompt=None):
+        """Mock schema-constrained JSON response."""
+        return self.llm.structured(prompt, schema, system_prompt=system_prompt)
+    
     def completion(self, **kwargs):
         """LiteLLM-compatible completion method required by CrewAI."""
         return self.llm.completion(**kwargs)
@@ -722,35 +921,88 @@ def setup_llm(use_mock=False, for_crewai=False, **kwargs):
         
         if for_crewai:
             return CrewAIMockAdapter(
-                model_name=os.getenv("OLLAMA_MODEL", kwargs.get("model_name", "llama3")),
+                model_name=kwargs.get("model_name") or os.getenv("OLLAMA_MODEL", "llama3"),
                 temperature=float(os.getenv("CREW_TEMPERATURE", str(kwargs.get("temperature", 0.7))))
             )
         else:
             return MockLLM(
-                model_name=os.getenv("OLLAMA_MODEL", kwargs.get("model_name", "llama3")),
+                model_name=kwargs.get("model_name") or os.getenv("OLLAMA_MODEL", "llama3"),
                 temperature=float(os.getenv("CREW_TEMPERATURE", str(kwargs.get("temperature", 0.7))))
             )
     
+    # Chat endpoint and model residency settings
+    chat_options = {
+        "use_chat": os.getenv("OLLAMA_USE_CHAT", str(kwargs.get("use_chat", True))).lower() == "true",
+        "keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", kwargs.get("keep_alive", "30m")) or None,
+        "num_ctx": int(os.getenv("OLLAMA_NUM_CTX", str(kwargs.get("num_ctx") or 0))) or None,
+    }
+    
+    # An explicit model name (e.g. from a model route) takes precedence over OLLAMA_MODEL
+    model_name = kwargs.get("model_name") or os.getenv("OLLAMA_MODEL", "llama3")
+    
     # Set up the real LlamaLLM
     if for_crewai:
         return CrewAILlamaAdapter(
-            model_name=os.getenv("OLLAMA_MODEL", kwargs.get("model_name", "llama3")),
+            model_name=model_name,
             base_url=os.getenv("OLLAMA_API_BASE", kwargs.get("base_url", "http://localhost:11434")),
             temperature=float(os.getenv("CREW_TEMPERATURE", str(kwargs.get("temperature", 0.7)))),
-            verbose=kwargs.get("verbose", True)
+            verbose=kwargs.get("verbose", True),
+            **chat_options
         )
     else:
         return LlamaLLM(
-            model_name=os.getenv("OLLAMA_MODEL", kwargs.get("model_name", "llama3")),
+            model_name=model_name,
             base_url=os.getenv("OLLAMA_API_BASE", kwargs.get("base_url", "http://localhost:11434")),
             temperature=float(os.getenv("CREW_TEMPERATURE", str(kwargs.get("temperature", 0.7)))),
             timeout=int(os.getenv("OLLAMA_TIMEOUT", str(kwargs.get("timeout", 120)))),
             retry_count=int(os.getenv("OLLAMA_RETRY_COUNT", str(kwargs.get("retry_count", 3)))),
             retry_delay=int(os.getenv("OLLAMA_RETRY_DELAY", str(kwargs.get("retry_delay", 2)))),
-            verbose=kwargs.get("verbose", True)
+            verbose=kwargs.get("verbose", True),
+            **chat_options
         )
 
 
+def setup_router(llm, use_mock=False, for_crewai=False, routes=None, concurrency=None, memory_gb=None, **kwargs):
+    """
+    Set up per-stage model routing around an LLM.
+    
+    Routes, concurrency limits and the memory budget are read from
+    OLLAMA_MODEL_ROUTES ("executive_summary=llama3:8b,investment_summary=llama3:8b"),
+    OLLAMA_MODEL_CONCURRENCY ("llama3:70b=1,llama3:8b=2") and OLLAMA_MEMORY_GB
+    unless given.
+    
+    Args:
+        llm: LLM used for stages without a route
+        use_mock: Whether routed models use the mock implementation
+        for_crewai: Whether routed models are CrewAI-compatible adapters
+        routes: Optional dictionary of stage name to model name
+        concurrency: Optional dictionary of model name to concurrent stages
+        memory_gb: Optional memory available to Ollama, in GB
+        **kwargs: Additional arguments passed to setup_llm for routed models
+        
+    Returns:
+        ModelRouter: The router
+    """
+    if routes is None:
+        routes = parse_mapping(os.getenv("OLLAMA_MODEL_ROUTES"))
+    if concurrency is None:
+        concurrency = parse_mapping(os.getenv("OLLAMA_MODEL_CONCURRENCY"), int)
+    if memory_gb is None and os.getenv("OLLAMA_MEMORY_GB"):
+        memory_gb = float(os.getenv("OLLAMA_MEMORY_GB"))
+    
+    def factory(model_name):
+        return setup_llm(use_mock=use_mock, for_crewai=for_crewai, **{**kwargs, "model_name": model_name})
+    
+    return ModelRouter(
+        llm,
+        routes=routes,
+        concurrency=concurrency,
+        factory=factory,
+        memory_gb=memory_gb,
+        base_url=os.getenv("OLLAMA_API_BASE", kwargs.get("base_url", "http://localhost:11434"))
+    )
+
+
 def test_llm_integration():
     """
     Test function to verify that the LLM integration is working.
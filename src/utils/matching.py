@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Multi-term text matching for research analysis.
+Compiles a dictionary of labelled term lists into a single regular
+expression, factored into a prefix trie, so every term hit in a document is
+found in one pass over the text instead of one substring scan per term.
+"""
+
+import re
+
+
+def trie_pattern(terms):
+    """
+    Build a regular expression matching any of the terms.
+
+    Terms sharing a prefix share a branch, so the engine examines each text
+    position against the trie rather than against every term in turn. At a
+    given position the longest matching term wins.
+
+    Args:
+        terms: Iterable of literal strings
+
+    Returns:
+        str: Regular expression source (empty if there are no terms)
+    """
+    trie = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    """Render one trie node and its children as a regular expression."""
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A term ends here; longer terms continuing from it are optional
+        body = "(?:" + body + ")?"
+    return body
+
+
+class TermMatcher:
+    """
+    Finds which terms of a labelled term dictionary occur in a text.
+    """
+
+    def __init__(self, groups, ignore_case=True):
+        """
+        Compile a term dictionary.
+
+        Args:
+            groups: Dictionary of label to list of terms; a term may appear
+                    under several labels
+            ignore_case: Whether matching ignores case
+        """
+        self.ignore_case = ignore_case
+        self._labels = {}
+        for label, terms in groups.items():
+            for term in terms:
+                self._labels.setdefault(self._normalize(term), set()).add(label)
+
+        # Only the longest term starting at a position is reported, so a hit
+        # also counts every term it contains (e.g. "new jobs" contains "new")
+        self._contained = {term: [other for other in self._labels if other in term] for term in self._labels}
+
+        # Lookahead so hits may overlap: every start position is tried
+        flags = re.IGNORECASE if ignore_case else 0
+        self.pattern = re.compile(f"(?=({trie_pattern(self._labels)}))", flags) if self._labels else None
+
+    def _normalize(self, text):
+        """Bring a term or matched text to the form used as a dictionary key."""
+        return text.lower() if self.ignore_case else text
+
+    def terms(self, text):
+        """
+        Find the terms occurring in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            set: Terms found (lowercase when ignoring case)
+        """
+        found = set()
+        if not text or self.pattern is None:
+            return found
+        for match in self.pattern.finditer(text):
+            hit = match.group(1)
+            if hit:
+                found.update(self._contained[self._normalize(hit)])
+        return found
+
+    def hits(self, text):
+        """
+        Find the terms occurring in a text, grouped by label.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            dict: Label to the set of its terms found; labels without hits are omitted
+        """
+        grouped = {}
+        for term in self.terms(text):
+            for label in self._labels[term]:
+                grouped.setdefault(label, set()).add(term)
+        return grouped
+
+    def labels(self, text):
+        """
+        Find the labels with at least one term in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            set: Labels found
+        """
+        return set(self.hits(text))
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Adaptive rate limiting for web research.
+Paces calls to each search provider and web domain with a token bucket whose
+rate adapts to the responses: it creeps up while calls succeed and halves
+when the service signals throttling (HTTP 429, or for DuckDuckGo alone its
+202 rate-limit reply), so throughput settles near the highest rate the
+service sustains.
+Throttled calls are retried with backoff instead of being dropped.
+"""
+
+import os
+import re
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+from .backends import backoff_delay
+from .formatting import print_warning
+from .routing import parse_mapping
+
+# HTTP statuses that mean "slow down"
+THROTTLE_STATUSES = {429}
+
+# Error text of rate-limit exceptions raised by search clients
+THROTTLE_PATTERN = re.compile(r"rate ?limit|too many requests|\b429\b", re.IGNORECASE)
+
+# DuckDuckGo also answers rate-limited requests with HTTP 202
+DUCKDUCKGO_THROTTLE_STATUSES = {429, 202}
+DUCKDUCKGO_THROTTLE_PATTERN = re.compile(r"rate ?limit|too many requests|\b(?:429|202)\b", re.IGNORECASE)
+
+# Starting rate of a bucket, in calls per second, and its bounds
+DEFAULT_RATE = 1.0
+MIN_RATE = 0.05
+MAX_RATE = 10.0
+
+# Additive increase per success (calls per second) and multiplicative decrease per throttle
+RATE_INCREASE = 0.05
+RATE_DECREASE = 0.5
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call is still throttled after all of its retries."""
+
+
+def is_throttled(outcome, statuses=THROTTLE_STATUSES, pattern=THROTTLE_PATTERN):
+    """
+    Check whether a response or exception signals rate limiting.
+
+    Args:
+        outcome: HTTP response (anything with status_code) or exception
+        statuses: HTTP statuses that signal rate limiting
+        pattern: Regular expression matching the text of rate-limit exceptions
+
+    Returns:
+        bool: True if the service asked the caller to slow down
+    """
+    if isinstance(outcome, BaseException):
+        name = type(outcome).__name__.lower()
+        return "ratelimit" in name or bool(pattern.search(str(outcome)))
+    return getattr(outcome, "status_code", None) in statuses
+
+
+def is_duckduckgo_throttled(outcome):
+    """Check whether a DuckDuckGo response or exception signals rate limiting, including its 202 reply."""
+    return is_throttled(outcome, DUCKDUCKGO_THROTTLE_STATUSES, DUCKDUCKGO_THROTTLE_PATTERN)
+
+
+# Throttle checks of the buckets whose services signal rate limiting in their own way
+THROTTLE_CHECKS = {
+    "ddg": is_duckduckgo_throttled,
+    "domain:duckduckgo.com": is_duckduckgo_throttled,
+    "domain:html.duckduckgo.com": is_duckduckgo_throttled,
+}
+
+
+def domain_key(url):
+    """Get the limiter key of a URL's host."""
+    host = (urlsplit(url if "://" in url else f"https://{url}").hostname or "").lower()
+    return f"domain:{host[4:] if host.startswith('www.') else host}"
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket with an additive-increase, multiplicative-decrease rate.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=1.0, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 increase=RATE_INCREASE, decrease=RATE_DECREASE, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Starting rate in calls per second
+            burst: Calls that may be made back to back after an idle period
+            min_rate: Lowest rate throttling can push the bucket to
+            max_rate: Highest rate successes can raise it to
+            increase: Rate added after each successful call
+            decrease: Factor the rate is multiplied by when throttled
+            clock: Monotonic time source
+            sleep: Function that waits a number of seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = burst
+        self.updated = clock()
+        self.throttles = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last update."""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Wait for a token.
+
+        The token is reserved before waiting, so concurrent callers queue up
+        behind each other instead of waking at the same moment.
+
+        Returns:
+            float: Seconds waited
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def on_success(self):
+        """Raise the rate after a call went through."""
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        """Cut the rate and drop saved-up tokens after the service throttled a call."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0.0)
+            self.throttles += 1
+
+
+class RateLimiter:
+    """
+    Adaptive token buckets per search provider and per web domain.
+    """
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, max_retries=4, base_delay=2.0, max_delay=60.0,
+                 clock=time.monotonic, sleep=time.sleep, rng=random.random, throttle_checks=None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rates: Dictionary of bucket key (provider name, or "domain:<host>") to
+                   starting rate; a "domain" entry applies to every domain
+            default_rate: Starting rate of other buckets
+            max_retries: Retries of a throttled call before giving up
+            base_delay: Backoff after the first throttled attempt, in seconds
+            max_delay: Maximum backoff before jitter, in seconds
+            clock: Monotonic time source
+            sleep: Function that waits a number of seconds
+            rng: Random number source for backoff jitter
+            throttle_checks: Dictionary of bucket key to a function telling whether
+                             a result or exception is throttling (default:
+                             THROTTLE_CHECKS; is_throttled for other keys)
+        """
+        self.rates = dict(rates or {})
+        self.throttle_checks = dict(THROTTLE_CHECKS if throttle_checks is None else throttle_checks)
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key):
+        """
+        Get the bucket of a provider or domain, creating it on first use.
+
+        Args:
+            key: Provider name, or "domain:<host>" (see domain_key)
+
+        Returns:
+            AdaptiveTokenBucket: The bucket
+        """
+        with self._lock:
+            if key not in self.buckets:
+                rate = self.rates.get(key)
+                if rate is None and key.startswith("domain:"):
+                    rate = self.rates.get("domain")
+                self.buckets[key] = AdaptiveTokenBucket(rate or self.default_rate, clock=self.clock,
+                                                        sleep=self.sleep)
+            return self.buckets[key]
+
+    def call(self, keys, function, *args, **kwargs):
+        """
+        Make a paced call, retrying with backoff while it is throttled.
+
+        Args:
+            keys: Bucket key or list of keys the call counts against
+            function: Callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's result
+
+        Raises:
+            RateLimitExceeded: If every attempt was throttled
+            Exception: Any other error raised by the callable
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        buckets = [self.bucket(key) for key in keys]
+        checks = {self.throttle_checks.get(key, is_throttled) for key in keys}
+        for attempt in range(self.max_retries + 1):
+            for bucket in buckets:
+                bucket.acquire()
+            try:
+                result = function(*args, **kwargs)
+                throttled = any(check(result) for check in checks)
+            except Exception as e:
+                if not any(check(e) for check in checks):
+                    raise
+                result, throttled = e, True
+
+            if not throttled:
+                for bucket in buckets:
+                    bucket.on_success()
+                return result
+
+            for bucket in buckets:
+                bucket.on_throttle()
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay, rng=self.rng)
+                names = ", ".join(key.replace("domain:", "") for key in keys)
+                print_warning(f"Rate limited by {names}; retrying in {delay:.1f}s")
+                self.sleep(delay)
+
+        raise RateLimitExceeded(f"Still rate limited after {self.max_retries + 1} attempts: {result}")
+
+    def status(self):
+        """
+        Get the current rate of every bucket.
+
+        Returns:
+            dict: Bucket key to {"rate", "throttles"}
+        """
+        with self._lock:
+            buckets = dict(self.buckets)
+        return {key: {"rate": round(bucket.rate, 3), "throttles": bucket.throttles} for key, bucket in buckets.items()}
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter():
+    """
+    Get the process-wide rate limiter, shared by every research tool of a batch run.
+
+    Starting rates come from RESEARCH_RATES ("ddg=0.5,domain=2").
+
+    Returns:
+        RateLimiter: The shared limiter
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(parse_mapping(os.getenv("RESEARCH_RATES"), float))
+        return _shared_limiter
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Embedding-based relevance scoring for web research results.
+Embeds search queries and result snippets in batches with a local Ollama
+embedding model (/api/embed), caches the vectors by text hash, and scores
+results by cosine similarity so off-topic results can be dropped before they
+reach an LLM prompt.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+import requests
+
+from .formatting import print_info, print_warning
+
+# Embedding model used unless OLLAMA_EMBED_MODEL says otherwise
+DEFAULT_EMBED_MODEL = "nomic-embed-text"
+
+# Cosine similarity below which a result is considered off-topic
+DEFAULT_THRESHOLD = 0.45
+
+# Texts sent to Ollama per /api/embed request
+EMBED_BATCH_SIZE = 32
+
+
+def text_key(model_name, text):
+    """Get the cache key of a text embedded with a model."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+def cosine_scores(query_vector, matrix):
+    """
+    Score each row of a matrix against a query vector by cosine similarity.
+
+    Args:
+        query_vector: Vector of length d
+        matrix: Array of shape (n, d)
+
+    Returns:
+        numpy.ndarray: n similarities in [-1, 1]; zero vectors score 0
+    """
+    query_vector = np.asarray(query_vector, dtype=float)
+    matrix = np.asarray(matrix, dtype=float).reshape(-1, query_vector.shape[0])
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vector)
+    dots = matrix @ query_vector
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+class OllamaEmbedder:
+    """
+    Batched, cached text embeddings from Ollama.
+    """
+
+    def __init__(self, model_name=DEFAULT_EMBED_MODEL, base_url="http://localhost:11434",
+                 batch_size=EMBED_BATCH_SIZE, timeout=60, cache_path=None):
+        """
+        Initialize the embedder.
+
+        Args:
+            model_name: Ollama embedding model name
+            base_url: Base URL for the Ollama API
+            batch_size: Texts sent per request
+            timeout: Timeout for each request, in seconds
+            cache_path: Optional JSON file the cache is loaded from and saved to
+        """
+        self.model_name = model_name
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.cache_path = Path(cache_path) if cache_path else None
+
+        # Cleared after the first failed request, so a missing model or a stopped
+        # server costs one request per session rather than one per search
+        self.available = True
+        self.cache = {}
+        self._lock = threading.Lock()
+
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r") as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError) as e:
+                print_warning(f"Ignoring unreadable embedding cache {self.cache_path}: {str(e)}")
+
+    def _request(self, texts):
+        """Embed one batch of texts with /api/embed."""
+        response = requests.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model_name, "input": texts},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Ollama embed request failed. Status: {response.status_code}")
+        embeddings = response.json().get("embeddings", [])
+        if len(embeddings) != len(texts):
+            raise RuntimeError(f"Ollama returned {len(embeddings)} embeddings for {len(texts)} texts")
+        return embeddings
+
+    def embed(self, texts):
+        """
+        Embed texts, requesting only those missing from the cache.
+
+        Args:
+            texts: List of strings
+
+        Returns:
+            numpy.ndarray: Array of shape (len(texts), d), or None if embeddings
+                           are unavailable
+        """
+        if not self.available:
+            return None
+
+        keys = [text_key(self.model_name, text) for text in texts]
+        with self._lock:
+            missing = list(dict.fromkeys(key for key in keys if key not in self.cache))
+        by_key = dict(zip(keys, texts))
+
+        try:
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                vectors = self._request([by_key[key] for key in batch])
+                with self._lock:
+                    self.cache.update(zip(batch, vectors))
+        except (requests.exceptions.RequestException, RuntimeError, ValueError) as e:
+            print_warning(f"Embeddings unavailable ({str(e)}); using keyword relevance instead")
+            self.available = False
+            return None
+
+        if missing:
+            self.save_cache()
+        with self._lock:
+            return np.array([self.cache[key] for key in keys], dtype=float)
+
+    def save_cache(self):
+        """Write the cache to cache_path, if one was given."""
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                snapshot = dict(self.cache)
+            with open(self.cache_path, "w") as f:
+                json.dump(snapshot, f)
+        except OSError as e:
+            print_warning(f"Could not save embedding cache {self.cache_path}: {str(e)}")
+
+
+class RelevanceEngine:
+    """
+    Scores search results against their query and filters out weak matches.
+    """
+
+    def __init__(self, embedder=None, threshold=DEFAULT_THRESHOLD):
+        """
+        Initialize the relevance engine.
+
+        Args:
+            embedder: Object with an embed(texts) method (default: OllamaEmbedder())
+            threshold: Minimum cosine similarity of a kept result
+        """
+        self.embedder = embedder if embedder is not None else OllamaEmbedder()
+        self.threshold = threshold
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build an engine from the environment.
+
+        Reads OLLAMA_EMBED_MODEL (set it to "none" to turn embeddings off),
+        RELEVANCE_THRESHOLD, RELEVANCE_CACHE and OLLAMA_API_BASE.
+
+        Returns:
+            RelevanceEngine: The engine, or None if embeddings are turned off
+        """
+        model_name = os.getenv("OLLAMA_EMBED_MODEL", DEFAULT_EMBED_MODEL)
+        if not model_name or model_name.lower() == "none":
+            return None
+        print_info(f"Scoring research relevance with embedding model '{model_name}'")
+        embedder = OllamaEmbedder(
+            model_name=model_name,
+            base_url=os.getenv("OLLAMA_API_BASE", "http://localhost:11434"),
+            cache_path=os.getenv("RELEVANCE_CACHE") or None
+        )
+        return cls(embedder, threshold=float(os.getenv("RELEVANCE_THRESHOLD", str(DEFAULT_THRESHOLD))))
+
+    def score(self, query, texts):
+        """
+        Score texts against a query.
+
+        The query and all texts are embedded in a single batch.
+
+        Args:
+            query: Search query
+            texts: List of result texts
+
+        Returns:
+            numpy.ndarray: One cosine similarity per text, or None if
+                           embeddings are unavailable
+        """
+        if not texts:
+            return np.zeros(0)
+        vectors = self.embedder.embed([query] + list(texts))
+        if vectors is None:
+            return None
+        return cosine_scores(vectors[0], vectors[1:])
+
+    def keep(self, scores):
+        """
+        Get the positions of scores at or above the threshold.
+
+        Args:
+            scores: Array of similarities from score()
+
+        Returns:
+            list: Indices of the results to keep, in their original order
+        """
+        return [int(i) for i in np.flatnonzero(np.asarray(scores) >= self.threshold)]
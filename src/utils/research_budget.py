@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Adaptive query budgeting for web research.
+Tracks how much each search adds to what a category already knows (new sources,
+amounts and other facts), closes a category with results as soon as a query
+stops adding anything, and spends the follow-up queries freed by searches that
+found nothing on the categories with the thinnest coverage (first of all those
+still without results) instead of retrying every category.
+"""
+
+# Share of new items below which a query counts as unproductive
+DEFAULT_MIN_NOVELTY = 0.5
+
+# Consecutive unproductive queries after which a category with results is closed
+DEFAULT_PATIENCE = 1
+
+# Follow-up queries that may be reallocated beyond one query per category
+DEFAULT_RESERVE = 2
+
+
+class ResearchBudget:
+    """
+    Allocates a shared search budget across research categories by marginal novelty.
+    """
+
+    def __init__(self, categories, reserve=DEFAULT_RESERVE, min_novelty=DEFAULT_MIN_NOVELTY,
+                 patience=DEFAULT_PATIENCE):
+        """
+        Initialize the budget.
+
+        Every category gets one query; each category whose first query finds
+        nothing frees one follow-up, up to `reserve`, which goes to the category
+        with the least coverage (usually the one that found nothing). The total
+        therefore never exceeds one query per category plus one per category
+        a fixed strategy would have had to retry.
+
+        Args:
+            categories: Category names, in order of preference for ties
+            reserve: Most follow-up queries that may be reallocated
+            min_novelty: Share of new items a query must bring to count as productive
+            patience: Consecutive unproductive queries that close a category with results
+        """
+        self.categories = list(categories)
+        self.reserve = reserve
+        self.min_novelty = min_novelty
+        self.patience = patience
+
+        self.seen = {category: set() for category in self.categories}
+        self.novelty = {category: [] for category in self.categories}
+        self.misses = set()
+
+    @property
+    def total_queries(self):
+        """Searches that may be run given the outcomes so far."""
+        return len(self.categories) + min(self.reserve, len(self.misses))
+
+    @property
+    def spent(self):
+        """Searches observed so far."""
+        return sum(len(history) for history in self.novelty.values())
+
+    @property
+    def remaining(self):
+        """Searches left in the budget."""
+        return max(0, self.total_queries - self.spent)
+
+    def is_open(self, category):
+        """
+        Check whether a category may still receive queries.
+
+        Args:
+            category: Category name
+
+        Returns:
+            bool: False once its last `patience` queries were all unproductive;
+                  a category without results stays open, so it can use the
+                  follow-up its empty search freed
+        """
+        if not self.seen[category]:
+            return True
+        recent = self.novelty[category][-self.patience:]
+        return len(recent) < self.patience or any(value >= self.min_novelty for value in recent)
+
+    def observe(self, category, items):
+        """
+        Record the outcome of one search.
+
+        Args:
+            category: Category the search belonged to
+            items: Hashable facts found by the search (empty if it found nothing)
+
+        Returns:
+            float: Share of the items that were new to the category (0 without items)
+        """
+        items = set(items)
+        if not items and not self.novelty[category]:
+            self.misses.add(category)
+        new = items - self.seen[category]
+        self.seen[category] |= new
+        value = len(new) / len(items) if items else 0.0
+        self.novelty[category].append(value)
+        return value
+
+    def next_category(self, candidates=None):
+        """
+        Choose the category for the next search.
+
+        Open categories with the fewest known items go first, then those with
+        the fewest searches so far, so every category is searched once before
+        any follow-up is spent.
+
+        Args:
+            candidates: Categories that still have queries to run (default: all)
+
+        Returns:
+            str: Category name, or None if the budget is spent or every
+                 candidate is closed
+        """
+        if self.remaining <= 0:
+            return None
+        candidates = self.categories if candidates is None else candidates
+        open_categories = [category for category in self.categories
+                           if category in candidates and self.is_open(category)]
+        if not open_categories:
+            return None
+        return min(open_categories, key=lambda category: (len(self.seen[category]), len(self.novelty[category])))
+
+    def summary(self):
+        """
+        Describe how the budget was used.
+
+        Returns:
+            dict: Category to {"queries", "coverage", "novelty", "open"}
+        """
+        return {
+            category: {
+                "queries": len(self.novelty[category]),
+                "coverage": len(self.seen[category]),
+                "novelty": [round(value, 2) for value in self.novelty[category]],
+                "open": self.is_open(category),
+            }
+            for category in self.categories
+        }
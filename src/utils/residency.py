@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Model residency management for Ollama.
+Preloads the configured model with a chosen keep_alive, reports whether it
+is loaded (/api/ps), records load timings so cold starts between pipeline
+stages are visible, and can pin the model in memory for the length of a
+batch run so it is not unloaded in the gaps between analyses.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import requests
+
+from .formatting import print_info, print_success, print_warning
+
+# Model load time above which a request counts as a cold start, in seconds
+COLD_LOAD_SECONDS = 1.0
+
+# keep_alive value that keeps a model loaded until it is released
+PIN_KEEP_ALIVE = -1
+
+
+class ModelResidency:
+    """
+    Tracks and controls whether an Ollama model stays loaded.
+    """
+
+    def __init__(self, model_name, base_url="http://localhost:11434", keep_alive="30m", options=None,
+                 timeout=600):
+        """
+        Initialize the residency manager.
+
+        Args:
+            model_name: Ollama model name
+            base_url: Base URL for the Ollama API
+            keep_alive: How long the model stays loaded after a request (e.g. "30m")
+            options: Model options sent with preloads; must match the options of
+                     later requests (such as num_ctx) or Ollama reloads the model
+            timeout: Timeout for loading the model, in seconds
+        """
+        self.model_name = model_name
+        self.base_url = base_url.rstrip('/')
+        self.keep_alive = keep_alive
+        self.options = dict(options or {})
+        self.timeout = timeout
+
+        # Load timings: {"event", "at", "seconds", "load_seconds", "cold"}
+        self.timings = []
+        self._pins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_pinned(self):
+        """Whether a batch currently pins the model."""
+        return self._pins > 0
+
+    def request_keep_alive(self):
+        """
+        Get the keep_alive to send with a request.
+
+        Every request resets the model's expiry, so while the model is pinned
+        requests must keep it pinned instead of restoring the normal timeout.
+
+        Returns:
+            The keep_alive value, or None for the server default
+        """
+        return PIN_KEEP_ALIVE if self.is_pinned else self.keep_alive
+
+    def _matches(self, name):
+        """Check whether a model name from the API refers to this model."""
+        return name == self.model_name or (":" not in self.model_name and name == f"{self.model_name}:latest")
+
+    def status(self):
+        """
+        Get the load state of the model.
+
+        Returns:
+            dict: "loaded", plus "expires_at", "size" and "size_vram" when loaded;
+                  None if the server could not be reached
+        """
+        try:
+            response = requests.get(f"{self.base_url}/api/ps", timeout=5)
+            if response.status_code != 200:
+                return None
+            models = response.json().get("models", [])
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+
+        for model in models:
+            if self._matches(model.get("name")) or self._matches(model.get("model")):
+                return {"loaded": True, "expires_at": model.get("expires_at"), "size": model.get("size"),
+                        "size_vram": model.get("size_vram")}
+        return {"loaded": False}
+
+    def observe(self, result, event="request"):
+        """
+        Record the load time reported in an Ollama response.
+
+        Args:
+            result: Response JSON of a generate or chat request
+            event: Label of the timing entry
+
+        Returns:
+            dict: The timing entry, or None if the response carries no load time
+        """
+        load_ns = result.get("load_duration") if isinstance(result, dict) else None
+        if load_ns is None:
+            return None
+        return self._record(event, result.get("total_duration", load_ns) / 1e9, load_ns / 1e9)
+
+    def _record(self, event, seconds, load_seconds):
+        """Add a timing entry."""
+        timing = {
+            "event": event,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(seconds, 3),
+            "load_seconds": round(load_seconds, 3),
+            "cold": load_seconds >= COLD_LOAD_SECONDS,
+        }
+        with self._lock:
+            self.timings.append(timing)
+        return timing
+
+    def cold_starts(self):
+        """
+        List the requests that had to load the model.
+
+        Returns:
+            list: Timing entries of cold starts
+        """
+        return [timing for timing in self.timings if timing["cold"]]
+
+    def _load(self, keep_alive, event):
+        """Send an empty generate request, which loads the model and sets its expiry."""
+        body = {"model": self.model_name, "stream": False}
+        if keep_alive is not None:
+            body["keep_alive"] = keep_alive
+        if self.options:
+            body["options"] = self.options
+
+        started = time.perf_counter()
+        try:
+            response = requests.post(f"{self.base_url}/api/generate", json=body, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            print_warning(f"Could not reach Ollama to load '{self.model_name}': {str(e)}")
+            return None
+        seconds = time.perf_counter() - started
+
+        if response.status_code != 200:
+            print_warning(f"Ollama could not load '{self.model_name}'. Status: {response.status_code}")
+            return None
+        result = response.json()
+        return self._record(event, seconds, result.get("load_duration", 0) / 1e9)
+
+    def preload(self, keep_alive=None):
+        """
+        Load the model ahead of the first request.
+
+        Args:
+            keep_alive: How long the model stays loaded (default: self.keep_alive)
+
+        Returns:
+            dict: Timing entry of the load, or None if it failed
+        """
+        timing = self._load(self.request_keep_alive() if keep_alive is None else keep_alive, "preload")
+        if timing is not None:
+            state = f"loaded in {timing['load_seconds']:.1f}s" if timing["cold"] else "already loaded"
+            print_success(f"Model '{self.model_name}' {state}")
+        return timing
+
+    def unload(self):
+        """
+        Unload the model now.
+
+        Returns:
+            bool: True if Ollama accepted the request
+        """
+        return self._load(0, "unload") is not None
+
+    @contextmanager
+    def pinned(self):
+        """
+        Keep the model loaded for the duration of a batch.
+
+        Loads the model with no expiry on entry; on exit the normal keep_alive
+        is restored, so it unloads that long after the batch ends. Pins nest.
+        """
+        with self._lock:
+            self._pins += 1
+            first = self._pins == 1
+        if first:
+            print_info(f"Pinning '{self.model_name}' in memory for this batch")
+            self._load(PIN_KEEP_ALIVE, "pin")
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._pins -= 1
+                last = self._pins == 0
+            if last:
+                self._load(self.keep_alive, "release")
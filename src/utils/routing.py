@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Per-stage model routing for the Land Analysis Crew.
+Assigns a model to each analysis stage from configuration, so condensing
+steps such as the executive and investment summaries can run on a small model
+while research and the full report use the large one. Each model has a
+concurrency limit, and the router decides whether the two model groups may
+run side by side given a memory budget.
+"""
+
+import threading
+
+import requests
+
+from .formatting import print_info, print_warning
+
+# Analysis stages that can be routed to their own model
+STAGES = ["research", "report", "executive_summary", "investment_summary", "assessment", "comparison"]
+
+# Stages that need the most capable model, and stages that condense its output
+DEEP_STAGES = ["research", "report"]
+SUMMARY_STAGES = ["executive_summary", "investment_summary", "assessment"]
+
+# Requests a model serves at once unless configured otherwise
+DEFAULT_CONCURRENCY = 1
+
+
+def parse_mapping(text, value_type=str):
+    """
+    Parse "key=value,key=value" configuration text.
+
+    Args:
+        text: Mapping text (empty or None gives an empty mapping)
+        value_type: Type the values are converted to
+
+    Returns:
+        dict: Parsed mapping
+
+    Raises:
+        ValueError: If an entry is not of the form key=value
+    """
+    mapping = {}
+    for entry in (text or "").split(","):
+        if not entry.strip():
+            continue
+        key, separator, value = entry.partition("=")
+        if not separator or not key.strip() or not value.strip():
+            raise ValueError(f"Invalid mapping entry '{entry.strip()}'; expected key=value")
+        mapping[key.strip()] = value_type(value.strip())
+    return mapping
+
+
+def model_name_of(llm):
+    """Get the Ollama model name of an LLM object, without a provider prefix."""
+    for attribute in ("model_name", "model"):
+        name = getattr(llm, attribute, None)
+        if isinstance(name, str) and name:
+            return name.split("/", 1)[1] if name.startswith("ollama/") else name
+    return None
+
+
+class ModelRouter:
+    """
+    Chooses the language model for each analysis stage.
+    """
+
+    def __init__(self, default_llm, routes=None, concurrency=None, factory=None, memory_gb=None,
+                 base_url="http://localhost:11434"):
+        """
+        Initialize the model router.
+
+        Args:
+            default_llm: LLM used for stages without a route
+            routes: Dictionary of stage name (see STAGES) to model name
+            concurrency: Dictionary of model name to the number of stages that may
+                         use it at once (default: DEFAULT_CONCURRENCY)
+            factory: Callable building an LLM for a model name; without one,
+                     every stage uses default_llm
+            memory_gb: Memory available to Ollama; deep and summary stages only
+                       run side by side when their models fit in it together
+            base_url: Base URL for the Ollama API, used to look up model sizes
+
+        Raises:
+            ValueError: If a route names an unknown stage
+        """
+        unknown = sorted(set(routes or {}) - set(STAGES))
+        if unknown:
+            raise ValueError(f"Unknown analysis stage(s) in model routes: {', '.join(unknown)}; "
+                             f"choose from {', '.join(STAGES)}")
+
+        self.default_llm = default_llm
+        self.default_model = model_name_of(default_llm)
+        self.routes = dict(routes or {})
+        self.concurrency = dict(concurrency or {})
+        self.factory = factory
+        self.memory_gb = memory_gb
+        self.base_url = base_url.rstrip('/')
+
+        self._llms = {self.default_model: default_llm}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+        if self.routes and factory is None:
+            print_warning("Model routes are configured but no LLM factory was given; using one model")
+
+    def model_for(self, stage):
+        """
+        Get the model name routed to a stage.
+
+        Args:
+            stage: Analysis stage name
+
+        Returns:
+            str: Model name
+        """
+        if self.factory is None:
+            return self.default_model
+        return self.routes.get(stage, self.default_model)
+
+    def llm_for(self, stage):
+        """
+        Get the LLM for a stage, building it the first time its model is used.
+
+        Args:
+            stage: Analysis stage name
+
+        Returns:
+            The LLM object
+        """
+        model = self.model_for(stage)
+        with self._lock:
+            if model not in self._llms:
+                print_info(f"Routing {stage.replace('_', ' ')} to model '{model}'")
+                self._llms[model] = self.factory(model)
+            return self._llms[model]
+
+    def slot(self, stage):
+        """
+        Get the concurrency limit of a stage's model, for use in a with statement.
+
+        Args:
+            stage: Analysis stage name
+
+        Returns:
+            threading.BoundedSemaphore: Shared by every stage routed to the model
+        """
+        model = self.model_for(stage)
+        with self._lock:
+            if model not in self._slots:
+                self._slots[model] = threading.BoundedSemaphore(self.concurrency.get(model, DEFAULT_CONCURRENCY))
+            return self._slots[model]
+
+    def model_sizes(self):
+        """
+        Get the download size of each installed model from Ollama.
+
+        Returns:
+            dict: Model name to size in bytes (empty if Ollama cannot be reached)
+        """
+        try:
+            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            if response.status_code != 200:
+                return {}
+            return {model.get("name"): model.get("size", 0) for model in response.json().get("models", [])}
+        except (requests.exceptions.RequestException, ValueError):
+            return {}
+
+    def can_overlap(self, sizes=None):
+        """
+        Check whether summary stages may run while deep stages run on another model.
+
+        Requires the two stage groups to use different models and a memory
+        budget that holds every routed model at once, so neither is unloaded to
+        make room for the other.
+
+        Args:
+            sizes: Optional model name to size in bytes (default: looked up in Ollama)
+
+        Returns:
+            bool: True if the stage groups can run concurrently
+        """
+        deep = {self.model_for(stage) for stage in DEEP_STAGES}
+        summary = {self.model_for(stage) for stage in SUMMARY_STAGES}
+        if deep & summary or not self.memory_gb:
+            return False
+
+        sizes = self.model_sizes() if sizes is None else sizes
+        needed = 0
+        for model in deep | summary:
+            size = sizes.get(model) or sizes.get(f"{model}:latest")
+            if not size:
+                print_info(f"Size of model '{model}' is unknown; running stages one at a time")
+                return False
+            needed += size
+        return needed <= self.memory_gb * 1024 ** 3
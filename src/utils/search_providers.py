@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Search providers for web research.
+Adapters give DuckDuckGo, a SearxNG instance and recorded fixtures the same
+text(query, max_results) interface, returning results as dictionaries with
+"title", "href" and "body". HedgedSearch sends a query to the first provider
+and, if it has not answered within its usual (p90) latency, to the next one as
+well, returning whichever answers first.
+When recording fixtures, the hedged search is recorded as a whole, so each
+query keeps the results that were actually returned.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import requests
+
+from .fixtures import RECORD, REPLAY, FixtureStore, RecordingSearchEngine, ReplaySearchEngine
+from .formatting import print_info, print_warning
+
+# Providers used unless SEARCH_PROVIDERS says otherwise
+DEFAULT_PROVIDERS = ["ddg"]
+
+# Latency quantile after which a query is also sent to the next provider
+HEDGE_QUANTILE = 0.9
+
+# Hedge delay until a provider has enough latency samples, in seconds
+DEFAULT_HEDGE_DELAY = 2.0
+
+
+class DuckDuckGoProvider:
+    """
+    DuckDuckGo text search through the duckduckgo_search library.
+    """
+
+    name = "ddg"
+
+    def __init__(self, engine=None):
+        """
+        Args:
+            engine: Optional DDGS instance
+
+        Raises:
+            ImportError: If duckduckgo_search is not installed and no engine is given
+        """
+        if engine is None:
+            from duckduckgo_search import DDGS
+            engine = DDGS()
+        self.engine = engine
+
+    def text(self, query, max_results=None):
+        """Search DuckDuckGo."""
+        return list(self.engine.text(query, max_results=max_results) or [])
+
+
+class SearxngProvider:
+    """
+    Search through a SearxNG instance's JSON API.
+    """
+
+    name = "searxng"
+
+    def __init__(self, base_url="http://localhost:8080", timeout=10, http=None):
+        """
+        Args:
+            base_url: Base URL of the SearxNG instance (JSON output must be enabled)
+            timeout: Request timeout in seconds
+            http: Object with a requests-style get method (default: requests)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.http = http or requests
+
+    def text(self, query, max_results=None):
+        """
+        Search SearxNG.
+
+        Raises:
+            RuntimeError: If the instance answers with an error status
+        """
+        response = self.http.get(f"{self.base_url}/search", params={"q": query, "format": "json"},
+                                 timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"SearxNG search failed. Status: {response.status_code}")
+        results = [{"title": item.get("title", ""), "href": item.get("url", ""), "body": item.get("content", "")}
+                   for item in response.json().get("results", [])]
+        return results[:max_results] if max_results else results
+
+
+class FixtureProvider(ReplaySearchEngine):
+    """
+    Search answered from recorded fixtures (see src.utils.fixtures).
+    """
+
+    name = "fixture"
+
+
+class HedgedSearch:
+    """
+    Searches a list of providers in order, hedging slow calls.
+    """
+
+    def __init__(self, providers, limiter=None, hedge=True, quantile=HEDGE_QUANTILE, window=50, min_samples=5,
+                 default_delay=DEFAULT_HEDGE_DELAY):
+        """
+        Initialize the hedged search.
+
+        Args:
+            providers: Providers in order of preference, each with a name and a
+                       text(query, max_results) method
+            limiter: Optional RateLimiter; each call counts against its provider's bucket
+            hedge: Whether slow calls are also sent to the next provider; without
+                   hedging the next provider is only tried after a failure
+            quantile: Latency quantile of a provider after which the call is hedged
+            window: Latency samples kept per provider
+            min_samples: Samples needed before the quantile replaces default_delay
+            default_delay: Hedge delay before enough samples exist, in seconds
+        """
+        if not providers:
+            raise ValueError("HedgedSearch needs at least one search provider")
+        self.providers = list(providers)
+        self.limiter = limiter
+        self.hedge = hedge
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+
+        self.latencies = {self._name(provider): deque(maxlen=window) for provider in self.providers}
+        self.hedged = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @staticmethod
+    def _name(provider):
+        """Get a provider's name."""
+        name = getattr(provider, "name", None)
+        return name if isinstance(name, str) and name else type(provider).__name__.lower()
+
+    @property
+    def name(self):
+        """Names of the providers, in order."""
+        return "+".join(self._name(provider) for provider in self.providers)
+
+    def hedge_delay(self, provider):
+        """
+        Get how long a call to a provider may take before it is hedged.
+
+        Args:
+            provider: The provider
+
+        Returns:
+            float: Seconds
+        """
+        with self._lock:
+            samples = list(self.latencies[self._name(provider)])
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        return float(np.quantile(samples, self.quantile))
+
+    def _call(self, provider, query, max_results):
+        """Query one provider and record its latency."""
+        name = self._name(provider)
+        started = time.perf_counter()
+        if self.limiter is not None:
+            results = self.limiter.call(name, provider.text, query, max_results=max_results)
+        else:
+            results = provider.text(query, max_results=max_results)
+        with self._lock:
+            self.latencies[name].append(time.perf_counter() - started)
+        return results
+
+    def text(self, query, max_results=None):
+        """
+        Search, hedging across providers.
+
+        Args:
+            query: The search query
+            max_results: Maximum results to return
+
+        Returns:
+            list: Results of the first provider to answer successfully
+
+        Raises:
+            Exception: The last provider error if every provider failed
+        """
+        if len(self.providers) == 1:
+            return self._call(self.providers[0], query, max_results)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2 * len(self.providers),
+                                                thread_name_prefix="search")
+        waiting = list(self.providers)
+        running = {}
+        error = None
+
+        def launch():
+            provider = waiting.pop(0)
+            running[self._executor.submit(self._call, provider, query, max_results)] = provider
+            return self.hedge_delay(provider) if self.hedge and waiting else None
+
+        timeout = launch()
+        while running:
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slower than usual: ask the next provider too and take the first answer
+                self.hedged += 1
+                timeout = launch()
+                continue
+
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    print_warning(f"Search provider '{self._name(provider)}' failed: {str(e)}")
+                    error = e
+            if waiting and not running:
+                timeout = launch()
+
+        raise error
+
+
+def create_search_providers(names=None, fixture_mode=None, fixture_store=None, fixture_latency=0.0):
+    """
+    Build the search providers named in configuration.
+
+    Args:
+        names: Provider names ("ddg", "searxng", "fixture"); default: the comma
+               separated SEARCH_PROVIDERS, or DEFAULT_PROVIDERS
+        fixture_mode: REPLAY replaces the providers with the fixture provider;
+                      recording happens in create_search_engine
+        fixture_store: FixtureStore used by the fixture modes and provider
+        fixture_latency: Latency of replayed searches
+
+    Returns:
+        list: Providers that could be created, in order
+    """
+    if fixture_mode == REPLAY:
+        return [FixtureProvider(fixture_store or FixtureStore(os.getenv("FIXTURE_DIR") or None), fixture_latency)]
+
+    if names is None:
+        names = [name.strip().lower() for name in os.getenv("SEARCH_PROVIDERS", "").split(",") if name.strip()]
+    providers = []
+    for name in names or DEFAULT_PROVIDERS:
+        if name == "ddg":
+            try:
+                providers.append(DuckDuckGoProvider())
+            except ImportError:
+                print_warning("DuckDuckGo search library not available; install it with: pip install -U duckduckgo-search")
+        elif name == "searxng":
+            providers.append(SearxngProvider(os.getenv("SEARXNG_URL", "http://localhost:8080")))
+        elif name == "fixture":
+            providers.append(FixtureProvider(fixture_store or FixtureStore(os.getenv("FIXTURE_DIR") or None),
+                                             fixture_latency))
+        else:
+            print_warning(f"Unknown search provider '{name}'; choose from ddg, searxng, fixture")
+
+    if len(providers) > 1:
+        print_info(f"Searching with {', '.join(HedgedSearch._name(p) for p in providers)}")
+    return providers
+
+
+def create_search_engine(providers, limiter=None, hedge=True, fixture_mode=None, fixture_store=None):
+    """
+    Combine search providers into one hedged search.
+
+    While recording, the hedged search is recorded rather than each provider,
+    so a hedged call whose loser answers last still records the winner's results.
+
+    Args:
+        providers: Providers in order of preference
+        limiter: Optional RateLimiter pacing the providers
+        hedge: Whether slow calls are also sent to the next provider
+        fixture_mode: RECORD records the results of every search
+        fixture_store: FixtureStore to record into
+
+    Returns:
+        The search engine, or None if there are no providers
+    """
+    if not providers:
+        return None
+    search = HedgedSearch(providers, limiter, hedge=hedge)
+    if fixture_mode == RECORD:
+        return RecordingSearchEngine(search, fixture_store)
+    return search
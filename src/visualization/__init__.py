@@ -8,6 +8,22 @@ from src.visualization.charts import (
     create_housing_value_chart,
     create_age_demographic_chart,
     create_market_radar_chart,
+    create_tornado_chart,
+    chart_outputs,
+    OUTPUT_TIERS,
+)
+from src.visualization.portfolio import (
+    create_score_heatmap,
+    create_scatter_matrix,
+    create_distribution_small_multiples,
+)
+from src.visualization.maps import create_geo_heatmap
+from src.visualization.pipeline import (
+    ChartRenderer,
+    write_manifests,
+    property_chart_specs,
+    render_property_charts,
+    render_portfolio_dashboard,
 )
 
 __all__ = [
@@ -16,4 +32,16 @@ __all__ = [
     "create_housing_value_chart",
     "create_age_demographic_chart",
     "create_market_radar_chart",
+    "create_tornado_chart",
+    "chart_outputs",
+    "OUTPUT_TIERS",
+    "create_score_heatmap",
+    "create_scatter_matrix",
+    "create_distribution_small_multiples",
+    "create_geo_heatmap",
+    "ChartRenderer",
+    "write_manifests",
+    "property_chart_specs",
+    "render_property_charts",
+    "render_portfolio_dashboard",
 ] 
\ No newline at end of file
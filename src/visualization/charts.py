@@ -2,51 +2,192 @@
 """
 Chart generation module for property analysis visualizations.
 Creates various charts and graphs for property reports.
+
+Charts are drawn with the object-oriented Figure API on a headless Agg canvas
+and apply their style only while drawing, so no global pyplot state is shared
+and charts can be rendered in parallel (see src.visualization.pipeline).
 """
 
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
+import re
+import functools
+import contextlib
+import contextvars
+import matplotlib
+import matplotlib.style
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+from cycler import cycler
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from pathlib import Path
 
+# Palette shared by all matplotlib charts
+CHART_COLORS = ['#2C3E50', '#E74C3C', '#3498DB', '#2ECC71', '#F39C12', 
+                '#9B59B6', '#1ABC9C', '#34495E', '#D35400', '#7F8C8D']
+
+# Base style and overrides applied while a chart is drawn
+CHART_BASE_STYLE = 'seaborn-v0_8-whitegrid'
+CHART_STYLE = {
+    'axes.prop_cycle': cycler(color=CHART_COLORS),
+    # Increase font sizes for readability
+    'font.size': 12,
+    'axes.titlesize': 16,
+    'axes.labelsize': 14,
+    'xtick.labelsize': 12,
+    'ytick.labelsize': 12,
+    'legend.fontsize': 12,
+}
+
+
+# Output tiers: file format and resolution for each use of a chart. Raster
+# formats are encoded with Pillow; "quality" applies to WebP only.
+OUTPUT_TIERS = {
+    "thumbnail": {"format": "webp", "dpi": 40, "quality": 70},
+    "screen": {"format": "png", "dpi": 100},
+    "print": {"format": "svg", "dpi": 300},
+}
+
+# Tiers written when none are requested; print output is rendered on demand
+DEFAULT_TIERS = ("screen", "thumbnail")
+
+# Tier embedded in markdown reports
+REPORT_TIER = "screen"
+
+# Tier selection and variant log for charts saved inside chart_outputs()
+_output_settings = contextvars.ContextVar("chart_output_settings", default=None)
+
 
 def setup_chart_style():
-    """Set up the styling for matplotlib charts."""
-    # Use a clean, modern style
-    plt.style.use('seaborn-v0_8-whitegrid')
+    """Apply the chart style globally (kept for pyplot-based callers)."""
+    matplotlib.style.use([CHART_BASE_STYLE, CHART_STYLE])
+
+
+def chart_style():
+    """
+    Context manager that applies the chart style only while a chart is drawn.
+    
+    Returns:
+        A matplotlib style context
+    """
+    return matplotlib.style.context([CHART_BASE_STYLE, CHART_STYLE])
+
+
+def styled_chart(func):
+    """Decorator that draws and saves a chart inside the chart style context."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with chart_style():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def chart_outputs(tiers=None, optimize=False):
+    """
+    Context manager selecting the output tiers of charts saved inside it.
     
-    # Set custom colors
-    colors = ['#2C3E50', '#E74C3C', '#3498DB', '#2ECC71', '#F39C12', 
-              '#9B59B6', '#1ABC9C', '#34495E', '#D35400', '#7F8C8D']
+    Args:
+        tiers: Output tiers to write (default: DEFAULT_TIERS)
+        optimize: Spend extra encoding time on smaller files
     
-    sns.set_palette(colors)
+    Yields:
+        list: Filled with a description of every file written (see save_chart)
+    """
+    variants = []
+    token = _output_settings.set({"tiers": tiers, "optimize": optimize, "variants": variants})
+    try:
+        yield variants
+    finally:
+        _output_settings.reset(token)
+
+
+def new_figure(figsize, nrows=1, ncols=1, **subplot_options):
+    """
+    Create a figure with its axes on a headless Agg canvas.
     
-    # Increase font sizes for readability
-    plt.rcParams['font.size'] = 12
-    plt.rcParams['axes.titlesize'] = 16
-    plt.rcParams['axes.labelsize'] = 14
-    plt.rcParams['xtick.labelsize'] = 12
-    plt.rcParams['ytick.labelsize'] = 12
-    plt.rcParams['legend.fontsize'] = 12
+    Args:
+        figsize: Figure size in inches as (width, height)
+        nrows: Rows of axes
+        ncols: Columns of axes
+        **subplot_options: Keyword arguments for Figure.subplots (e.g. sharex=True)
+    
+    Returns:
+        tuple: (Figure, Axes or array of Axes)
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols, **subplot_options)
+
+
+def _tier_path(output_dir, filename, tier):
+    """Path of one tier's file; the report tier keeps the plain chart name."""
+    extension = OUTPUT_TIERS[tier]["format"]
+    name = filename if tier == REPORT_TIER else f"{filename}.{tier}"
+    return os.path.join(output_dir, f"{name}.{extension}")
+
+
+def _optimize_png(filepath):
+    """Losslessly recompress a PNG after reducing it to a 256-color palette."""
+    from PIL import Image
+
+    with Image.open(filepath) as image:
+        image.load()
+    image.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(filepath, optimize=True)
+
 
+def _save_tier(fig, output_dir, filename, tier, optimize):
+    """Write one tier of a chart and describe the file."""
+    spec = OUTPUT_TIERS[tier]
+    filepath = _tier_path(output_dir, filename, tier)
+    options = {}
+    rc = {}
 
-def save_chart(plt, filename, format='png', dpi=300, output_dir=None):
+    if spec["format"] == "webp":
+        options["pil_kwargs"] = {"quality": spec.get("quality", 80), "method": 6 if optimize else 4}
+    elif spec["format"] == "svg":
+        # Leave out the timestamp so unchanged charts produce identical files
+        options["metadata"] = {"Date": None}
+        if optimize:
+            # Keep text as text instead of glyph outlines
+            rc["svg.fonttype"] = "none"
+
+    with matplotlib.rc_context(rc):
+        fig.savefig(filepath, format=spec["format"], dpi=spec["dpi"], bbox_inches='tight', **options)
+
+    if optimize and spec["format"] == "png":
+        _optimize_png(filepath)
+
+    return {
+        "chart": filename,
+        "tier": tier,
+        "path": filepath,
+        "format": spec["format"],
+        "dpi": spec["dpi"],
+        "bytes": os.path.getsize(filepath),
+    }
+
+
+def save_chart(fig, filename, format=None, dpi=None, output_dir=None, tiers=None, optimize=None):
     """
-    Save the chart to a file.
+    Save the chart to a file per output tier.
+    
+    Passing format or dpi writes a single file with those settings, as older
+    callers expect. Otherwise one file is written for each tier (see OUTPUT_TIERS);
+    the report tier is named "<filename>.<ext>" and the others "<filename>.<tier>.<ext>".
     
     Args:
-        plt: Matplotlib pyplot instance
+        fig: Matplotlib Figure (the pyplot module is also accepted for older callers)
         filename: Name of the file (without extension)
-        format: File format (default: png)
-        dpi: Resolution (default: 300)
+        format: File format for a single-file save (default: tiered output)
+        dpi: Resolution for a single-file save (default: tiered output)
         output_dir: Directory to save the chart (default: ./outputs/charts)
+        tiers: Output tiers to write (default: the active chart_outputs tiers or DEFAULT_TIERS)
+        optimize: Spend extra encoding time on smaller files (default: chart_outputs setting)
     
     Returns:
-        str: Path to the saved file
+        str: Path to the report-tier file, or the first tier written
     """
     if output_dir is None:
         # Default to outputs/charts directory relative to project root
@@ -56,17 +197,34 @@ def save_chart(plt, filename, format='png', dpi=300, output_dir=None):
     # Create directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Create full path
-    filepath = os.path.join(output_dir, f"{filename}.{format}")
+    if format is not None or dpi is not None:
+        format = format or 'png'
+        filepath = os.path.join(output_dir, f"{filename}.{format}")
+        fig.savefig(filepath, format=format, dpi=dpi or 300, bbox_inches='tight')
+    else:
+        settings = _output_settings.get() or {}
+        tiers = list(tiers or settings.get("tiers") or DEFAULT_TIERS)
+        optimize = settings.get("optimize", False) if optimize is None else optimize
+
+        unknown = [tier for tier in tiers if tier not in OUTPUT_TIERS]
+        if unknown:
+            raise ValueError(f"Unknown output tier: {', '.join(unknown)}. "
+                             f"Expected any of: {', '.join(OUTPUT_TIERS)}")
+
+        variants = [_save_tier(fig, output_dir, filename, tier, optimize) for tier in tiers]
+        if "variants" in settings:
+            settings["variants"].extend(variants)
+        filepath = next((v["path"] for v in variants if v["tier"] == REPORT_TIER), variants[0]["path"])
     
-    # Save the figure
-    plt.savefig(filepath, format=format, dpi=dpi, bbox_inches='tight')
-    plt.close()
+    if hasattr(fig, 'close'):
+        # pyplot keeps its current figure alive until it is closed
+        fig.close()
     
     return filepath
 
 
-def create_population_growth_chart(data, city_name, output_dir=None):
+@styled_chart
+def create_population_growth_chart(data, city_name, output_dir=None, trend=None, cagr=None):
     """
     Create a chart showing population growth over time.
     
@@ -74,12 +232,15 @@ def create_population_growth_chart(data, city_name, output_dir=None):
         data: Dictionary or DataFrame with years as keys/index and population as values
         city_name: Name of the city
         output_dir: Directory to save the chart (default: None)
+        trend: Optional precomputed yearly series (year -> population), e.g. from
+               trend_series on PropertyDataLoader.get_property_trends. Plotted
+               instead of fitting a trend line.
+        cagr: Optional precomputed growth rate (as a ratio) to annotate instead of
+              computing it from the data
     
     Returns:
         str: Path to the saved chart
     """
-    setup_chart_style()
-    
     # Convert to DataFrame if it's a dictionary
     if isinstance(data, dict):
         df = pd.DataFrame(list(data.items()), columns=['Year', 'Population'])
@@ -90,46 +251,54 @@ def create_population_growth_chart(data, city_name, output_dir=None):
     df = df.sort_values('Year')
     
     # Create the chart
-    plt.figure(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
     
     # Plot the data
-    plt.plot(df['Year'], df['Population'], marker='o', linewidth=3, markersize=8)
+    ax.plot(df['Year'], df['Population'], marker='o', linewidth=3, markersize=8)
     
-    # Add trend line (linear regression)
-    z = np.polyfit(range(len(df['Year'])), df['Population'], 1)
-    p = np.poly1d(z)
-    plt.plot(df['Year'], p(range(len(df['Year']))), "r--", linewidth=2, alpha=0.7)
+    # Add trend line (precomputed series, or linear regression when none is given)
+    if trend:
+        trend_years = sorted(trend)
+        ax.plot(trend_years, [trend[year] for year in trend_years], "r--", linewidth=2, alpha=0.7)
+    elif len(df) > 1:
+        z = np.polyfit(range(len(df['Year'])), df['Population'], 1)
+        p = np.poly1d(z)
+        ax.plot(df['Year'], p(range(len(df['Year']))), "r--", linewidth=2, alpha=0.7)
     
     # Calculate the growth rate
-    if len(df) > 1:
-        first_year = df['Year'].iloc[0]
-        last_year = df['Year'].iloc[-1]
-        first_pop = df['Population'].iloc[0]
-        last_pop = df['Population'].iloc[-1]
-        years_diff = last_year - first_year
-        growth_rate = ((last_pop / first_pop) ** (1 / years_diff) - 1) * 100
+    if cagr is not None or len(df) > 1:
+        if cagr is not None:
+            growth_rate = cagr * 100
+        else:
+            first_year = df['Year'].iloc[0]
+            last_year = df['Year'].iloc[-1]
+            first_pop = df['Population'].iloc[0]
+            last_pop = df['Population'].iloc[-1]
+            years_diff = last_year - first_year
+            growth_rate = ((last_pop / first_pop) ** (1 / years_diff) - 1) * 100
         
         # Add the growth rate annotation
-        plt.annotate(f"CAGR: {growth_rate:.2f}%", 
-                     xy=(0.7, 0.05), 
-                     xycoords='axes fraction', 
-                     fontsize=12,
-                     bbox=dict(boxstyle="round,pad=0.5", facecolor='white', alpha=0.8))
+        ax.annotate(f"CAGR: {growth_rate:.2f}%", 
+                    xy=(0.7, 0.05), 
+                    xycoords='axes fraction', 
+                    fontsize=12,
+                    bbox=dict(boxstyle="round,pad=0.5", facecolor='white', alpha=0.8))
     
     # Add labels and title
-    plt.title(f"Population Growth: {city_name}", fontweight='bold')
-    plt.xlabel("Year")
-    plt.ylabel("Population")
-    plt.grid(True, alpha=0.3)
+    ax.set_title(f"Population Growth: {city_name}", fontweight='bold')
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Population")
+    ax.grid(True, alpha=0.3)
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save and return the path
-    return save_chart(plt, f"population_growth_{city_name.lower().replace(' ', '_')}", 
+    return save_chart(fig, f"population_growth_{city_name.lower().replace(' ', '_')}", 
                      output_dir=output_dir)
 
 
+@styled_chart
 def create_income_distribution_chart(income_data, city_name, comparison_data=None, output_dir=None):
     """
     Create a chart showing income distribution.
@@ -143,50 +312,50 @@ def create_income_distribution_chart(income_data, city_name, comparison_data=Non
     Returns:
         str: Path to the saved chart
     """
-    setup_chart_style()
-    
     # Create the chart
-    plt.figure(figsize=(12, 7))
+    fig, ax = new_figure(figsize=(12, 7))
     
-    # Sort income brackets (assuming they're in the format "$X - $Y")
+    # Sort income brackets by their lower bound (e.g. "$X - $Y" or "$X+")
     sorted_brackets = sorted(income_data.keys(), 
-                             key=lambda x: int(x.split('-')[0].replace('$', '').replace(',', '').strip()))
+                             key=lambda x: int(re.sub(r'[^\d]', '', x.split('-')[0]) or 0))
     
     x = np.arange(len(sorted_brackets))
     width = 0.35
     
     # Plot city data
-    plt.bar(x - width/2 if comparison_data else x, 
-            [income_data[bracket] for bracket in sorted_brackets], 
-            width, 
-            label=city_name)
+    ax.bar(x - width/2 if comparison_data else x, 
+           [income_data[bracket] for bracket in sorted_brackets], 
+           width, 
+           label=city_name)
     
     # Plot comparison data if provided
     if comparison_data:
-        plt.bar(x + width/2, 
-                [comparison_data.get(bracket, 0) for bracket in sorted_brackets], 
-                width, 
-                label='National Average')
+        ax.bar(x + width/2, 
+               [comparison_data.get(bracket, 0) for bracket in sorted_brackets], 
+               width, 
+               label='National Average')
     
     # Add labels and title
-    plt.title(f"Income Distribution: {city_name}", fontweight='bold')
-    plt.xlabel("Income Bracket")
-    plt.ylabel("Percentage of Households")
-    plt.xticks(x, sorted_brackets, rotation=45, ha='right')
-    plt.grid(True, alpha=0.3, axis='y')
+    ax.set_title(f"Income Distribution: {city_name}", fontweight='bold')
+    ax.set_xlabel("Income Bracket")
+    ax.set_ylabel("Percentage of Households")
+    # Escape dollar signs so "$X - $Y" is not rendered as mathtext
+    ax.set_xticks(x, [bracket.replace('$', r'\$') for bracket in sorted_brackets], rotation=45, ha='right')
+    ax.grid(True, alpha=0.3, axis='y')
     
     if comparison_data:
-        plt.legend()
+        ax.legend()
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save and return the path
-    return save_chart(plt, f"income_distribution_{city_name.lower().replace(' ', '_')}", 
+    return save_chart(fig, f"income_distribution_{city_name.lower().replace(' ', '_')}", 
                      output_dir=output_dir)
 
 
-def create_housing_value_chart(data, city_name, output_dir=None):
+@styled_chart
+def create_housing_value_chart(data, city_name, output_dir=None, appreciation=None):
     """
     Create a chart showing housing value trends over time.
     
@@ -194,12 +363,12 @@ def create_housing_value_chart(data, city_name, output_dir=None):
         data: Dictionary or DataFrame with years as keys/index and median home values as values
         city_name: Name of the city
         output_dir: Directory to save the chart
+        appreciation: Optional precomputed annual appreciation rate (as a ratio), e.g.
+                      "home_value_5m_projected_cagr" from the trend table
     
     Returns:
         str: Path to the saved chart
     """
-    setup_chart_style()
-    
     # Convert to DataFrame if it's a dictionary
     if isinstance(data, dict):
         df = pd.DataFrame(list(data.items()), columns=['Year', 'Median Home Value'])
@@ -210,44 +379,48 @@ def create_housing_value_chart(data, city_name, output_dir=None):
     df = df.sort_values('Year')
     
     # Create the chart
-    plt.figure(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
     
     # Plot the data
-    plt.plot(df['Year'], df['Median Home Value'], marker='o', linewidth=3, markersize=8)
+    ax.plot(df['Year'], df['Median Home Value'], marker='o', linewidth=3, markersize=8)
     
     # Calculate the appreciation rate
-    if len(df) > 1:
-        first_year = df['Year'].iloc[0]
-        last_year = df['Year'].iloc[-1]
-        first_value = df['Median Home Value'].iloc[0]
-        last_value = df['Median Home Value'].iloc[-1]
-        years_diff = last_year - first_year
-        appreciation_rate = ((last_value / first_value) ** (1 / years_diff) - 1) * 100
+    if appreciation is not None or len(df) > 1:
+        if appreciation is not None:
+            appreciation_rate = appreciation * 100
+        else:
+            first_year = df['Year'].iloc[0]
+            last_year = df['Year'].iloc[-1]
+            first_value = df['Median Home Value'].iloc[0]
+            last_value = df['Median Home Value'].iloc[-1]
+            years_diff = last_year - first_year
+            appreciation_rate = ((last_value / first_value) ** (1 / years_diff) - 1) * 100
         
         # Add the appreciation rate annotation
-        plt.annotate(f"Annual Appreciation: {appreciation_rate:.2f}%", 
-                     xy=(0.05, 0.95), 
-                     xycoords='axes fraction', 
-                     fontsize=12,
-                     bbox=dict(boxstyle="round,pad=0.5", facecolor='white', alpha=0.8))
+        ax.annotate(f"Annual Appreciation: {appreciation_rate:.2f}%", 
+                    xy=(0.05, 0.95), 
+                    xycoords='axes fraction', 
+                    fontsize=12,
+                    bbox=dict(boxstyle="round,pad=0.5", facecolor='white', alpha=0.8))
     
     # Add dollar signs to y-axis
-    plt.gca().yaxis.set_major_formatter('${x:,.0f}')
+    ax.yaxis.set_major_formatter('${x:,.0f}')
     
     # Add labels and title
-    plt.title(f"Median Home Value Trends: {city_name}", fontweight='bold')
-    plt.xlabel("Year")
-    plt.ylabel("Median Home Value")
-    plt.grid(True, alpha=0.3)
+    ax.set_title(f"Median Home Value Trends: {city_name}", fontweight='bold')
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Median Home Value")
+    ax.grid(True, alpha=0.3)
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save and return the path
-    return save_chart(plt, f"housing_value_{city_name.lower().replace(' ', '_')}", 
+    return save_chart(fig, f"housing_value_{city_name.lower().replace(' ', '_')}", 
                      output_dir=output_dir)
 
 
+@styled_chart
 def create_age_demographic_chart(data, city_name, comparison_data=None, output_dir=None):
     """
     Create a chart showing age demographics.
@@ -261,10 +434,8 @@ def create_age_demographic_chart(data, city_name, comparison_data=None, output_d
     Returns:
         str: Path to the saved chart
     """
-    setup_chart_style()
-    
     # Create the chart
-    plt.figure(figsize=(12, 7))
+    fig, ax = new_figure(figsize=(12, 7))
     
     # Define standard age brackets if not consistent
     standard_brackets = ['0-9', '10-19', '20-29', '30-39', '40-49', '50-59', '60-69', '70-79', '80+']
@@ -280,33 +451,33 @@ def create_age_demographic_chart(data, city_name, comparison_data=None, output_d
     width = 0.35
     
     # Plot city data
-    plt.bar(x - width/2 if comparison_data else x, 
-            [data.get(bracket, 0) for bracket in sorted_brackets], 
-            width, 
-            label=city_name)
+    ax.bar(x - width/2 if comparison_data else x, 
+           [data.get(bracket, 0) for bracket in sorted_brackets], 
+           width, 
+           label=city_name)
     
     # Plot comparison data if provided
     if comparison_data:
-        plt.bar(x + width/2, 
-                [comparison_data.get(bracket, 0) for bracket in sorted_brackets], 
-                width, 
-                label='National Average')
+        ax.bar(x + width/2, 
+               [comparison_data.get(bracket, 0) for bracket in sorted_brackets], 
+               width, 
+               label='National Average')
     
     # Add labels and title
-    plt.title(f"Age Distribution: {city_name}", fontweight='bold')
-    plt.xlabel("Age Group")
-    plt.ylabel("Percentage of Population")
-    plt.xticks(x, sorted_brackets)
-    plt.grid(True, alpha=0.3, axis='y')
+    ax.set_title(f"Age Distribution: {city_name}", fontweight='bold')
+    ax.set_xlabel("Age Group")
+    ax.set_ylabel("Percentage of Population")
+    ax.set_xticks(x, sorted_brackets)
+    ax.grid(True, alpha=0.3, axis='y')
     
     if comparison_data:
-        plt.legend()
+        ax.legend()
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save and return the path
-    return save_chart(plt, f"age_distribution_{city_name.lower().replace(' ', '_')}", 
+    return save_chart(fig, f"age_distribution_{city_name.lower().replace(' ', '_')}", 
                      output_dir=output_dir)
 
 
@@ -372,6 +543,7 @@ def create_market_radar_chart(metrics, property_name, output_dir=None):
     return filepath
 
 
+@styled_chart
 def create_property_comparison_chart(properties_data, metrics, output_dir=None):
     """
     Create a grouped bar chart comparing multiple properties across metrics.
@@ -384,14 +556,12 @@ def create_property_comparison_chart(properties_data, metrics, output_dir=None):
     Returns:
         str: Path to the saved chart
     """
-    setup_chart_style()
-    
     # Number of properties and metrics
     n_properties = len(properties_data)
     n_metrics = len(metrics)
     
     # Create a figure with appropriate size
-    plt.figure(figsize=(12, 8))
+    fig, ax = new_figure(figsize=(12, 8))
     
     # Set up the x-axis
     x = np.arange(n_metrics)
@@ -403,19 +573,66 @@ def create_property_comparison_chart(properties_data, metrics, output_dir=None):
         scores = [prop.get(metric, 0) for metric in metrics]
         
         offset = (i - n_properties / 2 + 0.5) * width
-        plt.bar(x + offset, scores, width, label=property_name)
+        ax.bar(x + offset, scores, width, label=property_name)
+    
+    # Add labels and title
+    ax.set_title("Property Comparison", fontweight='bold')
+    ax.set_xlabel("Metrics")
+    ax.set_ylabel("Score (0-10)")
+    ax.set_xticks(x, metrics, rotation=45, ha='right')
+    ax.set_yticks(np.arange(0, 11, 1))
+    ax.grid(True, alpha=0.3, axis='y')
+    ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=n_properties)
+    
+    # Adjust layout
+    fig.tight_layout()
+    
+    # Save and return the path
+    return save_chart(fig, "property_comparison", output_dir=output_dir) 
+
+@styled_chart
+def create_tornado_chart(sensitivities, property_name, metric_label="ROI", as_percent=True, output_dir=None):
+    """
+    Create a tornado chart showing which assumptions move a metric the most.
+    
+    Args:
+        sensitivities: DataFrame rows from tornado_sensitivities for a single property
+        property_name: Name of the property
+        metric_label: Label of the metric on the x-axis
+        as_percent: Whether the metric is a ratio to display as a percentage
+        output_dir: Directory to save the chart
+    
+    Returns:
+        str: Path to the saved chart
+    """
+    # Largest swing at the top
+    data = sensitivities.sort_values('swing', ascending=True)
+    scale = 100 if as_percent else 1
+    base = data['base'].iloc[0] * scale
+    low = data['low'].to_numpy() * scale
+    high = data['high'].to_numpy() * scale
+    
+    fig, ax = new_figure(figsize=(10, max(4, 0.6 * len(data) + 2)))
+    
+    y = np.arange(len(data))
+    ax.barh(y, low - base, left=base, color='#E74C3C', label='Low value')
+    ax.barh(y, high - base, left=base, color='#2ECC71', label='High value')
+    ax.axvline(base, color='#2C3E50', linewidth=1.5)
+    
+    # Label each bar with the tested parameter range
+    labels = [f"{row.label} ({row.low_value:g} / {row.high_value:g})" for row in data.itertuples()]
+    ax.set_yticks(y, labels)
     
     # Add labels and title
-    plt.title("Property Comparison", fontweight='bold')
-    plt.xlabel("Metrics")
-    plt.ylabel("Score (0-10)")
-    plt.xticks(x, metrics, rotation=45, ha='right')
-    plt.yticks(np.arange(0, 11, 1))
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=n_properties)
+    unit = " (%)" if as_percent else ""
+    ax.set_title(f"Sensitivity of {metric_label}: {property_name}", fontweight='bold')
+    ax.set_xlabel(f"{metric_label}{unit} (base case {base:,.1f})")
+    ax.grid(True, alpha=0.3, axis='x')
+    ax.legend(loc='lower right')
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save and return the path
-    return save_chart(plt, "property_comparison", output_dir=output_dir) 
\ No newline at end of file
+    return save_chart(fig, f"tornado_{property_name.lower().replace(' ', '_')}", 
+                     output_dir=output_dir)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Offline geographic heat maps for the Land Analysis Crew.
+Plots every listing by Latitude/Longitude on a plain projected graticule (no
+tile server or network access), colored by any scored metric, and aggregates
+dense areas into hexagonal bins. Binning and drawing are vectorized over the
+whole portfolio: one hexagon collection and one scatter per map.
+"""
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import Normalize
+from matplotlib.transforms import AffineDeltaTransform
+from matplotlib.ticker import FuncFormatter
+
+from .charts import styled_chart, new_figure, save_chart
+from .portfolio import portfolio_matrix, COMPOSITE_SCORE
+
+# Unit hexagon (pointy top), scaled by the bin width and row height
+HEXAGON = np.array([[0.5, -0.5], [0.5, 0.5], [0.0, 1.0], [-0.5, 0.5], [-0.5, -0.5], [0.0, -1.0]])
+
+
+def project_coordinates(latitude, longitude, reference_latitude=None):
+    """
+    Project coordinates onto a plane with equal distances along both axes.
+
+    Uses an equirectangular projection scaled by the cosine of a reference
+    latitude, which is accurate enough for regional and national portfolios.
+
+    Args:
+        latitude: Array of latitudes in degrees
+        longitude: Array of longitudes in degrees
+        reference_latitude: Latitude where the scale is exact (default: mean latitude)
+
+    Returns:
+        tuple: (x, y, scale) where x = longitude * scale and y = latitude
+    """
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+    if reference_latitude is None:
+        reference_latitude = np.nanmean(latitude) if np.isfinite(latitude).any() else 0.0
+    scale = np.cos(np.radians(reference_latitude))
+    return longitude * scale, latitude, scale
+
+
+def hex_bins(x, y, gridsize, extent=None):
+    """
+    Assign points to a grid of regular hexagons.
+
+    Follows the two offset lattices used by matplotlib's hexbin, with the row
+    height chosen so the hexagons are regular in projected coordinates.
+
+    Args:
+        x: Array of projected x coordinates
+        y: Array of projected y coordinates
+        gridsize: Number of hexagons across the x extent
+        extent: (xmin, xmax, ymin, ymax) of the grid (default: data bounds)
+
+    Returns:
+        tuple: (bin index per point, (bins x 2) hexagon centers, bin width, row height)
+    """
+    if extent is None:
+        extent = (np.min(x), np.max(x), np.min(y), np.max(y))
+    xmin, xmax, ymin, _ = extent
+
+    width = max(xmax - xmin, 1e-9) / max(gridsize, 1)
+    height = width * np.sqrt(3)
+
+    ix = (x - xmin) / width
+    iy = (y - ymin) / height
+    ix1, iy1 = np.round(ix), np.round(iy)
+    ix2, iy2 = np.floor(ix), np.floor(iy)
+
+    # Nearest center of the main lattice or the lattice offset by half a cell
+    d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+    d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+    on_main = d1 < d2
+
+    center_x = np.where(on_main, ix1, ix2 + 0.5)
+    center_y = np.where(on_main, iy1, iy2 + 0.5)
+    keys, bins = np.unique(np.column_stack([center_x, center_y]), axis=0, return_inverse=True)
+
+    centers = np.column_stack([xmin + keys[:, 0] * width, ymin + keys[:, 1] * height])
+    return bins.ravel(), centers, width, height
+
+
+@styled_chart
+def create_geo_heatmap(properties, metric=COMPOSITE_SCORE, gridsize=30, min_count=2, cmap='viridis',
+                       output_dir=None):
+    """
+    Create a map of all listings colored by a metric, binning dense areas into hexagons.
+
+    Hexagons holding at least min_count listings are drawn filled with the
+    mean metric of their listings; listings in sparser hexagons are drawn as
+    individual points on the same color scale.
+
+    Args:
+        properties: DataFrame of listings with Latitude and Longitude columns
+        metric: Numeric column used for color
+        gridsize: Number of hexagons across the longer side of the map
+        min_count: Listings needed before an area is drawn as a hexagon
+        cmap: Matplotlib colormap name
+        output_dir: Directory to save the chart
+
+    Returns:
+        str: Path to the saved chart
+    """
+    for column in ['Latitude', 'Longitude', metric]:
+        if column not in properties.columns:
+            raise ValueError(f"Column not found for map: {column}")
+
+    stock_numbers, matrix = portfolio_matrix(properties, ['Latitude', 'Longitude', metric])
+    latitude, longitude, values = matrix.T
+
+    located = np.isfinite(latitude) & np.isfinite(longitude)
+    scored = located & np.isfinite(values)
+    x, y, scale = project_coordinates(latitude[scored], longitude[scored])
+    values = values[scored]
+
+    # Size the figure to the portfolio's footprint, plus room for the colorbar
+    x_span = np.ptp(x) if len(x) else 1.0
+    y_span = np.ptp(y) if len(y) else 1.0
+    aspect = y_span / x_span if x_span > 0 else 1.0
+    fig, ax = new_figure(figsize=(float(np.clip(9 / max(aspect, 1e-9), 5, 16)) + 2, 9))
+    if len(values) == 0:
+        ax.text(0.5, 0.5, f"No located listings with {metric.replace('_', ' ')}",
+                ha='center', va='center', transform=ax.transAxes)
+        return save_chart(fig, f"geo_heatmap_{metric.lower()}", output_dir=output_dir)
+
+    # Square grid extent so hexagon size follows the longer side of the map
+    span = max(x_span, y_span, 1e-6)
+    bins, centers, width, height = hex_bins(x, y, gridsize, (x.min(), x.min() + span, y.min(), y.min() + span))
+    counts = np.bincount(bins)
+    means = np.bincount(bins, weights=values) / counts
+    dense = counts >= min_count
+
+    low, high = np.nanpercentile(values, [2, 98])
+    norm = Normalize(vmin=low, vmax=high if high > low else low + 1)
+
+    # Dense areas: one collection of hexagons sized to the grid (as matplotlib's
+    # hexbin does, the shape is in data units and the offsets are data deltas)
+    hexagons = PolyCollection([HEXAGON * [width, height / 3]], offsets=centers[dense],
+                              offset_transform=AffineDeltaTransform(ax.transData), array=means[dense],
+                              cmap=cmap, norm=norm, edgecolors='white', linewidths=0.8)
+    ax.add_collection(hexagons)
+
+    # Sparse areas: individual listings
+    sparse = ~dense[bins]
+    points = ax.scatter(x[sparse], y[sparse], c=values[sparse], cmap=cmap, norm=norm,
+                        s=36, edgecolors='#2C3E50', linewidths=0.6, zorder=3)
+
+    # Listing counts on the aggregated hexagons
+    for (cx, cy), count in zip(centers[dense], counts[dense]):
+        ax.text(cx, cy, str(count), ha='center', va='center', fontsize=7, color='white', zorder=4)
+
+    # State labels give context without a base map
+    if 'State' in properties.columns:
+        states = properties['State'].astype(str).str.strip().to_numpy()[scored]
+        for state in np.unique(states):
+            in_state = states == state
+            ax.text(np.median(x[in_state]), np.max(y[in_state]) + height, state, ha='center',
+                    va='bottom', fontsize=11, fontweight='bold', color='#7F8C8D', zorder=4)
+
+    pad = max(width, 0.1)
+    ax.set_xlim(x.min() - pad, x.max() + pad)
+    ax.set_ylim(y.min() - pad, y.max() + 3 * pad)
+    ax.set_aspect('equal')
+
+    # Axes are projected; label them in degrees
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value / scale:.1f}°"))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value:.1f}°"))
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+
+    colorbar = fig.colorbar(points, ax=ax, fraction=0.035, pad=0.02)
+    colorbar.set_label(f"{metric.replace('_', ' ')} (hexagons: mean)")
+
+    unplotted = len(stock_numbers) - int(scored.sum())
+    title = (f"{metric.replace('_', ' ')}: {int(scored.sum())} Listings, "
+             f"{int(counts[dense].sum())} in {int(dense.sum())} Hexagons")
+    if unplotted:
+        title += f" ({unplotted} without location or score)"
+    ax.set_title(title, fontweight='bold')
+    fig.tight_layout()
+
+    return save_chart(fig, f"geo_heatmap_{metric.lower()}", output_dir=output_dir)
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Parallel chart rendering pipeline for property reports.
+Renders chart sets in a process pool on the headless Agg backend and caches
+every chart by a hash of its input data, style and output tiers, so unchanged
+charts are skipped on re-runs. Each chart directory gets a manifest.json that
+links the thumbnail, screen and print variants of its charts.
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from . import charts, portfolio, maps
+from .portfolio import INCOME_BRACKETS, AGE_BRACKETS
+from ..analysis.trends import TREND_METRICS, trend_series
+from ..utils.files import atomic_write
+from ..utils.formatting import print_error, print_info
+
+# Chart functions the pipeline can render, by name
+CHART_FUNCTIONS = {
+    "population_growth": charts.create_population_growth_chart,
+    "income_distribution": charts.create_income_distribution_chart,
+    "housing_value": charts.create_housing_value_chart,
+    "age_demographic": charts.create_age_demographic_chart,
+    "property_comparison": charts.create_property_comparison_chart,
+    "tornado": charts.create_tornado_chart,
+    "market_radar": charts.create_market_radar_chart,
+    "score_heatmap": portfolio.create_score_heatmap,
+    "scatter_matrix": portfolio.create_scatter_matrix,
+    "distribution_small_multiples": portfolio.create_distribution_small_multiples,
+    "geo_heatmap": maps.create_geo_heatmap,
+}
+
+# Bump to invalidate every cached chart after a drawing code change
+RENDER_VERSION = 2
+
+# Per-directory index of chart variants
+MANIFEST_NAME = "manifest.json"
+
+
+def _canonical(value):
+    """Convert chart inputs into JSON-serializable values for hashing."""
+    if isinstance(value, pd.DataFrame):
+        return {"columns": [str(c) for c in value.columns],
+                "data": _canonical(value.to_numpy().tolist())}
+    if isinstance(value, pd.Series):
+        return _canonical(value.to_dict())
+    if isinstance(value, np.ndarray):
+        return _canonical(value.tolist())
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def chart_hash(chart, kwargs, tiers=None, optimize=False):
+    """
+    Hash a chart's type, input data, output location, style and output tiers.
+
+    Args:
+        chart: Chart name from CHART_FUNCTIONS
+        kwargs: Keyword arguments for the chart function
+        tiers: Output tiers written (default: charts.DEFAULT_TIERS)
+        optimize: Whether the outputs are optimized
+
+    Returns:
+        str: Hex digest identifying the rendered output
+    """
+    tiers = list(tiers or charts.DEFAULT_TIERS)
+    payload = {
+        "chart": chart,
+        "kwargs": _canonical(kwargs),
+        "style": [charts.CHART_BASE_STYLE, repr(sorted(charts.CHART_STYLE.items()))],
+        "outputs": {"optimize": bool(optimize),
+                    "tiers": {tier: charts.OUTPUT_TIERS.get(tier) for tier in tiers}},
+        "version": RENDER_VERSION,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _init_worker():
+    """Force the headless backend in worker processes."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render(chart, kwargs, tiers=None, optimize=False):
+    """Render one chart; runs in a worker process."""
+    with charts.chart_outputs(tiers, optimize) as variants:
+        path = CHART_FUNCTIONS[chart](**kwargs)
+    return {"path": path, "variants": variants}
+
+
+def write_manifests(variants):
+    """
+    Merge chart variants into the manifest.json of each chart directory.
+
+    Manifests map chart name to tier to the file, format, dpi and size, with
+    file names relative to the manifest so chart directories can be moved.
+
+    Args:
+        variants: Variant descriptions recorded by charts.save_chart
+
+    Returns:
+        list: Paths of the manifests written
+    """
+    by_directory = {}
+    for variant in variants:
+        by_directory.setdefault(os.path.dirname(variant["path"]), []).append(variant)
+
+    written = []
+    for directory, entries in sorted(by_directory.items()):
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        manifest = {"charts": {}, "updated_at": None}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path) as f:
+                    manifest.update(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                print_error(f"Rebuilding unreadable chart manifest {manifest_path}: {e}")
+
+        for variant in entries:
+            manifest["charts"].setdefault(variant["chart"], {})[variant["tier"]] = {
+                "file": os.path.basename(variant["path"]),
+                "format": variant["format"],
+                "dpi": variant["dpi"],
+                "bytes": variant["bytes"],
+            }
+        manifest["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+        with atomic_write(manifest_path) as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        written.append(manifest_path)
+
+    return written
+
+
+class ChartRenderer:
+    """
+    Renders chart specs in parallel, skipping charts whose inputs are unchanged.
+    """
+
+    def __init__(self, cache_path=None, max_workers=None, tiers=None, optimize=False):
+        """
+        Initialize the chart renderer.
+
+        Args:
+            cache_path: JSON file mapping chart hashes to rendered files
+                        (default: outputs/charts/chart_cache.json)
+            max_workers: Maximum worker processes (default: CPU count)
+            tiers: Output tiers to write, e.g. ["screen", "print"]
+                   (default: charts.DEFAULT_TIERS)
+            optimize: Spend extra encoding time on smaller files
+        """
+        if cache_path is None:
+            project_root = Path(__file__).parent.parent.parent
+            cache_path = project_root / "outputs" / "charts" / "chart_cache.json"
+
+        self.cache_path = Path(cache_path)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tiers = list(tiers or charts.DEFAULT_TIERS)
+        self.optimize = optimize
+        self.cache = self._read_cache()
+
+        unknown = [tier for tier in self.tiers if tier not in charts.OUTPUT_TIERS]
+        if unknown:
+            raise ValueError(f"Unknown output tier: {', '.join(unknown)}. "
+                             f"Expected any of: {', '.join(charts.OUTPUT_TIERS)}")
+
+    def _read_cache(self):
+        """Read the chart cache index."""
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print_error(f"Ignoring unreadable chart cache {self.cache_path}: {e}")
+            return {}
+
+    def _write_cache(self):
+        """Write the chart cache index atomically."""
+        with atomic_write(self.cache_path) as f:
+            json.dump(self.cache, f, indent=2, sort_keys=True)
+
+    def render(self, specs, use_cache=True):
+        """
+        Render a list of charts.
+
+        Args:
+            specs: List of (chart name, keyword arguments) tuples
+            use_cache: Skip charts whose hash matches an existing output
+
+        Returns:
+            list: Report-tier paths in the same order as specs (None for failed charts)
+        """
+        for chart, _ in specs:
+            if chart not in CHART_FUNCTIONS:
+                raise ValueError(f"Unknown chart type: {chart}. "
+                                 f"Expected any of: {', '.join(CHART_FUNCTIONS)}")
+
+        hashes = [chart_hash(chart, kwargs, self.tiers, self.optimize) for chart, kwargs in specs]
+        paths = [None] * len(specs)
+        todo = []
+
+        for position, digest in enumerate(hashes):
+            cached = self.cache.get(digest)
+            if use_cache and isinstance(cached, dict) and os.path.exists(cached["path"]):
+                paths[position] = cached["path"]
+            else:
+                todo.append(position)
+
+        if todo:
+            print_info(f"Rendering {len(todo)} charts ({len(specs) - len(todo)} unchanged)")
+            variants = []
+            for position, result in zip(todo, self._render_all([specs[p] for p in todo])):
+                if result is None:
+                    continue
+                paths[position] = result["path"]
+                self.cache[hashes[position]] = result
+                variants.extend(result["variants"])
+            write_manifests(variants)
+            self._write_cache()
+
+        return paths
+
+    def variant_paths(self, path):
+        """
+        Get every tier file rendered alongside a chart.
+
+        Args:
+            path: Report-tier path returned by render
+
+        Returns:
+            list: Paths of all variants (just path when none are known)
+        """
+        for entry in self.cache.values():
+            if isinstance(entry, dict) and entry["path"] == path:
+                return [variant["path"] for variant in entry["variants"]] or [path]
+        return [path]
+
+    def _render_all(self, specs):
+        """Render specs in a process pool, or inline when a pool would not pay off."""
+        workers = min(self.max_workers, len(specs))
+        if workers <= 1:
+            return [self._render_safely(chart, kwargs) for chart, kwargs in specs]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_render, chart, kwargs, self.tiers, self.optimize)
+                       for chart, kwargs in specs]
+            results = []
+            for (chart, _), future in zip(specs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print_error(f"Error rendering {chart} chart: {e}")
+                    results.append(None)
+            return results
+
+    def _render_safely(self, chart, kwargs):
+        """Render one chart in this process, reporting failures."""
+        try:
+            return _render(chart, kwargs, self.tiers, self.optimize)
+        except Exception as e:
+            print_error(f"Error rendering {chart} chart: {e}")
+            return None
+
+
+def _bracket_shares(property_data, brackets):
+    """Convert bracket counts into percentages, or None if the data is missing."""
+    counts = {label: pd.to_numeric(property_data.get(column), errors='coerce')
+              for column, label in brackets.items()}
+    total = np.nansum(list(counts.values()))
+    if not total:
+        return None
+    return {label: 0.0 if pd.isna(count) else float(count / total * 100) for label, count in counts.items()}
+
+
+def _known_rate(trends, column):
+    """Get a rate from the trend table, or None if it is missing so the chart derives it from its data."""
+    rate = trends.get(column)
+    return None if rate is None or pd.isna(rate) else float(rate)
+
+
+def property_chart_specs(property_data, trends=None, output_dir=None):
+    """
+    Build the standard chart set for one property.
+
+    Args:
+        property_data: Dictionary of property data
+        trends: Optional row from PropertyDataLoader.get_property_trends
+        output_dir: Directory for the charts (default: outputs/charts/<StockNumber>)
+
+    Returns:
+        list: (chart name, keyword arguments) tuples for ChartRenderer.render
+    """
+    stock_number = str(property_data.get('StockNumber', 'unknown')).strip()
+    if output_dir is None:
+        project_root = Path(__file__).parent.parent.parent
+        output_dir = project_root / "outputs" / "charts" / stock_number
+    output_dir = str(output_dir)
+
+    city = str(property_data.get('City', 'Unknown'))
+    specs = []
+
+    if trends is not None:
+        population = trend_series(trends, "population", 5)
+        known = {year: population[year] for year in TREND_METRICS["population"] if year in population}
+        if len(known) > 1:
+            specs.append(("population_growth", {
+                "data": known, "city_name": city, "output_dir": output_dir,
+                "trend": population, "cagr": _known_rate(trends, "population_5m_cagr"),
+            }))
+
+        home_values = trend_series(trends, "home_value", 5)
+        known = {year: home_values[year] for year in TREND_METRICS["home_value"] if year in home_values}
+        if len(known) > 1:
+            specs.append(("housing_value", {
+                "data": known, "city_name": city, "output_dir": output_dir,
+                "appreciation": _known_rate(trends, "home_value_5m_projected_cagr"),
+            }))
+
+    income = _bracket_shares(property_data, INCOME_BRACKETS)
+    if income:
+        specs.append(("income_distribution", {"income_data": income, "city_name": city, "output_dir": output_dir}))
+
+    ages = _bracket_shares(property_data, AGE_BRACKETS)
+    if ages:
+        specs.append(("age_demographic", {"data": ages, "city_name": city, "output_dir": output_dir}))
+
+    return specs
+
+
+def render_property_charts(loader, stock_numbers, renderer=None, change_tracker=None):
+    """
+    Render the chart sets of one or more properties in a single process pool.
+
+    Args:
+        loader: PropertyDataLoader with the properties loaded
+        stock_numbers: Stock number or list of stock numbers
+        renderer: Optional ChartRenderer (default: project chart cache)
+        change_tracker: Optional ChangeTracker; charts are registered so they are
+                        invalidated when their listing changes
+
+    Returns:
+        dict: Stock number to the list of rendered chart paths
+    """
+    if isinstance(stock_numbers, str):
+        stock_numbers = [stock_numbers]
+
+    renderer = renderer or ChartRenderer()
+    owners = []
+    specs = []
+    for stock_number in stock_numbers:
+        property_data = loader.get_property_data(stock_number)
+        if property_data is None:
+            print_error(f"Property with stock number {stock_number} not found.")
+            continue
+        property_specs = property_chart_specs(property_data, loader.get_property_trends(stock_number))
+        specs.extend(property_specs)
+        owners.extend([str(stock_number).strip()] * len(property_specs))
+
+    rendered = {str(stock_number).strip(): [] for stock_number in stock_numbers}
+    for stock_number, path in zip(owners, renderer.render(specs)):
+        if path is None:
+            continue
+        rendered[stock_number].append(path)
+        if change_tracker is not None:
+            for variant_path in renderer.variant_paths(path):
+                change_tracker.register_artifact(stock_number, variant_path, kind="chart")
+
+    return rendered
+
+
+def render_portfolio_dashboard(properties, renderer=None, output_dir=None, map_metrics=None):
+    """
+    Render the portfolio dashboard (score heat map, scatter matrix, distribution
+    small multiples and geographic heat maps) for all listings.
+
+    Args:
+        properties: DataFrame of listings (e.g. PropertyDataLoader.properties)
+        renderer: Optional ChartRenderer (default: project chart cache)
+        output_dir: Directory for the charts (default: outputs/charts/portfolio)
+        map_metrics: Metrics to draw as geographic heat maps (default: Composite_Score)
+
+    Returns:
+        list: Paths of the rendered charts
+    """
+    renderer = renderer or ChartRenderer()
+    specs = portfolio.portfolio_chart_specs(properties, output_dir=output_dir, map_metrics=map_metrics)
+    return renderer.render(specs)
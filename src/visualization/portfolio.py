@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Portfolio-wide charts for the Land Analysis Crew.
+Draws every listing in a single figure pass (small-multiple grids, Composite_Score
+component heat maps and scatter matrices) from NumPy column arrays rather than
+per-property dictionaries.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from .charts import styled_chart, new_figure, save_chart, CHART_COLORS
+from ..utils.columns import to_numeric_array
+
+# Components that make up the Composite_Score
+SCORE_COMPONENTS = [
+    'Home_Affordability',
+    'Rent_Affordability',
+    'Convenience_Index',
+    'Population_Access',
+    'Market_Saturation',
+]
+COMPOSITE_SCORE = 'Composite_Score'
+
+# Household income bracket columns (5-mile radius) and their labels
+INCOME_BRACKETS = {
+    "HHInc0_5": "$0 - $9,999",
+    "HHInc10_5": "$10,000 - $14,999",
+    "HHInc15_5": "$15,000 - $24,999",
+    "HHInc25_5": "$25,000 - $34,999",
+    "HHInc35_5": "$35,000 - $49,999",
+    "HHInc50_5": "$50,000 - $74,999",
+    "HHInc75_5": "$75,000 - $99,999",
+    "HHInc100_5": "$100,000 - $149,999",
+    "HHInc150_5": "$150,000 - $199,999",
+    "HHInc200_5": "$200,000+",
+}
+
+# Age bracket columns (5-mile radius) and their labels
+AGE_BRACKETS = {
+    "Age0_4_5": "0-4",
+    "Age5_9_5": "5-9",
+    "Age10_14_5": "10-14",
+    "Age15_19_5": "15-19",
+    "Age20_24_5": "20-24",
+    "Age25_34_5": "25-34",
+    "Age35_44_5": "35-44",
+    "Age45_54_5": "45-54",
+    "Age55_59_5": "55-59",
+    "Age60_64_5": "60-64",
+    "Age65_74_5": "65-74",
+    "Age75_84_5": "75-84",
+    "Over85_5": "85+",
+}
+
+# Bracket sets available for distribution small multiples
+DISTRIBUTIONS = {
+    "income": ("Household Income (5-mile)", INCOME_BRACKETS),
+    "age": ("Age (5-mile)", AGE_BRACKETS),
+}
+
+
+def portfolio_matrix(properties, columns):
+    """
+    Extract numeric columns for every listing as one float matrix.
+
+    Args:
+        properties: DataFrame of listings
+        columns: Column names to extract (missing columns become NaN)
+
+    Returns:
+        tuple: (stock number array, (listings x columns) float array)
+    """
+    matrix = np.full((len(properties), len(columns)), np.nan)
+    for position, column in enumerate(columns):
+        if column in properties.columns:
+            matrix[:, position] = to_numeric_array(properties[column])
+
+    if 'StockNumber' in properties.columns:
+        stock_numbers = properties['StockNumber'].astype(str).str.strip().to_numpy()
+    else:
+        stock_numbers = np.arange(len(properties)).astype(str)
+    return stock_numbers, matrix
+
+
+def percentile_ranks(matrix):
+    """
+    Convert each column of a matrix to percentile ranks (0-100), ignoring NaN.
+
+    Args:
+        matrix: (rows x columns) float array
+
+    Returns:
+        numpy.ndarray: Percentile ranks with NaN preserved
+    """
+    ranks = pd.DataFrame(matrix).rank(pct=True).to_numpy() * 100
+    return np.where(np.isnan(matrix), np.nan, ranks)
+
+
+def _grid_shape(count, ncols):
+    """Rows and columns for a grid of count panels."""
+    ncols = max(1, min(ncols, count))
+    return int(np.ceil(count / ncols)), ncols
+
+
+@styled_chart
+def create_score_heatmap(properties, components=None, sort_by=COMPOSITE_SCORE, output_dir=None):
+    """
+    Create a heat map of Composite_Score components for every listing.
+
+    Cells show each listing's percentile rank on a component, so components with
+    different units share one color scale.
+
+    Args:
+        properties: DataFrame of listings
+        components: Score columns to show (default: SCORE_COMPONENTS plus Composite_Score)
+        sort_by: Column used to order the rows, highest first
+        output_dir: Directory to save the chart
+
+    Returns:
+        str: Path to the saved chart
+    """
+    components = components or SCORE_COMPONENTS + [COMPOSITE_SCORE]
+    stock_numbers, matrix = portfolio_matrix(properties, components)
+
+    # Order listings by the sort column, highest first and missing values last
+    if sort_by in components:
+        key = matrix[:, components.index(sort_by)]
+        order = np.argsort(np.where(np.isnan(key), -np.inf, key), kind="stable")[::-1]
+        stock_numbers, matrix = stock_numbers[order], matrix[order]
+
+    ranks = percentile_ranks(matrix)
+    n_rows = len(stock_numbers)
+
+    fig, ax = new_figure(figsize=(2 + 1.6 * len(components), max(4, 0.16 * n_rows + 2)))
+    image = ax.imshow(np.ma.masked_invalid(ranks), aspect='auto', cmap='RdYlGn',
+                      vmin=0, vmax=100, interpolation='nearest')
+
+    ax.set_xticks(np.arange(len(components)), [c.replace('_', ' ') for c in components],
+                  rotation=30, ha='right')
+    ax.set_yticks(np.arange(n_rows), stock_numbers, fontsize=max(5, min(10, 600 / max(n_rows, 1))))
+    ax.grid(False)
+
+    colorbar = fig.colorbar(image, ax=ax, fraction=0.05, pad=0.02)
+    colorbar.set_label("Percentile")
+
+    ax.set_title(f"Score Components: {n_rows} Listings", fontweight='bold')
+    fig.tight_layout()
+
+    return save_chart(fig, "portfolio_score_heatmap", output_dir=output_dir)
+
+
+@styled_chart
+def create_scatter_matrix(properties, columns=None, color_by=COMPOSITE_SCORE, output_dir=None):
+    """
+    Create a scatter matrix of score columns across all listings.
+
+    Args:
+        properties: DataFrame of listings
+        columns: Columns to plot against each other (default: SCORE_COMPONENTS)
+        color_by: Column used to color the points
+        output_dir: Directory to save the chart
+
+    Returns:
+        str: Path to the saved chart
+    """
+    columns = columns or SCORE_COMPONENTS
+    _, matrix = portfolio_matrix(properties, columns + [color_by])
+    values, colors = matrix[:, :-1], matrix[:, -1]
+    k = len(columns)
+
+    fig, axes = new_figure(figsize=(2.6 * k, 2.6 * k), nrows=k, ncols=k, squeeze=False)
+
+    scatter = None
+    for row in range(k):
+        for col in range(k):
+            ax = axes[row, col]
+            if row == col:
+                data = values[:, row]
+                ax.hist(data[~np.isnan(data)], bins=15, color=CHART_COLORS[2], alpha=0.8)
+            else:
+                scatter = ax.scatter(values[:, col], values[:, row], c=colors, cmap='viridis',
+                                     s=14, alpha=0.85, linewidths=0)
+            ax.tick_params(labelsize=8)
+            if row == k - 1:
+                ax.set_xlabel(columns[col].replace('_', ' '), fontsize=10)
+            else:
+                ax.set_xticklabels([])
+            if col == 0:
+                ax.set_ylabel(columns[row].replace('_', ' '), fontsize=10)
+            elif row != col:
+                ax.set_yticklabels([])
+
+    if scatter is not None:
+        colorbar = fig.colorbar(scatter, ax=axes, fraction=0.02, pad=0.02)
+        colorbar.set_label(color_by.replace('_', ' '))
+
+    fig.suptitle("Score Scatter Matrix", fontweight='bold', fontsize=16)
+
+    return save_chart(fig, "portfolio_scatter_matrix", output_dir=output_dir)
+
+
+@styled_chart
+def create_distribution_small_multiples(properties, distribution="income", ncols=10, output_dir=None):
+    """
+    Create a grid with one small bracket distribution per listing.
+
+    Bracket shares for all listings are computed as one matrix and every panel is
+    laid out on a single shared axes, so the whole grid is one bar collection
+    and one line instead of an axes per listing.
+
+    Args:
+        properties: DataFrame of listings
+        distribution: "income" or "age"
+        ncols: Panels per row
+        output_dir: Directory to save the chart
+
+    Returns:
+        str: Path to the saved chart
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}. Expected any of: {', '.join(DISTRIBUTIONS)}")
+
+    title, brackets = DISTRIBUTIONS[distribution]
+    stock_numbers, counts = portfolio_matrix(properties, list(brackets))
+    n_listings, n_brackets = counts.shape
+
+    totals = np.nansum(counts, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.where(totals > 0, np.nan_to_num(counts) / totals * 100, np.nan)
+
+    nrows, ncols = _grid_shape(n_listings, ncols)
+
+    # Panel geometry: each panel is one unit wide per bracket plus a gap, and as
+    # tall as the largest share plus room for its label
+    panel_width = n_brackets + 2
+    peak = np.nanmax(shares) if np.isfinite(shares).any() else 1.0
+    panel_height = peak * 1.35
+
+    cell = np.arange(n_listings)
+    x_origin = (cell % ncols) * panel_width
+    y_origin = (nrows - 1 - cell // ncols) * panel_height
+
+    # All bars for all listings in one call
+    bar_x = (x_origin[:, None] + np.arange(n_brackets)[None, :]).ravel()
+    bar_bottom = np.repeat(y_origin, n_brackets)
+    fig, ax = new_figure(figsize=(1.6 * ncols, 1.3 * nrows + 1))
+    ax.bar(bar_x, np.nan_to_num(shares).ravel(), bottom=bar_bottom, width=0.85,
+           align='edge', color=CHART_COLORS[2])
+
+    # Portfolio average drawn over every panel as one NaN-separated line
+    portfolio_mean = np.nanmean(shares, axis=0)
+    line_x = np.column_stack([x_origin[:, None] + np.arange(n_brackets)[None, :] + 0.425,
+                              np.full(n_listings, np.nan)]).ravel()
+    line_y = np.column_stack([y_origin[:, None] + portfolio_mean[None, :],
+                              np.full(n_listings, np.nan)]).ravel()
+    ax.plot(line_x, line_y, color=CHART_COLORS[1], linewidth=1)
+
+    for position in range(n_listings):
+        ax.text(x_origin[position] + n_brackets / 2, y_origin[position] + peak * 1.12,
+                stock_numbers[position], ha='center', va='bottom', fontsize=8)
+
+    ax.set_xlim(-1, ncols * panel_width - 1)
+    ax.set_ylim(0, nrows * panel_height)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.grid(False)
+
+    ax.set_title(f"{title} Distribution by Listing (bars: % of households or residents, "
+                 f"line: portfolio average; tallest bar {peak:.0f}%)", fontweight='bold', fontsize=12)
+    fig.tight_layout()
+
+    return save_chart(fig, f"portfolio_{distribution}_small_multiples", output_dir=output_dir)
+
+
+def portfolio_chart_specs(properties, output_dir=None, map_metrics=None):
+    """
+    Build the portfolio dashboard chart set for ChartRenderer.
+
+    Only the columns each chart needs are passed along, which keeps the content
+    hashes cheap and lets unrelated column changes reuse cached charts.
+
+    Args:
+        properties: DataFrame of listings
+        output_dir: Directory for the charts (default: outputs/charts/portfolio)
+        map_metrics: Metrics to draw as geographic heat maps (default: Composite_Score)
+
+    Returns:
+        list: (chart name, keyword arguments) tuples
+    """
+    if output_dir is None:
+        project_root = Path(__file__).parent.parent.parent
+        output_dir = project_root / "outputs" / "charts" / "portfolio"
+    output_dir = str(output_dir)
+
+    def subset(columns):
+        return properties[[c for c in ['StockNumber'] + columns if c in properties.columns]]
+
+    scores = SCORE_COMPONENTS + [COMPOSITE_SCORE]
+    specs = [
+        ("score_heatmap", {"properties": subset(scores), "output_dir": output_dir}),
+        ("scatter_matrix", {"properties": subset(scores), "output_dir": output_dir}),
+        ("distribution_small_multiples", {"properties": subset(list(INCOME_BRACKETS)),
+                                          "distribution": "income", "output_dir": output_dir}),
+        ("distribution_small_multiples", {"properties": subset(list(AGE_BRACKETS)),
+                                          "distribution": "age", "output_dir": output_dir}),
+    ]
+
+    if {'Latitude', 'Longitude'} <= set(properties.columns):
+        for metric in map_metrics or [COMPOSITE_SCORE]:
+            if metric in properties.columns:
+                specs.append(("geo_heatmap", {"properties": subset(['Latitude', 'Longitude', 'State', metric]),
+                                              "metric": metric, "output_dir": output_dir}))
+
+    return specs
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit tests for change detection on refreshed property data.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.data.changes import ChangeTracker, row_hashes, diff_snapshots
+from src.data.loader import PropertyDataLoader
+
+
+class TestChangeDetection(unittest.TestCase):
+    """Test suite for row hashing, snapshot diffs and artifact invalidation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.temp_dir.name, "master.csv")
+        self.snapshot_path = os.path.join(self.temp_dir.name, "snapshot.json")
+        self.test_data = pd.DataFrame({
+            'StockNumber': ['12345', '67890', '24680'],
+            'Property Address': ['123 Main St', '456 Oak Ave', '789 Pine Rd'],
+            'City': ['Austin', 'Dallas', 'Houston'],
+            'State': ['TX', 'TX', 'TX'],
+            'Land Area (AC)': [10.5, 20.0, 15.0],
+        })
+        self.test_data.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def _artifact(self, name):
+        """Create an output file and return its path."""
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w") as f:
+            f.write(name)
+        return path
+
+    def test_row_hashes_ignore_column_order(self):
+        """Test that hashes depend on content, not column order."""
+        reordered = self.test_data[list(reversed(self.test_data.columns))]
+        self.assertEqual(row_hashes(self.test_data), row_hashes(reordered))
+
+        edited = self.test_data.copy()
+        edited.loc[1, 'Land Area (AC)'] = 21.0
+        self.assertNotEqual(row_hashes(self.test_data)['67890'], row_hashes(edited)['67890'])
+        self.assertEqual(row_hashes(self.test_data)['12345'], row_hashes(edited)['12345'])
+
+    def test_diff_snapshots(self):
+        """Test the added, removed, changed and unchanged sets."""
+        changes = diff_snapshots({'a': '1', 'b': '2', 'c': '3'}, {'b': '2', 'c': '4', 'd': '5'})
+
+        self.assertEqual(changes['added'], {'d'})
+        self.assertEqual(changes['removed'], {'a'})
+        self.assertEqual(changes['changed'], {'c'})
+        self.assertEqual(changes['unchanged'], {'b'})
+
+    def test_loader_reload(self):
+        """Test that reloading an edited file reports only the edited listings."""
+        loader = PropertyDataLoader(self.csv_path)
+
+        edited = self.test_data.copy()
+        edited.loc[0, 'City'] = 'Round Rock'
+        edited = edited[edited['StockNumber'] != '24680']
+        edited.to_csv(self.csv_path, index=False)
+
+        changes = loader.reload()
+        self.assertEqual(changes['changed'], {'12345'})
+        self.assertEqual(changes['removed'], {'24680'})
+        self.assertEqual(changes['unchanged'], {'67890'})
+        self.assertEqual(len(loader.get_property_list()), 2)
+
+    def test_tracker_invalidates_only_dependents(self):
+        """Test that only outputs of changed listings are invalidated."""
+        tracker = ChangeTracker(self.snapshot_path)
+        tracker.update(row_hashes(self.test_data))
+
+        chart = self._artifact("chart_12345.png")
+        research = self._artifact("area_research.md")
+        report = self._artifact("report_67890.md")
+        tracker.register_artifact('12345', chart, kind="chart")
+        tracker.register_artifact('12345', research, kind="research")
+        tracker.register_artifact('24680', research, kind="research")
+        tracker.register_artifact('12345', self._artifact("report_12345.md"))
+        tracker.register_artifact('67890', report)
+        tracker.register_artifact('24680', self._artifact("report_24680.md"))
+
+        self.assertEqual(tracker.pending(), [])
+
+        edited = self.test_data.copy()
+        edited.loc[0, 'Land Area (AC)'] = 11.0
+
+        # A new tracker reads the persisted snapshot, as in the next nightly run
+        changes = ChangeTracker(self.snapshot_path).update(row_hashes(edited))
+        self.assertEqual(changes['changed'], {'12345'})
+        self.assertFalse(os.path.exists(chart))
+        self.assertFalse(os.path.exists(research))
+        self.assertTrue(os.path.exists(report))
+        self.assertEqual(len(changes['stale_reports']), 1)
+
+        tracker = ChangeTracker(self.snapshot_path)
+        self.assertEqual(tracker.pending(), ['12345'])
+        # Shared research is dropped for the unchanged listing that used it
+        self.assertNotIn(research, [a['path'] for a in tracker.state['artifacts']['24680']])
+
+    def test_added_listings_are_pending(self):
+        """Test that new listings need analysis and unchanged ones do not."""
+        tracker = ChangeTracker(self.snapshot_path)
+        tracker.update(row_hashes(self.test_data.iloc[:2]))
+        tracker.register_artifact('12345', self._artifact("report_12345.md"))
+        tracker.register_artifact('67890', self._artifact("report_67890.md"))
+
+        changes = tracker.update(row_hashes(self.test_data))
+        self.assertEqual(changes['added'], {'24680'})
+        self.assertEqual(tracker.pending(), ['24680'])
+
+
+if __name__ == '__main__':
+    unittest.main()
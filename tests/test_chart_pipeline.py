@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the parallel chart rendering pipeline.
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+import numpy as np
+import pandas as pd
+from src.analysis.trends import build_trend_table
+from src.visualization import charts, pipeline
+from src.visualization.pipeline import ChartRenderer, chart_hash, property_chart_specs
+
+
+class TestChartPipeline(unittest.TestCase):
+    """Test suite for ChartRenderer and property chart sets."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "charts")
+        self.cache_path = os.path.join(self.temp_dir.name, "chart_cache.json")
+        self.spec = ("population_growth", {
+            "data": {2000: 1000, 2020: 1500, 2024: 1600},
+            "city_name": "Austin",
+            "output_dir": self.output_dir,
+        })
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_chart_hash(self):
+        """Test that hashes change with the input data only."""
+        chart, kwargs = self.spec
+        self.assertEqual(chart_hash(chart, kwargs), chart_hash(chart, dict(kwargs)))
+
+        changed = {**kwargs, "data": {2000: 1000, 2020: 1500, 2024: 1700}}
+        self.assertNotEqual(chart_hash(chart, kwargs), chart_hash(chart, changed))
+
+    def test_unchanged_charts_are_skipped(self):
+        """Test that a second render reuses the cached output."""
+        renderer = ChartRenderer(self.cache_path, max_workers=1)
+        first = renderer.render([self.spec])
+        self.assertTrue(os.path.exists(first[0]))
+
+        # A new renderer reads the persisted cache, as on a re-run
+        with patch.object(pipeline, "_render") as render:
+            second = ChartRenderer(self.cache_path, max_workers=1).render([self.spec])
+            render.assert_not_called()
+        self.assertEqual(first, second)
+
+        # Deleted outputs are rendered again
+        os.remove(first[0])
+        self.assertTrue(os.path.exists(renderer.render([self.spec])[0]))
+
+    def test_process_pool(self):
+        """Test rendering several charts across worker processes."""
+        specs = [self.spec, ("housing_value", {
+            "data": {2024: 200000, 2029: 230000},
+            "city_name": "Austin",
+            "output_dir": self.output_dir,
+        })]
+        paths = ChartRenderer(self.cache_path, max_workers=2).render(specs)
+
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ["population_growth_austin.png", "housing_value_austin.png"])
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+
+    def test_output_tiers_and_manifest(self):
+        """Test that every tier is written and linked from the directory manifest."""
+        renderer = ChartRenderer(self.cache_path, max_workers=1, tiers=["screen", "thumbnail", "print"])
+        path = renderer.render([self.spec])[0]
+
+        self.assertEqual(os.path.basename(path), "population_growth_austin.png")
+        with open(os.path.join(self.output_dir, pipeline.MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        variants = manifest["charts"]["population_growth_austin"]
+        self.assertEqual(sorted(variants), ["print", "screen", "thumbnail"])
+        self.assertEqual(variants["thumbnail"]["file"], "population_growth_austin.thumbnail.webp")
+        self.assertEqual(variants["print"]["format"], "svg")
+        self.assertEqual(len(renderer.variant_paths(path)), 3)
+        self.assertTrue(all(os.path.exists(p) for p in renderer.variant_paths(path)))
+
+        # Tiers are part of the cache key
+        chart, kwargs = self.spec
+        self.assertNotEqual(chart_hash(chart, kwargs), chart_hash(chart, kwargs, ["print"]))
+
+    def test_optimized_png_is_smaller(self):
+        """Test that optimization shrinks the screen tier."""
+        plain = ChartRenderer(self.cache_path, max_workers=1, tiers=["screen"]).render([self.spec])[0]
+        plain_size = os.path.getsize(plain)
+
+        optimized_spec = (self.spec[0], {**self.spec[1], "output_dir": os.path.join(self.output_dir, "optimized")})
+        optimized = ChartRenderer(self.cache_path, max_workers=1, tiers=["screen"],
+                                  optimize=True).render([optimized_spec])[0]
+        self.assertLess(os.path.getsize(optimized), plain_size)
+
+    def test_unknown_tier(self):
+        """Test that unknown output tiers are rejected."""
+        with self.assertRaises(ValueError):
+            ChartRenderer(self.cache_path, tiers=["poster"])
+
+    def test_single_file_save(self):
+        """Test that an explicit format and dpi bypass the tiers."""
+        fig, ax = charts.new_figure(figsize=(4, 3))
+        ax.plot([1, 2, 3])
+        path = charts.save_chart(fig, "legacy", format="png", dpi=72, output_dir=self.output_dir)
+
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["legacy.png"])
+        self.assertTrue(path.endswith("legacy.png"))
+
+    def test_unknown_chart(self):
+        """Test that unknown chart types are rejected."""
+        with self.assertRaises(ValueError):
+            ChartRenderer(self.cache_path).render([("pie", {})])
+
+    def test_property_chart_specs(self):
+        """Test the chart set built from a listing and its trends."""
+        property_data = {
+            'StockNumber': '12345',
+            'City': 'Austin',
+            '2000 Population(5m)': 1000, '2020 Population(5m)': 1500,
+            '2024 Population(5m)': 1600, '2029 Population(5m)': 1800,
+            'HHInc0_5': 10, 'HHInc50_5': 30,
+            'Age25_34_5': 150, 'Age75_84_5': 30, 'Over85_5': 20,
+        }
+        trends = build_trend_table(pd.DataFrame([property_data])).iloc[0]
+        specs = property_chart_specs(property_data, trends, output_dir=self.output_dir)
+
+        self.assertEqual([chart for chart, _ in specs],
+                         ["population_growth", "income_distribution", "age_demographic"])
+        population = specs[0][1]
+        self.assertEqual(sorted(population["data"]), [2000, 2020, 2024, 2029])
+        self.assertEqual(len(population["trend"]), 30)
+        self.assertAlmostEqual(specs[1][1]["income_data"]["$50,000 - $74,999"], 75.0)
+        self.assertAlmostEqual(specs[2][1]["data"]["25-34"], 75.0)
+        self.assertAlmostEqual(specs[2][1]["data"]["85+"], 10.0)
+
+        # A rate the trend table could not compute is left to the chart instead of annotating "nan%"
+        self.assertAlmostEqual(population["cagr"], trends["population_5m_cagr"])
+        trends["population_5m_cagr"] = np.nan
+        specs = property_chart_specs(property_data, trends, output_dir=self.output_dir)
+        self.assertIsNone(specs[0][1]["cagr"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit tests for research context chunking and packing.
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.archive import PageArchive
+from src.utils.context import ContextStore, chunk_text, estimate_tokens, find_urls, bm25_scores
+
+RESEARCH = """## Zoning
+
+The parcel is zoned R-2 residential with a minimum lot size of 7,500 square feet.
+Duplexes are permitted by right and a rezoning to R-3 is under review.
+
+## Housing Market
+
+Median home prices rose 8% last year to $310,000. Rents for two-bedroom units average $1,450.
+Vacancy is below 3% and builders report a shortage of starter homes.
+
+## Economy
+
+The county added 2,400 jobs as a battery plant opened. Population grew 1.9% and median household
+income reached $64,000.
+
+## Sources
+
+See https://example.com/county-report. and https://news.example.org/plant?id=4
+"""
+
+
+class StubEmbedder:
+    """Embeds texts as counts of a few fixed words."""
+
+    WORDS = ["zoning", "price", "jobs"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return np.array([[text.lower().count(word) for word in self.WORDS] for text in texts], dtype=float)
+
+
+class StubRelevance:
+    """Relevance engine scoring with StubEmbedder, or unavailable."""
+
+    def __init__(self, available=True):
+        self.available = available
+        self.embedder = StubEmbedder()
+
+    def score(self, query, texts):
+        if not self.available:
+            return None
+        vectors = self.embedder.embed([query] + list(texts))
+        norms = np.linalg.norm(vectors[1:], axis=1) * np.linalg.norm(vectors[0])
+        dots = vectors[1:] @ vectors[0]
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+class TestChunking(unittest.TestCase):
+    """Test suite for chunk_text."""
+
+    def test_chunks_follow_headings(self):
+        """Test that chunks never span headings and keep their heading."""
+        chunks = chunk_text(RESEARCH)
+        self.assertEqual([chunk["heading"] for chunk in chunks],
+                         ["## Zoning", "## Housing Market", "## Economy", "## Sources"])
+        self.assertIn("R-2 residential", chunks[0]["text"])
+        self.assertNotIn("##", chunks[0]["text"])
+
+    def test_long_paragraphs_are_split(self):
+        """Test that text longer than the chunk size is split at sentence ends."""
+        text = " ".join(f"Sentence number {i} is about land." for i in range(200))
+        chunks = chunk_text(text, max_tokens=50)
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(estimate_tokens(chunk["text"]) <= 50 for chunk in chunks))
+        self.assertTrue(chunks[0]["text"].endswith("land."))
+        self.assertEqual(" ".join(chunk["text"] for chunk in chunks), text)
+
+    def test_small_paragraphs_are_merged(self):
+        """Test that short paragraphs under one heading share a chunk."""
+        chunks = chunk_text("# Title\n\nOne.\n\nTwo.\n\nThree.")
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]["text"], "One.\n\nTwo.\n\nThree.")
+
+    def test_find_urls(self):
+        """Test that cited URLs are found without trailing punctuation."""
+        self.assertEqual(find_urls(RESEARCH),
+                         ["https://example.com/county-report", "https://news.example.org/plant?id=4"])
+
+    def test_bm25_prefers_matching_documents(self):
+        """Test that BM25 ranks the document sharing rare terms first."""
+        scores = bm25_scores(["battery plant jobs"], ["home prices and rents", "battery plant adds jobs", ""])
+        self.assertEqual(int(np.argmax(scores[0])), 1)
+        self.assertEqual(scores[0][2], 0.0)
+
+
+class TestContextStore(unittest.TestCase):
+    """Test suite for ContextStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store = ContextStore()
+        self.store.add(RESEARCH)
+
+    def test_pack_selects_relevant_chunks(self):
+        """Test that packing keeps the chunks that answer the questions."""
+        packed = self.store.pack(["What are home prices and rents?"], token_budget=80)
+        self.assertIn("Median home prices", packed["text"])
+        self.assertIn("## Housing Market", packed["text"])
+        self.assertNotIn("battery plant", packed["text"])
+        self.assertLessEqual(packed["tokens"], 80)
+        self.assertLess(packed["tokens"], packed["total_tokens"])
+
+    def test_pack_respects_budget_and_order(self):
+        """Test that a selection stays within budget and in document order."""
+        packed = self.store.pack(["zoning lot size", "jobs population income", "home prices"], token_budget=1000)
+        text = packed["text"]
+        self.assertLess(text.index("R-2"), text.index("Median home"))
+        self.assertLess(text.index("Median home"), text.index("battery plant"))
+        self.assertEqual(self.store.pack(["zoning"], token_budget=5)["text"], "")
+
+    def test_exclude_avoids_repeats(self):
+        """Test that excluded chunks are not selected again."""
+        first = self.store.pack(["zoning lot size"], token_budget=1000)
+        second = self.store.pack(["zoning lot size"], token_budget=1000, exclude=first["chunks"])
+        self.assertTrue(first["chunks"])
+        self.assertFalse(first["chunks"] & second["chunks"])
+
+    def test_embedding_scores(self):
+        """Test that embedding similarity is used when available, with a keyword fallback."""
+        relevance = StubRelevance()
+        store = ContextStore(relevance=relevance)
+        store.add(RESEARCH)
+        packed = store.pack(["jobs"], token_budget=60)
+        self.assertIn("battery plant", packed["text"])
+        self.assertGreater(relevance.embedder.calls, 0)
+
+        relevance.available = False
+        packed = store.pack(["battery plant jobs"], token_budget=60)
+        self.assertIn("battery plant", packed["text"])
+
+    def test_add_pages(self):
+        """Test that archived pages are added once under their URL."""
+        root = tempfile.mkdtemp()
+        try:
+            archive = PageArchive(root)
+            archive.store("https://example.com/county-report", "<html></html>",
+                          "The county approved a water line extension to the parcel.")
+            self.assertEqual(self.store.add_pages(archive, find_urls(RESEARCH)), 1)
+            self.assertEqual(self.store.add("again", source="https://example.com/county-report"), 0)
+            archive.close()
+        finally:
+            shutil.rmtree(root)
+
+        packed = self.store.pack(["water line utilities"], token_budget=100)
+        self.assertTrue(packed["text"].startswith("Source: https://example.com/county-report"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for research duplicate detection.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.dedup import DuplicateIndex, canonicalize_url, hamming_distance, simhash
+from src.tools.web_research import create_duplicate_index
+
+ARTICLE = ("County approves new 300 home subdivision near the highway, officials said on Tuesday after "
+           "a long debate about traffic and schools. The project adds affordable units and a park, with "
+           "construction expected to begin next spring.")
+OTHER = "Local team wins the regional title in a dramatic overtime finish at the downtown stadium on Friday night."
+
+
+class TestDuplicateDetection(unittest.TestCase):
+    """Test suite for URL canonicalization, SimHash and DuplicateIndex."""
+
+    def test_canonicalize_url(self):
+        """Test that tracking, mobile and AMP variants share a canonical URL."""
+        expected = "https://example.com/news/story?a=1&b=2"
+        for url in ["http://www.Example.com/news/story/amp/?utm_source=feed&b=2&a=1#comments",
+                    "https://m.example.com/news/story?a=1&b=2&fbclid=xyz",
+                    "example.com/news/story/?b=2&a=1&outputType=amp"]:
+            self.assertEqual(canonicalize_url(url), expected)
+        self.assertEqual(canonicalize_url("https://example.com/story.amp.html"), "https://example.com/story.html")
+        self.assertNotEqual(canonicalize_url("https://example.com/?id=1"), canonicalize_url("https://example.com/?id=2"))
+        self.assertEqual(canonicalize_url(""), "")
+
+    def test_simhash(self):
+        """Test that near-identical texts get close fingerprints and unrelated texts do not."""
+        self.assertLessEqual(hamming_distance(simhash(ARTICLE), simhash(ARTICLE + " Read more.")), 8)
+        self.assertGreater(hamming_distance(simhash(ARTICLE), simhash(OTHER)), 8)
+        self.assertIsNone(simhash("  ...  "))
+
+    def test_representative(self):
+        """Test that URL variants and syndicated copies resolve to the first document."""
+        index = DuplicateIndex()
+        original = index.representative("https://www.example.com/story?utm_medium=rss", ARTICLE)
+        self.assertEqual(original, "https://example.com/story")
+        self.assertEqual(index.representative("https://m.example.com/story/", ARTICLE[:90]), original)
+        self.assertEqual(index.representative("https://news.partner.org/syndicated/42", "Jan 5 - " + ARTICLE),
+                         original)
+        self.assertEqual(index.representative("https://sports.example.net/final", OTHER),
+                         "https://sports.example.net/final")
+        self.assertEqual(index.lookup("https://news.partner.org/syndicated/42"), original)
+        self.assertIsNone(index.lookup("https://unknown.example.com/"))
+
+    def test_by_text(self):
+        """Test that page text can reassign a URL first recorded from its snippet."""
+        index = DuplicateIndex()
+        index.representative("https://example.com/story", ARTICLE)
+        index.representative("https://mirror.example.org/copy", "A short teaser snippet about housing")
+        self.assertEqual(index.representative("https://mirror.example.org/copy", ARTICLE, by_text=True),
+                         "https://example.com/story")
+        self.assertEqual(index.lookup("https://mirror.example.org/copy"), "https://example.com/story")
+
+    def test_persistence(self):
+        """Test that fingerprints survive a save and reload."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache" / "fingerprints.json"
+            index = DuplicateIndex(path)
+            index.representative("https://example.com/story", ARTICLE)
+            index.save()
+
+            reloaded = DuplicateIndex(path)
+            self.assertEqual(reloaded.representative("https://partner.org/copy", ARTICLE + " Read more."),
+                             "https://example.com/story")
+
+
+    def test_fingerprint_file_location(self):
+        """Test that the fingerprint file is found from the project root, whatever the working directory."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                with mock.patch.dict(os.environ):
+                    os.environ.pop("RESEARCH_FINGERPRINTS", None)
+                    self.assertEqual(create_duplicate_index().path,
+                                     project_root / "outputs" / "cache" / "research_fingerprints.json")
+                    os.environ["RESEARCH_FINGERPRINTS"] = "outputs/cache/other.json"
+                    self.assertEqual(create_duplicate_index().path, project_root / "outputs" / "cache" / "other.json")
+                    os.environ["RESEARCH_FINGERPRINTS"] = "none"
+                    self.assertIsNone(create_duplicate_index().path)
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Unit tests for atomic file writes.
+"""
+
+import os
+import sys
+import stat
+import unittest
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.files import atomic_write, write_bytes_atomic
+
+
+def permissions(path):
+    """Get the permission bits of a file."""
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test suite for atomic_write and write_bytes_atomic."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "nested" / "report.md"
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_new_file_gets_umask_default(self):
+        """Test that a new file gets the permissions open() would give it, not mkstemp's 0600."""
+        write_bytes_atomic(self.path, b"report")
+        reference = self.path.with_name("reference.md")
+        with open(reference, "w") as f:
+            f.write("report")
+        self.assertEqual(self.path.read_bytes(), b"report")
+        self.assertEqual(permissions(self.path), permissions(reference))
+
+    def test_keeps_existing_permissions(self):
+        """Test that replacing a file keeps its permissions."""
+        write_bytes_atomic(self.path, b"old")
+        os.chmod(self.path, 0o640)
+        with atomic_write(self.path) as f:
+            f.write("new")
+        self.assertEqual(self.path.read_text(), "new")
+        self.assertEqual(permissions(self.path), 0o640)
+
+    def test_failed_write_leaves_file(self):
+        """Test that an error inside the block leaves the file and no temporary file behind."""
+        write_bytes_atomic(self.path, b"old")
+        with self.assertRaises(ValueError):
+            with atomic_write(self.path, "wb") as f:
+                f.write(b"partial")
+                raise ValueError("interrupted")
+        self.assertEqual(self.path.read_bytes(), b"old")
+        self.assertEqual(os.listdir(self.path.parent), ["report.md"])
+
+
+if __name__ == '__main__':
+    unittest.main()
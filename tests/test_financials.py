@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the financial projection engine.
+"""
+
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the module to be tested
+from src.analysis.financials import (
+    extract_financial_inputs,
+    evaluate_development,
+    simulate_financials,
+    format_financial_summary,
+)
+from src.utils.columns import to_numeric_array
+
+
+class TestFinancialEngine(unittest.TestCase):
+    """Test suite for the financial projection engine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data = pd.DataFrame({
+            'StockNumber': ['12345', '67890', '24680'],
+            'Land Area (AC)': [10.0, 20.0, np.nan],
+            'For Sale Price': ['$500,000', np.nan, '$1,000,000'],
+            'MedianGrossRent_5': [1000.0, np.nan, 1200.0],
+            'MedianGrossRent_10': [1100.0, 1300.0, 1250.0],
+            'MedianHValue_5': [200000.0, 250000.0, 300000.0],
+        })
+        self.assumptions = {
+            "housing_mix": {"manufactured": 0.80, "apartment": 0.15, "stick_built": 0.05},
+            "units_per_acre": 10.0,
+            "unit_costs": {"manufactured": 100000, "apartment": 200000, "stick_built": 300000},
+            "site_cost_per_unit": 0,
+            "default_land_cost_per_acre": 50000,
+            "sale_price_ratio": {"manufactured": 1.0, "stick_built": 1.0},
+            "rent_ratio": 1.0,
+            "operating_expense_ratio": 0.0,
+            "vacancy_rate": 0.0,
+            "cap_rate": 0.06,
+        }
+
+    def test_to_numeric_array(self):
+        """Test converting currency strings, numbers and blanks to floats."""
+        values = to_numeric_array(pd.Series(["$1,250,000", "3,400", None, "n/a"]))
+        np.testing.assert_array_equal(values[:2], [1250000.0, 3400.0])
+        self.assertTrue(np.isnan(values[2:]).all())
+        np.testing.assert_array_equal(to_numeric_array(pd.Series([1, 2])), [1.0, 2.0])
+
+    def test_extract_inputs(self):
+        """Test that inputs are parsed from currency strings with fallbacks."""
+        inputs = extract_financial_inputs(self.test_data, self.assumptions)
+
+        self.assertEqual(inputs["land_cost"][0], 500000)
+        # Missing asking price falls back to acreage times the per-acre cost
+        self.assertEqual(inputs["land_cost"][1], 20.0 * 50000)
+        self.assertTrue(inputs["land_cost_estimated"][1])
+        # Missing 5-mile rent falls back to the 10-mile rent
+        self.assertEqual(inputs["rent"][1], 1300.0)
+
+    def test_evaluate_development(self):
+        """Test the deterministic model against a hand calculation."""
+        inputs = extract_financial_inputs(self.test_data.iloc[[0]], self.assumptions)
+        result = evaluate_development(inputs, self.assumptions)
+
+        # 100 units: 80 manufactured, 15 apartments, 5 stick-built
+        cost = 500000 + 80 * 100000 + 15 * 200000 + 5 * 300000
+        revenue = 85 * 200000 + 15 * 1000 * 12 / 0.06
+        self.assertEqual(result["units"][0], 100)
+        self.assertAlmostEqual(result["total_cost"][0], cost)
+        self.assertAlmostEqual(result["revenue"][0], revenue)
+        self.assertAlmostEqual(result["roi"][0], (revenue - cost) / cost)
+
+    def test_factors_broadcast(self):
+        """Test that factor arrays evaluate every scenario for every property."""
+        inputs = extract_financial_inputs(self.test_data, self.assumptions)
+        result = evaluate_development(inputs, self.assumptions, cost_factor=np.array([[0.9], [1.0], [1.1]]))
+
+        self.assertEqual(result["roi"].shape, (3, 3))
+        # Higher costs always lower ROI
+        self.assertTrue(np.all(result["roi"][0, :2] > result["roi"][2, :2]))
+
+    def test_simulation_is_reproducible(self):
+        """Test that the Monte Carlo simulation is deterministic for a seed."""
+        first = simulate_financials(self.test_data, self.assumptions, draws=2000, seed=7)
+        second = simulate_financials(self.test_data, self.assumptions, draws=2000, seed=7, chunk_size=1)
+
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(first.index), ['12345', '67890', '24680'])
+
+    def test_simulation_scenarios_are_ordered(self):
+        """Test that conservative <= moderate <= optimistic ROI."""
+        projections = simulate_financials(self.test_data, self.assumptions, draws=2000)
+        valid = projections.dropna(subset=["roi"])
+
+        self.assertEqual(len(valid), 2)
+        self.assertTrue((valid["roi_conservative"] <= valid["roi_moderate"]).all())
+        self.assertTrue((valid["roi_moderate"] <= valid["roi_optimistic"]).all())
+        self.assertTrue(valid["probability_of_loss"].between(0, 1).all())
+
+    def test_format_financial_summary(self):
+        """Test the prompt text for complete and incomplete projections."""
+        projections = simulate_financials(self.test_data, self.assumptions, draws=500)
+
+        summary = format_financial_summary(projections.loc['12345'])
+        self.assertIn("80/15/5", summary)
+        self.assertIn("Moderate (P50)", summary)
+
+        self.assertIn("unavailable", format_financial_summary(projections.loc['24680']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline geographic heat maps.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+import numpy as np
+import pandas as pd
+from src.visualization.maps import project_coordinates, hex_bins, create_geo_heatmap
+
+
+class TestGeoMaps(unittest.TestCase):
+    """Test suite for hexagon binning and map rendering."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+
+        # A dense cluster in Florida, a lone listing in New York and one without coordinates
+        self.properties = pd.DataFrame({
+            "StockNumber": ["FL-1", "FL-2", "FL-3", "NY-1", "XX-1"],
+            "State": ["FL", "FL", "FL", "NY", "XX"],
+            "Latitude": [28.10, 28.11, 28.12, 42.90, None],
+            "Longitude": [-81.80, -81.81, -81.79, -78.80, -80.0],
+            "Composite_Score": ["0.5", "0.6", "0.7", "0.2", "0.4"],
+        })
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_project_coordinates(self):
+        """Test that longitude is scaled by the cosine of the reference latitude."""
+        x, y, scale = project_coordinates([60.0, 60.0], [10.0, 20.0], reference_latitude=60.0)
+
+        self.assertAlmostEqual(scale, 0.5)
+        np.testing.assert_allclose(x, [5.0, 10.0])
+        np.testing.assert_allclose(y, [60.0, 60.0])
+
+    def test_hex_bins(self):
+        """Test that nearby points share a hexagon and distant points do not."""
+        x = np.array([0.0, 0.01, 5.0, 10.0])
+        y = np.array([0.0, 0.01, 5.0, 10.0])
+        bins, centers, width, height = hex_bins(x, y, gridsize=10)
+
+        self.assertEqual(bins[0], bins[1])
+        self.assertEqual(len(set(bins)), 3)
+        self.assertEqual(len(centers), 3)
+        self.assertAlmostEqual(height, width * np.sqrt(3))
+
+        # Every point lies within one bin width of its hexagon center
+        distances = np.hypot(*(np.column_stack([x, y]) - centers[bins]).T)
+        self.assertTrue((distances <= width).all())
+
+    def test_map_is_saved(self):
+        """Test rendering a map with dense and sparse areas."""
+        path = create_geo_heatmap(self.properties, gridsize=10, output_dir=self.output_dir)
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(os.path.basename(path), "geo_heatmap_composite_score.png")
+
+    def test_missing_column(self):
+        """Test that an unknown metric raises ValueError."""
+        with self.assertRaises(ValueError):
+            create_geo_heatmap(self.properties, metric="Walk_Score", output_dir=self.output_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
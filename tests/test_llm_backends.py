@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for LLM backend selection.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.backends import Backend, BackendManager, BackendUnavailable, CircuitBreaker, backoff_delay
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test suite for CircuitBreaker."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=1, base_delay=2, max_delay=10, jitter=0.5, clock=self.clock,
+                                      rng=lambda: 0.0)
+
+    def test_backoff_delay(self):
+        """Test exponential growth, the cap and jitter."""
+        self.assertEqual([backoff_delay(n, 1, 8, jitter=0) for n in range(5)], [1, 2, 4, 8, 8])
+        self.assertEqual(backoff_delay(2, 1, 8, jitter=0.5, rng=lambda: 1.0), 2.0)
+
+    def test_opens_and_backs_off(self):
+        """Test that failures open the breaker for growing delays."""
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_in(), 2)
+
+        # One trial request after the delay; its failure doubles the delay
+        self.clock.now = 2
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.retry_in(), 4)
+
+        self.clock.now = 100
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.retry_in(), 2)
+
+    def test_failure_threshold(self):
+        """Test that the breaker stays closed below its threshold."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=self.clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        tripped = CircuitBreaker(clock=self.clock)
+        tripped.record_failure(trip=True)
+        self.assertFalse(tripped.allow())
+
+
+class TestBackendManager(unittest.TestCase):
+    """Test suite for BackendManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.calls = []
+        self.checks = []
+        self.up = {"primary": True, "fallback": True}
+
+    def backend(self, name):
+        """Create a backend that answers while it is up."""
+        def call(prompt):
+            self.calls.append(name)
+            return f"{name}: {prompt}" if self.up[name] else None
+
+        def check():
+            self.checks.append(name)
+            return self.up[name]
+
+        return Backend(name, call, check=check,
+                       breaker=CircuitBreaker(base_delay=10, clock=self.clock, rng=lambda: 0.0))
+
+    def manager(self):
+        """Create a manager with a primary and a fallback backend."""
+        return BackendManager([self.backend("primary"), self.backend("fallback")], health_ttl=30, clock=self.clock)
+
+    def test_prefers_first_backend(self):
+        """Test that fallbacks are not touched while the first backend answers."""
+        manager = self.manager()
+        self.assertEqual(manager.run("hi"), "primary: hi")
+        self.assertEqual(manager.run("again"), "primary: again")
+        self.assertEqual(self.calls, ["primary", "primary"])
+        self.assertEqual(self.checks, ["primary"])
+        self.assertEqual(manager.active, "primary")
+
+    def test_fails_over_once(self):
+        """Test that a down backend costs one failure, not one per request."""
+        manager = self.manager()
+        self.up["primary"] = False
+
+        self.assertEqual(manager.run("a"), "fallback: a")
+        self.assertEqual(manager.run("b"), "fallback: b")
+        self.assertEqual(self.calls, ["fallback", "fallback"])
+        self.assertEqual(self.checks, ["primary", "fallback"])
+        self.assertEqual(manager.status()["primary"]["state"], "open")
+
+        # After the backoff the primary is checked again and takes over
+        self.up["primary"] = True
+        self.clock.now = 10
+        self.assertEqual(manager.run("c"), "primary: c")
+        self.assertEqual(manager.status()["primary"]["state"], "closed")
+
+    def test_all_down(self):
+        """Test that requests fail fast while every breaker is open."""
+        manager = self.manager()
+        self.up.update(primary=False, fallback=False)
+
+        self.assertIsNone(manager.run("a"))
+        self.checks.clear()
+        self.assertIsNone(manager.run("b"))
+        self.assertEqual(self.checks, [])
+        self.assertEqual(self.calls, [])
+
+    def test_unavailable_backend_opens_breaker(self):
+        """Test that repeated BackendUnavailable errors open the breaker."""
+        def unavailable(prompt):
+            raise BackendUnavailable("connection refused")
+
+        manager = BackendManager([Backend("broken", unavailable, breaker=CircuitBreaker(clock=self.clock)),
+                                  self.backend("fallback")], clock=self.clock)
+        self.assertEqual(manager.run("a"), "fallback: a")
+        self.assertEqual(manager.status()["broken"]["state"], "closed")
+        manager.run("b")
+        manager.run("c")
+        self.assertEqual(manager.status()["broken"]["state"], "open")
+
+    def test_request_errors_keep_breaker_closed(self):
+        """Test that rejected or raising requests fail alone and the next request is sent."""
+        replies = iter([None, ValueError("bad schema"), "ok"])
+
+        def call(prompt):
+            reply = next(replies)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+
+        manager = BackendManager([Backend("primary", call, breaker=CircuitBreaker(failure_threshold=1,
+                                                                                   clock=self.clock))],
+                                 clock=self.clock)
+        self.assertIsNone(manager.run("a"))
+        self.assertIsNone(manager.run("b"))
+        self.assertEqual(manager.run("c"), "ok")
+        self.assertEqual(manager.status()["primary"]["state"], "closed")
+
+    def test_run_on(self):
+        """Test sending a request only one backend supports."""
+        manager = self.manager()
+        self.assertEqual(manager.run_on("fallback", lambda text: text.upper(), "x"), "X")
+        self.assertEqual(self.checks, ["fallback"])
+
+        self.assertIsNone(manager.run_on("fallback", lambda text: None, "x"))
+        self.assertEqual(manager.status()["fallback"]["state"], "closed")
+
+
+if __name__ == '__main__':
+    unittest.main()
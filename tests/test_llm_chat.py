@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Ollama chat requests.
+"""
+
+import sys
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.llm import LlamaLLM, NO_BACKEND_RESPONSE
+
+
+def ollama_response(payload):
+    """Build a successful Ollama HTTP response."""
+    response = mock.Mock(status_code=200)
+    response.json.return_value = payload
+    return response
+
+
+class TestChatRequests(unittest.TestCase):
+    """Test suite for LlamaLLM chat requests."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        for method in ("_verify_model_availability", "_server_available"):
+            patcher = mock.patch.object(LlamaLLM, method, return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.llm = LlamaLLM(model_name="llama3", temperature=0.3, verbose=False, keep_alive="10m", num_ctx=8192)
+
+        patcher = mock.patch("src.utils.llm.requests.post", return_value=ollama_response(
+            {"message": {"role": "assistant", "content": "Answer"}, "prompt_eval_count": 12, "eval_count": 3}))
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sent(self, call=-1):
+        """Get the URL and body of a posted request."""
+        args, kwargs = self.post.call_args_list[call]
+        return args[0], kwargs["json"]
+
+    def test_chat_request(self):
+        """Test that messages keep their roles and settings are sent."""
+        messages = [
+            {"role": "system", "content": "You are a land analyst."},
+            {"role": "user", "content": "Assess the parcel."},
+            {"role": "function", "content": 42},
+        ]
+        self.assertEqual(self.llm.call(messages=messages), "Answer")
+
+        url, body = self.sent()
+        self.assertTrue(url.endswith("/api/chat"))
+        self.assertEqual([m["role"] for m in body["messages"]], ["system", "user", "user"])
+        self.assertEqual(body["messages"][2]["content"], "42")
+        self.assertEqual(body["options"], {"temperature": 0.3, "num_ctx": 8192})
+        self.assertEqual(body["keep_alive"], "10m")
+        self.assertEqual(self.llm.last_usage, {"prompt_eval_count": 12, "eval_count": 3})
+
+    def test_prefix_is_byte_stable(self):
+        """Test that a growing conversation resends an identical prefix."""
+        conversation = [
+            {"role": "system", "content": "You are a land analyst."},
+            {"role": "user", "content": "Assess the parcel."},
+        ]
+        self.llm.call(messages=list(conversation))
+        conversation += [{"role": "assistant", "content": "Answer"}, {"role": "user", "content": "And zoning?"}]
+        self.llm.call(messages=list(conversation))
+
+        first = json.dumps(self.sent(0)[1]["messages"])
+        second = json.dumps(self.sent(1)[1]["messages"])
+        self.assertTrue(second.startswith(first[:-1]))
+        self.assertEqual({k: v for k, v in self.sent(0)[1].items() if k != "messages"},
+                         {k: v for k, v in self.sent(1)[1].items() if k != "messages"})
+
+    def test_generate_mode(self):
+        """Test that chat can be turned off in favor of flattened prompts."""
+        self.llm.use_chat = False
+        self.post.return_value = ollama_response({"response": "Flat answer"})
+        self.assertEqual(self.llm.call(prompt="Hello"), "Flat answer")
+
+        url, body = self.sent()
+        self.assertTrue(url.endswith("/api/generate"))
+        self.assertEqual(body["prompt"], "User: Hello\n\nAssistant: ")
+        self.assertEqual(body["keep_alive"], "10m")
+
+    def test_rejected_request_keeps_backend(self):
+        """Test that a 400 reply, structured or plain, does not stop the next call from reaching Ollama."""
+        answer = self.post.return_value
+        self.post.side_effect = [mock.Mock(status_code=400), mock.Mock(status_code=400), answer]
+        with mock.patch.object(LlamaLLM, "_client", return_value=None):
+            self.assertIsNone(self.llm.structured("Assess the parcel.", {"type": "object"}))
+            self.assertEqual(self.llm.call(prompt="Hello"), NO_BACKEND_RESPONSE)
+            self.assertEqual(self.llm.call(prompt="Hello"), "Answer")
+        self.assertEqual(self.post.call_count, 3)
+        self.assertEqual(self.llm.backends.status()["ollama"]["state"], "closed")
+
+    def test_unreachable_server_opens_breaker(self):
+        """Test that refused connections count against the breaker until it opens."""
+        self.post.side_effect = requests.exceptions.ConnectionError("refused")
+        with mock.patch.object(LlamaLLM, "_client", return_value=None):
+            for _ in range(3):
+                self.assertEqual(self.llm.call(prompt="Hello"), NO_BACKEND_RESPONSE)
+        self.assertEqual(self.llm.backends.status()["ollama"]["state"], "open")
+
+
+if __name__ == '__main__':
+    unittest.main()
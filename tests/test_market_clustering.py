@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for market area clustering.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.analysis.clustering import MarketClusterer, haversine_matrix, format_market_area
+from src.data.loader import PropertyDataLoader
+
+
+class TestMarketClusterer(unittest.TestCase):
+    """Test suite for MarketClusterer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # Two listings near Batavia, two near Lakeland and one far away in Texas
+        self.test_data = pd.DataFrame({
+            'StockNumber': ['NY-1', 'NY-2', 'FL-1', 'FL-2', 'TX-1'],
+            'Latitude': [43.00, 43.05, 28.04, 28.10, 30.27],
+            'Longitude': [-78.19, -78.25, -81.95, -81.90, -97.74],
+            'Market': ['Upstate NY', 'Upstate NY', 'Florida', 'Florida', 'Texas'],
+            'County Name': ['Genesee', 'Genesee', 'Polk', 'Polk', 'Travis'],
+            'MedianHHInc_5': [60000, 62000, 55000, 56000, 90000],
+            'MedianGrossRent_5': [900, 950, 1200, 1250, 1600],
+        })
+        self.clusterer = MarketClusterer(eps_miles=15, min_samples=2)
+        self.market_areas = self.clusterer.fit(self.test_data)
+
+    def test_haversine_matrix(self):
+        """Test great-circle distances against a known value."""
+        # New York City to Los Angeles is roughly 2,445 miles
+        distances = haversine_matrix([40.7128, 34.0522], [-74.0060, -118.2437])
+        self.assertAlmostEqual(distances[0, 1], 2445, delta=15)
+        self.assertEqual(distances[0, 0], 0)
+
+    def test_nearby_listings_share_market_area(self):
+        """Test that nearby, similar listings are grouped together."""
+        self.assertEqual(self.clusterer.membership['NY-1'], self.clusterer.membership['NY-2'])
+        self.assertEqual(self.clusterer.membership['FL-1'], self.clusterer.membership['FL-2'])
+        self.assertNotEqual(self.clusterer.membership['NY-1'], self.clusterer.membership['FL-1'])
+
+    def test_isolated_listing_gets_own_market_area(self):
+        """Test that noise points still receive a market area."""
+        area = self.clusterer.get_market_area('TX-1')
+        self.assertIsNotNone(area)
+        self.assertEqual(area['members'], ['TX-1'])
+        self.assertEqual(len(self.market_areas), 3)
+
+    def test_market_area_statistics(self):
+        """Test that shared statistics are area medians."""
+        area = self.clusterer.get_market_area('NY-1')
+        self.assertEqual(area['statistics']['MedianHHInc_5'], 61000)
+        self.assertEqual(area['name'], 'Upstate NY: Genesee')
+        self.assertIn('Market Area', format_market_area(area))
+
+    def test_demographic_weight_splits_dissimilar_listings(self):
+        """Test that very different demographics keep close listings apart."""
+        data = self.test_data.copy()
+        data.loc[1, 'MedianHHInc_5'] = 250000
+        data.loc[1, 'MedianGrossRent_5'] = 3000
+        clusterer = MarketClusterer(eps_miles=15, min_samples=2, demographic_weight=3.0)
+        clusterer.fit(data)
+        self.assertNotEqual(clusterer.membership['NY-1'], clusterer.membership['NY-2'])
+
+    def test_missing_coordinates(self):
+        """Test that listings without coordinates are not clustered with others."""
+        data = self.test_data.copy()
+        data.loc[0, 'Latitude'] = np.nan
+        clusterer = MarketClusterer(eps_miles=15, min_samples=2)
+        clusterer.fit(data)
+        self.assertEqual(clusterer.get_market_area('NY-1')['members'], ['NY-1'])
+
+    def test_loader_market_areas(self):
+        """Test that the data loader exposes market areas."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "test_data.csv")
+            self.test_data.to_csv(csv_path, index=False)
+            loader = PropertyDataLoader(csv_path)
+
+            self.assertEqual(len(loader.get_market_areas()), 3)
+            self.assertIn('FL-2', loader.get_market_area('FL-1')['members'])
+            self.assertIsNone(loader.get_market_area('XX-0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
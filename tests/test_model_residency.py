@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Ollama model residency management.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.residency import ModelResidency, PIN_KEEP_ALIVE
+
+
+def ollama_response(payload, status_code=200):
+    """Build an Ollama HTTP response."""
+    response = mock.Mock(status_code=status_code)
+    response.json.return_value = payload
+    return response
+
+
+class TestModelResidency(unittest.TestCase):
+    """Test suite for ModelResidency."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.residency = ModelResidency("llama3", keep_alive="30m", options={"num_ctx": 8192})
+        patcher = mock.patch("src.utils.residency.requests.post",
+                             return_value=ollama_response({"load_duration": 4_500_000_000}))
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def keep_alives(self):
+        """keep_alive values of the posted requests, in order."""
+        return [call.kwargs["json"].get("keep_alive") for call in self.post.call_args_list]
+
+    def test_preload(self):
+        """Test that preloading sends the keep_alive and options and records a cold start."""
+        timing = self.residency.preload()
+        body = self.post.call_args.kwargs["json"]
+        self.assertEqual(body, {"model": "llama3", "stream": False, "keep_alive": "30m",
+                                "options": {"num_ctx": 8192}})
+        self.assertTrue(timing["cold"])
+        self.assertEqual(timing["load_seconds"], 4.5)
+
+        # A warm model reports a negligible load time
+        self.post.return_value = ollama_response({"load_duration": 20_000_000})
+        self.assertFalse(self.residency.preload()["cold"])
+        self.assertEqual(len(self.residency.cold_starts()), 1)
+
+    def test_preload_failure(self):
+        """Test that an unreachable server is reported without raising."""
+        self.post.side_effect = requests.exceptions.ConnectionError("refused")
+        self.assertIsNone(self.residency.preload())
+
+    def test_pinned(self):
+        """Test that pinning keeps requests pinned and restores keep_alive after the batch."""
+        self.assertEqual(self.residency.request_keep_alive(), "30m")
+        with self.residency.pinned():
+            with self.residency.pinned():
+                self.assertEqual(self.residency.request_keep_alive(), PIN_KEEP_ALIVE)
+            self.assertTrue(self.residency.is_pinned)
+        self.assertFalse(self.residency.is_pinned)
+        self.assertEqual(self.keep_alives(), [PIN_KEEP_ALIVE, "30m"])
+
+    def test_observe(self):
+        """Test recording load times reported by requests."""
+        self.assertIsNone(self.residency.observe({"response": "ok"}))
+        timing = self.residency.observe({"load_duration": 2_000_000_000, "total_duration": 9_000_000_000},
+                                        event="chat")
+        self.assertEqual((timing["event"], timing["seconds"], timing["cold"]), ("chat", 9.0, True))
+
+    def test_status(self):
+        """Test reading the load state from /api/ps."""
+        models = {"models": [{"name": "llama3:latest", "model": "llama3:latest", "size": 5,
+                              "size_vram": 5, "expires_at": "2026-01-01T00:30:00Z"}]}
+        with mock.patch("src.utils.residency.requests.get", return_value=ollama_response(models)):
+            status = self.residency.status()
+            self.assertTrue(status["loaded"])
+            self.assertEqual(status["expires_at"], "2026-01-01T00:30:00Z")
+            self.assertFalse(ModelResidency("llama3:70b").status()["loaded"])
+
+
+if __name__ == '__main__':
+    unittest.main()
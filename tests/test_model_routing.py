@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-stage model routing.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.routing import ModelRouter, parse_mapping, model_name_of
+from src.utils.llm import MockLLM, CrewAIMockAdapter, setup_router
+
+GB = 1024 ** 3
+
+
+class TestModelRouter(unittest.TestCase):
+    """Test suite for ModelRouter."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.default = MockLLM(model_name="llama3:70b")
+        self.built = []
+
+        def factory(model_name):
+            self.built.append(model_name)
+            return MockLLM(model_name=model_name)
+
+        self.router = ModelRouter(
+            self.default,
+            routes={"executive_summary": "llama3:8b", "investment_summary": "llama3:8b"},
+            concurrency={"llama3:8b": 2},
+            factory=factory,
+            memory_gb=48
+        )
+
+    def test_parse_mapping(self):
+        """Test parsing key=value configuration."""
+        self.assertEqual(parse_mapping(" report=llama3:70b, assessment=llama3:8b "),
+                         {"report": "llama3:70b", "assessment": "llama3:8b"})
+        self.assertEqual(parse_mapping("llama3:8b=2", int), {"llama3:8b": 2})
+        self.assertEqual(parse_mapping(None), {})
+        with self.assertRaises(ValueError):
+            parse_mapping("report")
+
+    def test_model_names(self):
+        """Test reading model names from LLM objects."""
+        self.assertEqual(model_name_of(CrewAIMockAdapter(model_name="llama3:8b")), "llama3:8b")
+        self.assertEqual(model_name_of(self.default), "llama3:70b")
+        self.assertEqual(model_name_of(type("Adapter", (), {"model": "ollama/llama3"})()), "llama3")
+        self.assertIsNone(model_name_of(object()))
+
+    def test_routing(self):
+        """Test that routed stages get their model, built once, and others the default."""
+        self.assertIs(self.router.llm_for("report"), self.default)
+        summary = self.router.llm_for("executive_summary")
+        self.assertEqual(summary.model_name, "llama3:8b")
+        self.assertIs(self.router.llm_for("investment_summary"), summary)
+        self.assertEqual(self.built, ["llama3:8b"])
+
+    def test_unknown_stage(self):
+        """Test that routes must name known stages."""
+        with self.assertRaises(ValueError):
+            ModelRouter(self.default, routes={"summary": "llama3:8b"})
+
+    def test_without_factory(self):
+        """Test that every stage uses the default LLM without a factory."""
+        router = ModelRouter(self.default, routes={"report": "llama3:8b"})
+        self.assertIs(router.llm_for("report"), self.default)
+
+    def test_slots(self):
+        """Test that stages on the same model share its concurrency limit."""
+        slot = self.router.slot("executive_summary")
+        self.assertIs(slot, self.router.slot("investment_summary"))
+        self.assertTrue(slot.acquire(blocking=False))
+        self.assertTrue(slot.acquire(blocking=False))
+        self.assertFalse(slot.acquire(blocking=False))
+
+        research = self.router.slot("research")
+        self.assertIsNot(research, slot)
+        self.assertTrue(research.acquire(blocking=False))
+        self.assertFalse(research.acquire(blocking=False))
+
+    def test_can_overlap(self):
+        """Test that stage groups overlap only on different models that fit in memory."""
+        # The assessment stage shares the large model with the deep stages
+        self.assertFalse(self.router.can_overlap({"llama3:70b": 40 * GB, "llama3:8b": 5 * GB}))
+
+        self.router.routes["assessment"] = "llama3:8b"
+        self.assertTrue(self.router.can_overlap({"llama3:70b": 40 * GB, "llama3:8b": 5 * GB}))
+        self.assertFalse(self.router.can_overlap({"llama3:70b": 45 * GB, "llama3:8b": 5 * GB}))
+        self.assertFalse(self.router.can_overlap({"llama3:70b": 40 * GB}))
+
+        self.router.memory_gb = None
+        self.assertFalse(self.router.can_overlap({"llama3:70b": 40 * GB, "llama3:8b": 5 * GB}))
+
+    def test_setup_router(self):
+        """Test building routed mock models from configuration."""
+        router = setup_router(CrewAIMockAdapter(model_name="llama3:70b"), use_mock=True, for_crewai=True,
+                              routes={"executive_summary": "llama3:8b"}, concurrency={})
+        self.assertIsInstance(router.llm_for("executive_summary"), CrewAIMockAdapter)
+        self.assertEqual(router.model_for("executive_summary"), "llama3:8b")
+        self.assertEqual(router.model_for("report"), "llama3:70b")
+
+
+if __name__ == '__main__':
+    unittest.main()
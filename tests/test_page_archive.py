@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the fetched page archive.
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.archive import PageArchive
+
+HTML = "<html><body><h1>Zoning</h1><p>Parcels along Route 9 are zoned R-1.</p></body></html>"
+TEXT = "Zoning\nParcels along Route 9 are zoned R-1."
+
+
+class TestPageArchive(unittest.TestCase):
+    """Test suite for PageArchive."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.archive = PageArchive(self.temp_dir.name)
+        self.addCleanup(self.archive.close)
+
+    def test_store_and_read(self):
+        """Test that raw and extracted text round-trip through compression."""
+        record = self.archive.store("https://county.gov/zoning", HTML, TEXT, content_type="text/html")
+        self.assertEqual(self.archive.get_text("https://county.gov/zoning"), TEXT)
+        self.assertEqual(self.archive.get_raw("https://county.gov/zoning"), HTML)
+        self.assertEqual(self.archive.lookup("https://county.gov/zoning")["raw_hash"], record["raw_hash"])
+        self.assertIsNone(self.archive.get_text("https://county.gov/other"))
+
+    def test_content_addressed(self):
+        """Test that identical content is stored once and variants of a URL share it."""
+        self.archive.store("https://county.gov/zoning", HTML, TEXT)
+        self.archive.store("https://mirror.org/zoning", HTML, TEXT)
+        objects = [path for path in (Path(self.temp_dir.name) / "objects").rglob("*") if path.is_file()]
+        self.assertEqual(len(objects), 2)
+        self.assertEqual(self.archive.count(), 2)
+        self.assertEqual(self.archive.get_text("https://www.county.gov/zoning/?utm_source=feed"), TEXT)
+
+    def test_freshness(self):
+        """Test that stale pages are only served when any age is accepted."""
+        self.archive.store("https://county.gov/zoning", HTML, TEXT, fetched_at=datetime.now() - timedelta(days=10))
+        self.assertIsNone(self.archive.get_text("https://county.gov/zoning", max_age=7 * 86400))
+        self.assertEqual(self.archive.get_text("https://county.gov/zoning"), TEXT)
+        self.assertGreater(self.archive.lookup("https://county.gov/zoning")["age_seconds"], 9 * 86400)
+
+        self.archive.store("https://county.gov/zoning", HTML + " ", TEXT + " updated")
+        self.assertEqual(self.archive.get_text("https://county.gov/zoning", max_age=60), TEXT + " updated")
+
+    def test_reopen(self):
+        """Test that the archive persists across instances."""
+        self.archive.store("https://county.gov/zoning", HTML, TEXT)
+        reopened = PageArchive(self.temp_dir.name)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get_text("https://county.gov/zoning"), TEXT)
+
+
+if __name__ == '__main__':
+    unittest.main()
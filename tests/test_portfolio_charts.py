@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the portfolio-wide charts.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+import numpy as np
+import pandas as pd
+from src.visualization.portfolio import (
+    SCORE_COMPONENTS, INCOME_BRACKETS, AGE_BRACKETS,
+    portfolio_matrix, percentile_ranks, portfolio_chart_specs,
+    create_score_heatmap, create_scatter_matrix, create_distribution_small_multiples,
+)
+
+
+class TestPortfolioCharts(unittest.TestCase):
+    """Test suite for the portfolio dashboard charts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+
+        rows = []
+        for position in range(6):
+            row = {"StockNumber": f"TX-{position:05d}", "City": "Austin", "State": "TX",
+                   "Latitude": 30.2 + position * 0.01, "Longitude": -97.7 - position * 0.01}
+            for offset, column in enumerate(SCORE_COMPONENTS + ["Composite_Score"]):
+                row[column] = float((position * 7 + offset * 3) % 10)
+            for offset, column in enumerate(INCOME_BRACKETS):
+                row[column] = f"{(position + 1) * (offset + 1) * 100:,}"
+            for offset, column in enumerate(AGE_BRACKETS):
+                row[column] = (offset + 1) * 50
+            rows.append(row)
+        self.properties = pd.DataFrame(rows)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_portfolio_matrix(self):
+        """Test column extraction with comma strings and missing columns."""
+        stock_numbers, matrix = portfolio_matrix(self.properties, ["HHInc10_5", "Missing"])
+
+        self.assertEqual(list(stock_numbers[:2]), ["TX-00000", "TX-00001"])
+        self.assertEqual(matrix.shape, (6, 2))
+        self.assertEqual(matrix[1, 0], 400.0)
+        self.assertTrue(np.isnan(matrix[:, 1]).all())
+
+    def test_age_brackets(self):
+        """Test that the age brackets cover every 5-mile age column, through 85+."""
+        self.assertEqual(list(AGE_BRACKETS), [
+            "Age0_4_5", "Age5_9_5", "Age10_14_5", "Age15_19_5", "Age20_24_5", "Age25_34_5", "Age35_44_5",
+            "Age45_54_5", "Age55_59_5", "Age60_64_5", "Age65_74_5", "Age75_84_5", "Over85_5",
+        ])
+        self.assertEqual(AGE_BRACKETS["Over85_5"], "85+")
+
+    def test_percentile_ranks(self):
+        """Test that ranks are per column and NaN stays NaN."""
+        matrix = np.array([[1.0, 10.0], [2.0, np.nan], [3.0, 5.0]])
+        ranks = percentile_ranks(matrix)
+
+        np.testing.assert_allclose(ranks[:, 0], [100 / 3, 200 / 3, 100.0])
+        self.assertTrue(np.isnan(ranks[1, 1]))
+        self.assertEqual(ranks[0, 1], 100.0)
+
+    def test_charts_are_saved(self):
+        """Test that every portfolio chart writes an image."""
+        paths = [
+            create_score_heatmap(self.properties, output_dir=self.output_dir),
+            create_scatter_matrix(self.properties, output_dir=self.output_dir),
+            create_distribution_small_multiples(self.properties, ncols=4, output_dir=self.output_dir),
+            create_distribution_small_multiples(self.properties, distribution="age", output_dir=self.output_dir),
+        ]
+
+        for path in paths:
+            self.assertTrue(os.path.exists(path))
+        self.assertEqual(len(set(paths)), 4)
+
+    def test_unknown_distribution(self):
+        """Test that an unknown distribution raises ValueError."""
+        with self.assertRaises(ValueError):
+            create_distribution_small_multiples(self.properties, distribution="education",
+                                                output_dir=self.output_dir)
+
+    def test_chart_specs_subset_columns(self):
+        """Test that each chart only receives the columns it draws."""
+        specs = portfolio_chart_specs(self.properties, output_dir=self.output_dir)
+
+        self.assertEqual([chart for chart, _ in specs],
+                         ["score_heatmap", "scatter_matrix",
+                          "distribution_small_multiples", "distribution_small_multiples", "geo_heatmap"])
+        heatmap_columns = set(specs[0][1]["properties"].columns)
+        self.assertNotIn("HHInc0_5", heatmap_columns)
+        self.assertIn("Composite_Score", heatmap_columns)
+        self.assertEqual(list(specs[3][1]["properties"].columns), ["StockNumber"] + list(AGE_BRACKETS))
+
+
+if __name__ == '__main__':
+    unittest.main()
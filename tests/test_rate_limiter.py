@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unit tests for adaptive research rate limiting.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.ratelimit import (AdaptiveTokenBucket, RateLimiter, RateLimitExceeded, domain_key,
+                                 is_duckduckgo_throttled, is_throttled)
+
+
+class RatelimitException(Exception):
+    """Stand-in for the exception DuckDuckGo search raises when throttled."""
+
+
+class FakeClock:
+    """Clock that only advances when something sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test suite for AdaptiveTokenBucket and RateLimiter."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.limiter = RateLimiter({"ddg": 2.0, "domain": 0.5}, max_retries=2, base_delay=1.0,
+                                   clock=self.clock, sleep=self.clock.sleep, rng=lambda: 0.0)
+
+    def test_is_throttled(self):
+        """Test recognizing throttling in responses and errors."""
+        self.assertTrue(is_throttled(mock.Mock(status_code=429)))
+        self.assertFalse(is_throttled(mock.Mock(status_code=202)))
+        self.assertFalse(is_throttled(mock.Mock(status_code=200)))
+        self.assertTrue(is_throttled(RatelimitException("https://duckduckgo.com 202 Ratelimit")))
+        self.assertTrue(is_throttled(RuntimeError("Too Many Requests")))
+        self.assertFalse(is_throttled(RuntimeError("HTTP 202 Accepted")))
+        self.assertFalse(is_throttled(ValueError("no results for 2024 survey")))
+        self.assertFalse(is_throttled([{"title": "result"}]))
+
+        self.assertTrue(is_duckduckgo_throttled(mock.Mock(status_code=202)))
+        self.assertTrue(is_duckduckgo_throttled(RuntimeError("https://html.duckduckgo.com/html 202")))
+        self.assertFalse(is_duckduckgo_throttled(mock.Mock(status_code=200)))
+
+    def test_bucket_paces_calls(self):
+        """Test that calls beyond the burst wait for tokens at the current rate."""
+        bucket = AdaptiveTokenBucket(rate=2.0, clock=self.clock, sleep=self.clock.sleep)
+        waits = [bucket.acquire() for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.5, 0.5])
+
+    def test_aimd(self):
+        """Test additive increase on success and multiplicative decrease on throttling."""
+        bucket = AdaptiveTokenBucket(rate=1.0, increase=0.1, decrease=0.5, min_rate=0.3,
+                                     clock=self.clock, sleep=self.clock.sleep)
+        bucket.on_success()
+        self.assertAlmostEqual(bucket.rate, 1.1)
+        bucket.on_throttle()
+        bucket.on_throttle()
+        self.assertAlmostEqual(bucket.rate, 0.3)
+        self.assertEqual(bucket.throttles, 2)
+
+    def test_retries_throttled_calls(self):
+        """Test that a throttled call is retried with backoff and eventually succeeds."""
+        search = mock.Mock(side_effect=[RatelimitException("202 Ratelimit"), [{"title": "ok"}]])
+        self.assertEqual(self.limiter.call("ddg", search, "query", max_results=3), [{"title": "ok"}])
+        search.assert_called_with("query", max_results=3)
+        self.assertIn(1.0, self.clock.sleeps)
+        self.assertEqual(self.limiter.status()["ddg"], {"rate": 1.05, "throttles": 1})
+
+    def test_gives_up(self):
+        """Test that a call throttled on every attempt raises RateLimitExceeded."""
+        fetch = mock.Mock(return_value=mock.Mock(status_code=429))
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter.call(domain_key("https://www.county.gov/zoning"), fetch)
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual(self.limiter.status()["domain:county.gov"]["throttles"], 3)
+
+    def test_202_throttles_duckduckgo_only(self):
+        """Test that HTTP 202 is a throttle signal from DuckDuckGo but a normal reply elsewhere."""
+        accepted = mock.Mock(status_code=202)
+        fetch = mock.Mock(return_value=accepted)
+        self.assertIs(self.limiter.call(domain_key("https://www.county.gov/permits"), fetch), accepted)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(self.limiter.status()["domain:county.gov"]["throttles"], 0)
+
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter.call(domain_key("https://html.duckduckgo.com/html/?q=zoning"), fetch)
+        self.assertEqual(self.limiter.status()["domain:html.duckduckgo.com"]["throttles"], 3)
+
+    def test_other_errors_propagate(self):
+        """Test that errors unrelated to rate limiting are not retried."""
+        failing = mock.Mock(side_effect=ConnectionError("refused"))
+        with self.assertRaises(ConnectionError):
+            self.limiter.call("ddg", failing)
+        self.assertEqual(failing.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
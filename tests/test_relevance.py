@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for embedding-based research relevance scoring.
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import requests
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.relevance import OllamaEmbedder, RelevanceEngine, cosine_scores
+
+# Toy embedding space: the first axis is housing, the second is sports
+VECTORS = {
+    "housing market": [1.0, 0.0],
+    "New homes approved downtown": [0.9, 0.1],
+    "Rental vacancy falls": [0.8, 0.3],
+    "Local team wins title": [0.05, 1.0],
+}
+
+
+def embed_response(texts):
+    """Build an /api/embed response for a batch of texts."""
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {"embeddings": [VECTORS[text] for text in texts]}
+    return response
+
+
+class TestRelevance(unittest.TestCase):
+    """Test suite for OllamaEmbedder and RelevanceEngine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        patcher = mock.patch("src.utils.relevance.requests.post",
+                             side_effect=lambda url, json, timeout: embed_response(json["input"]))
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.embedder = OllamaEmbedder(batch_size=2)
+
+    def test_cosine_scores(self):
+        """Test vectorized cosine similarity, including zero vectors."""
+        scores = cosine_scores([1.0, 0.0], [[2.0, 0.0], [0.0, 3.0], [0.0, 0.0], [-1.0, 0.0]])
+        np.testing.assert_allclose(scores, [1.0, 0.0, 0.0, -1.0])
+
+    def test_batches_and_cache(self):
+        """Test that texts are sent in batches and cached embeddings are not requested again."""
+        texts = list(VECTORS)
+        vectors = self.embedder.embed(texts)
+        self.assertEqual(vectors.shape, (4, 2))
+        self.assertEqual(self.post.call_count, 2)
+
+        self.embedder.embed(["housing market", "housing market", "Rental vacancy falls"])
+        self.assertEqual(self.post.call_count, 2)
+
+    def test_persistent_cache(self):
+        """Test that the cache is saved and reloaded between runs."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "embeddings.json"
+            OllamaEmbedder(cache_path=path).embed(["housing market"])
+            self.post.reset_mock()
+            vectors = OllamaEmbedder(cache_path=path).embed(["housing market"])
+            self.assertEqual(vectors.tolist(), [[1.0, 0.0]])
+            self.post.assert_not_called()
+
+    def test_unavailable(self):
+        """Test that a failed request turns embeddings off instead of raising."""
+        self.post.side_effect = requests.exceptions.ConnectionError("refused")
+        engine = RelevanceEngine(self.embedder)
+        self.assertIsNone(engine.score("housing market", ["Local team wins title"]))
+        self.assertIsNone(engine.score("housing market", ["Rental vacancy falls"]))
+        self.assertEqual(self.post.call_count, 1)
+
+    def test_filter(self):
+        """Test that off-topic results fall below the threshold."""
+        engine = RelevanceEngine(self.embedder, threshold=0.5)
+        texts = ["New homes approved downtown", "Local team wins title", "Rental vacancy falls"]
+        scores = engine.score("housing market", texts)
+        self.assertEqual(len(scores), 3)
+        self.assertEqual(engine.keep(scores), [0, 2])
+        self.assertEqual(len(engine.score("housing market", [])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the report assembly engine.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.reports.assembly import ReportAssembler, read_sections, write_text_atomic
+
+
+class TestReportAssembly(unittest.TestCase):
+    """Test suite for ReportAssembler."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "property_1", "analysis.md")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def assemble(self, summary="Summary", details="Details"):
+        """Assemble the two-section test report."""
+        assembler = ReportAssembler(self.path)
+        assembler.add_section("summary", "SUMMARY", summary)
+        assembler.add_section("details", "DETAILS", details)
+        return assembler.assemble()
+
+    def test_first_assembly(self):
+        """Test that a new report renders every section in order."""
+        result = self.assemble()
+
+        self.assertTrue(result["written"])
+        self.assertEqual(result["rendered"], ["summary", "details"])
+        content = Path(self.path).read_text()
+        self.assertTrue(content.startswith("# PROPERTY ANALYSIS REPORT\n"))
+        self.assertLess(content.index("## SUMMARY"), content.index("## DETAILS"))
+        self.assertEqual(list(read_sections(self.path)), ["summary", "details"])
+
+    def test_unchanged_report_is_not_rewritten(self):
+        """Test that identical inputs leave the file untouched."""
+        self.assemble()
+        before = os.stat(self.path).st_mtime_ns
+
+        result = self.assemble()
+        self.assertFalse(result["written"])
+        self.assertEqual(result["reused"], ["summary", "details"])
+        self.assertEqual(os.stat(self.path).st_mtime_ns, before)
+
+    def test_only_changed_section_is_rendered(self):
+        """Test that unchanged sections are copied byte-for-byte."""
+        self.assemble(details="Long details\n" * 1000)
+        old = read_sections(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+            old_details = data[old["details"]["start"]:old["details"]["end"]]
+
+        result = self.assemble(summary="New summary", details="Long details\n" * 1000)
+        self.assertEqual(result["rendered"], ["summary"])
+        self.assertEqual(result["reused"], ["details"])
+
+        new = read_sections(self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data[new["details"]["start"]:new["details"]["end"]], old_details)
+        self.assertIn(b"New summary", data)
+
+    def test_lazy_sections_stream_and_skip(self):
+        """Test that lazy sections stream chunks and are not rendered when inputs match."""
+        calls = []
+
+        def render():
+            calls.append(1)
+            for row in range(3):
+                yield f"row {row}\n"
+
+        for _ in range(2):
+            assembler = ReportAssembler(self.path)
+            assembler.add_section("table", "TABLE", render, inputs={"rows": 3})
+            assembler.assemble()
+
+        self.assertEqual(len(calls), 1)
+        self.assertIn("row 0\nrow 1\nrow 2\n", Path(self.path).read_text())
+
+        with self.assertRaises(ValueError):
+            ReportAssembler(self.path).add_section("table", "TABLE", render)
+
+    def test_refresh_single_section(self):
+        """Test refreshing one section while keeping the others."""
+        self.assemble()
+
+        assembler = ReportAssembler(self.path, keep_existing=True)
+        assembler.add_section("details", "DETAILS", "Refreshed details")
+        assembler.add_section("appendix", "APPENDIX", "Appendix")
+        result = assembler.assemble()
+
+        self.assertEqual(result["rendered"], ["details", "appendix"])
+        self.assertEqual(result["reused"], ["summary"])
+        self.assertEqual(list(read_sections(self.path)), ["summary", "details", "appendix"])
+        content = Path(self.path).read_text()
+        self.assertIn("Summary", content)
+        self.assertNotIn("\nDetails\n", content)
+
+    def test_failed_render_keeps_report(self):
+        """Test that an error while rendering leaves the old report and no temporary file."""
+        self.assemble()
+        before = Path(self.path).read_bytes()
+
+        def render():
+            yield "partial"
+            raise RuntimeError("model went away")
+
+        assembler = ReportAssembler(self.path, keep_existing=True)
+        assembler.add_section("summary", "SUMMARY", render, inputs="v2")
+        with self.assertRaises(RuntimeError):
+            assembler.assemble()
+
+        self.assertEqual(Path(self.path).read_bytes(), before)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["analysis.md"])
+
+    def test_duplicate_section(self):
+        """Test that section names must be unique."""
+        assembler = ReportAssembler(self.path).add_section("summary", "SUMMARY", "a")
+        with self.assertRaises(ValueError):
+            assembler.add_section("summary", "SUMMARY", "b")
+
+    def test_write_text_atomic(self):
+        """Test that unchanged text files are not rewritten."""
+        path = os.path.join(self.temp_dir.name, "summary.md")
+        self.assertTrue(write_text_atomic(path, "text"))
+        self.assertFalse(write_text_atomic(path, "text"))
+        self.assertTrue(write_text_atomic(path, "new text"))
+        self.assertEqual(Path(path).read_text(), "new text")
+
+    def test_report_permissions(self):
+        """Test that reports get the permissions of a plainly created file and keep them on rewrite."""
+        self.assemble()
+        reference = os.path.join(self.temp_dir.name, "reference.md")
+        open(reference, "w").close()
+        self.assertEqual(os.stat(self.path).st_mode, os.stat(reference).st_mode)
+
+        os.chmod(self.path, 0o640)
+        self.assemble(details="New details")
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+
+if __name__ == '__main__':
+    unittest.main()
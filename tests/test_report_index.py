@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the report index.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.reports.index import ReportIndex
+
+
+class TestReportIndex(unittest.TestCase):
+    """Test suite for ReportIndex."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.reports_dir = Path(self.temp_dir.name)
+        self.index = ReportIndex(self.reports_dir / "report_index.sqlite")
+        self.property_data = {
+            'StockNumber': 'FL-00001',
+            'Property Address': '1 Orange Blvd',
+            'City': 'Dade City',
+            'State': 'FL',
+            'Composite_Score': '0.61',
+            'Home_Affordability': 0.4,
+        }
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def write_report(self, name, text):
+        """Write a report file and return its path."""
+        path = self.reports_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def test_record_and_latest(self):
+        """Test that recorded metadata is returned for the latest report."""
+        path = self.write_report("property_FL-00001/analysis.md", "Wetlands border the eastern parcel.")
+        self.index.record(path, self.property_data, model="ollama/llama3",
+                          durations={"research": 12.5, "report": 30.0})
+
+        latest = self.index.latest("FL-00001")
+        self.assertEqual(latest["model"], "ollama/llama3")
+        self.assertEqual(latest["city"], "Dade City")
+        self.assertAlmostEqual(latest["composite_score"], 0.61)
+        self.assertEqual(latest["scores"]["Home_Affordability"], 0.4)
+        self.assertEqual(latest["durations"], {"report": 30.0, "research": 12.5})
+        self.assertAlmostEqual(latest["total_seconds"], 42.5)
+        self.assertIsNone(self.index.latest("NY-00001"))
+
+    def test_model_of_llm_object(self):
+        """Test that an LLM object is recorded under the same name the model router uses."""
+        path = self.write_report("property_FL-00001/analysis.md", "Report.")
+        self.index.record(path, self.property_data, model=mock.Mock(model="ollama/llama3", model_name="llama3"))
+        self.assertEqual(self.index.latest("FL-00001")["model"], "llama3")
+
+    def test_search(self):
+        """Test full-text search with snippets and a stock number filter."""
+        first = self.write_report("property_FL-00001/analysis.md", "Zoning allows multifamily. Wetlands nearby.")
+        second = self.write_report("property_NC-00002/analysis.md", "Zoning is agricultural.")
+        self.index.record(first, self.property_data)
+        self.index.record(second)
+
+        self.assertEqual(len(self.index.search("zoning")), 2)
+        results = self.index.search("wetlands")
+        self.assertEqual([r["stock_number"] for r in results], ["FL-00001"])
+        self.assertIn("[Wetlands]", results[0]["snippet"])
+        self.assertEqual(len(self.index.search("zoning", stock_number="NC-00002")), 1)
+
+    def test_update_reindexes_changed_content(self):
+        """Test that a re-saved report replaces its indexed text."""
+        path = self.write_report("property_FL-00001/analysis.md", "Old text about septic systems.")
+        report_id = self.index.record(path, self.property_data)
+
+        path.write_text("New text about sewer access.")
+        self.assertEqual(self.index.record(path, self.property_data), report_id)
+
+        self.assertEqual(self.index.search("septic"), [])
+        self.assertEqual(len(self.index.search("sewer")), 1)
+        self.assertEqual(len(self.index.reports()), 1)
+
+    def test_sync(self):
+        """Test indexing files on disk incrementally and dropping deleted ones."""
+        self.write_report("20250101_120000_1_orange_blvd_analysis.md", "Report one.")
+        removed = self.write_report("property_FL-00001/analysis.md", "Report two.")
+
+        self.assertEqual(self.index.sync()["indexed"], 2)
+        counts = self.index.sync()
+        self.assertEqual((counts["indexed"], counts["unchanged"]), (0, 2))
+
+        addresses = {r["address"] for r in self.index.reports()}
+        self.assertIn("1 orange blvd", addresses)
+
+        os.remove(removed)
+        self.assertEqual(self.index.sync()["removed"], 1)
+        self.assertEqual(len(self.index.reports()), 1)
+
+    def test_sync_skips_other_markdown(self):
+        """Test that only report files are indexed, not summaries and comparisons beside them."""
+        self.write_report("property_FL-00001/analysis.md", "Report.")
+        self.write_report("error_report_20250101_120000.md", "Analysis failed.")
+        for name in ("property_FL-00001/full_report.md", "property_FL-00001/executive_summary.md",
+                     "property_FL-00001/investment_summary.md", "property_comparison.md",
+                     "mock_crew/analysis.md", "archive/20250101_120000_1_orange_blvd_analysis.md"):
+            self.write_report(name, "Stray summary.")
+
+        self.assertEqual(self.index.sync()["indexed"], 2)
+        self.assertEqual(self.index.search("stray"), [])
+
+        bogus = self.write_report("property_comparison.md", "Not a report.")
+        self.index.record(bogus)
+        self.assertEqual(self.index.sync()["removed"], 1)
+        self.assertEqual(len(self.index.reports()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Unit tests for structured assessment records.
+"""
+
+import sys
+import json
+import unittest
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.reports.records import (
+    ASSESSMENT_SCHEMA,
+    PropertyAssessment,
+    validate,
+    assessment_path,
+    save_assessment,
+    load_assessment,
+)
+from src.reports.index import ReportIndex
+from src.utils.llm import MockLLM
+
+
+def make_response(**overrides):
+    """Build a valid structured response."""
+    response = {
+        "opportunity_score": 7,
+        "risk_level": "medium",
+        "recommended_use": "Single-family subdivision",
+        "estimated_units": 120,
+        "roi_low_pct": 15,
+        "roi_high_pct": 22.5,
+        "rezoning_required": True,
+        "key_strengths": ["Growing suburb", "Utilities on site"],
+        "key_risks": ["Sewer extension"],
+        "summary": "Good residential potential. Rezoning needed.",
+    }
+    response.update(overrides)
+    return response
+
+
+class TestValidate(unittest.TestCase):
+    """Test suite for schema validation."""
+
+    def test_valid_response(self):
+        """Test that a valid response passes unchanged."""
+        response = make_response()
+        self.assertEqual(validate(response, ASSESSMENT_SCHEMA), response)
+
+    def test_errors_are_collected(self):
+        """Test that every mismatch is reported."""
+        response = make_response(opportunity_score=12, risk_level="extreme")
+        del response["summary"]
+        with self.assertRaises(ValueError) as context:
+            validate(response, ASSESSMENT_SCHEMA)
+        message = str(context.exception)
+        self.assertIn("$.opportunity_score", message)
+        self.assertIn("$.risk_level", message)
+        self.assertIn("$.summary: missing", message)
+
+    def test_types(self):
+        """Test integer, boolean and nullable types."""
+        cleaned = validate(make_response(opportunity_score=8.0, estimated_units=None), ASSESSMENT_SCHEMA)
+        self.assertEqual(cleaned["opportunity_score"], 8)
+        self.assertIsInstance(cleaned["opportunity_score"], int)
+        self.assertIsNone(cleaned["estimated_units"])
+
+        for bad in [{"opportunity_score": True}, {"opportunity_score": "7"}, {"estimated_units": 2.5}]:
+            with self.assertRaises(ValueError):
+                validate(make_response(**bad), ASSESSMENT_SCHEMA)
+
+    def test_truncation(self):
+        """Test that long strings and arrays are cut and unknown keys dropped."""
+        cleaned = validate(make_response(summary="x" * 1000, key_risks=[f"risk {i}" for i in range(9)],
+                                         reasoning="not in schema"), ASSESSMENT_SCHEMA)
+        self.assertEqual(len(cleaned["summary"]), 400)
+        self.assertEqual(len(cleaned["key_risks"]), 5)
+        self.assertNotIn("reasoning", cleaned)
+
+
+class TestPropertyAssessment(unittest.TestCase):
+    """Test suite for PropertyAssessment records."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.report_path = Path(self.temp_dir.name) / "property_FL-00001" / "analysis.md"
+        self.report_path.parent.mkdir()
+        self.report_path.write_text("# PROPERTY ANALYSIS REPORT\n\nZoning and wetlands.\n")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_from_response(self):
+        """Test building a record from a model response."""
+        assessment = PropertyAssessment.from_response(make_response(), stock_number="FL-00001", model="llama3")
+        self.assertEqual(assessment.opportunity_score, 7)
+        self.assertEqual(assessment.key_risks, ["Sewer extension"])
+        self.assertEqual(assessment.model, "llama3")
+        self.assertIsNotNone(assessment.extracted_at)
+
+        with self.assertRaises(ValueError):
+            PropertyAssessment.from_response(["not", "an", "object"])
+
+    def test_save_and_load(self):
+        """Test storing a record beside its report."""
+        self.assertIsNone(load_assessment(self.report_path))
+
+        assessment = PropertyAssessment.from_response(make_response(), stock_number="FL-00001")
+        path = save_assessment(self.report_path, assessment)
+        self.assertEqual(Path(path), assessment_path(self.report_path))
+        self.assertEqual(Path(path).name, "analysis.assessment.json")
+        self.assertEqual(json.loads(Path(path).read_text())["risk_level"], "medium")
+        self.assertEqual(load_assessment(self.report_path), assessment)
+
+    def test_mock_llm_satisfies_schema(self):
+        """Test that the mock LLM returns a valid structured response."""
+        response = MockLLM().structured("Assess the property", ASSESSMENT_SCHEMA)
+        assessment = PropertyAssessment.from_response(response)
+        self.assertTrue(1 <= assessment.opportunity_score <= 10)
+
+    def test_index_ranking(self):
+        """Test ranking listings by the opportunity score of their latest report."""
+        index = ReportIndex(Path(self.temp_dir.name) / "report_index.sqlite")
+        try:
+            for stock_number, score in [("FL-00001", 4), ("FL-00002", 9), ("FL-00003", None)]:
+                path = Path(self.temp_dir.name) / f"property_{stock_number}" / "analysis.md"
+                path.parent.mkdir(exist_ok=True)
+                path.write_text(f"# Report for {stock_number}\n")
+                assessment = None if score is None else PropertyAssessment.from_response(
+                    make_response(opportunity_score=score), stock_number=stock_number)
+                index.record(path, {'StockNumber': stock_number}, assessment=assessment)
+
+            ranked = index.rank()
+            self.assertEqual([report["stock_number"] for report in ranked], ["FL-00002", "FL-00001"])
+            self.assertEqual(ranked[0]["risk_level"], "medium")
+            self.assertEqual(ranked[0]["assessment"]["opportunity_score"], 9)
+
+            with self.assertRaises(ValueError):
+                index.rank(by="address")
+        finally:
+            index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Unit tests for adaptive research query budgeting.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.dedup import DuplicateIndex
+from src.utils.ratelimit import RateLimiter
+from src.utils.research_budget import ResearchBudget
+from src.tools.web_research import EnhancedWebResearchTool
+
+PROPERTY = {"City": "Ithaca", "County Name": "Tompkins", "State": "NY", "Zip": "14850"}
+
+
+class StubEngine:
+    """Search engine answering queries from a predicate, counting calls."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+
+    def text(self, query, max_results=None):
+        self.queries.append(query)
+        if not self.answers(query, len(self.queries)):
+            return []
+        return [{"title": "Ithaca housing growth", "href": f"https://news{len(self.queries)}.example.com/a",
+                 "body": f"Story {len(self.queries)}: housing growth and $5 million in new jobs investment."}]
+
+
+def baseline_queries(answers, max_queries=3):
+    """Count the queries of the fixed strategy that stopped each category at its first results."""
+    tool = EnhancedWebResearchTool
+    context = {"city": "Ithaca", "county": "Tompkins", "state": "NY", "full_location": "Ithaca, Tompkins, NY"}
+    count = 0
+    for templates in tool.SEARCH_TEMPLATES.values():
+        found = False
+        for level in ("medium", "high", "low"):
+            for template in templates[:max_queries]:
+                count += 1
+                if answers(template.format(location=tool.build_location_query(None, context, level)), count):
+                    found = True
+                    break
+            if found:
+                break
+    return count
+
+
+class TestResearchBudget(unittest.TestCase):
+    """Test suite for ResearchBudget."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.budget = ResearchBudget(["economy", "housing", "schools"], reserve=3, min_novelty=0.5, patience=2)
+
+    def test_novelty(self):
+        """Test that novelty is the share of items new to the category."""
+        self.assertEqual(self.budget.observe("economy", {"a", "b"}), 1.0)
+        self.assertEqual(self.budget.observe("economy", {"a", "b", "c", "d"}), 0.5)
+        self.assertEqual(self.budget.observe("economy", set()), 0.0)
+        self.assertEqual(self.budget.observe("housing", {"a"}), 1.0)
+        self.assertEqual(self.budget.spent, 4)
+        self.assertEqual(self.budget.remaining, 0)
+
+    def test_misses_fund_follow_ups(self):
+        """Test that only categories whose first query found nothing free follow-ups."""
+        budget = ResearchBudget(["economy", "housing", "schools"], reserve=1)
+        self.assertEqual(budget.total_queries, 3)
+        budget.observe("economy", {"a"})
+        budget.observe("housing", set())
+        budget.observe("schools", set())
+        self.assertEqual(budget.total_queries, 4)
+        self.assertEqual(budget.next_category(), "housing")
+        budget.observe("housing", {"b"})
+        self.assertIsNone(budget.next_category())
+
+    def test_closes_saturated_category(self):
+        """Test that a category closes after consecutive unproductive queries."""
+        self.budget.observe("housing", {"a", "b", "c"})
+        self.budget.observe("housing", {"a", "b"})
+        self.assertTrue(self.budget.is_open("housing"))
+        self.budget.observe("housing", {"a", "b", "c"})
+        self.assertFalse(self.budget.is_open("housing"))
+
+        budget = ResearchBudget(["housing"])
+        budget.observe("housing", {"a"})
+        self.assertTrue(budget.is_open("housing"))
+        budget.observe("housing", {"a"})
+        self.assertFalse(budget.is_open("housing"))
+
+    def test_prefers_thin_coverage(self):
+        """Test that the next query goes to the open category that knows the least."""
+        self.assertEqual(self.budget.next_category(), "economy")
+        self.budget.observe("economy", {"a", "b", "c"})
+        self.assertEqual(self.budget.next_category(), "housing")
+        self.budget.observe("housing", {"a"})
+        self.assertEqual(self.budget.next_category(), "schools")
+        self.budget.observe("schools", set())
+        self.assertEqual(self.budget.next_category(), "schools")
+        self.assertEqual(self.budget.next_category(["economy", "housing"]), "housing")
+
+    def test_budget_exhausted(self):
+        """Test that no category is chosen once the budget is spent or all are closed."""
+        for _ in range(2):
+            for category in ("economy", "housing", "schools"):
+                self.budget.observe(category, set())
+        self.assertIsNone(self.budget.next_category())
+        self.assertEqual(self.budget.summary()["schools"],
+                         {"queries": 2, "coverage": 0, "novelty": [0.0, 0.0], "open": True})
+
+        closed = ResearchBudget(["economy", "housing"], reserve=10, patience=1)
+        closed.observe("economy", {"a"})
+        closed.observe("housing", set())
+        closed.observe("economy", {"a"})
+        self.assertEqual(closed.next_category(["economy"]), None)
+        self.assertTrue(closed.is_open("housing"))
+
+
+class TestSearchStrategyBudget(unittest.TestCase):
+    """Test that the search strategy runs no more queries than the fixed strategy it replaced."""
+
+    def run_strategy(self, answers):
+        """Run the full search strategy against a stub engine and return its queries."""
+        engine = StubEngine(answers)
+        with mock.patch.dict(os.environ, {"RESEARCH_FIXTURES": "", "SEARCH_HEDGE": "false",
+                                          "OLLAMA_EMBED_MODEL": "none"}):
+            tool = EnhancedWebResearchTool(duplicates=DuplicateIndex(), search_engine=engine,
+                                           limiter=RateLimiter(sleep=lambda seconds: None))
+        tool.execute_search_strategy(PROPERTY)
+        return engine.queries
+
+    def test_query_count_within_baseline(self):
+        """Test the query count when every, no, or only some queries find results."""
+        scenarios = {
+            "all": lambda query, n: True,
+            "none": lambda query, n: False,
+            "housing empty": lambda query, n: "housing" not in query and "home" not in query,
+            "first misses": lambda query, n: n > 2,
+        }
+        for name, answers in scenarios.items():
+            with self.subTest(name):
+                queries = self.run_strategy(answers)
+                self.assertGreaterEqual(len(queries), len(EnhancedWebResearchTool.SEARCH_TEMPLATES))
+                self.assertLessEqual(len(queries), baseline_queries(answers))
+
+    def test_empty_category_gets_follow_up(self):
+        """Test that a category whose first query finds nothing is retried instead of losing coverage."""
+        empty = "Ithaca NY housing market analysis 2024"
+        engine = StubEngine(lambda query, n: query != empty)
+        with mock.patch.dict(os.environ, {"RESEARCH_FIXTURES": "", "SEARCH_HEDGE": "false",
+                                          "OLLAMA_EMBED_MODEL": "none"}):
+            tool = EnhancedWebResearchTool(duplicates=DuplicateIndex(), search_engine=engine,
+                                           limiter=RateLimiter(sleep=lambda seconds: None))
+        results = tool.execute_search_strategy(PROPERTY)
+
+        self.assertIn(empty, engine.queries)
+        for category in EnhancedWebResearchTool.SEARCH_TEMPLATES:
+            with self.subTest(category):
+                self.assertTrue(tool.get_results_by_category(category))
+        budget = results["research_budget"]
+        self.assertEqual(budget["housing_market"]["queries"], 2)
+        self.assertEqual(budget["economic_development"]["queries"], 1)
+        self.assertLessEqual(len(engine.queries), baseline_queries(lambda query, n: query != empty))
+
+
+if __name__ == '__main__':
+    unittest.main()
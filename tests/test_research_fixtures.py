@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for recording and replaying web research traffic.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.archive import PageArchive
+from src.utils.fixtures import (FixtureMissingError, FixtureStore, RecordingHttp, RecordingSearchEngine,
+                                ReplayHttp, ReplaySearchEngine, RECORDED_LATENCY, fixture_mode_from_env)
+
+from src.tools.web_research import WebResearchTool
+
+RESULTS = [{"title": "Ithaca housing study", "href": "https://example.com/study", "body": "Vacancy is low."}]
+
+
+class TestResearchFixtures(unittest.TestCase):
+    """Test suite for the fixture store and its record and replay backends."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store = FixtureStore(self.temp_dir.name)
+
+    def test_search_round_trip(self):
+        """Test that recorded searches are replayed without the live engine."""
+        live = mock.Mock()
+        live.text.return_value = iter(RESULTS)
+        self.assertEqual(RecordingSearchEngine(live, self.store).text("Ithaca NY housing", max_results=3), RESULTS)
+
+        replay = ReplaySearchEngine(self.store)
+        self.assertEqual(replay.text("Ithaca NY housing", max_results=3), RESULTS)
+        self.assertEqual(self.store.count("search"), 1)
+        with self.assertRaises(FixtureMissingError):
+            replay.text("Ithaca NY housing", max_results=5)
+
+    def test_http_round_trip(self):
+        """Test that recorded pages are replayed and credentials are not stored."""
+        session = mock.Mock()
+        session.get.return_value = mock.Mock(status_code=200, text="<p>Zoned R-1</p>",
+                                             headers={"Content-Type": "text/html"})
+        RecordingHttp(self.store, session).get("https://api.example.com/search?q=zoning&api_key=secret",
+                                               timeout=10)
+
+        response = ReplayHttp(self.store).get("https://api.example.com/search?q=zoning&api_key=other")
+        self.assertEqual((response.status_code, response.text), (200, "<p>Zoned R-1</p>"))
+        self.assertEqual(response.headers["content-type"], "text/html")
+        self.assertEqual(response.content, b"<p>Zoned R-1</p>")
+        for path in Path(self.temp_dir.name).rglob("*.json"):
+            self.assertNotIn("secret", path.read_text())
+
+    def test_recording_bypasses_archive(self):
+        """Test that pages archived earlier are fetched and recorded, so replays can serve them."""
+        url = "https://example.com/zoning"
+        archive = PageArchive(Path(self.temp_dir.name) / "archive")
+        archive.store(url, b"<p>Zoned A-1</p>", "Zoned A-1")
+        session = mock.Mock()
+        session.get.return_value = mock.Mock(status_code=200, text="<p>Zoned R-1</p>", content=b"<p>Zoned R-1</p>",
+                                             headers={"Content-Type": "text/html"})
+        environment = {"RESEARCH_FIXTURES": "record", "FIXTURE_DIR": self.temp_dir.name}
+
+        with mock.patch.dict(os.environ, environment):
+            recorder = WebResearchTool(archive=archive)
+        recorder.http.session = session
+        self.assertEqual(recorder.fetch_page_content(url), "Zoned R-1")
+        self.assertEqual(recorder.fetch_page_content(url), "Zoned R-1")
+        self.assertEqual(self.store.count("http"), 1)
+
+        with mock.patch.dict(os.environ, dict(environment, RESEARCH_FIXTURES="replay")):
+            self.assertEqual(WebResearchTool().fetch_page_content(url), "Zoned R-1")
+
+    def test_latency(self):
+        """Test fixed and recorded replay latency."""
+        self.store.save("search", {"query": "q", "max_results": 1}, RESULTS, elapsed=0.05)
+        for latency in (0.05, RECORDED_LATENCY):
+            started = time.perf_counter()
+            ReplaySearchEngine(self.store, latency).text("q", max_results=1)
+            self.assertGreaterEqual(time.perf_counter() - started, 0.045)
+
+    def test_mode_from_env(self):
+        """Test reading the fixture settings from the environment."""
+        with mock.patch.dict(os.environ, {"RESEARCH_FIXTURES": "Replay", "FIXTURE_DIR": self.temp_dir.name,
+                                          "FIXTURE_LATENCY": "0.2"}):
+            mode, store, latency = fixture_mode_from_env()
+            self.assertEqual((mode, store.root, latency), ("replay", Path(self.temp_dir.name), 0.2))
+        with mock.patch.dict(os.environ, {"RESEARCH_FIXTURES": ""}):
+            self.assertEqual(fixture_mode_from_env(), (None, None, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the scenario sweep engine.
+"""
+
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the module to be tested
+from src.analysis.financials import extract_financial_inputs, evaluate_development
+from src.analysis.scenarios import (
+    DEFAULT_SENSITIVITY_RANGES,
+    sweep_scenarios,
+    scenario_table,
+    tornado_sensitivities,
+)
+
+
+class TestScenarioSweep(unittest.TestCase):
+    """Test suite for scenario sweeps and tornado sensitivities."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data = pd.DataFrame({
+            'StockNumber': ['12345', '67890', '24680'],
+            'Land Area (AC)': [10.0, 20.0, 15.0],
+            'For Sale Price': ['$500,000', np.nan, '$1,000,000'],
+            'MedianGrossRent_5': [1000.0, 1300.0, 1200.0],
+            'MedianHValue_5': [200000.0, 250000.0, 300000.0],
+        })
+
+    def test_grid_shape(self):
+        """Test that every grid combination is evaluated for every property."""
+        sweep = sweep_scenarios(self.test_data, {
+            "cost_factor": [0.9, 1.0, 1.15],
+            "rent_factor": [0.95, 1.0],
+        })
+
+        self.assertEqual(len(sweep["scenarios"]), 6)
+        self.assertEqual(sweep["roi"].shape, (6, 3))
+        self.assertEqual(sweep["profit"].shape, (6, 3))
+
+    def test_base_case_matches_financial_model(self):
+        """Test that the base-case scenario equals the deterministic model."""
+        sweep = sweep_scenarios(self.test_data, {"cost_factor": [1.0]})
+        expected = evaluate_development(extract_financial_inputs(self.test_data))
+
+        np.testing.assert_allclose(sweep["roi"][0], expected["roi"])
+
+    def test_costs_up_rents_down(self):
+        """Test the "costs +15%, rents -5%" scenario against a direct evaluation."""
+        sweep = sweep_scenarios(self.test_data, {"cost_factor": [1.15], "rent_factor": [0.95]})
+        expected = evaluate_development(extract_financial_inputs(self.test_data),
+                                        cost_factor=1.15, rent_factor=0.95)
+
+        np.testing.assert_allclose(sweep["profit"][0], expected["profit"])
+
+        table = scenario_table(sweep)
+        self.assertEqual(list(table.columns), ["cost_factor=1.15, rent_factor=0.95"])
+        self.assertEqual(list(table.index), ['12345', '67890', '24680'])
+
+    def test_tornado_sensitivities(self):
+        """Test that sensitivities cover every parameter and are sorted by swing."""
+        sensitivities = tornado_sensitivities(self.test_data)
+
+        self.assertEqual(len(sensitivities), 3 * len(DEFAULT_SENSITIVITY_RANGES))
+        for _, rows in sensitivities.groupby("StockNumber"):
+            self.assertTrue(rows["swing"].is_monotonic_decreasing)
+            self.assertEqual(rows["base"].nunique(), 1)
+
+        # Higher construction costs always reduce ROI
+        costs = sensitivities[sensitivities["parameter"] == "cost_factor"]
+        self.assertTrue((costs["high"] < costs["low"]).all())
+
+    def test_unknown_parameter(self):
+        """Test that unknown parameters are rejected."""
+        with self.assertRaises(ValueError):
+            sweep_scenarios(self.test_data, {"interest_rate": [0.05]})
+        with self.assertRaises(ValueError):
+            tornado_sensitivities(self.test_data, ranges={"interest_rate": (0.04, 0.06)})
+
+
+if __name__ == '__main__':
+    unittest.main()
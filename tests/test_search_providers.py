@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for search providers and hedged search.
+"""
+
+import sys
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.fixtures import RECORD, REPLAY, FixtureStore
+from src.utils.search_providers import (FixtureProvider, HedgedSearch, SearxngProvider,
+                                        create_search_engine, create_search_providers)
+
+
+class StubProvider:
+    """Provider answering after a fixed delay, or failing."""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def text(self, query, max_results=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{"title": f"{self.name}: {query}", "href": f"https://{self.name}.example/", "body": ""}]
+
+
+class TestSearchProviders(unittest.TestCase):
+    """Test suite for the provider adapters and HedgedSearch."""
+
+    def test_searxng(self):
+        """Test mapping SearxNG JSON results to the common result format."""
+        http = mock.Mock()
+        http.get.return_value = mock.Mock(status_code=200, json=mock.Mock(return_value={"results": [
+            {"title": "Zoning update", "url": "https://county.gov/zoning", "content": "New R-1 rules"},
+            {"title": "Other", "url": "https://other.org", "content": ""},
+        ]}))
+        provider = SearxngProvider("http://searx.local/", http=http)
+        self.assertEqual(provider.text("zoning", max_results=1),
+                         [{"title": "Zoning update", "href": "https://county.gov/zoning", "body": "New R-1 rules"}])
+        self.assertEqual(http.get.call_args.args[0], "http://searx.local/search")
+        self.assertEqual(http.get.call_args.kwargs["params"], {"q": "zoning", "format": "json"})
+
+        http.get.return_value = mock.Mock(status_code=429)
+        with self.assertRaises(RuntimeError):
+            provider.text("zoning")
+
+    def test_hedges_slow_provider(self):
+        """Test that a call slower than the hedge delay is answered by the next provider."""
+        slow, fast = StubProvider("slow", delay=0.5), StubProvider("fast")
+        search = HedgedSearch([slow, fast], default_delay=0.05)
+        results = search.text("housing")
+        self.assertEqual(results[0]["title"], "fast: housing")
+        self.assertEqual(search.hedged, 1)
+
+    def test_no_hedge_when_fast(self):
+        """Test that a timely primary answer does not involve the other providers."""
+        primary, backup = StubProvider("primary"), StubProvider("backup")
+        search = HedgedSearch([primary, backup], default_delay=1.0)
+        self.assertEqual(search.text("housing")[0]["title"], "primary: housing")
+        self.assertEqual((backup.calls, search.hedged), (0, 0))
+
+    def test_failover(self):
+        """Test that a failing provider falls through to the next, and all failing raises."""
+        broken = StubProvider("broken", error=ConnectionError("refused"))
+        search = HedgedSearch([broken, StubProvider("backup")], hedge=False)
+        self.assertEqual(search.text("housing")[0]["title"], "backup: housing")
+        with self.assertRaises(ConnectionError):
+            HedgedSearch([broken, StubProvider("also_broken", error=ConnectionError("down"))]).text("q")
+
+    def test_hedge_delay_quantile(self):
+        """Test that the hedge delay follows the provider's p90 latency once sampled."""
+        provider = StubProvider("p")
+        search = HedgedSearch([provider], min_samples=5, default_delay=2.0)
+        self.assertEqual(search.hedge_delay(provider), 2.0)
+        search.latencies["p"].extend([0.1] * 9 + [1.1])
+        self.assertAlmostEqual(search.hedge_delay(provider), 0.2)
+
+    def test_create_providers(self):
+        """Test building providers from names and in replay mode."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FixtureStore(tmp)
+            providers = create_search_providers(["searxng", "fixture", "bogus"], fixture_store=store)
+            self.assertEqual([provider.name for provider in providers], ["searxng", "fixture"])
+
+            replay = create_search_providers(["searxng"], fixture_mode=REPLAY, fixture_store=store)
+            self.assertEqual(len(replay), 1)
+            self.assertIsInstance(replay[0], FixtureProvider)
+
+    def test_records_hedged_winner(self):
+        """Test that recording keeps the results returned, not those of a hedged provider answering later."""
+        slow, fast = StubProvider("slow", delay=0.3), StubProvider("fast")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FixtureStore(tmp)
+            search = create_search_engine([slow, fast], fixture_mode=RECORD, fixture_store=store)
+            search.engine.default_delay = 0.05
+            live = search.text("q", max_results=3)
+            self.assertEqual(live[0]["title"], "fast: q")
+
+            time.sleep(0.4)
+            self.assertEqual(slow.calls, 1)
+            self.assertEqual(FixtureProvider(store).text("q", max_results=3), live)
+
+        self.assertIsNone(create_search_engine([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for compiled multi-term matching.
+"""
+
+import re
+import sys
+import unittest
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.utils.matching import TermMatcher, trie_pattern
+
+
+class TestTermMatcher(unittest.TestCase):
+    """Test suite for TermMatcher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.matcher = TermMatcher({
+            "growth": ["expansion", "growth", "new jobs", "hiring"],
+            "recency": ["new", "2024", "recent"],
+            "projects": ["project", "development"],
+            "housing": ["development", "new homes"],
+        })
+
+    def test_trie_pattern(self):
+        """Test that the trie pattern matches exactly the terms, longest first."""
+        pattern = re.compile(trie_pattern(["new", "new jobs", "news", "hiring"]))
+        self.assertEqual([pattern.fullmatch(t) is not None for t in ["new", "new jobs", "news", "hiring", "ne"]],
+                         [True, True, True, True, False])
+        self.assertEqual(pattern.match("new jobs added").group(0), "new jobs")
+        self.assertEqual(trie_pattern([]), "")
+
+    def test_hits(self):
+        """Test that one pass finds overlapping and shared terms under every label."""
+        hits = self.matcher.hits("Hiring surges as New Jobs follow the 2024 development project.")
+        self.assertEqual(hits, {
+            "growth": {"hiring", "new jobs"},
+            "recency": {"new", "2024"},
+            "projects": {"development", "project"},
+            "housing": {"development"},
+        })
+
+    def test_substring_semantics(self):
+        """Test that terms match inside words, like the substring checks they replace."""
+        self.assertEqual(self.matcher.labels("renewal projects"), {"recency", "projects"})
+        self.assertEqual(self.matcher.labels(""), set())
+        self.assertEqual(TermMatcher({}).hits("anything"), {})
+
+    def test_case_sensitive(self):
+        """Test matching that respects case."""
+        codes = TermMatcher({"residential": ["R-1"], "commercial": ["C-"]}, ignore_case=False)
+        self.assertEqual(codes.labels("Parcel zoned R-1"), {"residential"})
+        self.assertEqual(codes.labels("parcel zoned r-1, see c-"), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for demographic trend analytics.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+# Import the modules to be tested
+from src.analysis.trends import build_trend_table, interpolate_series, trend_series, format_trend_summary
+from src.data.loader import PropertyDataLoader
+
+
+class TestTrendAnalytics(unittest.TestCase):
+    """Test suite for the precomputed trend table."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_data = pd.DataFrame({
+            'StockNumber': ['12345', '67890'],
+            'Property Address': ['123 Main St', '456 Oak Ave'],
+            'City': ['Austin', 'Dallas'],
+            'State': ['TX', 'TX'],
+            '2000 Population(3m)': ['1,000', '2,000'],
+            '2020 Population(3m)': ['2,000', '2,000'],
+            '2024 Population(3m)': ['2,000', '2,100'],
+            '2029 Population(3m)': ['2,500', '2,000'],
+            '2000 Population(10m)': [10000, 20000],
+            '2020 Population(10m)': [12000, 20000],
+            '2024 Population(10m)': [12000, 21000],
+            '2029 Population(10m)': [12600, 21000],
+            '2024 Median Home Value(5m)': [200000, 300000],
+            '2029 Median HH Value(5m)': [250000, np.nan],
+        })
+        self.trends = build_trend_table(self.test_data)
+
+    def test_cagr(self):
+        """Test growth rates against hand calculations."""
+        row = self.trends.loc['12345']
+        self.assertAlmostEqual(row['population_3m_cagr'], 2.5 ** (1 / 29) - 1)
+        self.assertAlmostEqual(row['population_3m_historical_cagr'], 2.0 ** (1 / 24) - 1)
+        self.assertAlmostEqual(row['population_3m_projected_cagr'], 1.25 ** (1 / 5) - 1)
+        self.assertEqual(row['population_3m_change'], 1500)
+        self.assertEqual(row['population_3m_projected_change'], 500)
+
+    def test_interpolated_series(self):
+        """Test that yearly series hit the known values and grow geometrically between them."""
+        series = trend_series(self.trends.loc['12345'], 'population', 3)
+
+        self.assertEqual(sorted(series), list(range(2000, 2030)))
+        self.assertAlmostEqual(series[2000], 1000)
+        self.assertAlmostEqual(series[2020], 2000)
+        self.assertAlmostEqual(series[2010], 1000 * 2 ** 0.5)
+
+        # Non-positive values fall back to linear interpolation
+        values = interpolate_series(np.array([2020, 2024]), np.array([[0.0, 400.0]]), [2022])
+        self.assertAlmostEqual(values[0, 0], 200.0)
+
+    def test_radius_gradient(self):
+        """Test that the gradient compares inner and outer radius growth."""
+        row = self.trends.loc['12345']
+        expected = row['population_3m_projected_cagr'] - row['population_10m_projected_cagr']
+        self.assertAlmostEqual(row['population_cagr_gradient'], expected)
+        self.assertAlmostEqual(row['population_radius_ratio'], 2000 / 12000)
+
+    def test_missing_data(self):
+        """Test that missing columns and values produce NaN rather than errors."""
+        row = self.trends.loc['67890']
+        self.assertTrue(np.isnan(row['home_value_5m_projected_cagr']))
+        self.assertTrue(np.isnan(row['median_income_5m_cagr']))
+        self.assertIn("N/A", format_trend_summary(row))
+        self.assertIn("unavailable", format_trend_summary(None))
+
+    def test_loader_trends_and_ranking(self):
+        """Test that the data loader precomputes trends and ranks by them."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "test_data.csv")
+            self.test_data.to_csv(csv_path, index=False)
+            loader = PropertyDataLoader(csv_path)
+
+            self.assertEqual(len(loader.get_trend_table()), 2)
+            self.assertIsNone(loader.get_property_trends('00000'))
+
+            ranking = loader.rank_properties(by='population_3m_projected_cagr')
+            self.assertEqual([prop['StockNumber'] for prop in ranking], ['12345', '67890'])
+            self.assertEqual(ranking[0]['City'], 'Austin')
+            self.assertEqual(loader.rank_properties(by='not_a_column'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()